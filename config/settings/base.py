@@ -299,6 +299,10 @@ CELERY_TASK_ROUTES = (
             "safe_transaction_service.history.tasks.retry_get_metadata_task",
             {"queue": "tokens", "delivery_mode": "transient"},
         ),
+        (
+            "safe_transaction_service.history.tasks.prefetch_collectibles_metadata_task",
+            {"queue": "tokens", "delivery_mode": "transient"},
+        ),
         (
             "safe_transaction_service.history.tasks.reindex_mastercopies_last_hours_task",
             {"queue": "indexing", "delivery_mode": "transient"},
@@ -311,6 +315,10 @@ CELERY_TASK_ROUTES = (
             "safe_transaction_service.history.tasks.process_decoded_internal_txs_for_safe_task",
             {"queue": "processing", "delivery_mode": "transient"},
         ),
+        (
+            "safe_transaction_service.history.tasks.process_decoded_internal_txs_for_shard_task",
+            {"queue": "processing", "delivery_mode": "transient"},
+        ),
         (
             "safe_transaction_service.history.tasks.process_decoded_internal_txs_task",
             {"queue": "processing", "delivery_mode": "transient"},
@@ -601,6 +609,9 @@ ETH_INTERNAL_TRACE_TXS_BATCH_SIZE = env.int(
 ETH_INTERNAL_TRACE_TXS_CONCURRENCY = env.int(
     "ETH_INTERNAL_TRACE_TXS_CONCURRENCY", default=3
 )  # Number of concurrent `trace_transactions` batch requests (floored at 1: 0/negative runs serially)
+ETH_INTERNAL_TXS_PREFETCH_RANGES = env.int(
+    "ETH_INTERNAL_TXS_PREFETCH_RANGES", default=0
+)  # Number of block ranges to `trace_filter`/`trace_block` ahead while the current range is being stored. 0 == disabled
 ETH_INTERNAL_TX_DECODED_PROCESS_BATCH = env.int(
     "ETH_INTERNAL_TX_DECODED_PROCESS_BATCH", default=500
 )  # Number of InternalTxDecoded to process together. Keep it low to be memory friendly
@@ -625,6 +636,15 @@ ETH_EVENTS_BLOCK_PROCESS_LIMIT_MAX = env.int(
 ETH_EVENTS_BLOCKS_TO_REINDEX_AGAIN = env.int(
     "ETH_EVENTS_BLOCKS_TO_REINDEX_AGAIN", default=2
 )  # Blocks to reindex again every indexer run when service is synced. Useful for RPCs not reliable
+ETH_EVENTS_PREFETCH_RANGES = env.int(
+    "ETH_EVENTS_PREFETCH_RANGES", default=0
+)  # Number of block ranges to `getLogs` ahead while the current range is being stored. 0 == disabled
+ETH_EVENTS_BACKFILL_SHARD_SIZE = env.int(
+    "ETH_EVENTS_BACKFILL_SHARD_SIZE", default=100_000
+)  # Number of blocks for every shard when backfilling Safe events in parallel with `backfill_safe_events_task`
+ETH_EVENTS_BACKFILL_SHARD_STALE_MINUTES = env.int(
+    "ETH_EVENTS_BACKFILL_SHARD_STALE_MINUTES", default=20
+)  # Not finished backfill shards without progress for these minutes will have their task sent again. Should be higher than `CELERY_TASK_LOCK_TIMEOUT`
 ETH_EVENTS_GET_LOGS_CONCURRENCY = env.int(
     "ETH_EVENTS_GET_LOGS_CONCURRENCY", default=20
 )  # Number of concurrent requests to `getLogs`
@@ -634,12 +654,33 @@ ETH_EVENTS_QUERY_CHUNK_SIZE = env.int(
 ETH_EVENTS_UPDATED_BLOCK_BEHIND = env.int(
     "ETH_EVENTS_UPDATED_BLOCK_BEHIND", default=24 * 60 * 60 // 15
 )  # Number of blocks to consider an address 'almost updated'.
+ETH_PROCESSED_ELEMENTS_CACHE_SIZE_BYTES = env.int(
+    "ETH_PROCESSED_ELEMENTS_CACHE_SIZE_BYTES", default=16 * 1024 * 1024
+)  # Approximate memory for every indexer to remember already processed events/traces, so they are not processed again
+ETH_BLOCK_PROCESS_LIMIT_CONTROLLER = env(
+    "ETH_BLOCK_PROCESS_LIMIT_CONTROLLER", default="aimd"
+)  # Algorithm to auto adjust the number of blocks processed every time by the indexers: `aimd` or `pid`
+ETH_BLOCK_PROCESS_LIMIT_TARGET_SECONDS = env.float(
+    "ETH_BLOCK_PROCESS_LIMIT_TARGET_SECONDS", default=10.0
+)  # Desired seconds to retrieve a block range from the node
+ETH_BLOCK_PROCESS_LIMIT_TARGET_ELEMENTS = env.int(
+    "ETH_BLOCK_PROCESS_LIMIT_TARGET_ELEMENTS", default=0
+)  # Desired maximum number of logs/traces returned by the node for a block range. `0 == no limit`
+ETH_BLOCK_PROCESS_LIMIT_PERSIST = env.bool(
+    "ETH_BLOCK_PROCESS_LIMIT_PERSIST", default=True
+)  # Store the adjusted number of blocks on Redis, so next indexer runs start from it
 ETH_REORG_BLOCKS_BATCH = env.int(
     "ETH_REORG_BLOCKS_BATCH", default=250
 )  # Number of blocks to be checked in the same batch for reorgs
 ETH_REORG_BLOCKS = env.int(
     "ETH_REORG_BLOCKS", default=200 if ETH_L2_NETWORK else 10
 )  # Number of blocks from the current block number needed to consider a block valid/stable
+ETH_RPC_CACHE_PATH = env(
+    "ETH_RPC_CACHE_PATH", default=None
+)  # SQLite file to cache RPC responses for blocks older than `ETH_REORG_BLOCKS`, so reindexing again is faster. Never expired, delete the file to clear it. Disabled by default
+ETH_RPC_CACHE_COMPRESSION_LEVEL = env.int(
+    "ETH_RPC_CACHE_COMPRESSION_LEVEL", default=1
+)  # zlib compression level for the RPC cache, from 0 to 9
 ETH_REINDEX_MAX_RETRIES = env.int(
     "ETH_REINDEX_MAX_RETRIES", default=5
 )  # Number of consecutive failures of the same block range during reindex
@@ -650,6 +691,15 @@ ETH_ERC20_INDEX_MAX_CONSECUTIVE_FAILURES = env.int(
 ETH_ERC20_LOAD_ADDRESSES_CHUNK_SIZE = env.int(
     "ETH_ERC20_LOAD_ADDRESSES_CHUNK_SIZE", default=500_000
 )  # Load Safe addresses for the ERC20 indexer with a database iterator with the defined `chunk_size`
+ETH_ERC20_ADDRESSES_SNAPSHOT_PATH = env(
+    "ETH_ERC20_ADDRESSES_SNAPSHOT_PATH", default=None
+)  # File to store Safe addresses sorted for the ERC20 indexer, memory mapped and shared by every worker on the host. Disabled by default
+ETH_ERC20_ADDRESSES_SNAPSHOT_MAX_DELTA = env.int(
+    "ETH_ERC20_ADDRESSES_SNAPSHOT_MAX_DELTA", default=100_000
+)  # Number of Safes created after the snapshot to write it again
+ETH_ERC20_BULK_COPY_BLOCKS_BEHIND = env.int(
+    "ETH_ERC20_BULK_COPY_BLOCKS_BEHIND", default=0
+)  # Store ERC20/721 events using PostgreSQL `COPY` when they are more than these blocks behind the current block (backfills/reindexing). Disabled by default
 ETH_EVENTS_IGNORED_INITIATORS: set[ChecksumAddress] = {
     ChecksumAddress(HexAddress(HexStr(address)))
     for address in env.list("ETH_EVENTS_IGNORED_INITIATORS", default=[])
@@ -664,6 +714,36 @@ ETH_EVENTS_IGNORED_TO: set[ChecksumAddress] = {
 COLLECTIBLES_ENABLE_DOWNLOAD_METADATA = env.bool(
     "COLLECTIBLES_ENABLE_DOWNLOAD_METADATA", default=False
 )
+COLLECTIBLES_USE_OWNERSHIP_TABLE = env.bool(
+    "COLLECTIBLES_USE_OWNERSHIP_TABLE", default=False
+)  # Get collectibles for a Safe from `ERC721Ownership`, paginated on the database. Run `rebuild_erc721_ownership` before enabling it
+COLLECTIBLES_METADATA_MAX_CONCURRENCY = env.int(
+    "COLLECTIBLES_METADATA_MAX_CONCURRENCY", default=50
+)  # Maximum number of collectibles metadata downloaded at the same time by every process
+COLLECTIBLES_METADATA_MAX_CONCURRENCY_PER_HOST = env.int(
+    "COLLECTIBLES_METADATA_MAX_CONCURRENCY_PER_HOST", default=5
+)  # Maximum number of requests to the same host (e.g. an IPFS gateway) at the same time by every process
+COLLECTIBLES_METADATA_REQUEST_TIMEOUT = env.int(
+    "COLLECTIBLES_METADATA_REQUEST_TIMEOUT", default=10
+)  # Seconds to wait for every metadata request
+COLLECTIBLES_METADATA_MAX_WAIT_SECONDS = env.int(
+    "COLLECTIBLES_METADATA_MAX_WAIT_SECONDS", default=10
+)  # Seconds to wait for the metadata of a page of collectibles, metadata not downloaded is retried asynchronously
+COLLECTIBLES_METADATA_CIRCUIT_BREAKER_FAILURES = env.int(
+    "COLLECTIBLES_METADATA_CIRCUIT_BREAKER_FAILURES", default=5
+)  # Consecutive failures for a host to stop requesting metadata from it
+COLLECTIBLES_METADATA_CIRCUIT_BREAKER_SECONDS = env.int(
+    "COLLECTIBLES_METADATA_CIRCUIT_BREAKER_SECONDS", default=60
+)  # Seconds a failing host is not requested
+COLLECTIBLES_METADATA_NEGATIVE_CACHE_SECONDS = env.int(
+    "COLLECTIBLES_METADATA_NEGATIVE_CACHE_SECONDS", default=60 * 60
+)  # Seconds a not valid metadata uri is not requested after failing. Doubled on every failure
+COLLECTIBLES_METADATA_NEGATIVE_CACHE_MAX_SECONDS = env.int(
+    "COLLECTIBLES_METADATA_NEGATIVE_CACHE_MAX_SECONDS", default=60 * 60 * 24 * 7
+)  # Maximum seconds a not valid metadata uri is not requested
+COLLECTIBLES_PREFETCH_METADATA = env.bool(
+    "COLLECTIBLES_PREFETCH_METADATA", default=False
+)  # Download metadata for ERC721 tokens received by Safes when they are indexed. Requires `COLLECTIBLES_ENABLE_DOWNLOAD_METADATA`
 
 # Events processing
 # ------------------------------------------------------------------------------
@@ -673,6 +753,9 @@ PROCESSING_ENABLE_OUT_OF_ORDER_CHECK = env.bool(
 PROCESSING_ALL_SAFES_TOGETHER = env.bool(
     "PROCESSING_ALL_SAFES_TOGETHER", default=False
 )  # Process every Safe together in the same task. More optimal, but one problematic Safe can stuck the others
+PROCESSING_SHARDS = env.int(
+    "PROCESSING_SHARDS", default=0
+)  # If set, Safes are partitioned in this number of shards by address and every shard is processed in a different task. Takes precedence over `PROCESSING_ALL_SAFES_TOGETHER`. Safes are split in 256 partitions grouped in shards, so more than 256 shards will not add parallelism
 
 
 # Tokens
@@ -688,9 +771,21 @@ TOKENS_ENS_IMAGE_URL = env.str(
 TOKENS_ERC20_GET_BALANCES_BATCH = env.int(
     "TOKENS_ERC20_GET_BALANCES_BATCH", default=2_000
 )  # Number of tokens to get balances from in the same request. From 2_500 some nodes raise HTTP 413
+TOKENS_BALANCES_USE_LEDGER = env.bool(
+    "TOKENS_BALANCES_USE_LEDGER", default=False
+)  # Get tokens for a Safe from `SafeTokenLedger`. Run `rebuild_safe_token_ledger` before enabling it
 TOKENS_TRUSTED_CACHE_TTL = env.int(
     "TOKENS_TRUSTED_CACHE_TTL", default=60 * 60
 )  # Seconds the in-memory set of trusted token addresses is cached for (default 1h)
+TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH = env.int(
+    "TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH", default=200
+)  # Number of tokens not in database to get name, symbol and decimals from in the same multicall
+TOKENS_CREATE_FROM_INDEXER = env.bool(
+    "TOKENS_CREATE_FROM_INDEXER", default=False
+)  # Store tokens when their first transfer is indexed, instead of when balances or collectibles are requested
+TOKENS_CREATE_FROM_INDEXER_MAX = env.int(
+    "TOKENS_CREATE_FROM_INDEXER_MAX", default=1_000
+)  # Maximum number of tokens queued by the indexer to create on every run of the periodic task
 
 # ENS
 # ------------------------------------------------------------------------------
@@ -754,12 +849,36 @@ SHELL_PLUS_PRINT_SQL_TRUNCATE = env.int("SHELL_PLUS_PRINT_SQL_TRUNCATE", default
 TX_SERVICE_ALL_TXS_ENDPOINT_LIMIT_TRANSFERS = env.int(
     "TX_SERVICE_ALL_TXS_ENDPOINT_LIMIT_TRANSFERS", default=1_000
 )  # Don't return more than 1_000 transfers
+EXPORT_STREAM_CHUNK_SIZE = env.int(
+    "EXPORT_STREAM_CHUNK_SIZE", default=1_000
+)  # Rows fetched from the database server side cursor every time when streaming exports
+EXPORT_FILES_ENABLED = env.bool(
+    "EXPORT_FILES_ENABLED", default=False
+)  # Allow generating export files asynchronously on Celery and storing them on file storage
 
 # Compression level – an integer from 0 to 9. 0 means not compression
 CACHE_ALL_TXS_COMPRESSION_LEVEL = env.int("CACHE_ALL_TXS_COMPRESSION_LEVEL", default=0)
 CACHE_VIEW_DEFAULT_TIMEOUT = env.int(
     "CACHE_VIEW_DEFAULT_TIMEOUT", default=0
 )  # 0 will disable the cache
+CACHE_SAFE_OWNERS_TIMEOUT = env.int(
+    "CACHE_SAFE_OWNERS_TIMEOUT", default=60 * 60
+)  # Seconds owners and threshold of indexed Safes are cached to validate signatures. Removed when the indexer stores a new Safe status. 0 will disable the cache
+CACHE_SAFE_OWNERS_BLOCKCHAIN_TIMEOUT = env.int(
+    "CACHE_SAFE_OWNERS_BLOCKCHAIN_TIMEOUT", default=15
+)  # Seconds owners and threshold retrieved from the node (Safes not indexed or with nonce 0) are cached
+CACHE_EIP1271_SIGNATURES_TIMEOUT = env.int(
+    "CACHE_EIP1271_SIGNATURES_TIMEOUT", default=60 * 10
+)  # Seconds valid EIP-1271 contract signatures are cached, so owner contracts are not called again. 0 will disable the cache
+
+# Signature verification
+# ------------------------------------------------------------------------------
+SIGNATURE_VERIFICATION_MAX_WORKERS = env.int(
+    "SIGNATURE_VERIFICATION_MAX_WORKERS", default=1
+)  # Threads used to recover owners from ECDSA signatures. 1 will recover them on the calling thread. API and Celery run with gevent monkey patching, so threads are greenlets and don't add parallelism
+SIGNATURE_VERIFICATION_EIP1271_BATCH_SIZE = env.int(
+    "SIGNATURE_VERIFICATION_EIP1271_BATCH_SIZE", default=200
+)  # Maximum number of EIP-1271 signatures checked on the same multicall
 
 # Contracts reindex batch configuration
 # ------------------------------------------------------------------------------
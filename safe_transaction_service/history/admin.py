@@ -21,6 +21,7 @@ from .models import (
     ERC721Transfer,
     EthereumBlock,
     EthereumTx,
+    IndexingShard,
     IndexingStatus,
     InternalTx,
     InternalTxDecoded,
@@ -104,6 +105,21 @@ class IndexingStatusAdmin(admin.ModelAdmin):
     ordering = ["-indexing_type"]
 
 
+@admin.register(IndexingShard)
+class IndexingShardAdmin(admin.ModelAdmin):
+    list_display = (
+        "from_block_number",
+        "to_block_number",
+        "block_number",
+        "created",
+        "modified",
+    )
+    search_fields = [
+        "=from_block_number",
+    ]
+    ordering = ["from_block_number"]
+
+
 @admin.register(Chain)
 class ChainAdmin(admin.ModelAdmin):
     list_display = ("chain_id",)
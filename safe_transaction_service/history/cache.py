@@ -6,8 +6,10 @@ from urllib.parse import urlencode
 
 from django.conf import settings
 from django.db import transaction
+from django.http import HttpResponse
 
 from eth_typing import ChecksumAddress
+from redis.exceptions import WatchError
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -30,6 +32,7 @@ class CacheSafeTxsView:
     LIST_MULTISIGTRANSACTIONS_VIEW_CACHE_KEY = "multisigtransactionsview"
     LIST_MODULETRANSACTIONS_VIEW_CACHE_KEY = "moduletransactionsview"
     LIST_TRANSFERS_VIEW_CACHE_KEY = "transfersview"
+    LIST_ALL_TRANSACTIONS_VIEW_CACHE_KEY = "alltransactionsview"
 
     def __init__(self, cache_tag: str, address: ChecksumAddress):
         self.redis = get_redis()
@@ -153,18 +156,76 @@ def cache_txs_view_for_address(
     return decorator
 
 
-def get_cache_view_tag_and_addresses(
+def cache_rendered_txs_view_for_address(
+    cache_tag: str,
+    parameter_key: str = "address",
+    timeout: int = settings.CACHE_VIEW_DEFAULT_TIMEOUT,
+):
+    """
+    Custom cache decorator that caches the rendered JSON response of the view, so cached
+    responses are returned as they are stored, without deserializing and rendering them again.
+    Cache is stored by path and query parameters, so views with different versions can share
+    the same `cache_tag`. `ETag` header is stored with the response.
+    Responses not rendered as JSON (e.g. browsable API) are not cached.
+
+    :param cache_tag: Cache tag used for invalidating.
+    :param parameter_key: View kwarg with the Safe address.
+    :param timeout: Cache timeout in seconds.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(view, request, *args, **kwargs):
+            address = view.kwargs.get(parameter_key)
+            if not address or request.accepted_renderer.format != "json":
+                return view_func(view, request, *args, **kwargs)
+
+            query_params = sorted(request.GET.dict().items())
+            cache_path = f"{request.path}?{urlencode(query_params)}"
+            cache_txs_view = CacheSafeTxsView(cache_tag, address)
+            if cached_response := cache_txs_view.get_cache_data(cache_path):
+                etag, content = cached_response.split(b"\n", 1)
+                response = HttpResponse(
+                    content, content_type=request.accepted_renderer.media_type
+                )
+                if etag:
+                    response["ETag"] = etag.decode()
+                return response
+
+            response = view_func(view, request, *args, **kwargs)
+            if response.status_code == 200 and cache_txs_view.enabled:
+
+                def store_rendered_response(rendered_response: Response) -> None:
+                    cache_txs_view.set_cache_data(
+                        cache_path,
+                        rendered_response.get("ETag", "").encode()
+                        + b"\n"
+                        + rendered_response.content,
+                        timeout,
+                    )
+
+                # Response is rendered by Django after the view returns
+                response.add_post_render_callback(store_rendered_response)
+            return response
+
+        return _wrapped_view
+
+    return decorator
+
+
+def get_cache_view_tags_and_addresses(
     instance: TokenTransfer
     | InternalTx
     | MultisigConfirmation
     | MultisigTransaction
     | ModuleTransaction,
-) -> tuple[str, list[ChecksumAddress]] | None:
+) -> tuple[list[str], list[ChecksumAddress]] | None:
     """
-    Resolve which view cache the instance invalidates.
+    Resolve which view caches the instance invalidates. Every instance with a cached
+    view is also shown on the all transactions view.
 
     :param instance:
-    :return: Tuple of cache tag and addresses whose cached views the instance
+    :return: Tuple of cache tags and addresses whose cached views the instance
         invalidates, or ``None`` if the instance has no cached view
     """
     addresses = []
@@ -189,7 +250,10 @@ def get_cache_view_tag_and_addresses(
         addresses.append(instance.safe)
 
     if cache_tag:
-        return cache_tag, addresses
+        return [
+            cache_tag,
+            CacheSafeTxsView.LIST_ALL_TRANSACTIONS_VIEW_CACHE_KEY,
+        ], addresses
     return None
 
 
@@ -212,20 +276,22 @@ def remove_cache_views(cache_names: Collection[str]) -> None:
 
 
 def remove_cache_view_for_addresses(
-    cache_tag: str, addresses: list[ChecksumAddress]
+    cache_tags: Collection[str], addresses: list[ChecksumAddress]
 ) -> None:
     """
-    Remove the cached views for the provided cache_tag and addresses. With no
+    Remove the cached views for the provided cache_tags and addresses. With no
     transaction open the removal is immediate. Inside a transaction the cache
     only becomes wrong at commit — concurrent readers must keep seeing the
     pre-commit data it holds until then — so the keys are accumulated on the
     connection and removed together on commit with a single Redis call.
 
-    :param cache_tag:
+    :param cache_tags:
     :param addresses:
     :return:
     """
-    cache_names = [f"{cache_tag}:{address}" for address in addresses]
+    cache_names = [
+        f"{cache_tag}:{address}" for cache_tag in cache_tags for address in addresses
+    ]
     connection = transaction.get_connection()
     if not connection.in_atomic_block:
         remove_cache_views(cache_names)
@@ -250,3 +316,97 @@ def _remove_pending_cache_invalidations() -> None:
     """
     connection = transaction.get_connection()
     remove_cache_views(connection.__dict__.pop("_pending_cache_invalidations", ()))
+
+
+SAFE_OWNERS_CACHE_TAG = "safeowners"
+SAFE_OWNERS_GENERATION_CACHE_TAG = "safeownersgeneration"
+
+
+def get_cached_safe_owners(
+    safe_address: ChecksumAddress,
+) -> tuple[list[ChecksumAddress], int] | None:
+    """
+    :param safe_address:
+    :return: Owners and threshold cached by ``set_cached_safe_owners``, ``None`` if not cached
+    """
+    if cached := get_redis().get(f"{SAFE_OWNERS_CACHE_TAG}:{safe_address}"):
+        safe_owners = json.loads(cached)
+        return safe_owners["owners"], safe_owners["threshold"]
+    return None
+
+
+def get_safe_owners_generation(safe_address: ChecksumAddress) -> bytes | None:
+    """
+    Generation is increased every time cached owners are removed. It must be retrieved before
+    owners and threshold, and provided to ``set_cached_safe_owners``
+
+    :param safe_address:
+    :return: Current generation for the cached owners of the Safe
+    """
+    return get_redis().get(f"{SAFE_OWNERS_GENERATION_CACHE_TAG}:{safe_address}")
+
+
+def set_cached_safe_owners(
+    safe_address: ChecksumAddress,
+    owners: list[ChecksumAddress],
+    threshold: int,
+    generation: bytes | None,
+    timeout: int,
+) -> bool:
+    """
+    Cache owners and threshold only if they were not removed since they were retrieved,
+    otherwise they could be outdated
+
+    :param safe_address:
+    :param owners:
+    :param threshold:
+    :param generation: Returned by ``get_safe_owners_generation`` before retrieving `owners` and `threshold`
+    :param timeout:
+    :return: `True` if cached, `False` otherwise
+    """
+    if not timeout:
+        return False
+
+    generation_key = f"{SAFE_OWNERS_GENERATION_CACHE_TAG}:{safe_address}"
+    with get_redis().pipeline() as pipe:
+        try:
+            pipe.watch(generation_key)
+            if pipe.get(generation_key) != generation:
+                return False
+            pipe.multi()
+            pipe.set(
+                f"{SAFE_OWNERS_CACHE_TAG}:{safe_address}",
+                json.dumps({"owners": owners, "threshold": threshold}),
+                timeout,
+            )
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+def remove_cached_safe_owners(addresses: list[ChecksumAddress]) -> None:
+    """
+    Remove cached owners and threshold and increase their generation, so owners retrieved
+    before can not be cached. On commit if a transaction is open
+
+    :param addresses:
+    """
+
+    def remove():
+        try:
+            with get_redis().pipeline() as pipe:
+                for address in addresses:
+                    generation_key = f"{SAFE_OWNERS_GENERATION_CACHE_TAG}:{address}"
+                    pipe.incr(generation_key)
+                    # Generation only needs to live longer than a request retrieving owners
+                    pipe.expire(generation_key, 60 * 60)
+                    pipe.unlink(f"{SAFE_OWNERS_CACHE_TAG}:{address}")
+                pipe.execute()
+        except Exception:
+            logger.warning(
+                "Could not remove cached owners for %s", addresses, exc_info=True
+            )
+
+    if addresses:
+        transaction.on_commit(remove, robust=True)
@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from logging import getLogger
+
+from django.conf import settings
+
+from safe_transaction_service.utils.redis import get_redis
+
+logger = getLogger(__name__)
+
+BLOCK_PROCESS_LIMIT_REDIS_PREFIX = "block-process-limit:"
+
+
+@dataclass
+class BlockRangeMeasure:
+    """
+    Cost of retrieving a block range from the node
+    """
+
+    blocks: int  # Number of blocks in the range
+    elements: int = 0  # Number of logs/traces returned
+    seconds: float = 0.0
+
+
+class BlockProcessLimitController(ABC):
+    """
+    Calculates the next `block_process_limit` for an indexer, targeting a latency and a number
+    of elements returned by the node for every block range
+    """
+
+    def __init__(self, target_seconds: float = 10.0, target_elements: int = 0):
+        """
+        :param target_seconds: Desired seconds to retrieve a block range
+        :param target_elements: Desired maximum number of elements (logs, traces...) for a block range.
+            `0` == `No limit`
+        """
+        assert target_seconds > 0
+        self.target_seconds = target_seconds
+        self.target_elements = target_elements
+
+    def get_load(self, measure: BlockRangeMeasure) -> float:
+        """
+        :param measure:
+        :return: Cost of the block range relative to the budget. Bigger than `1` if budget was exceeded
+        """
+        load = measure.seconds / self.target_seconds
+        if self.target_elements:
+            load = max(load, measure.elements / self.target_elements)
+        return load
+
+    @abstractmethod
+    def get_next_block_process_limit(
+        self, block_process_limit: int, measure: BlockRangeMeasure
+    ) -> int:
+        """
+        :param block_process_limit: Current `block_process_limit`
+        :param measure: Cost of the last block range. It can be smaller than `block_process_limit`
+            (e.g. when indexer is almost synced)
+        :return: Next `block_process_limit`, always bigger than `0`
+        """
+
+
+class AimdBlockProcessLimitController(BlockProcessLimitController):
+    """
+    Additive increase/multiplicative decrease. Limit is increased by a constant while ranges are under budget
+    and decreased just enough to meet the budget (but never more than `multiplicative_decrease`)
+    when it's exceeded, so one heavy block does not halve the limit to double it right after
+    """
+
+    def __init__(
+        self,
+        target_seconds: float = 10.0,
+        target_elements: int = 0,
+        additive_increase: int = 20,
+        multiplicative_decrease: float = 0.5,
+    ):
+        """
+        :param target_seconds:
+        :param target_elements:
+        :param additive_increase: Blocks to add when a block range is under budget
+        :param multiplicative_decrease: Maximum decrease factor when a block range is over budget
+        """
+        super().__init__(target_seconds, target_elements)
+        assert 0 < multiplicative_decrease < 1
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+
+    def get_next_block_process_limit(
+        self, block_process_limit: int, measure: BlockRangeMeasure
+    ) -> int:
+        load = self.get_load(measure)
+        if load > 1:
+            decrease = max(self.multiplicative_decrease, 1 / load)
+            return max(int(block_process_limit * decrease), 1)
+        if measure.blocks < block_process_limit:
+            # Not a full range, we cannot know if the limit can be increased
+            return block_process_limit
+        return block_process_limit + self.additive_increase
+
+
+class PidBlockProcessLimitController(BlockProcessLimitController):
+    """
+    Proportional-integral-derivative controller over the load of the block ranges. The error
+    is clamped so a single heavy block range cannot move the limit further than `max_change`
+    """
+
+    MAX_INTEGRAL = 5.0
+
+    def __init__(
+        self,
+        target_seconds: float = 10.0,
+        target_elements: int = 0,
+        kp: float = 0.5,
+        ki: float = 0.1,
+        kd: float = 0.1,
+        max_change: float = 2.0,
+    ):
+        """
+        :param target_seconds:
+        :param target_elements:
+        :param kp: Proportional gain
+        :param ki: Integral gain
+        :param kd: Derivative gain
+        :param max_change: Maximum factor to increase or decrease the limit every block range
+        """
+        super().__init__(target_seconds, target_elements)
+        assert max_change > 1
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.max_change = max_change
+        self.integral = 0.0
+        self.previous_error = 0.0
+
+    def get_next_block_process_limit(
+        self, block_process_limit: int, measure: BlockRangeMeasure
+    ) -> int:
+        # Positive error means there's room to increase the limit
+        error = min(max(1 - self.get_load(measure), -1.0), 1.0)
+        if error > 0 and measure.blocks < block_process_limit:
+            # Not a full range, we cannot know if the limit can be increased
+            return block_process_limit
+
+        self.integral = min(
+            max(self.integral + error, -self.MAX_INTEGRAL), self.MAX_INTEGRAL
+        )
+        derivative = error - self.previous_error
+        self.previous_error = error
+        output = self.kp * error + self.ki * self.integral + self.kd * derivative
+        factor = min(max(1 + output, 1 / self.max_change), self.max_change)
+        return max(round(block_process_limit * factor), 1)
+
+
+def get_block_process_limit_controller() -> BlockProcessLimitController:
+    """
+    :return: New controller configured with `ETH_BLOCK_PROCESS_LIMIT_*` settings. A new instance
+        is required for every indexer, as controllers can keep state
+    """
+    controllers: dict[str, type[BlockProcessLimitController]] = {
+        "aimd": AimdBlockProcessLimitController,
+        "pid": PidBlockProcessLimitController,
+    }
+    try:
+        controller_class = controllers[settings.ETH_BLOCK_PROCESS_LIMIT_CONTROLLER]
+    except KeyError:
+        raise ValueError(
+            f"Invalid ETH_BLOCK_PROCESS_LIMIT_CONTROLLER={settings.ETH_BLOCK_PROCESS_LIMIT_CONTROLLER}, "
+            f"valid values are {list(controllers)}"
+        ) from None
+
+    return controller_class(
+        target_seconds=settings.ETH_BLOCK_PROCESS_LIMIT_TARGET_SECONDS,
+        target_elements=settings.ETH_BLOCK_PROCESS_LIMIT_TARGET_ELEMENTS,
+    )
+
+
+def get_stored_block_process_limits() -> dict[str, int]:
+    """
+    :return: Block process limits stored on Redis by the indexers, with the indexer name as the key
+    """
+    redis = get_redis()
+    keys = list(redis.scan_iter(f"{BLOCK_PROCESS_LIMIT_REDIS_PREFIX}*"))
+    return {
+        key.decode().removeprefix(BLOCK_PROCESS_LIMIT_REDIS_PREFIX): int(value)
+        for key, value in zip(keys, redis.mget(keys) if keys else [], strict=True)
+        if value is not None
+    }
+
+
+def delete_stored_block_process_limits() -> int:
+    """
+    Remove the block process limits stored on Redis, so indexers start again from the configured ones
+
+    :return: Number of limits removed
+    """
+    redis = get_redis()
+    if keys := list(redis.scan_iter(f"{BLOCK_PROCESS_LIMIT_REDIS_PREFIX}*")):
+        return redis.delete(*keys)
+    return 0
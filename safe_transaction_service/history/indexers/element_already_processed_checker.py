@@ -1,33 +1,83 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
 from logging import getLogger
 
-from eth_typing import HexStr
-from hexbytes import HexBytes
-from safe_eth.util.util import to_0x_hex_str
+from django.conf import settings
 
-from safe_transaction_service.utils.utils import FixedSizeDict
+from eth_typing import HexStr
+from web3.types import LogReceipt
 
 logger = getLogger(__name__)
 
+EMPTY_HASH = bytes(32)
+
+
+def _hash_to_bytes(value: HexStr | bytes | None) -> bytes:
+    if value is None:
+        return EMPTY_HASH
+    if isinstance(value, bytes):  # `HexBytes` is a subclass of `bytes`
+        return value
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
 
 class ElementAlreadyProcessedChecker:
     """
-    Keeps a cache of already processed transactions and events
+    Keeps an LRU cache of already processed transactions and events.
+    Keys are packed as `tx_hash (32 bytes) + block_hash (32 bytes) + index (4 bytes)`
     """
 
-    def __init__(self):
-        self._processed_element_cache = FixedSizeDict(maxlen=40_000)  # Around 3MiB
+    # Approximate memory used by every entry: `bytes` object for the 68 bytes key plus the `OrderedDict` node
+    ENTRY_SIZE_BYTES = 200
+
+    def __init__(self, max_size_bytes: int | None = None):
+        """
+        :param max_size_bytes: Approximate memory for the cache. If not provided,
+            `ETH_PROCESSED_ELEMENTS_CACHE_SIZE_BYTES` is used
+        """
+        if max_size_bytes is None:
+            max_size_bytes = settings.ETH_PROCESSED_ELEMENTS_CACHE_SIZE_BYTES
+        self.maxlen = max(max_size_bytes // self.ENTRY_SIZE_BYTES, 1)
+        self._processed_element_cache: OrderedDict[bytes, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._processed_element_cache)
 
     def clear(self) -> None:
         return self._processed_element_cache.clear()
 
+    @staticmethod
     def get_key(
-        self, tx_hash: HexStr | bytes, block_hash: HexStr | bytes | None, index: int
+        tx_hash: HexStr | bytes, block_hash: HexStr | bytes | None, index: int
     ) -> bytes:
-        tx_hash_bytes = HexBytes(tx_hash)
-        block_hash_bytes = HexBytes(block_hash or 0)
-        index_bytes = HexBytes(index)
-        return tx_hash_bytes + block_hash_bytes + index_bytes
+        return (
+            _hash_to_bytes(tx_hash)
+            + _hash_to_bytes(block_hash)
+            + index.to_bytes(4, "big")
+        )
+
+    def _get_log_receipt_key(self, log_receipt: LogReceipt) -> bytes:
+        return self.get_key(
+            log_receipt["transactionHash"],
+            log_receipt["blockHash"],
+            log_receipt["logIndex"],
+        )
+
+    def _is_key_processed(self, key: bytes) -> bool:
+        if key in self._processed_element_cache:
+            # Recently seen elements are the most likely to be seen again
+            self._processed_element_cache.move_to_end(key)
+            return True
+        return False
+
+    def _mark_key_as_processed(self, key: bytes) -> bool:
+        if key in self._processed_element_cache:
+            self._processed_element_cache.move_to_end(key)
+            return False
+        self._processed_element_cache[key] = None
+        if len(self._processed_element_cache) > self.maxlen:
+            self._processed_element_cache.popitem(last=False)
+        return True
 
     def is_processed(
         self, tx_hash: HexStr | bytes, block_hash: HexStr | bytes | None, index: int = 0
@@ -38,8 +88,7 @@ class ElementAlreadyProcessedChecker:
         :param index: Only for events
         :return: ``True`` if element was processed, ``False`` otherwise
         """
-        tx_id = self.get_key(tx_hash, block_hash, index)
-        return tx_id in self._processed_element_cache
+        return self._is_key_processed(self.get_key(tx_hash, block_hash, index))
 
     def mark_as_processed(
         self, tx_hash: HexStr | bytes, block_hash: HexStr | bytes | None, index: int = 0
@@ -52,22 +101,33 @@ class ElementAlreadyProcessedChecker:
         :param index: Only for events
         :return: ``True`` if element was marked as processed, ``False`` if it was marked already
         """
-        tx_id = self.get_key(tx_hash, block_hash, index)
-
-        if tx_id in self._processed_element_cache:
-            logger.debug(
-                "Element with tx-hash=%s on block=%s with index=%d was already processed",
-                to_0x_hex_str(HexBytes(tx_hash)),
-                to_0x_hex_str(HexBytes(block_hash or 0)),
-                index,
-            )
-            return False
-        else:
-            logger.debug(
-                "Marking element with tx-hash=%s on block=%s with index=%d as processed",
-                to_0x_hex_str(HexBytes(tx_hash)),
-                to_0x_hex_str(HexBytes(block_hash or 0)),
-                index,
-            )
-            self._processed_element_cache[tx_id] = None
-            return True
+        return self._mark_key_as_processed(self.get_key(tx_hash, block_hash, index))
+
+    def filter_not_processed(
+        self, log_receipts: Iterable[LogReceipt]
+    ) -> list[LogReceipt]:
+        """
+        :param log_receipts:
+        :return: `log_receipts` not processed yet, in the same order
+        """
+        return [
+            log_receipt
+            for log_receipt in log_receipts
+            if not self._is_key_processed(self._get_log_receipt_key(log_receipt))
+        ]
+
+    def mark_processed_many(self, log_receipts: Sequence[LogReceipt]) -> int:
+        """
+        Mark `log_receipts` as processed
+
+        :param log_receipts:
+        :return: Number of `log_receipts` that were not marked already
+        """
+        marked = sum(
+            self._mark_key_as_processed(self._get_log_receipt_key(log_receipt))
+            for log_receipt in log_receipts
+        )
+        logger.debug(
+            "Marked %d/%d log receipts as processed", marked, len(log_receipts)
+        )
+        return marked
@@ -1,27 +1,38 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import datetime
+import fcntl
 from collections import OrderedDict
 from collections.abc import Iterator, Sequence
 from logging import getLogger
-from typing import NamedTuple
+from typing import Any, NamedTuple
 
-from django.db.models import BinaryField, QuerySet
+from django.db.models import BinaryField, Max, QuerySet
 from django.db.models.functions import Cast
 from django.db.models.query import EmptyQuerySet
 
+import gevent
 from eth_typing import ChecksumAddress
 from hexbytes import HexBytes
 from safe_eth.eth import EthereumClient
+from safe_eth.util.util import to_0x_hex_str
 from web3.contract.contract import ContractEvent
 from web3.types import EventData, LogReceipt
 
-from ...utils.utils import FixedSizeDict
+from safe_transaction_service.tokens.services import TokenServiceProvider
+
+from ...utils.sorted_address_set import SortedAddressSet
+from ...utils.utils import FixedSizeDict, chunks
 from ..models import (
+    BulkCreateSignalMixin,
     ERC20Transfer,
+    ERC721Ownership,
+    ERC721OwnershipEntries,
     ERC721Transfer,
     IndexingStatus,
     SafeContract,
     SafeRelevantTransaction,
+    SafeTokenLedger,
+    SafeTokenLedgerEntries,
     TokenTransfer,
 )
 from ..services.event_service import set_safe_membership
@@ -31,7 +42,7 @@ logger = getLogger(__name__)
 
 
 class AddressesCache(NamedTuple):
-    addresses: set[bytes]
+    addresses: set[bytes] | SortedAddressSet
     last_checked: datetime.datetime | None
 
 
@@ -48,6 +59,12 @@ class Erc20EventsIndexerProvider:
         return Erc20EventsIndexer(
             EthereumClient(settings.ETHEREUM_NODE_URL),
             eth_erc20_load_addresses_chunk_size=settings.ETH_ERC20_LOAD_ADDRESSES_CHUNK_SIZE,
+            eth_erc20_addresses_snapshot_path=settings.ETH_ERC20_ADDRESSES_SNAPSHOT_PATH,
+            eth_erc20_addresses_snapshot_max_delta=settings.ETH_ERC20_ADDRESSES_SNAPSHOT_MAX_DELTA,
+            eth_erc20_bulk_copy_blocks_behind=settings.ETH_ERC20_BULK_COPY_BLOCKS_BEHIND,
+            collectibles_prefetch_metadata=settings.COLLECTIBLES_PREFETCH_METADATA
+            and settings.COLLECTIBLES_ENABLE_DOWNLOAD_METADATA,
+            tokens_create=settings.TOKENS_CREATE_FROM_INDEXER,
         )
 
     @classmethod
@@ -76,6 +93,26 @@ class Erc20EventsIndexer(EventsIndexer):
         self.eth_erc20_load_addresses_chunk_size = kwargs.get(
             "eth_erc20_load_addresses_chunk_size", 500_000
         )
+        # If set, Safe addresses are stored sorted on a file that every worker on the host memory maps,
+        # instead of keeping a Python `set` per worker
+        self.eth_erc20_addresses_snapshot_path: str | None = kwargs.get(
+            "eth_erc20_addresses_snapshot_path"
+        )
+        self.eth_erc20_addresses_snapshot_max_delta = kwargs.get(
+            "eth_erc20_addresses_snapshot_max_delta", 100_000
+        )
+        # Use `COPY` to store the events when indexing blocks older than `current block - eth_erc20_bulk_copy_blocks_behind`.
+        # `0` == `Disabled`
+        self.eth_erc20_bulk_copy_blocks_behind: int = kwargs.get(
+            "eth_erc20_bulk_copy_blocks_behind", 0
+        )
+        # Queue the download of the metadata for ERC721 tokens received by Safes
+        self.collectibles_prefetch_metadata: bool = kwargs.get(
+            "collectibles_prefetch_metadata", False
+        )
+        # Queue the creation of the tokens when their transfers are indexed
+        self.tokens_create: bool = kwargs.get("tokens_create", False)
+        self._token_addresses_checked = FixedSizeDict(maxlen=40_000)
 
     @property
     def contract_events(self) -> list[ContractEvent]:
@@ -100,7 +137,7 @@ class Erc20EventsIndexer(EventsIndexer):
 
     def _do_node_query(
         self,
-        addresses: set[bytes],
+        addresses: set[bytes] | SortedAddressSet,
         from_block_number: int,
         to_block_number: int,
     ) -> list[LogReceipt]:
@@ -114,19 +151,15 @@ class Erc20EventsIndexer(EventsIndexer):
         """
 
         # If not too many addresses are provided it's alright to do the filtering in the RPC server
-        # Otherwise, get all the ERC20/721 events and filter them here
-        parameter_addresses = (
-            None if len(addresses) > self.query_chunk_size else addresses
-        )
-
-        with self.auto_adjust_block_limit(from_block_number, to_block_number):
-            transfer_events = self.ethereum_client.erc20.get_total_transfer_history(
-                parameter_addresses,
-                from_block=from_block_number,
-                to_block=to_block_number,
-            )
+        if len(addresses) <= self.query_chunk_size:
+            with self.auto_adjust_block_limit(
+                from_block_number, to_block_number
+            ) as block_range_measure:
+                transfer_events = self._get_total_transfer_history(
+                    addresses, from_block_number, to_block_number
+                )
+                block_range_measure.elements = len(transfer_events)
 
-        if parameter_addresses:
             return [
                 transfer_event
                 for transfer_event in transfer_events
@@ -134,7 +167,17 @@ class Erc20EventsIndexer(EventsIndexer):
                 != transfer_event["transactionHash"]  # CELO ERC20 rewards
             ]
 
-        # Every ERC20/721 event is returned, we need to filter ourselves
+        # Otherwise, get all the ERC20/721 events and filter them here. Most of them are not relevant,
+        # so they are filtered using the raw topics and only the relevant ones are decoded
+        with self.auto_adjust_block_limit(
+            from_block_number, to_block_number
+        ) as block_range_measure:
+            transfer_logs = self._get_transfer_logs(from_block_number, to_block_number)
+            block_range_measure.elements = len(transfer_logs)
+
+        transfer_events = self.ethereum_client.erc20.decode_logs(
+            self._filter_transfer_logs(transfer_logs, addresses)
+        )
         return [
             transfer_event
             for transfer_event in transfer_events
@@ -146,6 +189,90 @@ class Erc20EventsIndexer(EventsIndexer):
             )
         ]
 
+    @staticmethod
+    def _filter_transfer_logs(
+        transfer_logs: Sequence[LogReceipt], addresses: set[bytes] | SortedAddressSet
+    ) -> list[LogReceipt]:
+        """
+        Filter not decoded `Transfer` logs using the indexed `from` and `to` topics (addresses are
+        left padded to 32 bytes). Logs without indexed addresses (non standard `Transfer` events)
+        are kept, as they can only be filtered after decoding
+
+        :param transfer_logs:
+        :param addresses:
+        :return: `transfer_logs` that can be relevant for `addresses`, in the same order
+        """
+        return [
+            transfer_log
+            for transfer_log in transfer_logs
+            if len(topics := transfer_log["topics"]) < 3
+            or topics[1][12:] in addresses
+            or topics[2][12:] in addresses
+        ]
+
+    def _get_transfer_logs(
+        self, from_block_number: int, to_block_number: int
+    ) -> list[LogReceipt]:
+        """
+        Get every ERC20/721 transfer log in the range without decoding, using the RPC cache if configured
+
+        :param from_block_number:
+        :param to_block_number:
+        :return: Not decoded transfer logs
+        """
+
+        def fetch() -> list[LogReceipt]:
+            return self.ethereum_client.slow_w3.eth.get_logs(
+                {
+                    "fromBlock": from_block_number,
+                    "toBlock": to_block_number,
+                    "topics": [
+                        to_0x_hex_str(self.ethereum_client.erc20.TRANSFER_TOPIC)
+                    ],
+                }
+            )
+
+        if not self.rpc_cache:
+            return fetch()
+
+        namespace = self.rpc_cache.build_namespace("erc20_transfer_logs")
+        return self.rpc_cache.get_or_fetch_block_range(
+            namespace, from_block_number, to_block_number, fetch
+        )
+
+    def _get_total_transfer_history(
+        self,
+        addresses: set[bytes] | SortedAddressSet | None,
+        from_block_number: int,
+        to_block_number: int,
+    ) -> list[EventData]:
+        """
+        Get ERC20/721 transfer events, using the RPC cache if configured
+
+        :param addresses: If ``None``, every transfer event in the range is returned
+        :param from_block_number:
+        :param to_block_number:
+        :return: Decoded transfer events
+        """
+
+        def fetch() -> list[EventData]:
+            return self.ethereum_client.erc20.get_total_transfer_history(
+                addresses, from_block=from_block_number, to_block=to_block_number
+            )
+
+        if not self.rpc_cache:
+            return fetch()
+
+        namespace = self.rpc_cache.build_namespace(
+            "erc20_transfer_history",
+            sorted(HexBytes(address).hex() for address in addresses)
+            if addresses
+            else None,
+        )
+        return self.rpc_cache.get_or_fetch_block_range(
+            namespace, from_block_number, to_block_number, fetch
+        )
+
     def _process_decoded_element(self, decoded_element: EventData) -> None:
         """
         Not used as `process_elements` is redefined using custom processors
@@ -156,24 +283,55 @@ class Erc20EventsIndexer(EventsIndexer):
         pass
 
     def events_to_erc20_transfer(
-        self, log_receipts: Sequence[EventData]
+        self,
+        log_receipts: Sequence[EventData],
+        ledger_entries: SafeTokenLedgerEntries | None = None,
     ) -> Iterator[ERC20Transfer]:
+        """
+        :param log_receipts:
+        :param ledger_entries: If provided, transfers for every Safe are added to it, to update `SafeTokenLedger`
+        :return: `ERC20Transfer` for the ERC20 events in `log_receipts`
+        """
         safe_addresses = self._get_safe_addresses_for_membership()
         for log_receipt in log_receipts:
             try:
                 transfer = ERC20Transfer.from_decoded_event(log_receipt)
+                to_is_a_safe = HexBytes(transfer.to) in safe_addresses
+                from_is_a_safe = HexBytes(transfer._from) in safe_addresses
                 set_safe_membership(
                     transfer,
-                    to_is_a_safe=HexBytes(transfer.to) in safe_addresses,
-                    from_is_a_safe=HexBytes(transfer._from) in safe_addresses,
+                    to_is_a_safe=to_is_a_safe,
+                    from_is_a_safe=from_is_a_safe,
                 )
+                if ledger_entries is not None:
+                    for safe_address, is_a_safe in (
+                        (transfer.to, to_is_a_safe),
+                        (transfer._from, from_is_a_safe),
+                    ):
+                        if is_a_safe:
+                            key = (safe_address, transfer.address)
+                            transfer_count, last_seen_block = ledger_entries.get(
+                                key, (0, 0)
+                            )
+                            ledger_entries[key] = (
+                                transfer_count + 1,
+                                max(last_seen_block, transfer.block_number),
+                            )
                 yield transfer
             except ValueError:
                 pass
 
     def events_to_erc721_transfer(
-        self, log_receipts: Sequence[EventData]
+        self,
+        log_receipts: Sequence[EventData],
+        ownership_entries: ERC721OwnershipEntries | None = None,
     ) -> Iterator[ERC721Transfer]:
+        """
+        :param log_receipts:
+        :param ownership_entries: If provided, latest owner for every token is stored on it,
+            to update `ERC721Ownership`
+        :return: `ERC721Transfer` for the ERC721 events in `log_receipts`
+        """
         safe_addresses = self._get_safe_addresses_for_membership()
         for log_receipt in log_receipts:
             try:
@@ -183,11 +341,18 @@ class Erc20EventsIndexer(EventsIndexer):
                     to_is_a_safe=HexBytes(transfer.to) in safe_addresses,
                     from_is_a_safe=HexBytes(transfer._from) in safe_addresses,
                 )
+                if ownership_entries is not None:
+                    key = (transfer.address, transfer.token_id)
+                    position = (transfer.block_number, transfer.log_index)
+                    if key not in ownership_entries or (
+                        ownership_entries[key][1:] < position
+                    ):
+                        ownership_entries[key] = (transfer.to, *position)
                 yield transfer
             except ValueError:
                 pass
 
-    def _get_safe_addresses_for_membership(self) -> set[bytes]:
+    def _get_safe_addresses_for_membership(self) -> set[bytes] | SortedAddressSet:
         """
         :return: The full set of monitored Safe addresses held in memory, loading it from
             database if the address cache is not populated yet (``process_elements`` invoked
@@ -206,6 +371,36 @@ class Erc20EventsIndexer(EventsIndexer):
             except ValueError:
                 pass
 
+    def _use_bulk_copy(self, log_receipts: Sequence[EventData]) -> bool:
+        """
+        :param log_receipts:
+        :return: ``True`` if events must be stored using `COPY`, as they are far behind the current block
+            (e.g. backfilling or reindexing), ``False`` otherwise
+        """
+        if not self.eth_erc20_bulk_copy_blocks_behind or not log_receipts:
+            return False
+        last_block_number = max(
+            log_receipt["blockNumber"] for log_receipt in log_receipts
+        )
+        return (
+            self.ethereum_client.current_block_number - last_block_number
+            > self.eth_erc20_bulk_copy_blocks_behind
+        )
+
+    @staticmethod
+    def _bulk_insert(
+        manager: BulkCreateSignalMixin, objs: Iterator[Any], bulk_copy: bool
+    ) -> int:
+        """
+        :param manager:
+        :param objs: Objects to insert, ignoring the ones already in database
+        :param bulk_copy: Use `COPY`, faster for big batches
+        :return: Number of inserted objects. If `bulk_copy` is ``False`` conflicting objects are also counted
+        """
+        if bulk_copy:
+            return manager.bulk_copy_from_generator(objs)
+        return manager.bulk_create_from_generator(objs, ignore_conflicts=True)
+
     def process_elements(
         self, log_receipts: Sequence[EventData]
     ) -> list[TokenTransfer]:
@@ -230,31 +425,45 @@ class Erc20EventsIndexer(EventsIndexer):
             self._prefetch_ethereum_txs(tx_hashes)
             logger.debug("Storing TokenTransfer objects")
             logger.debug("Storing Transfer Events")
+            bulk_copy = self._use_bulk_copy(not_processed_log_receipts)
             # SafeRelevantTransactions are stored first, as they don't
             # publish events, so when the ERC20/721 events are published
             # everything is ready on the database
-            result_safe_relevant_transaction = (
-                SafeRelevantTransaction.objects.bulk_create_from_generator(
-                    self.events_to_safe_relevant_transaction(
-                        not_processed_log_receipts
-                    ),
-                    ignore_conflicts=True,
-                )
+            result_safe_relevant_transaction = self._bulk_insert(
+                SafeRelevantTransaction.objects,
+                self.events_to_safe_relevant_transaction(not_processed_log_receipts),
+                bulk_copy,
             )
             logger.debug(
                 "Stored %d Safe Relevant Transactions",
                 result_safe_relevant_transaction,
             )
-            result_erc20 = ERC20Transfer.objects.bulk_create_from_generator(
-                self.events_to_erc20_transfer(not_processed_log_receipts),
-                ignore_conflicts=True,
+            ledger_entries: SafeTokenLedgerEntries = {}
+            result_erc20 = self._bulk_insert(
+                ERC20Transfer.objects,
+                self.events_to_erc20_transfer(
+                    not_processed_log_receipts, ledger_entries=ledger_entries
+                ),
+                bulk_copy,
             )
             logger.debug("Stored %d ERC20 Events", result_erc20)
-            result_erc721 = ERC721Transfer.objects.bulk_create_from_generator(
-                self.events_to_erc721_transfer(not_processed_log_receipts),
-                ignore_conflicts=True,
+            result_ledger = SafeTokenLedger.objects.add_transfers(ledger_entries)
+            logger.debug("Updated %d Safe Token Ledger entries", result_ledger)
+            ownership_entries: ERC721OwnershipEntries = {}
+            result_erc721 = self._bulk_insert(
+                ERC721Transfer.objects,
+                self.events_to_erc721_transfer(
+                    not_processed_log_receipts, ownership_entries=ownership_entries
+                ),
+                bulk_copy,
             )
             logger.debug("Stored %d ERC721 Events", result_erc721)
+            result_ownership = ERC721Ownership.objects.add_transfers(ownership_entries)
+            logger.debug("Updated %d ERC721 Ownership entries", result_ownership)
+            if self.collectibles_prefetch_metadata:
+                self._prefetch_collectibles_metadata(ownership_entries)
+            if self.tokens_create:
+                self._create_tokens(not_processed_log_receipts)
             logger.debug("Marking events as processed")
             self._mark_log_receipts_processed(not_processed_log_receipts)
             logger.debug("Marked events as processed")
@@ -262,7 +471,118 @@ class Erc20EventsIndexer(EventsIndexer):
                 result_erc20 + result_erc721
             )  # TODO Hack to prevent returning `TokenTransfer` and using too much RAM
 
-    def get_almost_updated_addresses(self, current_block_number: int) -> set[bytes]:
+    def _prefetch_collectibles_metadata(
+        self, ownership_entries: ERC721OwnershipEntries
+    ) -> int:
+        """
+        Queue the download of the metadata for the ERC721 tokens received by Safes
+
+        :param ownership_entries:
+        :return: Number of tokens queued
+        """
+        from ..tasks import prefetch_collectibles_metadata_task
+
+        safe_addresses = self._get_safe_addresses_for_membership()
+        addresses_with_token_ids = [
+            (token_address, token_id)
+            for (token_address, token_id), (owner, _, _) in ownership_entries.items()
+            if HexBytes(owner) in safe_addresses
+        ]
+        for addresses_with_token_ids_chunk in chunks(addresses_with_token_ids, 100):
+            prefetch_collectibles_metadata_task.delay(addresses_with_token_ids_chunk)
+        return len(addresses_with_token_ids)
+
+    def _create_tokens(self, log_receipts: Sequence[EventData]) -> int:
+        """
+        Queue the tokens of the transfers not stored in database, so they are created in batches
+        by ``create_pending_tokens_task`` before balances or collectibles are requested.
+        Tokens already checked by this indexer are not checked again
+
+        :param log_receipts:
+        :return: Number of tokens queued
+        """
+        token_addresses = [
+            token_address
+            for token_address in dict.fromkeys(
+                log_receipt["address"] for log_receipt in log_receipts
+            )
+            if token_address not in self._token_addresses_checked
+        ]
+        number = 0
+        for token_addresses_chunk in chunks(token_addresses, 500):
+            number += TokenServiceProvider().enqueue_tokens(token_addresses_chunk)
+        for token_address in token_addresses:
+            self._token_addresses_checked[token_address] = None
+        return number
+
+    def _write_addresses_snapshot(self) -> int:
+        """
+        Store every Safe address sorted on `eth_erc20_addresses_snapshot_path`. Sorting is done
+        by the database using the primary key, so addresses are never all loaded in memory
+
+        :return: Number of addresses stored
+        """
+        logger.info(
+            "%s: Writing Safe addresses snapshot to %s",
+            self.__class__.__name__,
+            self.eth_erc20_addresses_snapshot_path,
+        )
+        # Addresses created while the snapshot is written will be loaded again on the `delta`
+        last_checked = self.database_queryset.aggregate(last_checked=Max("created"))[
+            "last_checked"
+        ]
+        number_addresses = SortedAddressSet.write(
+            self.eth_erc20_addresses_snapshot_path,
+            (
+                bytes(address)
+                for address in self.database_queryset.values_list(
+                    "address_bytes", flat=True
+                )
+                .order_by("address")
+                .iterator(chunk_size=self.eth_erc20_load_addresses_chunk_size)
+            ),
+            last_checked,
+        )
+        logger.info(
+            "%s: Written %d Safe addresses to snapshot",
+            self.__class__.__name__,
+            number_addresses,
+        )
+        return number_addresses
+
+    def _load_addresses_snapshot(self) -> AddressesCache:
+        """
+        Load the Safe addresses snapshot, writing it first if it does not exist or it's too outdated.
+        A lock file prevents multiple workers on the same host writing it at the same time
+
+        :return: `AddressesCache` with a `SortedAddressSet`. Addresses created after the snapshot
+            will be loaded by `get_almost_updated_addresses`
+        """
+        with open(f"{self.eth_erc20_addresses_snapshot_path}.lock", "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    # Another worker is writing the snapshot, don't block the gevent loop
+                    gevent.sleep(1)
+            addresses = SortedAddressSet.open(self.eth_erc20_addresses_snapshot_path)
+            if (
+                addresses is None
+                or self.database_queryset.filter(
+                    created__gte=addresses.last_checked
+                ).count()
+                > self.eth_erc20_addresses_snapshot_max_delta
+            ):
+                self._write_addresses_snapshot()
+                addresses = SortedAddressSet.open(
+                    self.eth_erc20_addresses_snapshot_path
+                )
+        return AddressesCache(addresses, addresses.last_checked)
+
+    def get_almost_updated_addresses(
+        self, current_block_number: int
+    ) -> set[bytes] | SortedAddressSet:
         """
 
         :param current_block_number:
@@ -271,6 +591,16 @@ class Erc20EventsIndexer(EventsIndexer):
 
         logger.debug("%s: Retrieving monitored addresses", self.__class__.__name__)
 
+        if self.eth_erc20_addresses_snapshot_path and (
+            not self.addresses_cache
+            or (
+                isinstance(self.addresses_cache.addresses, SortedAddressSet)
+                and len(self.addresses_cache.addresses.delta)
+                > self.eth_erc20_addresses_snapshot_max_delta
+            )
+        ):
+            self.addresses_cache = self._load_addresses_snapshot()
+
         last_checked: datetime.datetime | None
         if self.addresses_cache:
             # Only search for the new addresses
@@ -1,20 +1,30 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import time
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
 from logging import getLogger
 from typing import Any
 
 from django.db.models import Min, QuerySet
 
+import gevent
 from celery.exceptions import SoftTimeLimitExceeded
 from eth_typing import ChecksumAddress, HexStr
+from gevent.queue import Queue
 from requests import Timeout
 from safe_eth.eth import EthereumClient
 from web3.exceptions import Web3RPCError
 
+from ...utils.redis import get_redis
+from ...utils.rpc_cache import RpcCache, get_rpc_cache
 from ..services import IndexingException, IndexService, IndexServiceProvider
+from .block_process_limit_controller import (
+    BLOCK_PROCESS_LIMIT_REDIS_PREFIX,
+    AimdBlockProcessLimitController,
+    BlockProcessLimitController,
+    BlockRangeMeasure,
+)
 from .element_already_processed_checker import ElementAlreadyProcessedChecker
 
 logger = getLogger(__name__)
@@ -24,6 +34,16 @@ class FindRelevantElementsException(IndexingException):
     pass
 
 
+# Errors that will halve the `block_process_limit` before being raised
+INDEXING_ERRORS = (
+    FindRelevantElementsException,
+    SoftTimeLimitExceeded,
+    Timeout,
+    ValueError,
+    Web3RPCError,
+)
+
+
 class EthereumIndexer(ABC):
     """
     This service allows indexing of Ethereum blockchain.
@@ -32,6 +52,8 @@ class EthereumIndexer(ABC):
     `process_elements` defines what happens with elements found
     So the flow would be `start()` -> `process_addresses` -> `find_relevant_elements` -> `process_elements` ->
     `process_element`
+    If `prefetch_ranges` is set, `process_addresses_pipelined` is used instead of `process_addresses`, so
+    `find_relevant_elements` for the next block ranges runs while `process_elements` stores the current one
     """
 
     def __init__(
@@ -44,6 +66,9 @@ class EthereumIndexer(ABC):
         updated_blocks_behind: int = 20,
         query_chunk_size: int | None = 1_000,
         block_auto_process_limit: bool = True,
+        block_process_limit_controller: BlockProcessLimitController | None = None,
+        persist_block_process_limit: bool = False,
+        prefetch_ranges: int = 0,
         **kwargs,
     ):
         """
@@ -61,6 +86,12 @@ class EthereumIndexer(ABC):
             it seems that `5000` can be a good value (for `eth_getLogs`). If `0`, process all together
         :param block_auto_process_limit: Auto increase or decrease the `block_process_limit`
             based on congestion algorithm
+        :param block_process_limit_controller: Congestion algorithm for `block_auto_process_limit`.
+            If not provided, `AimdBlockProcessLimitController` with default values is used
+        :param persist_block_process_limit: Store the `block_process_limit` adjusted by `block_auto_process_limit`
+            on Redis, so next instances of the indexer (e.g. next task runs) start from it
+        :param prefetch_ranges: Number of block ranges to fetch from the node ahead of the range being
+            processed and stored, so RPC and database latencies overlap. `0` == Pipelining disabled
         """
         self.ethereum_client = ethereum_client
         self.index_service: IndexService = IndexServiceProvider()
@@ -75,6 +106,17 @@ class EthereumIndexer(ABC):
         self.updated_blocks_behind = updated_blocks_behind
         self.query_chunk_size = query_chunk_size
         self.block_auto_process_limit = block_auto_process_limit
+        self.block_process_limit_controller = (
+            block_process_limit_controller or AimdBlockProcessLimitController()
+        )
+        self.persist_block_process_limit = persist_block_process_limit
+        if self.block_auto_process_limit and self.persist_block_process_limit:
+            if stored_block_process_limit := self.get_stored_block_process_limit():
+                self.block_process_limit = self._cap_block_process_limit(
+                    stored_block_process_limit
+                )
+        self.prefetch_ranges = prefetch_ranges
+        self.rpc_cache: RpcCache | None = get_rpc_cache()
         self.element_already_processed_checker = ElementAlreadyProcessedChecker()
 
     def _is_processed(
@@ -360,65 +402,73 @@ class EthereumIndexer(ABC):
 
         return updated_addresses
 
+    @property
+    def block_process_limit_redis_key(self) -> str:
+        return f"{BLOCK_PROCESS_LIMIT_REDIS_PREFIX}{self.__class__.__name__}"
+
+    def get_stored_block_process_limit(self) -> int | None:
+        """
+        :return: `block_process_limit` stored on Redis by a previous instance of the indexer
+        """
+        if stored_block_process_limit := get_redis().get(
+            self.block_process_limit_redis_key
+        ):
+            return int(stored_block_process_limit)
+        return None
+
+    def _cap_block_process_limit(self, block_process_limit: int) -> int:
+        if self.block_process_limit_max:
+            return min(block_process_limit, self.block_process_limit_max)
+        return block_process_limit
+
+    def _set_block_process_limit(self, block_process_limit: int) -> None:
+        """
+        Set `block_process_limit` and store it on Redis if `persist_block_process_limit`
+
+        :param block_process_limit:
+        """
+        if block_process_limit == self.block_process_limit:
+            return None
+
+        self.block_process_limit = block_process_limit
+        if self.persist_block_process_limit:
+            get_redis().set(self.block_process_limit_redis_key, block_process_limit)
+
     @contextmanager
-    def auto_adjust_block_limit(self, from_block_number: int, to_block_number: int):
+    def auto_adjust_block_limit(
+        self, from_block_number: int, to_block_number: int
+    ) -> Iterator[BlockRangeMeasure]:
         """
         Optimize number of elements processed every time (block process limit)
-        based on how fast the block interval is retrieved
+        based on how fast the block interval is retrieved and how many elements are returned,
+        using `block_process_limit_controller`. Callers should set `elements` on the
+        yielded `BlockRangeMeasure`
         """
+        measure = BlockRangeMeasure(blocks=1 + to_block_number - from_block_number)
+        start = time.monotonic()
+        yield measure
+        measure.seconds = time.monotonic() - start
 
-        # Check that we are processing the `block_process_limit`, if not, measures are not valid
-        if not (
-            self.block_auto_process_limit
-            and (1 + to_block_number - from_block_number) == self.block_process_limit
-        ):
+        if not self.block_auto_process_limit:
             # Auto adjustment disabled
-            yield
-        else:
-            start = time.monotonic()
-            yield
-            delta = time.monotonic() - start
-            if delta > 30:
-                self.block_process_limit = max(self.block_process_limit // 2, 1)
-                logger.info(
-                    "%s: block_process_limit halved to %d",
-                    self.__class__.__name__,
-                    self.block_process_limit,
-                )
-            elif delta > 10:
-                new_block_process_limit = max(self.block_process_limit - 20, 1)
-                self.block_process_limit = new_block_process_limit
-                logger.info(
-                    "%s: block_process_limit decreased to %d",
-                    self.__class__.__name__,
-                    self.block_process_limit,
-                )
-            elif delta < 2:
-                self.block_process_limit *= 2
-                logger.info(
-                    "%s: block_process_limit duplicated to %d",
-                    self.__class__.__name__,
-                    self.block_process_limit,
-                )
-            elif delta < 5:
-                self.block_process_limit += 20
-                logger.info(
-                    "%s: block_process_limit increased to %d",
-                    self.__class__.__name__,
-                    self.block_process_limit,
-                )
+            return None
 
-            if (
-                self.block_process_limit_max
-                and self.block_process_limit > self.block_process_limit_max
-            ):
-                logger.info(
-                    "%s: block_process_limit %d is bigger than block_process_limit_max %d, reducing",
-                    self.__class__.__name__,
-                    self.block_process_limit,
-                    self.block_process_limit_max,
-                )
-                self.block_process_limit = self.block_process_limit_max
+        block_process_limit = self._cap_block_process_limit(
+            self.block_process_limit_controller.get_next_block_process_limit(
+                self.block_process_limit, measure
+            )
+        )
+        if block_process_limit != self.block_process_limit:
+            logger.info(
+                "%s: block_process_limit changed from %d to %d. Retrieved %d elements for %d blocks in %.2f seconds",
+                self.__class__.__name__,
+                self.block_process_limit,
+                block_process_limit,
+                measure.elements,
+                measure.blocks,
+                measure.seconds,
+            )
+            self._set_block_process_limit(block_process_limit)
 
     def process_addresses(
         self,
@@ -453,21 +503,30 @@ class EthereumIndexer(ABC):
                 current_block_number=current_block_number,
             )
             processed_elements = self.process_elements(elements)
-        except (
-            FindRelevantElementsException,
-            SoftTimeLimitExceeded,
-            Timeout,
-            ValueError,
-            Web3RPCError,
-        ) as e:
-            self.block_process_limit = max(self.block_process_limit // 2, 1)
-            logger.info(
-                "%s: block_process_limit halved to %d after error",
-                self.__class__.__name__,
-                self.block_process_limit,
-            )
+        except INDEXING_ERRORS as e:
+            self._halve_block_process_limit_after_error()
             raise e
 
+        self._update_monitored_addresses_or_raise(
+            addresses, from_block_number, to_block_number
+        )
+
+        return processed_elements, from_block_number, to_block_number, updated
+
+    def _halve_block_process_limit_after_error(self) -> None:
+        self._set_block_process_limit(max(self.block_process_limit // 2, 1))
+        logger.info(
+            "%s: block_process_limit halved to %d after error",
+            self.__class__.__name__,
+            self.block_process_limit,
+        )
+
+    def _update_monitored_addresses_or_raise(
+        self,
+        addresses: set[ChecksumAddress],
+        from_block_number: int,
+        to_block_number: int,
+    ) -> None:
         if not self.update_monitored_addresses(
             addresses, from_block_number, to_block_number
         ):
@@ -475,7 +534,128 @@ class EthereumIndexer(ABC):
                 "Possible reorg, indexed addresses were updated while indexer was running"
             )
 
-        return processed_elements, from_block_number, to_block_number, updated
+    def _fetch_relevant_elements_ahead(
+        self,
+        addresses: set[ChecksumAddress],
+        from_block_number: int,
+        to_block_number: int,
+        current_block_number: int,
+        queue: Queue,
+    ) -> None:
+        """
+        Producer for `process_addresses_pipelined`. Find relevant elements for consecutive block ranges
+        and put them on the `queue`, blocking while it is full. Errors are put on the `queue` so
+        they are raised by the consumer, and `None` is put when there are no more ranges to fetch
+
+        :param addresses:
+        :param from_block_number: First block of the first range
+        :param to_block_number: Last block of the first range
+        :param current_block_number:
+        :param queue: Bounded queue shared with the consumer
+        """
+        try:
+            while True:
+                elements = self.find_relevant_elements(
+                    addresses,
+                    from_block_number,
+                    to_block_number,
+                    current_block_number=current_block_number,
+                )
+                queue.put((elements, from_block_number, to_block_number))
+                if to_block_number >= current_block_number - self.confirmations:
+                    break
+                # `block_process_limit` could have been adjusted by the previous query
+                from_block_number = to_block_number + 1
+                to_block_number = self.get_to_block_number(
+                    from_block_number, current_block_number
+                )
+        except Exception as e:
+            queue.put(e)
+        else:
+            queue.put(None)
+
+    def process_addresses_pipelined(
+        self,
+        addresses: set[ChecksumAddress],
+        current_block_number: int | None = None,
+    ) -> Iterator[tuple[Sequence[Any], int | None, int, bool]]:
+        """
+        Same as calling `process_addresses` until `addresses` are updated, but relevant elements for the next
+        `prefetch_ranges` block ranges are retrieved from the node in a different greenlet while the current
+        range is processed and stored. Block number for monitored addresses is only updated after
+        a range is stored, and ranges are always stored in order
+
+        :param addresses: Addresses to process
+        :param current_block_number: To prevent fetching it again
+        :return: Iterator of the same tuples `process_addresses` returns, one per block range processed
+        """
+        assert addresses, "Addresses cannot be empty!"
+
+        current_block_number = (
+            current_block_number or self.ethereum_client.current_block_number
+        )
+        parameters = self.get_block_numbers_for_search(addresses, current_block_number)
+        if parameters is None:
+            yield [], None, current_block_number, True
+            return
+        from_block_number, to_block_number = parameters
+
+        queue = Queue(maxsize=self.prefetch_ranges)
+        producer = gevent.spawn(
+            self._fetch_relevant_elements_ahead,
+            addresses,
+            from_block_number,
+            to_block_number,
+            current_block_number,
+            queue,
+        )
+        try:
+            while (item := queue.get()) is not None:
+                if isinstance(item, Exception):
+                    if isinstance(item, INDEXING_ERRORS):
+                        self._halve_block_process_limit_after_error()
+                    raise item
+                elements, from_block_number, to_block_number = item
+                try:
+                    processed_elements = self.process_elements(elements)
+                except INDEXING_ERRORS as e:
+                    self._halve_block_process_limit_after_error()
+                    raise e
+                self._update_monitored_addresses_or_raise(
+                    addresses, from_block_number, to_block_number
+                )
+                updated = to_block_number == (current_block_number - self.confirmations)
+                yield processed_elements, from_block_number, to_block_number, updated
+        finally:
+            # Don't keep fetching if processing failed or iteration was stopped
+            producer.kill()
+
+    def process_addresses_until_updated(
+        self,
+        addresses: set[ChecksumAddress],
+        current_block_number: int | None = None,
+    ) -> Iterator[tuple[Sequence[Any], int | None, int, bool]]:
+        """
+        Process `addresses` until they are updated, using `process_addresses_pipelined` if `prefetch_ranges`
+        is configured or `process_addresses` otherwise
+
+        :param addresses: Addresses to process
+        :param current_block_number: To prevent fetching it again
+        :return: Iterator of the tuples returned by `process_addresses`, one per block range processed
+        """
+        if self.prefetch_ranges:
+            yield from self.process_addresses_pipelined(
+                addresses, current_block_number=current_block_number
+            )
+            return
+
+        updated = False
+        while not updated:
+            result = self.process_addresses(
+                addresses, current_block_number=current_block_number
+            )
+            updated = result[3]
+            yield result
 
     def start(self) -> tuple[int, int]:
         """
@@ -502,17 +682,15 @@ class EthereumIndexer(ABC):
                 "%s: Processing almost updated addresses",
                 self.__class__.__name__,
             )
-            updated = False
-            while not updated:
-                (
-                    processed_elements,
-                    from_block_number,
-                    to_block_number,
-                    updated,
-                ) = self.process_addresses(
-                    almost_updated_addresses,
-                    current_block_number=current_block_number,
-                )
+            for (
+                processed_elements,
+                from_block_number,
+                to_block_number,
+                _,
+            ) in self.process_addresses_until_updated(
+                almost_updated_addresses,
+                current_block_number=current_block_number,
+            ):
                 number_processed_elements = len(processed_elements)
                 logger.debug(
                     "%s: Processed %d elements for almost updated addresses. From-block-number=%s to-block-number=%d",
@@ -541,17 +719,15 @@ class EthereumIndexer(ABC):
                 self.__class__.__name__,
             )
 
-            updated = False
-            while not updated:
-                (
-                    processed_elements,
-                    from_block_number,
-                    to_block_number,
-                    updated,
-                ) = self.process_addresses(
-                    not_updated_addresses,
-                    current_block_number=current_block_number,
-                )
+            for (
+                processed_elements,
+                from_block_number,
+                to_block_number,
+                _,
+            ) in self.process_addresses_until_updated(
+                not_updated_addresses,
+                current_block_number=current_block_number,
+            ):
                 if from_block_number is not None and (
                     start_block is None or from_block_number < start_block
                 ):
@@ -21,6 +21,7 @@ from web3.types import EventData, FilterParams, LogReceipt
 
 from safe_transaction_service.utils.utils import chunks
 
+from .block_process_limit_controller import get_block_process_limit_controller
 from .ethereum_indexer import EthereumIndexer, FindRelevantElementsException
 
 logger = getLogger(__name__)
@@ -53,6 +54,15 @@ class EventsIndexer(EthereumIndexer):
         kwargs.setdefault(
             "updated_blocks_behind", settings.ETH_EVENTS_UPDATED_BLOCK_BEHIND
         )  # For last x blocks, consider them almost updated and process them first
+        kwargs.setdefault(
+            "prefetch_ranges", settings.ETH_EVENTS_PREFETCH_RANGES
+        )  # Block ranges to fetch from the node while the current one is stored
+        kwargs.setdefault(
+            "block_process_limit_controller", get_block_process_limit_controller()
+        )
+        kwargs.setdefault(
+            "persist_block_process_limit", settings.ETH_BLOCK_PROCESS_LIMIT_PERSIST
+        )
 
         # Number of concurrent requests to `getLogs`
         self.get_logs_concurrency = settings.ETH_EVENTS_GET_LOGS_CONCURRENCY
@@ -117,16 +127,17 @@ class EventsIndexer(EthereumIndexer):
 
             gevent_pool = pool.Pool(self.get_logs_concurrency)
             jobs = [
-                gevent_pool.spawn(
-                    self.ethereum_client.slow_w3.eth.get_logs, single_parameters
-                )
+                gevent_pool.spawn(self._get_logs, single_parameters)
                 for single_parameters in multiple_parameters
             ]
 
             try:
-                with self.auto_adjust_block_limit(from_block_number, to_block_number):
+                with self.auto_adjust_block_limit(
+                    from_block_number, to_block_number
+                ) as block_range_measure:
                     # Check how long all the jobs take
                     gevent.joinall(jobs, raise_error=True)
+                    block_range_measure.elements = sum(len(job.value) for job in jobs)
             finally:
                 # `joinall` raises on the first failed job without stopping the others,
                 # so kill any job still in flight
@@ -134,8 +145,36 @@ class EventsIndexer(EthereumIndexer):
 
             return [log_receipt for job in jobs for log_receipt in job.get()]
         else:
-            with self.auto_adjust_block_limit(from_block_number, to_block_number):
-                return self.ethereum_client.slow_w3.eth.get_logs(parameters)
+            with self.auto_adjust_block_limit(
+                from_block_number, to_block_number
+            ) as block_range_measure:
+                log_receipts = self._get_logs(parameters)
+                block_range_measure.elements = len(log_receipts)
+            return log_receipts
+
+    def _get_logs(self, parameters: FilterParams) -> list[LogReceipt]:
+        """
+        Call `eth_getLogs`, using the RPC cache if configured
+
+        :param parameters:
+        :return: LogReceipt for matching events
+        """
+        if not self.rpc_cache:
+            return self.ethereum_client.slow_w3.eth.get_logs(parameters)
+
+        namespace = self.rpc_cache.build_namespace(
+            "eth_getLogs",
+            {
+                "address": sorted(parameters.get("address") or []),
+                "topics": parameters["topics"],
+            },
+        )
+        return self.rpc_cache.get_or_fetch_block_range(
+            namespace,
+            parameters["fromBlock"],
+            parameters["toBlock"],
+            lambda: self.ethereum_client.slow_w3.eth.get_logs(parameters),
+        )
 
     def _find_elements_using_topics(
         self,
@@ -255,26 +294,13 @@ class EventsIndexer(EthereumIndexer):
         """
         Return only log receipts that haven't been processed yet.
         """
-        return [
-            log_receipt
-            for log_receipt in log_receipts
-            if not self._is_processed(
-                log_receipt["transactionHash"],
-                log_receipt["blockHash"],
-                log_receipt["logIndex"],
-            )
-        ]
+        return self.element_already_processed_checker.filter_not_processed(log_receipts)
 
     def _mark_log_receipts_processed(self, log_receipts: Sequence[LogReceipt]) -> None:
         """
         Mark provided log receipts as processed.
         """
-        for log_receipt in log_receipts:
-            self._mark_processed(
-                log_receipt["transactionHash"],
-                log_receipt["blockHash"],
-                log_receipt["logIndex"],
-            )
+        self.element_already_processed_checker.mark_processed_many(log_receipts)
 
     def _process_decoded_elements(self, decoded_elements: list[EventData]) -> list[Any]:
         processed_elements = []
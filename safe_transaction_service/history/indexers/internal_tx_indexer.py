@@ -31,6 +31,7 @@ from ..models import (
     SafeRelevantTransaction,
 )
 from ..services.event_service import set_safe_membership
+from .block_process_limit_controller import get_block_process_limit_controller
 from .ethereum_indexer import EthereumIndexer, FindRelevantElementsException
 
 logger = getLogger(__name__)
@@ -72,6 +73,15 @@ class InternalTxIndexer(EthereumIndexer):
         kwargs.setdefault(
             "blocks_to_reindex_again", settings.ETH_INTERNAL_TXS_BLOCKS_TO_REINDEX_AGAIN
         )
+        kwargs.setdefault(
+            "prefetch_ranges", settings.ETH_INTERNAL_TXS_PREFETCH_RANGES
+        )  # Block ranges to fetch from the node while the current one is stored
+        kwargs.setdefault(
+            "block_process_limit_controller", get_block_process_limit_controller()
+        )
+        kwargs.setdefault(
+            "persist_block_process_limit", settings.ETH_BLOCK_PROCESS_LIMIT_PERSIST
+        )
         super().__init__(*args, **kwargs)
 
         self.trace_txs_batch_size: int = settings.ETH_INTERNAL_TRACE_TXS_BATCH_SIZE
@@ -137,6 +147,53 @@ class InternalTxIndexer(EthereumIndexer):
             )
             return relevant_elements
 
+    def _trace_blocks(self, block_numbers: list[int]) -> list[list[BlockTrace]]:
+        """
+        Call `trace_block` for every block, using the RPC cache if configured
+
+        :param block_numbers:
+        :return: List of traces for every block, in the same order as `block_numbers`
+        """
+        if not self.rpc_cache:
+            return self.ethereum_client.tracing.trace_blocks(block_numbers)
+
+        return self.rpc_cache.get_or_fetch_many(
+            "trace_block",
+            block_numbers,
+            self.ethereum_client.tracing.trace_blocks,
+            lambda block_number, _: block_number,
+        )
+
+    def _trace_filter(
+        self,
+        addresses: set[ChecksumAddress],
+        from_block_number: int,
+        to_block_number: int,
+    ) -> list[FilterTrace]:
+        """
+        Call `trace_filter` for traces `to` the `addresses`, using the RPC cache if configured
+
+        :param addresses:
+        :param from_block_number:
+        :param to_block_number:
+        :return: Traces for the block range
+        """
+
+        def fetch() -> list[FilterTrace]:
+            return self.ethereum_client.tracing.trace_filter(
+                from_block=from_block_number,
+                to_block=to_block_number,
+                to_address=list(addresses),
+            )
+
+        if not self.rpc_cache:
+            return fetch()
+
+        namespace = self.rpc_cache.build_namespace("trace_filter", sorted(addresses))
+        return self.rpc_cache.get_or_fetch_block_range(
+            namespace, from_block_number, to_block_number, fetch
+        )
+
     def _find_relevant_elements_using_trace_block(
         self,
         addresses: set[ChecksumAddress],
@@ -152,9 +209,12 @@ class InternalTxIndexer(EthereumIndexer):
         try:
             block_numbers = list(range(from_block_number, to_block_number + 1))
 
-            with self.auto_adjust_block_limit(from_block_number, to_block_number):
-                all_blocks_traces = self.ethereum_client.tracing.trace_blocks(
-                    block_numbers
+            with self.auto_adjust_block_limit(
+                from_block_number, to_block_number
+            ) as block_range_measure:
+                all_blocks_traces = self._trace_blocks(block_numbers)
+                block_range_measure.elements = sum(
+                    len(block_traces or []) for block_traces in all_blocks_traces
                 )
             traces: OrderedDict[bytes, list[BlockTrace]] = OrderedDict()
             relevant_tx_hashes: set[bytes] = set()
@@ -208,12 +268,13 @@ class InternalTxIndexer(EthereumIndexer):
 
         try:
             # We only need to search for traces `to` the provided addresses
-            with self.auto_adjust_block_limit(from_block_number, to_block_number):
-                to_traces = self.ethereum_client.tracing.trace_filter(
-                    from_block=from_block_number,
-                    to_block=to_block_number,
-                    to_address=list(addresses),
+            with self.auto_adjust_block_limit(
+                from_block_number, to_block_number
+            ) as block_range_measure:
+                to_traces = self._trace_filter(
+                    addresses, from_block_number, to_block_number
                 )
+                block_range_measure.elements = len(to_traces)
         except (OSError, ValueError, Web3RPCError) as e:
             # For example, Infura returns:
             #   ValueError: {'code': -32005, 'data': {'from': '0x6BBCE1', 'limit': 10000, 'to': '0x7072DB'}, 'message': 'query returned more than 10000 results. Try with this block range [0x6BBCE1, 0x7072DB].'}
@@ -282,7 +343,8 @@ class InternalTxIndexer(EthereumIndexer):
         self, tx_hashes: Sequence[HexStr], batch_size: int
     ) -> list[list[FilterTrace]]:
         """
-        Fetch traces for the provided ``tx_hashes`` in parallel batches.
+        Fetch traces for the provided ``tx_hashes`` in parallel batches, using the RPC cache
+        if configured.
 
         Chunks are fetched concurrently using a gevent pool, but results are returned
         in the same order as the input ``tx_hashes`` so callers can safely ``zip`` them.
@@ -294,6 +356,20 @@ class InternalTxIndexer(EthereumIndexer):
         if not tx_hashes:
             return []
 
+        if self.rpc_cache:
+            return self.rpc_cache.get_or_fetch_many(
+                "trace_transaction",
+                tx_hashes,
+                lambda missing_tx_hashes: self._trace_transactions(
+                    missing_tx_hashes, batch_size
+                ),
+                lambda _, traces: traces[0]["blockNumber"] if traces else None,
+            )
+        return self._trace_transactions(tx_hashes, batch_size)
+
+    def _trace_transactions(
+        self, tx_hashes: Sequence[HexStr], batch_size: int
+    ) -> list[list[FilterTrace]]:
         batch_size = batch_size or len(tx_hashes)  # If `0`, don't use batches
         gevent_pool = pool.Pool(self.trace_txs_concurrency)
         jobs = [
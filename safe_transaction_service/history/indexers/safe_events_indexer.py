@@ -106,19 +106,13 @@ class SafeEventsIndexer(EventsIndexer):
         logger.debug("Conditional indexing: filtering events by tx._from and tx.to")
 
         # 1. Filter already processed log receipts and normalize tx hashes once
-        not_processed_log_receipts: list[LogReceipt] = []
-        not_processed_tx_hashes_by_index: list[bytes] = []
-        for log_receipt in log_receipts:
-            if self._is_processed(
-                log_receipt["transactionHash"],
-                log_receipt["blockHash"],
-                log_receipt["logIndex"],
-            ):
-                continue
-            not_processed_log_receipts.append(log_receipt)
-            not_processed_tx_hashes_by_index.append(
-                HexBytes(log_receipt["transactionHash"])
-            )
+        not_processed_log_receipts = self._filter_not_processed_log_receipts(
+            log_receipts
+        )
+        not_processed_tx_hashes_by_index: list[bytes] = [
+            HexBytes(log_receipt["transactionHash"])
+            for log_receipt in not_processed_log_receipts
+        ]
 
         if not not_processed_log_receipts:
             return []
@@ -251,12 +245,7 @@ class SafeEventsIndexer(EventsIndexer):
         # 13. Mark ALL original receipts as processed so blocked/filtered-out ones
         # are never re-fetched. Receipt-fetch failures never reach here (they raise
         # in step 11), so nothing that still needs indexing is marked here.
-        for log_receipt in not_processed_log_receipts:
-            self._mark_processed(
-                log_receipt["transactionHash"],
-                log_receipt["blockHash"],
-                log_receipt["logIndex"],
-            )
+        self._mark_log_receipts_processed(not_processed_log_receipts)
 
         return processed_elements
 
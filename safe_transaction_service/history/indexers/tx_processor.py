@@ -34,6 +34,7 @@ from safe_transaction_service.account_abstraction.services import (
 )
 from safe_transaction_service.safe_messages import models as safe_message_models
 
+from ..cache import remove_cached_safe_owners
 from ..models import (
     EthereumTx,
     InternalTx,
@@ -80,6 +81,19 @@ class ProcessedResult:
     )
 
 
+@dataclasses.dataclass
+class PendingSafeStatuses:
+    """
+    Snapshots kept by `store_new_safe_status` during one `process_decoded_transactions` call,
+    not stored in database yet
+    """
+
+    safe_statuses: dict[int, SafeStatus] = dataclasses.field(default_factory=dict)
+    safe_last_statuses: dict[str, SafeLastStatus] = dataclasses.field(
+        default_factory=dict
+    )
+
+
 class SafeTxProcessorProvider:
     def __new__(cls):
         if not hasattr(cls, "instance"):
@@ -431,24 +445,47 @@ class SafeTxProcessor(TxProcessor):
         self,
         safe_last_status: SafeLastStatus,
         internal_tx: InternalTx,
-        modified_fields: list[str],
+        pending_safe_statuses: PendingSafeStatuses,
     ) -> SafeLastStatus:
         """
-        Updates `SafeLastStatus`. An entry to `SafeStatus` is added too via a Django signal.
+        Keeps a snapshot of `safe_last_status` in `pending_safe_statuses` to be stored as
+        `SafeLastStatus` and `SafeStatus` when `flush_safe_statuses` is called
 
         :param safe_last_status:
         :param internal_tx:
-        :param modified_fields: only update modified fields (db optimization)
+        :param pending_safe_statuses: Snapshots of the current `process_decoded_transactions` call
         :return: Updated `SafeLastStatus`
         """
         safe_last_status.internal_tx = internal_tx
-        if modified_fields:
-            safe_last_status.save(update_fields=modified_fields + ["internal_tx"])
-        else:
-            safe_last_status.save()
+        safe_status = SafeStatus.from_status_instance(safe_last_status)
+        pending_safe_statuses.safe_statuses[internal_tx.pk] = safe_status
+        pending_safe_statuses.safe_last_statuses[safe_last_status.address] = (
+            SafeLastStatus.from_status_instance(safe_status)
+        )
         self.safe_last_status_cache[safe_last_status.address] = safe_last_status
         return safe_last_status
 
+    def flush_safe_statuses(self, pending_safe_statuses: PendingSafeStatuses) -> int:
+        """
+        Store the snapshots kept by `store_new_safe_status` using one query for `SafeStatus`
+        and one for `SafeLastStatus`. Cached owners for the Safes are removed, as they could have changed
+
+        :param pending_safe_statuses: Snapshots of the current `process_decoded_transactions` call.
+            They are removed after being stored
+        :return: Number of `SafeStatus` stored
+        """
+        safe_statuses = list(pending_safe_statuses.safe_statuses.values())
+        safe_last_statuses = list(pending_safe_statuses.safe_last_statuses.values())
+        pending_safe_statuses.safe_statuses.clear()
+        pending_safe_statuses.safe_last_statuses.clear()
+        if safe_statuses:
+            SafeStatus.objects.bulk_upsert(safe_statuses)
+            SafeLastStatus.objects.bulk_upsert(safe_last_statuses)
+            remove_cached_safe_owners(
+                [safe_last_status.address for safe_last_status in safe_last_statuses]
+            )
+        return len(safe_statuses)
+
     @transaction.atomic
     def process_decoded_transactions(
         self, internal_txs_decoded: Sequence[InternalTxDecoded]
@@ -470,6 +507,8 @@ class SafeTxProcessor(TxProcessor):
             for internal_tx_decoded in internal_txs_decoded
         }
         banned_addresses = SafeContract.objects.get_banned_addresses_cached()
+        # Local to this call, as the processor is shared by every task in the worker
+        pending_safe_statuses = PendingSafeStatuses()
 
         try:
             for internal_tx_decoded in internal_txs_decoded:
@@ -484,7 +523,7 @@ class SafeTxProcessor(TxProcessor):
                 else:
                     try:
                         processed_result = self.__process_decoded_transaction(
-                            internal_tx_decoded
+                            internal_tx_decoded, pending_safe_statuses
                         )
                         results.append(processed_result.processed)
                         safe_relevant_txs.extend(
@@ -505,6 +544,8 @@ class SafeTxProcessor(TxProcessor):
                         )
                         results.append(False)
 
+            self.flush_safe_statuses(pending_safe_statuses)
+
             # Insert at the very end to minimize the lock window: erc20_events_indexer
             # inserts the same (ethereum_tx, safe) unique key, so inserting here means
             # the conflict lock is held only until commit, not for the full batch duration.
@@ -523,11 +564,14 @@ class SafeTxProcessor(TxProcessor):
                 self.clear_cache(safe_address=contract_address)
 
     def __process_decoded_transaction(
-        self, internal_tx_decoded: InternalTxDecoded
+        self,
+        internal_tx_decoded: InternalTxDecoded,
+        pending_safe_statuses: PendingSafeStatuses,
     ) -> ProcessedResult:
         """
         Decode internal tx and creates needed models
         :param internal_tx_decoded: InternalTxDecoded to process. It will be set as `processed`
+        :param pending_safe_statuses: Snapshots of the current `process_decoded_transactions` call
         :return: ProcessedResult with whether the tx was processed and any SafeRelevantTransaction to insert
         """
         internal_tx = internal_tx_decoded.internal_tx
@@ -581,7 +625,7 @@ class SafeTxProcessor(TxProcessor):
                     fallback_handler=fallback_handler,
                 ),
                 internal_tx,
-                [],
+                pending_safe_statuses,
             )
         else:
             safe_last_status = self.get_last_safe_status_for_address(contract_address)
@@ -609,18 +653,22 @@ class SafeTxProcessor(TxProcessor):
                 else:  # removeOwner, removeOwnerWithThreshold
                     self.swap_owner(internal_tx, safe_last_status, owner, None)
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["owners", "threshold"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name == "swapOwner":
                 logger.debug("[%s] Processing owner swap", contract_address)
                 old_owner = arguments["oldOwner"]
                 new_owner = arguments["newOwner"]
                 self.swap_owner(internal_tx, safe_last_status, old_owner, new_owner)
-                self.store_new_safe_status(safe_last_status, internal_tx, ["owners"])
+                self.store_new_safe_status(
+                    safe_last_status, internal_tx, pending_safe_statuses
+                )
             elif function_name == "changeThreshold":
                 logger.debug("[%s] Processing threshold change", contract_address)
                 safe_last_status.threshold = arguments["_threshold"]
-                self.store_new_safe_status(safe_last_status, internal_tx, ["threshold"])
+                self.store_new_safe_status(
+                    safe_last_status, internal_tx, pending_safe_statuses
+                )
             elif function_name == "changeMasterCopy":
                 logger.debug("[%s] Processing master copy change", contract_address)
                 # TODO Ban address if it doesn't have a valid master copy
@@ -641,13 +689,13 @@ class SafeTxProcessor(TxProcessor):
                     # Transactions queued not executed are not valid anymore
                     MultisigTransaction.objects.queued(contract_address).delete()
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["master_copy"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name == "setFallbackHandler":
                 logger.debug("[%s] Setting FallbackHandler", contract_address)
                 safe_last_status.fallback_handler = arguments["handler"]
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["fallback_handler"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name == "setGuard":
                 safe_last_status.guard = (
@@ -657,7 +705,9 @@ class SafeTxProcessor(TxProcessor):
                     logger.debug("[%s] Setting TransactionGuard", contract_address)
                 else:
                     logger.debug("[%s] Unsetting TransactionGuard", contract_address)
-                self.store_new_safe_status(safe_last_status, internal_tx, ["guard"])
+                self.store_new_safe_status(
+                    safe_last_status, internal_tx, pending_safe_statuses
+                )
             elif function_name == "setModuleGuard":
                 safe_last_status.module_guard = (
                     arguments["moduleGuard"]
@@ -669,19 +719,19 @@ class SafeTxProcessor(TxProcessor):
                 else:
                     logger.debug("[%s] Unsetting ModuleGuard", contract_address)
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["module_guard"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name == "enableModule":
                 logger.debug("[%s] Enabling Module", contract_address)
                 safe_last_status.enabled_modules.append(arguments["module"])
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["enabled_modules"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name == "disableModule":
                 logger.debug("[%s] Disabling Module", contract_address)
                 self.disable_module(internal_tx, safe_last_status, arguments["module"])
                 self.store_new_safe_status(
-                    safe_last_status, internal_tx, ["enabled_modules"]
+                    safe_last_status, internal_tx, pending_safe_statuses
                 )
             elif function_name in {
                 "execTransactionFromModule",
@@ -890,7 +940,9 @@ class SafeTxProcessor(TxProcessor):
                         )
 
                 safe_last_status.nonce = nonce + 1
-                self.store_new_safe_status(safe_last_status, internal_tx, ["nonce"])
+                self.store_new_safe_status(
+                    safe_last_status, internal_tx, pending_safe_statuses
+                )
             else:
                 processed_successfully = False
                 logger.warning(
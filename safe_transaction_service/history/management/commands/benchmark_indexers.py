@@ -0,0 +1,284 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import json
+import resource
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from safe_eth.eth import get_auto_ethereum_client
+
+from ....utils.json_rpc_replay_server import JsonRpcReplayServer
+from ....utils.rpc_cache import get_rpc_cache
+from ...indexers import (
+    Erc20EventsIndexerProvider,
+    InternalTxIndexerProvider,
+    ProxyFactoryIndexerProvider,
+    SafeEventsIndexerProvider,
+)
+from ...indexers.tx_processor import SafeTxProcessorProvider
+from ...services import IndexServiceProvider
+
+INDEXER_PROVIDERS = {
+    "proxy_factory": ProxyFactoryIndexerProvider,
+    "internal_tx": InternalTxIndexerProvider,
+    "safe_events": SafeEventsIndexerProvider,
+    "erc20": Erc20EventsIndexerProvider,
+}
+
+
+@dataclass
+class StageResult:
+    name: str
+    seconds: float = 0.0
+    blocks: int = 0
+    elements: int = 0  # Events/traces found or decoded txs processed
+    queries: int = 0
+    queries_per_range: list[int] = field(default_factory=list)
+    peak_rss_mib: float = 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks / self.seconds if self.seconds else 0.0
+
+    @property
+    def elements_per_second(self) -> float:
+        return self.elements / self.seconds if self.seconds else 0.0
+
+    @property
+    def mean_queries_per_range(self) -> float:
+        if not self.queries_per_range:
+            return 0.0
+        return sum(self.queries_per_range) / len(self.queries_per_range)
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "blocks_per_second": self.blocks_per_second,
+            "elements_per_second": self.elements_per_second,
+            "mean_queries_per_range": self.mean_queries_per_range,
+        }
+
+
+def get_peak_rss_mib() -> float:
+    # `ru_maxrss` is returned in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark indexing and processing throughput, replaying node responses recorded on a fixture "
+        "through a local JSON-RPC server. Use --record-from-node to create the fixture"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fixture", help="Gzipped JSON file with the recorded node responses"
+        )
+        parser.add_argument(
+            "--from-block-number", type=int, required=True, help="First block to index"
+        )
+        parser.add_argument(
+            "--to-block-number", type=int, required=True, help="Last block to index"
+        )
+        parser.add_argument(
+            "--block-process-limit",
+            type=int,
+            default=50,
+            help="Number of blocks to query each time. Auto-adjust is disabled so block ranges are the "
+            "same when recording and replaying",
+        )
+        parser.add_argument(
+            "--indexers",
+            nargs="+",
+            choices=list(INDEXER_PROVIDERS),
+            help="Indexers to run, in order. If not provided, `safe_events` and `erc20` are used "
+            "for L2 networks and `proxy_factory`, `internal_tx` and `erc20` otherwise",
+        )
+        parser.add_argument(
+            "--record-from-node",
+            help="Node url. Responses are fetched from it and stored on the fixture instead of replayed",
+        )
+        parser.add_argument(
+            "--output", help="Store the results as JSON on the provided file"
+        )
+        parser.add_argument(
+            "--use-configured-database",
+            action="store_true",
+            default=False,
+            help="Index on the configured database instead of a new temporary one. "
+            "Indexed data will be kept",
+        )
+
+    def handle(self, *args, **options):
+        from_block_number = options["from_block_number"]
+        to_block_number = options["to_block_number"]
+        if to_block_number < from_block_number:
+            raise CommandError("--to-block-number must be >= --from-block-number")
+
+        if record_from_node := options["record_from_node"]:
+            server = JsonRpcReplayServer(upstream_url=record_from_node)
+        else:
+            try:
+                server = JsonRpcReplayServer.load(options["fixture"])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot load fixture: {e}") from e
+
+        indexer_names = options["indexers"] or (
+            ["safe_events", "erc20"]
+            if settings.ETH_L2_NETWORK
+            else ["proxy_factory", "internal_tx", "erc20"]
+        )
+        with server, self.database(not options["use_configured_database"]):
+            with override_settings(
+                ETHEREUM_NODE_URL=server.url,
+                ETHEREUM_TRACING_NODE_URL=server.url,
+                ETH_BLOCK_PROCESS_LIMIT_PERSIST=False,
+                ETH_RPC_CACHE_PATH=None,
+            ):
+                self.clear_singletons()
+                try:
+                    call_command("setup_service", stdout=StringIO())
+                    results = self.run_stages(
+                        indexer_names,
+                        from_block_number,
+                        to_block_number,
+                        options["block_process_limit"],
+                    )
+                finally:
+                    self.clear_singletons()
+
+        if record_from_node:
+            stored = server.save(options["fixture"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Stored {stored} responses on fixture {options['fixture']}"
+                )
+            )
+        elif server.not_recorded_requests_count:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{server.not_recorded_requests_count} of {server.requests_count} requests were not "
+                    f"recorded on the fixture, results are not comparable"
+                )
+            )
+
+        for result in results:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{result.name}: {result.seconds:.2f}s, {result.blocks_per_second:.1f} blocks/s, "
+                    f"{result.elements} elements ({result.elements_per_second:.1f}/s), "
+                    f"{result.queries} queries ({result.mean_queries_per_range:.1f}/range), "
+                    f"peak RSS {result.peak_rss_mib:.1f} MiB"
+                )
+            )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump([result.to_dict() for result in results], f, indent=2)
+
+    @staticmethod
+    def clear_singletons() -> None:
+        """
+        Singletons are built using the node urls on settings, so they must be rebuilt
+        to use the replay server
+        """
+        get_auto_ethereum_client.cache_clear()
+        get_rpc_cache.cache_clear()
+        IndexServiceProvider.del_singleton()
+        SafeTxProcessorProvider.del_singleton()
+        for indexer_provider in INDEXER_PROVIDERS.values():
+            indexer_provider.del_singleton()
+
+    @contextmanager
+    def database(self, temporary: bool) -> Iterator[None]:
+        """
+        :param temporary: If ``True``, create a new database for the benchmark and drop it afterwards
+        """
+        if not temporary:
+            yield
+            return
+
+        old_database_name = connection.settings_dict["NAME"]
+        connection.settings_dict["TEST"]["NAME"] = f"benchmark_{old_database_name}"
+        self.stdout.write(self.style.SUCCESS("Creating benchmark database"))
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+    @contextmanager
+    def count_queries(self, result: StageResult) -> Iterator[None]:
+        def execute_wrapper(execute: Callable, sql, params, many, context):
+            result.queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(execute_wrapper):
+            yield
+
+    @staticmethod
+    def get_on_block_range_processed(
+        result: StageResult,
+    ) -> Callable[[int, int], None]:
+        """
+        :param result:
+        :return: Callback storing on ``result`` the queries done for every block range
+        """
+        queries_before_range = 0
+
+        def on_block_range_processed(
+            _from_block_number: int, _to_block_number: int
+        ) -> None:
+            nonlocal queries_before_range
+            result.queries_per_range.append(result.queries - queries_before_range)
+            queries_before_range = result.queries
+
+        return on_block_range_processed
+
+    def run_stages(
+        self,
+        indexer_names: list[str],
+        from_block_number: int,
+        to_block_number: int,
+        block_process_limit: int,
+    ) -> list[StageResult]:
+        index_service = IndexServiceProvider()
+        results = []
+        for indexer_name in indexer_names:
+            self.stdout.write(self.style.SUCCESS(f"Running {indexer_name} indexer"))
+            indexer = INDEXER_PROVIDERS[indexer_name].get_new_instance()
+            indexer.block_auto_process_limit = False
+            result = StageResult(
+                indexer_name, blocks=to_block_number - from_block_number + 1
+            )
+            start = time.perf_counter()
+            with self.count_queries(result):
+                result.elements = index_service._reindex(
+                    indexer,
+                    from_block_number,
+                    to_block_number=to_block_number,
+                    block_process_limit=block_process_limit,
+                    on_block_range_processed=self.get_on_block_range_processed(result),
+                )
+            result.seconds = time.perf_counter() - start
+            result.peak_rss_mib = get_peak_rss_mib()
+            results.append(result)
+
+        self.stdout.write(self.style.SUCCESS("Processing decoded txs"))
+        result = StageResult("process_decoded_txs")
+        start = time.perf_counter()
+        with self.count_queries(result):
+            result.elements = index_service.process_all_decoded_txs()
+        result.seconds = time.perf_counter() - start
+        result.peak_rss_mib = get_peak_rss_mib()
+        results.append(result)
+        return results
@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from django.core.management.base import BaseCommand
+
+from ...indexers.block_process_limit_controller import (
+    delete_stored_block_process_limits,
+    get_stored_block_process_limits,
+)
+
+
+class Command(BaseCommand):
+    help = "Show the block process limits learned by the indexers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            help="Remove learned limits, so indexers start again from the configured ones",
+            action="store_true",
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            removed = delete_stored_block_process_limits()
+            self.stdout.write(
+                self.style.SUCCESS(f"Removed {removed} block process limits")
+            )
+            return None
+
+        block_process_limits = get_stored_block_process_limits()
+        if not block_process_limits:
+            self.stdout.write(self.style.SUCCESS("No block process limits stored"))
+        for indexer_name, block_process_limit in sorted(block_process_limits.items()):
+            self.stdout.write(
+                self.style.SUCCESS(f"{indexer_name}: {block_process_limit}")
+            )
@@ -1,11 +1,17 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 from safe_eth.eth import EthereumClient
 from safe_eth.eth.constants import NULL_ADDRESS
 from safe_eth.eth.contracts import get_safe_V1_3_0_contract
 
+from safe_transaction_service.utils.batch_processor import (
+    BatchProcessorException,
+    BatchResult,
+    KeysetBatchProcessor,
+)
+
 from ...models import MultisigTransaction, SafeLastStatus
 from ...services import IndexServiceProvider
 
@@ -47,6 +53,18 @@ class Command(BaseCommand):
             help="Size of batch requests",
             default=1000,
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of batches to request to the node in parallel",
+            default=1,
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            help="Store progress on this file after every batch. If the file exists, "
+            "checking is resumed from the stored progress",
+            default=None,
+        )
 
     def get_nonce_fn(self, ethereum_client: EthereumClient):
         return get_safe_V1_3_0_contract(
@@ -65,29 +83,32 @@ class Command(BaseCommand):
             queryset = queryset.exclude(nonce=0)
 
         if (count := queryset.count()) > 0:
+            self.stdout.write(self.style.SUCCESS(f"Checking {count} Safes"))
             index_service = IndexServiceProvider()
             ethereum_client = index_service.ethereum_client
             nonce_fn = self.get_nonce_fn(ethereum_client)
             first_issue_block_number = ethereum_client.current_block_number
             all_problematic_addresses = set()
 
-            for i in range(0, count, batch_size):
-                self.stdout.write(self.style.SUCCESS(f"Processed {i}/{count}"))
-                safe_statuses = queryset[i : i + batch_size]
-                safe_statuses_list = list(
-                    safe_statuses
-                )  # Force retrieve queryset from DB
-
-                blockchain_nonces = ethereum_client.batch_call_same_function(
+            def get_blockchain_nonces(
+                safe_statuses: list[SafeLastStatus],
+            ) -> list[int | None]:
+                return ethereum_client.batch_call_same_function(
                     nonce_fn,
-                    [safe_status.address for safe_status in safe_statuses_list],
+                    [safe_status.address for safe_status in safe_statuses],
                     raise_exception=False,
                     force_batch_call=force_batch_call,
                 )
 
+            def check_safe_statuses(
+                safe_statuses: list[SafeLastStatus],
+                blockchain_nonces: list[int | None],
+            ) -> BatchResult:
+                nonlocal first_issue_block_number
+                batch_first_issue_block_number: int | None = None
                 addresses_to_reindex = set()
                 for safe_status, blockchain_nonce in zip(
-                    safe_statuses_list, blockchain_nonces, strict=False
+                    safe_statuses, blockchain_nonces, strict=False
                 ):
                     address = safe_status.address
                     nonce = safe_status.nonce
@@ -127,9 +148,13 @@ class Command(BaseCommand):
                                     f"ethereum-tx-hash={last_valid_transaction.ethereum_tx_id}"
                                 )
                             )
+                            block_number = last_valid_transaction.ethereum_tx.block_id
+                            batch_first_issue_block_number = min(
+                                block_number,
+                                batch_first_issue_block_number or block_number,
+                            )
                             first_issue_block_number = min(
-                                last_valid_transaction.ethereum_tx.block_id,
-                                first_issue_block_number,
+                                block_number, first_issue_block_number
                             )
                         addresses_to_reindex.add(address)
 
@@ -151,7 +176,24 @@ class Command(BaseCommand):
                     )
                     index_service.reprocess_addresses(addresses_to_reindex)
 
-                all_problematic_addresses |= addresses_to_reindex
+                all_problematic_addresses.update(addresses_to_reindex)
+                return BatchResult(
+                    problems=len(addresses_to_reindex),
+                    first_bad_block=batch_first_issue_block_number,
+                )
+
+            batch_processor = KeysetBatchProcessor(
+                "check_index_problems",
+                queryset,
+                batch_size,
+                workers=options["workers"],
+                checkpoint_path=options["checkpoint_file"],
+                write=lambda text: self.stdout.write(self.style.SUCCESS(text)),
+            )
+            try:
+                batch_processor.run(get_blockchain_nonces, check_safe_statuses)
+            except BatchProcessorException as exc:
+                raise CommandError(str(exc)) from exc
 
             if all_problematic_addresses:
                 self.stdout.write(
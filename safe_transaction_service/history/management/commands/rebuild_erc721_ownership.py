@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from django.core.management.base import BaseCommand
+
+from ...models import ERC721Ownership
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the ERC721 Ownership from the stored ERC721 transfers. Required for transfers indexed before "
+        "the table existed, before enabling `COLLECTIBLES_USE_OWNERSHIP_TABLE`"
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("Rebuilding ERC721 Ownership"))
+        stored = ERC721Ownership.objects.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {stored} ERC721 Ownership entries")
+        )
@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from django.core.management.base import BaseCommand
+
+from ...models import SafeTokenLedger
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the Safe Token Ledger from the stored ERC20 transfers. Required for Safes indexed before "
+        "the ledger existed, before enabling `TOKENS_BALANCES_USE_LEDGER`"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--safes",
+            nargs="+",
+            help="Rebuild the ledger only for these Safes. If not provided, every Safe is processed",
+        )
+
+    def handle(self, *args, **options):
+        safes = options["safes"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilding Safe Token Ledger for {len(safes) if safes else 'every'} Safe(s)"
+            )
+        )
+        stored = SafeTokenLedger.objects.rebuild(safe_addresses=safes)
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {stored} Safe Token Ledger entries")
+        )
@@ -104,6 +104,12 @@ TASKS = [
         period=IntervalSchedule.SECONDS,
         enabled=settings.ETH_L2_NETWORK,
     ),
+    CeleryTaskConfiguration(
+        name="safe_transaction_service.history.tasks.resend_stale_safe_events_backfill_shards_task",
+        description="Resend stale Safe events backfill shards (L2) (every 5 minutes)",
+        cron=CronDefinition(minute="*/5"),  # Every 5 minutes - */5 * * * *
+        enabled=settings.ETH_L2_NETWORK,
+    ),
     CeleryTaskConfiguration(
         name="safe_transaction_service.history.tasks.index_new_proxies_task",
         description="Index new Proxies (every 15 seconds)",
@@ -151,6 +157,13 @@ TASKS = [
         description="Fix Pool Token Names (every hour at minute 0)",
         cron=CronDefinition(minute=0),  # Every hour at minute 0 - 0 * * * *
     ),
+    CeleryTaskConfiguration(
+        name="safe_transaction_service.tokens.tasks.create_pending_tokens_task",
+        description="Create Tokens queued by the ERC20 indexer (every 15 seconds)",
+        interval=15,
+        period=IntervalSchedule.SECONDS,
+        enabled=settings.TOKENS_CREATE_FROM_INDEXER,
+    ),
     CeleryTaskConfiguration(
         name="safe_transaction_service.tokens.tasks.update_token_info_from_token_list_task",
         description="Update Token info from token list (every day at 00:00)",
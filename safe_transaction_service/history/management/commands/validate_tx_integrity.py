@@ -1,13 +1,22 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
-from django.core.management.base import BaseCommand
-from django.db import connection
+from collections.abc import Sequence
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import OuterRef, QuerySet, Subquery
 
 from hexbytes import HexBytes
 from safe_eth.eth import get_auto_ethereum_client
 from safe_eth.safe import Safe
 from safe_eth.safe.safe_signature import SafeSignature
 
-from ...models import MultisigConfirmation, MultisigTransaction
+from safe_transaction_service.utils.batch_processor import (
+    BatchProcessorException,
+    BatchResult,
+    KeysetBatchProcessor,
+)
+
+from ...models import MultisigConfirmation, MultisigTransaction, SafeLastStatus
+from ...services import SignatureServiceProvider
 
 
 class Command(BaseCommand):
@@ -16,27 +25,38 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.ethereum_client = get_auto_ethereum_client()
+        self.signature_service = SignatureServiceProvider()
 
-    def get_queue_for_every_safe(self) -> list[bytes]:
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="Number of multisig transactions validated on every batch",
+            type=int,
+            default=500,
+        )
+        parser.add_argument(
+            "--workers",
+            help="Number of batches validated in parallel",
+            type=int,
+            default=1,
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            help="Store progress on this file after every batch. If the file exists, "
+            "validation is resumed from the stored progress",
+            default=None,
+        )
+
+    def get_queue_for_every_safe(self) -> QuerySet[MultisigTransaction]:
         """
-        :return: Pending safes to execute
+        :return: Not executed multisig transactions with a nonce not lower than the current Safe nonce
         """
-        query = (
-            "SELECT ENCODE(safe_tx_hash, 'hex') FROM history_multisigtransaction hm "
-            "JOIN history_safelaststatus hs "
-            "ON hm.safe = hs.address AND hm.nonce >= hs.nonce AND hm.ethereum_tx_id is NULL"
+        safe_nonce = SafeLastStatus.objects.filter(address=OuterRef("safe")).values(
+            "nonce"
         )
-        with connection.cursor() as cursor:
-            # Queries all the ERC721 IN and all OUT and only returns the ones currently owned
-            cursor.execute(query, [])
-            return [HexBytes(safe_tx_hash) for (safe_tx_hash,) in cursor.fetchall()]
-
-    def get_multisig_transactions(
-        self, safe_tx_hash: list[bytes]
-    ) -> list[MultisigTransaction]:
         return MultisigTransaction.objects.filter(
-            safe_tx_hash__in=safe_tx_hash
-        ).iterator()
+            ethereum_tx=None, nonce__gte=Subquery(safe_nonce[:1])
+        ).prefetch_related("confirmations")
 
     def validate_safe_tx_hash(self, multisig_transaction: MultisigTransaction) -> bool:
         """
@@ -58,51 +78,120 @@ class Command(BaseCommand):
         )
         return HexBytes(multisig_transaction.safe_tx_hash) == safe_tx.safe_tx_hash
 
-    def validate_confirmation(
-        self,
-        multisig_confirmation: MultisigConfirmation,
-        multisig_transaction: MultisigTransaction,
-    ) -> bool:
+    def get_invalid_confirmations(
+        self, multisig_transactions: Sequence[MultisigTransaction]
+    ) -> list[tuple[MultisigConfirmation, MultisigTransaction]]:
         """
-        :param multisig_confirmation:
-        :param multisig_transaction:
-        :return: `True` if database confirmation owner matches the calculated one from the signature, `False` otherwise
+        Validate the confirmations for all the provided multisig transactions at once,
+        using `SignatureService.verify_signatures`
+
+        :param multisig_transactions:
+        :return: Confirmations with an invalid signature or with an owner not matching the calculated one
+            from the signature
         """
-        for safe_signature in SafeSignature.parse_signature(
-            multisig_confirmation.signature, multisig_transaction.safe_tx_hash
+        invalid_confirmations = []
+        confirmations_to_verify = []
+        safe_signatures_with_safes = []
+        for multisig_transaction in multisig_transactions:
+            for multisig_confirmation in multisig_transaction.confirmations.all():
+                safe_signatures = SafeSignature.parse_signature(
+                    multisig_confirmation.signature or b"",
+                    multisig_transaction.safe_tx_hash,
+                )
+                if not safe_signatures:
+                    invalid_confirmations.append(
+                        (multisig_confirmation, multisig_transaction)
+                    )
+                    continue
+                # Only the first signature is relevant for the confirmation
+                confirmations_to_verify.append(
+                    (multisig_confirmation, multisig_transaction)
+                )
+                safe_signatures_with_safes.append(
+                    (safe_signatures[0], multisig_transaction.safe)
+                )
+
+        for (multisig_confirmation, multisig_transaction), verification in zip(
+            confirmations_to_verify,
+            self.signature_service.verify_signatures(safe_signatures_with_safes),
+            strict=True,
         ):
-            return (
-                safe_signature.is_valid(self.ethereum_client, multisig_transaction.safe)
-                and safe_signature.owner == multisig_confirmation.owner
-            )
+            if (
+                not verification.is_valid
+                or verification.owner != multisig_confirmation.owner
+            ):
+                invalid_confirmations.append(
+                    (multisig_confirmation, multisig_transaction)
+                )
+        return invalid_confirmations
+
+    def validate_multisig_transactions(
+        self, multisig_transactions: list[MultisigTransaction]
+    ) -> tuple[
+        list[MultisigTransaction],
+        list[tuple[MultisigConfirmation, MultisigTransaction]],
+    ]:
+        """
+        :param multisig_transactions:
+        :return: Multisig transactions with a not matching safe_tx_hash and invalid confirmations
+        """
+        return [
+            multisig_transaction
+            for multisig_transaction in multisig_transactions
+            if not self.validate_safe_tx_hash(multisig_transaction)
+        ], self.get_invalid_confirmations(multisig_transactions)
 
     def handle(self, *args, **options):
-        safe_tx_hashes = self.get_queue_for_every_safe()
-        self.stdout.write(
-            self.style.SUCCESS(f"Found {len(safe_tx_hashes)} transactions")
-        )
+        queryset = self.get_queue_for_every_safe()
+        self.stdout.write(self.style.SUCCESS(f"Found {queryset.count()} transactions"))
 
-        for multisig_transaction in self.get_multisig_transactions(safe_tx_hashes):
-            if multisig_transaction.signatures:
+        def report_problems(
+            multisig_transactions: list[MultisigTransaction],
+            problems: tuple[
+                list[MultisigTransaction],
+                list[tuple[MultisigConfirmation, MultisigTransaction]],
+            ],
+        ) -> BatchResult:
+            not_matching_multisig_transactions, invalid_confirmations = problems
+            executed_multisig_transactions = [
+                multisig_transaction
+                for multisig_transaction in multisig_transactions
+                if multisig_transaction.signatures
+            ]
+            for multisig_transaction in executed_multisig_transactions:
                 self.stdout.write(
                     self.style.WARNING(
                         f"{multisig_transaction.safe_tx_hash} should not have signatures as it is not executed"
                     )
                 )
-            if not self.validate_safe_tx_hash(multisig_transaction):
+            for multisig_transaction in not_matching_multisig_transactions:
                 self.stdout.write(
                     self.style.WARNING(
                         f"{multisig_transaction.safe_tx_hash} is not matching"
                     )
                 )
-
-            for multisig_confirmation in multisig_transaction.confirmations.all():
-                if not self.validate_confirmation(
-                    multisig_confirmation, multisig_transaction
-                ):
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Confirmation for owner {multisig_confirmation.owner} is not valid "
-                            f"for multisig transaction {multisig_transaction.safe_tx_hash}"
-                        )
+            for multisig_confirmation, multisig_transaction in invalid_confirmations:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Confirmation for owner {multisig_confirmation.owner} is not valid "
+                        f"for multisig transaction {multisig_transaction.safe_tx_hash}"
                     )
+                )
+            return BatchResult(
+                problems=len(executed_multisig_transactions)
+                + len(not_matching_multisig_transactions)
+                + len(invalid_confirmations)
+            )
+
+        batch_processor = KeysetBatchProcessor(
+            "validate_tx_integrity",
+            queryset,
+            options["batch_size"],
+            workers=options["workers"],
+            checkpoint_path=options["checkpoint_file"],
+            write=lambda text: self.stdout.write(self.style.SUCCESS(text)),
+        )
+        try:
+            batch_processor.run(self.validate_multisig_transactions, report_problems)
+        except BatchProcessorException as exc:
+            raise CommandError(str(exc)) from exc
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.15 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0102_alter_multisigconfirmation_signature_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexingShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("from_block_number", models.PositiveIntegerField(unique=True)),
+                ("to_block_number", models.PositiveIntegerField()),
+                ("block_number", models.PositiveIntegerField()),
+            ],
+            options={
+                "ordering": ["from_block_number"],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.15 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+import safe_eth.eth.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0103_indexingshard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SafeTokenLedger",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("safe", safe_eth.eth.django.models.EthereumAddressBinaryField()),
+                (
+                    "token_address",
+                    safe_eth.eth.django.models.EthereumAddressBinaryField(),
+                ),
+                ("transfer_count", models.PositiveBigIntegerField(default=0)),
+                ("last_seen_block", models.PositiveIntegerField()),
+            ],
+            options={
+                "verbose_name": "Safe Token Ledger",
+                "verbose_name_plural": "Safe Token Ledger",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("safe", "token_address"),
+                        name="unique_safe_token_ledger",
+                    )
+                ],
+            },
+        ),
+    ]
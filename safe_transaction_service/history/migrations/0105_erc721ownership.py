@@ -0,0 +1,52 @@
+# Generated by Django 5.2.15 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+import safe_eth.eth.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0104_safetokenledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ERC721Ownership",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("owner", safe_eth.eth.django.models.EthereumAddressBinaryField()),
+                (
+                    "token_address",
+                    safe_eth.eth.django.models.EthereumAddressBinaryField(),
+                ),
+                ("token_id", safe_eth.eth.django.models.Uint256Field()),
+                ("block_number", models.PositiveIntegerField(db_index=True)),
+                ("log_index", models.PositiveIntegerField()),
+            ],
+            options={
+                "verbose_name": "ERC721 Ownership",
+                "verbose_name_plural": "ERC721 Ownership",
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "token_address", "token_id"],
+                        name="history_erc721_owner_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("token_address", "token_id"),
+                        name="unique_erc721_ownership",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -2,7 +2,7 @@
 import datetime
 import json
 import operator
-from collections.abc import Iterator, Sequence
+from collections.abc import Collection, Iterable, Iterator, Sequence
 from decimal import Decimal
 from enum import Enum
 from functools import cache, lru_cache
@@ -75,6 +75,7 @@ from safe_transaction_service.contracts.models import Contract
 from safe_transaction_service.utils.constants import (
     SIGNATURE_LENGTH as MAX_SIGNATURE_LENGTH,
 )
+from safe_transaction_service.utils.utils import chunks
 
 from .constants import SAFE_PROXY_FACTORY_CREATION_EVENT_TOPIC
 from .utils import clean_receipt_log
@@ -210,6 +211,157 @@ class BulkCreateSignalMixin:
             else:
                 return total
 
+    def _get_unique_fields(self) -> list[models.Field]:
+        """
+        :return: Fields of the first unique constraint of the model, used to detect conflicts
+        """
+        opts = self.model._meta
+        field_names = next(iter(opts.unique_together), None) or next(
+            (constraint.fields for constraint in opts.total_unique_constraints), None
+        )
+        if not field_names:
+            raise ValueError(f"{self.model.__name__} has no unique constraints")
+        return [opts.get_field(field_name) for field_name in field_names]
+
+    def _get_insert_fields(self) -> list[models.Field]:
+        """
+        :return: Fields to insert. Auto primary keys are generated by the database
+        """
+        return [
+            field
+            for field in self.model._meta.concrete_fields
+            if not isinstance(field, models.AutoField)
+        ]
+
+    @staticmethod
+    def _get_db_values(obj: Any, fields: Sequence[models.Field]) -> list[Any]:
+        return [
+            field.get_db_prep_save(field.pre_save(obj, True), connection)
+            for field in fields
+        ]
+
+    def _get_inserted_objs(
+        self,
+        objs: Sequence[Any],
+        unique_fields: Sequence[models.Field],
+        rows: Sequence[tuple[Any, ...]],
+    ) -> list[Any]:
+        """
+        Set the primary key of the inserted objects and send `post_bulk_create` for them
+
+        :param objs: Objects to insert
+        :param unique_fields:
+        :param rows: Rows returned by the insert with the primary key and the `unique_fields`
+        :return: Inserted objects
+        """
+        objs_by_key: dict[tuple[Any, ...], Any] = {}
+        for obj in objs:
+            key = tuple(
+                field.get_prep_value(getattr(obj, field.attname))
+                for field in unique_fields
+            )
+            # If there are duplicated objects, the first one is inserted
+            objs_by_key.setdefault(key, obj)
+        inserted_objs = []
+        for pk, *key in rows:
+            obj = objs_by_key[tuple(key)]
+            obj.pk = pk
+            obj._state.adding = False
+            inserted_objs.append(obj)
+        for obj in inserted_objs:
+            post_bulk_create.send(obj.__class__, instance=obj, created=True)
+        return inserted_objs
+
+    def bulk_insert_ignore_conflicts(self, objs: Iterable[Any]) -> list[Any]:
+        """
+        Insert `objs` using `INSERT ... ON CONFLICT DO NOTHING RETURNING`. Unlike
+        `bulk_create(ignore_conflicts=True)`, the primary key is set for the inserted objects
+        and `post_bulk_create` is only sent for them
+
+        :param objs: Objects to insert. Objects conflicting with the existing ones are ignored
+        :return: Inserted objects, with the primary key set
+        """
+        objs = list(objs)
+        if not objs:
+            return []
+
+        opts = self.model._meta
+        fields = self._get_insert_fields()
+        unique_fields = self._get_unique_fields()
+        quote_name = connection.ops.quote_name
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        returning = ", ".join(
+            quote_name(field.column) for field in [opts.pk, *unique_fields]
+        )
+        placeholders = ", ".join([f"({', '.join(['%s'] * len(fields))})"] * len(objs))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote_name(opts.db_table)} ({columns}) VALUES {placeholders} "
+                f"ON CONFLICT DO NOTHING RETURNING {returning}",
+                [value for obj in objs for value in self._get_db_values(obj, fields)],
+            )
+            rows = cursor.fetchall()
+        return self._get_inserted_objs(objs, unique_fields, rows)
+
+    def bulk_copy(self, objs: Iterable[Any]) -> list[Any]:
+        """
+        Insert `objs` using `COPY` into a temporary staging table (not written to the WAL) and then
+        `INSERT ... SELECT ... ON CONFLICT DO NOTHING`. A lot faster than `bulk_create` for big batches.
+        Unlike `bulk_create(ignore_conflicts=True)`, `post_bulk_create` is only sent for the objects
+        really inserted
+
+        :param objs: Objects to insert. Objects conflicting with the existing ones are ignored
+        :return: Inserted objects, with the primary key set
+        """
+        objs = list(objs)
+        if not objs:
+            return []
+
+        opts = self.model._meta
+        # Auto primary keys are generated on the insert, not on the staging table
+        fields = self._get_insert_fields()
+        unique_fields = self._get_unique_fields()
+        quote_name = connection.ops.quote_name
+        table = quote_name(opts.db_table)
+        staging_table = quote_name(f"{opts.db_table}_staging")
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        returning = ", ".join(
+            quote_name(field.column) for field in [opts.pk, *unique_fields]
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging_table} ON COMMIT DROP "
+                f"AS SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            with cursor.copy(f"COPY {staging_table} ({columns}) FROM STDIN") as copy:
+                for obj in objs:
+                    copy.write_row(self._get_db_values(obj, fields))
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging_table} "
+                f"ON CONFLICT DO NOTHING RETURNING {returning}"
+            )
+            rows = cursor.fetchall()
+            # Table would not be dropped until the outer transaction commits
+            cursor.execute(f"DROP TABLE {staging_table}")
+
+        return self._get_inserted_objs(objs, unique_fields, rows)
+
+    def bulk_copy_from_generator(
+        self, objs: Iterator[Any], batch_size: int = 25_000
+    ) -> int:
+        """
+        Same as `bulk_create_from_generator` but using `bulk_copy`
+
+        :return: Count of inserted elements, ignoring the conflicting ones
+        """
+        assert batch_size is not None and batch_size > 0
+        iterator = iter(objs)
+        total = 0
+        while batch := list(islice(iterator, batch_size)):
+            total += len(self.bulk_copy(batch))
+        return total
+
 
 class IndexingStatusManager(models.Manager):
     def get_erc20_721_indexing_status(self) -> "IndexingStatus":
@@ -246,6 +398,101 @@ class IndexingStatus(models.Model):
         return f"{indexing_status_type} - {self.block_number}"
 
 
+class IndexingShardManager(models.Manager):
+    def create_shards(
+        self, from_block_number: int, to_block_number: int, shard_size: int
+    ) -> list["IndexingShard"]:
+        """
+        Split `[from_block_number, to_block_number]` in disjoint block ranges
+
+        :param from_block_number:
+        :param to_block_number:
+        :param shard_size: Number of blocks for every shard
+        :return: Created shards, sorted by block number
+        """
+        assert shard_size > 0
+        return self.bulk_create(
+            [
+                IndexingShard(
+                    from_block_number=shard_from_block_number,
+                    to_block_number=min(
+                        shard_from_block_number + shard_size - 1, to_block_number
+                    ),
+                    block_number=shard_from_block_number,
+                )
+                for shard_from_block_number in range(
+                    from_block_number, to_block_number + 1, shard_size
+                )
+            ]
+        )
+
+    def set_block_number(self, shard_id: int, block_number: int) -> bool:
+        """
+        :param shard_id:
+        :param block_number: Next block to process for the shard
+        :return: `True` if shard progress was updated, `False` otherwise (e.g. shard was removed)
+        """
+        return bool(
+            self.filter(pk=shard_id, block_number__lt=block_number).update(
+                block_number=block_number, modified=timezone.now()
+            )
+        )
+
+    def get_merge_boundary(self) -> int | None:
+        """
+        :return: First block not processed for the shards, as every block below it
+            was processed by some shard. `None` if there are no shards
+        """
+        if first_not_finished := (
+            self.not_finished().order_by("from_block_number").first()
+        ):
+            return first_not_finished.block_number
+        last_block_number = self.aggregate(last_block_number=Max("to_block_number"))[
+            "last_block_number"
+        ]
+        return None if last_block_number is None else last_block_number + 1
+
+    def not_finished(self) -> QuerySet["IndexingShard"]:
+        return self.filter(block_number__lte=F("to_block_number"))
+
+    def stale(self, minutes: int) -> QuerySet["IndexingShard"]:
+        """
+        :param minutes:
+        :return: Not finished shards without progress for the last `minutes`
+        """
+        return self.not_finished().filter(
+            modified__lt=timezone.now() - datetime.timedelta(minutes=minutes)
+        )
+
+
+class IndexingShard(models.Model):
+    """
+    Block range processed by a worker during a sharded backfill of the Safe events indexer.
+    `block_number` stores the next block to process for the shard, and `modified` when
+    progress was stored for the last time
+    """
+
+    objects = IndexingShardManager()
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+    from_block_number = models.PositiveIntegerField(unique=True)
+    to_block_number = models.PositiveIntegerField()
+    block_number = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["from_block_number"]
+
+    def __str__(self):
+        return (
+            f"Shard from-block-number={self.from_block_number} "
+            f"to-block-number={self.to_block_number} - {self.block_number}"
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.block_number > self.to_block_number
+
+
 class Chain(models.Model):
     """
     This model keeps track of the chainId used to configure the service, to prevent issues if a wrong ethereum
@@ -751,6 +998,125 @@ class ERC20Transfer(TokenTransfer):
         )
 
 
+# `(safe, token_address) -> (transfer_count, last_seen_block)`
+SafeTokenLedgerEntries = dict[tuple[ChecksumAddress, ChecksumAddress], tuple[int, int]]
+
+
+class SafeTokenLedgerManager(models.Manager):
+    def add_transfers(
+        self, entries: SafeTokenLedgerEntries, batch_size: int = 1_000
+    ) -> int:
+        """
+        Increment `transfer_count` and update `last_seen_block` for every `(safe, token_address)`,
+        creating the rows if they don't exist
+
+        :param entries:
+        :param batch_size:
+        :return: Number of rows inserted or updated
+        """
+        table_name = self.model._meta.db_table
+        # Sorted to always lock the rows in the same order and prevent deadlocks between indexers
+        rows = [
+            (HexBytes(safe), HexBytes(token_address), transfer_count, last_seen_block)
+            for (safe, token_address), (transfer_count, last_seen_block) in sorted(
+                entries.items()
+            )
+        ]
+        with connection.cursor() as cursor:
+            for batch in chunks(rows, batch_size):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table_name} (safe, token_address, transfer_count, last_seen_block)
+                    VALUES {", ".join(["(%s, %s, %s, %s)"] * len(batch))}
+                    ON CONFLICT (safe, token_address) DO UPDATE SET
+                        transfer_count = {table_name}.transfer_count + EXCLUDED.transfer_count,
+                        last_seen_block = GREATEST({table_name}.last_seen_block, EXCLUDED.last_seen_block)
+                    """,
+                    [value for row in batch for value in row],
+                )
+        return len(rows)
+
+    def rebuild(self, safe_addresses: Sequence[ChecksumAddress] | None = None) -> int:
+        """
+        Build the ledger from the stored `ERC20Transfer`, for Safes indexed before the ledger existed
+
+        :param safe_addresses: If not provided, ledger is built for every Safe
+        :return: Number of rows stored
+        """
+        table_name = self.model._meta.db_table
+        safe_filter = ""
+        params = []
+        if safe_addresses is not None:
+            safe_filter = "WHERE safe_contract.address = ANY(%s)"
+            params = [[HexBytes(safe_address) for safe_address in safe_addresses]] * 2
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table_name} (safe, token_address, transfer_count, last_seen_block)
+                SELECT safe, address, COUNT(*), MAX(block_number) FROM (
+                    SELECT erc20.to AS safe, erc20.address, erc20.block_number
+                    FROM history_erc20transfer erc20
+                    JOIN history_safecontract safe_contract ON safe_contract.address = erc20.to
+                    {safe_filter}
+                    UNION ALL
+                    SELECT erc20._from AS safe, erc20.address, erc20.block_number
+                    FROM history_erc20transfer erc20
+                    JOIN history_safecontract safe_contract ON safe_contract.address = erc20._from
+                    {safe_filter}
+                ) safe_transfers
+                GROUP BY safe, address
+                ON CONFLICT (safe, token_address) DO UPDATE SET
+                    transfer_count = EXCLUDED.transfer_count,
+                    last_seen_block = EXCLUDED.last_seen_block
+                """,
+                params,
+            )
+            return cursor.rowcount
+
+    def get_for_safe(
+        self, safe_address: ChecksumAddress
+    ) -> list[tuple[ChecksumAddress, int, int]]:
+        """
+        :param safe_address:
+        :return: `(token_address, transfer_count, last_seen_block)` for every ERC20 token
+            sent or received by the Safe
+        """
+        return list(
+            self.filter(safe=safe_address).values_list(
+                "token_address", "transfer_count", "last_seen_block"
+            )
+        )
+
+
+class SafeTokenLedger(models.Model):
+    """
+    ERC20 tokens sent or received by every Safe. Maintained by the ERC20 indexer when transfers are stored,
+    so tokens for a Safe can be retrieved without querying all the transfers.
+
+    `transfer_count` is only used to detect new transfers, it can be bigger than the real number of
+    transfers if events are reprocessed
+    """
+
+    objects = SafeTokenLedgerManager()
+    safe = EthereumAddressBinaryField()
+    token_address = EthereumAddressBinaryField()
+    transfer_count = models.PositiveBigIntegerField(default=0)
+    last_seen_block = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["safe", "token_address"], name="unique_safe_token_ledger"
+            )
+        ]
+        verbose_name = "Safe Token Ledger"
+        verbose_name_plural = "Safe Token Ledger"
+
+    def __str__(self):
+        return f"[{self.safe}] {self.token_address} - {self.transfer_count} transfers"
+
+
 class ERC721TransferManager(TokenTransferManager):
     def erc721_owned_by(
         self,
@@ -878,6 +1244,193 @@ class ERC721Transfer(TokenTransfer):
         )
 
 
+# `(token_address, token_id) -> (owner, block_number, log_index)`
+ERC721OwnershipEntries = dict[
+    tuple[ChecksumAddress, int], tuple[ChecksumAddress, int, int]
+]
+
+
+class ERC721OwnershipManager(models.Manager):
+    def _get_latest_transfers_query(self, where: str = "") -> str:
+        """
+        :param where: Optional filter for `history_erc721transfer`
+        :return: Query to insert the latest stored `ERC721Transfer` for every token, updating rows
+            for tokens already stored
+        """
+        table_name = self.model._meta.db_table
+        return f"""
+        INSERT INTO {table_name} (owner, token_address, token_id, block_number, log_index)
+        SELECT DISTINCT ON (address, token_id) "to", address, token_id, block_number, log_index
+        FROM history_erc721transfer
+        {where}
+        ORDER BY address, token_id, block_number DESC, log_index DESC
+        ON CONFLICT (token_address, token_id) DO UPDATE SET
+            owner = EXCLUDED.owner,
+            block_number = EXCLUDED.block_number,
+            log_index = EXCLUDED.log_index
+        """
+
+    def add_transfers(
+        self, entries: ERC721OwnershipEntries, batch_size: int = 1_000
+    ) -> int:
+        """
+        Set the owner of every `(token_address, token_id)`. Rows are only updated if the transfer
+        is newer than the stored one, so events can be processed more than once and in any order
+
+        :param entries:
+        :param batch_size:
+        :return: Number of rows processed
+        """
+        table_name = self.model._meta.db_table
+        # Sorted to always lock the rows in the same order and prevent deadlocks between indexers
+        rows = [
+            (
+                HexBytes(owner),
+                HexBytes(token_address),
+                token_id,
+                block_number,
+                log_index,
+            )
+            for (token_address, token_id), (owner, block_number, log_index) in sorted(
+                entries.items()
+            )
+        ]
+        with connection.cursor() as cursor:
+            for batch in chunks(rows, batch_size):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table_name} (owner, token_address, token_id, block_number, log_index)
+                    VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(batch))}
+                    ON CONFLICT (token_address, token_id) DO UPDATE SET
+                        owner = EXCLUDED.owner,
+                        block_number = EXCLUDED.block_number,
+                        log_index = EXCLUDED.log_index
+                    WHERE ({table_name}.block_number, {table_name}.log_index)
+                        < (EXCLUDED.block_number, EXCLUDED.log_index)
+                    """,
+                    [value for row in batch for value in row],
+                )
+        return len(rows)
+
+    def rewind(self, block_number: int) -> int:
+        """
+        Revert ownership changed on blocks greater or equal than `block_number`, using the latest
+        `ERC721Transfer` still stored for every affected token. Transfers for those blocks must be
+        already removed (e.g. on a reorg)
+
+        :param block_number:
+        :return: Number of tokens rewound
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {self.model._meta.db_table} WHERE block_number >= %s "
+                    "RETURNING token_address, token_id",
+                    [block_number],
+                )
+                rewound = cursor.fetchall()
+                if rewound:
+                    token_addresses, token_ids = zip(*rewound, strict=True)
+                    cursor.execute(
+                        self._get_latest_transfers_query(
+                            "WHERE (address, token_id) IN "
+                            "(SELECT * FROM UNNEST(%s::bytea[], %s::numeric[]))"
+                        ),
+                        [list(token_addresses), list(token_ids)],
+                    )
+        return len(rewound)
+
+    def rebuild(self) -> int:
+        """
+        Build the ownership from the stored `ERC721Transfer`, for transfers indexed before the table existed
+
+        :return: Number of rows stored
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(self._get_latest_transfers_query())
+            return cursor.rowcount
+
+    def owned_by(
+        self,
+        owner: ChecksumAddress,
+        only_trusted: bool | None = None,
+        exclude_spam: bool | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[tuple[ChecksumAddress, int]], int]:
+        """
+        Same as `ERC721TransferManager.erc721_owned_by`, but paginated on the database using
+        the `(owner, token_address, token_id)` index
+
+        :param owner:
+        :param only_trusted: If True, return only trusted tokens
+        :param exclude_spam: If True, exclude spam tokens
+        :param limit: page size
+        :param offset: page position
+        :return: Tuple with a list of tuples(token_address: str, token_id: int) for the page
+            and the total number of tokens owned
+        """
+        queryset = self.filter(owner=owner)
+        if only_trusted:
+            queryset = queryset.filter(
+                token_address__in=RawSQL(
+                    "SELECT address FROM tokens_token WHERE trusted = TRUE", ()
+                )
+            )
+        elif exclude_spam:
+            queryset = queryset.exclude(
+                token_address__in=RawSQL(
+                    "SELECT address FROM tokens_token WHERE spam = TRUE", ()
+                )
+            )
+
+        count = queryset.count()
+        # Sort by token `address`, then by `token_id` to be stable
+        owned = queryset.order_by("token_address", "token_id").values_list(
+            "token_address", "token_id"
+        )
+        if limit is not None:
+            owned = owned[offset : offset + limit]
+        elif offset:
+            owned = owned[offset:]
+        return [
+            (token_address, int(token_id)) for token_address, token_id in owned
+        ], count
+
+
+class ERC721Ownership(models.Model):
+    """
+    Current owner of every ERC721 token, using the latest `ERC721Transfer` stored. Maintained by the ERC20/721
+    indexer when transfers are stored and rewound on reorgs, so collectibles for a Safe can be retrieved
+    without aggregating all the transfers
+    """
+
+    objects = ERC721OwnershipManager()
+    owner = EthereumAddressBinaryField()
+    token_address = EthereumAddressBinaryField()
+    token_id = Uint256Field()
+    block_number = models.PositiveIntegerField(db_index=True)
+    log_index = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=["owner", "token_address", "token_id"],
+                name="history_erc721_owner_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["token_address", "token_id"], name="unique_erc721_ownership"
+            )
+        ]
+        verbose_name = "ERC721 Ownership"
+        verbose_name_plural = "ERC721 Ownership"
+
+    def __str__(self):
+        return f"{self.owner} owns {self.token_address} token_id={self.token_id}"
+
+
 class InternalTxManager(BulkCreateSignalMixin, models.Manager):
     def _trace_address_to_str(self, trace_address: Sequence[int]) -> str:
         return ",".join([str(address) for address in trace_address])
@@ -950,9 +1503,8 @@ class InternalTxManager(BulkCreateSignalMixin, models.Manager):
         internal_txs_decoded: list["InternalTxDecoded"],
     ) -> list["InternalTx"]:
         """
-        Store internal txs and internal txs decoded in the most optimal way.
-
-        If possible, use batch inserting. If there's a conflict, fallback to insert one by one.
+        Store internal txs and internal txs decoded in the most optimal way, using batch inserting.
+        Internal txs already stored (e.g. when reindexing) and their internal txs decoded are ignored.
 
         :param internal_txs:
         :param internal_txs_decoded:
@@ -969,81 +1521,21 @@ class InternalTxManager(BulkCreateSignalMixin, models.Manager):
             len(internal_txs_decoded),
         )
 
-        # When reindexing, most of the InternalTxs will be already stored. Filter them out
-        # beforehand so `bulk_create` doesn't raise `IntegrityError`, which is slower to handle
-        # and reported as an error by monitoring tools
-        already_stored = set(
-            self.filter(
-                ethereum_tx_id__in={
-                    internal_tx.ethereum_tx_id for internal_tx in internal_txs
-                }
-            ).values_list("ethereum_tx_id", "trace_address")
-        )
-        if already_stored:
-
-            def is_already_stored(internal_tx: "InternalTx") -> bool:
-                return (
-                    to_0x_hex_str(HexBytes(internal_tx.ethereum_tx_id)),
-                    internal_tx.trace_address,
-                ) in already_stored
-
-            internal_txs = [
-                internal_tx
-                for internal_tx in internal_txs
-                if not is_already_stored(internal_tx)
-            ]
-            internal_txs_decoded = [
-                internal_tx_decoded
-                for internal_tx_decoded in internal_txs_decoded
-                if not is_already_stored(internal_tx_decoded.internal_tx)
-            ]
-            if not internal_txs:
-                return []
-
-        # Try to store in a batch in the most optimal way
-        # bulk_create with `ignore_conflicts` cannot be used as it doesn't populate autogenerated `id` on `InternalTx`
-        stored_internal_txs: list[InternalTx] = []
+        # When reindexing, most of the InternalTxs will be already stored. Conflicts are ignored by the
+        # database and only the ids of the inserted InternalTxs are returned, so their InternalTxDecoded
+        # can be inserted in a second statement
         with transaction.atomic():
-            try:
-                self.bulk_create(internal_txs)
-                InternalTxDecoded.objects.bulk_create(internal_txs_decoded)
-                stored_internal_txs = internal_txs
-            except IntegrityError:
-                logger.info(
-                    "Cannot bulk create the provided InternalTxs, trying one by one"
-                )
-
-        if not stored_internal_txs:
-            # Fallback handler in case of integrity error due to data being already inserted (e.g. a reindex)
-            for internal_decoded_tx in internal_txs_decoded:
-                internal_tx = internal_decoded_tx.internal_tx
-                try:
-                    with transaction.atomic():
-                        # Insert first the internal_tx with internalDecodedTx relation
-                        internal_tx.save(force_insert=True)
-                        internal_decoded_tx.save()
-                        # Remove inserted internal transactions from the list
-                        internal_txs.remove(internal_tx)
-                        stored_internal_txs.append(internal_tx)
-                except IntegrityError:
-                    logger.info(
-                        "Ignoring already processed InternalTx with tx-hash=%s and trace-address=%s",
-                        to_0x_hex_str(internal_tx.ethereum_tx_id),
-                        internal_tx.trace_address,
-                    )
-
-            # Insert the remaining InternalTxs (with no InternalTxDecoded associated)
-            for internal_tx in internal_txs:
-                try:
-                    with transaction.atomic():
-                        internal_tx.save(force_insert=True)
-                        stored_internal_txs.append(internal_tx)
-                except IntegrityError:
-                    logger.info(
-                        "Ignoring already processed InternalTx with tx-hash=%s and trace-address=%s",
-                        to_0x_hex_str(internal_tx.ethereum_tx_id),
-                        internal_tx.trace_address,
-                    )
+            stored_internal_txs = self.bulk_insert_ignore_conflicts(internal_txs)
+            stored_internal_txs_ids = {
+                id(internal_tx) for internal_tx in stored_internal_txs
+            }
+            InternalTxDecoded.objects.bulk_create(
+                [
+                    internal_tx_decoded
+                    for internal_tx_decoded in internal_txs_decoded
+                    if id(internal_tx_decoded.internal_tx) in stored_internal_txs_ids
+                ]
+            )
 
         logger.debug(
             "Inserted %d InternalTx and InternalTxDecoded", len(stored_internal_txs)
@@ -1327,21 +1819,49 @@ class InternalTxDecodedManager(BulkCreateSignalMixin, models.Manager):
         :return: `True` if there are internal txs out of order (processed newer
             than no processed, e.g. due to a reindex), `False` otherwise
         """
-        return (
-            self.for_safe(safe_address)
-            .not_processed()
-            .filter(
-                internal_tx__timestamp__lt=InternalTx.objects.for_safe(safe_address)
-                .filter(decoded_tx__processed=True)
-                .annotate(dummy_group_by=Value(1))
-                .values("dummy_group_by")
-                .annotate(max_timestamp=Max("timestamp"))
-                .values("max_timestamp")
+        return safe_address in self.out_of_order_for_safes([safe_address])
+
+    def out_of_order_for_safes(
+        self, safe_addresses: Iterable[ChecksumAddress]
+    ) -> set[ChecksumAddress]:
+        """
+        Check every Safe using only one query, grouping the decoded txs by Safe
+
+        :param safe_addresses:
+        :return: Safes with internal txs out of order (processed newer than
+            no processed, e.g. due to a reindex)
+        """
+        return set(
+            self.filter(safe_address__in=safe_addresses)
+            .order_by()
+            .values("safe_address")
+            .annotate(
+                min_not_processed_timestamp=Min(
+                    "internal_tx__timestamp", filter=Q(processed=False)
+                ),
+                max_processed_timestamp=Max(
+                    "internal_tx__timestamp", filter=Q(processed=True)
+                ),
             )
-            .exists()
+            .filter(min_not_processed_timestamp__lt=F("max_processed_timestamp"))
+            .values_list("safe_address", flat=True)
         )
 
 
+# Safes are split in a fixed number of partitions, grouped in shards to be processed in parallel
+SAFE_PARTITIONS = 256
+
+
+def get_shard_partitions(shard: int, shards: int) -> list[int]:
+    """
+    :param shard: From `0` to `shards - 1`
+    :param shards: Number of shards
+    :return: Safe partitions processed by `shard`
+    """
+    assert 0 <= shard < shards
+    return list(range(shard, SAFE_PARTITIONS, shards))
+
+
 class InternalTxDecodedQuerySet(models.QuerySet):
     def for_safe(self, safe_address: ChecksumAddress):
         """
@@ -1357,6 +1877,47 @@ class InternalTxDecodedQuerySet(models.QuerySet):
     def not_processed(self):
         return self.filter(processed=False)
 
+    def for_partitions(self, partitions: Collection[int]):
+        """
+        Partition `InternalTxDecoded` by Safe, so every Safe is always on the same partition
+        and its transactions can be processed in order. Partitions don't depend on the number of shards
+
+        :param partitions: From `0` to `SAFE_PARTITIONS - 1`
+        :return: Queryset of InternalTxDecoded for Safes on the `partitions`
+        """
+        # Last byte of the address, uniformly distributed as addresses are derived from hashes
+        partition_key = Func(
+            "safe_address",
+            Value(19),
+            function="get_byte",
+            output_field=models.IntegerField(),
+        )
+        return self.alias(safe_partition=partition_key).filter(
+            safe_partition__in=partitions
+        )
+
+    def for_shard(self, shard: int, shards: int):
+        """
+        :param shard: From `0` to `shards - 1`
+        :param shards: Number of shards
+        :return: Queryset of InternalTxDecoded for Safes on the `shard`
+        """
+        return self.for_partitions(get_shard_partitions(shard, shards))
+
+    def below_backfill_merge_boundary(self):
+        """
+        While a Safe events backfill is running, older transactions for a Safe can still be
+        indexed by a not finished shard, so transactions from the merge boundary cannot be processed yet
+
+        :return: Queryset of InternalTxDecoded below the merge boundary if a backfill is running,
+            not filtered otherwise
+        """
+        if IndexingShard.objects.not_finished().exists():
+            return self.filter(
+                internal_tx__block_number__lt=IndexingShard.objects.get_merge_boundary()
+            )
+        return self
+
     def order_by_processing_queue(self):
         """
         :return: Transactions ordered to be processed. First `setup` and then older transactions
@@ -2348,23 +2909,46 @@ class SafeStatusBase(models.Model):
         cls, safe_status_base: "SafeStatusBase"
     ) -> Union["SafeStatus", "SafeLastStatus"]:
         """
-        Converts from SafeStatus to SafeLastStatus and vice versa
+        Converts from SafeStatus to SafeLastStatus and vice versa. `owners` and `enabled_modules`
+        are copied, so the new instance is not modified when the original one is
         """
         return cls(
             internal_tx=safe_status_base.internal_tx,
             address=safe_status_base.address,
-            owners=safe_status_base.owners,
+            owners=list(safe_status_base.owners),
             threshold=safe_status_base.threshold,
             nonce=safe_status_base.nonce,
             master_copy=safe_status_base.master_copy,
             fallback_handler=safe_status_base.fallback_handler,
             guard=safe_status_base.guard,
             module_guard=safe_status_base.module_guard,
-            enabled_modules=safe_status_base.enabled_modules,
+            enabled_modules=list(safe_status_base.enabled_modules),
+        )
+
+
+class SafeStatusBaseManagerMixin:
+    def bulk_upsert(self, objs: Sequence[SafeStatusBase]) -> list[SafeStatusBase]:
+        """
+        Insert `objs` in one query, updating every field of the ones already stored.
+        `post_save` signals are not sent
+
+        :param objs: Must not contain the same primary key twice
+        :return: Stored objects
+        """
+        pk_name = self.model._meta.pk.name
+        return self.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=[pk_name],
+            update_fields=[
+                field.name
+                for field in self.model._meta.concrete_fields
+                if field.name != pk_name
+            ],
         )
 
 
-class SafeLastStatusManager(models.Manager):
+class SafeLastStatusManager(SafeStatusBaseManagerMixin, models.Manager):
     def get_or_generate(self, address: ChecksumAddress) -> "SafeLastStatus":
         """
         :param address:
@@ -2475,7 +3059,7 @@ class SafeLastStatus(SafeStatusBase):
         )
 
 
-class SafeStatusManager(models.Manager):
+class SafeStatusManager(SafeStatusBaseManagerMixin, models.Manager):
     pass
 
 
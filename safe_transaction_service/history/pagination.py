@@ -1,7 +1,36 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import json
+
+from django.db.models import QuerySet
 from django.http import HttpRequest
 
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+from safe_transaction_service.utils.utils import parse_boolean_query_param
+
+
+def get_approximate_count(queryset: QuerySet) -> int:
+    """
+    :param queryset:
+    :return: Number of rows estimated by the database planner, without running the query
+    """
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination using the ordering of the view (``OrderingFilter``). Rows are filtered
+    by the value of the first ordering field of the last row returned, so no `OFFSET` scans are required
+    """
+
+    page_size_query_param = "limit"
+
+    def __init__(self, page_size: int, max_page_size: int):
+        super().__init__()
+        self.page_size = page_size
+        self.max_page_size = max_page_size
 
 
 class DefaultPagination(LimitOffsetPagination):
@@ -14,6 +43,74 @@ class SmallPagination(LimitOffsetPagination):
     default_limit = 20
 
 
+class OptionalCursorPaginationMixin:
+    """
+    Keep `LimitOffsetPagination` behaviour, but use `KeysetPagination` if the `cursor` query parameter is
+    provided (empty for the first page). Then `count` is not calculated and it's returned as ``None``,
+    unless `approximate_count=true` is provided, then an estimation is returned.
+
+    View must use ``OrderingFilter`` and define a default `ordering`
+    """
+
+    cursor_query_param = "cursor"
+    approximate_count_query_param = "approximate_count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_pagination: KeysetPagination | None = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.keyset_pagination = KeysetPagination(self.default_limit, self.max_limit)
+        self.request = request
+        self.count = (
+            get_approximate_count(queryset)
+            if parse_boolean_query_param(
+                request.query_params.get(self.approximate_count_query_param, False)
+            )
+            else None
+        )
+        return self.keyset_pagination.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "keyset_pagination", None):
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "count": self.count,
+                "next": self.keyset_pagination.get_next_link(),
+                "previous": self.keyset_pagination.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Use cursor pagination instead of `offset`. Empty for the first page, "
+                "then use `next` and `previous` links",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.approximate_count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Return an estimated `count` when using cursor pagination",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+
+class DefaultCursorPagination(OptionalCursorPaginationMixin, DefaultPagination):
+    pass
+
+
+class SmallCursorPagination(OptionalCursorPaginationMixin, SmallPagination):
+    pass
+
+
 class ListPagination(LimitOffsetPagination):
     def __init__(
         self,
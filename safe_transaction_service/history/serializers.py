@@ -61,6 +61,7 @@ from .models import (
     TransferDict,
 )
 from .services.safe_service import SafeCreationInfo
+from .services.signature_service import SignatureServiceProvider
 
 logger = logging.getLogger(__name__)
 
@@ -128,10 +129,11 @@ class SafeMultisigConfirmationSerializer(serializers.Serializer):
         parsed_signatures = SafeSignature.parse_signature(
             signature, safe_tx_hash, safe_hash_preimage=safe_tx.safe_tx_hash_preimage
         )
-        signature_owners = []
-        ethereum_client = get_auto_ethereum_client()
-        for safe_signature in parsed_signatures:
-            owner = safe_signature.owner
+        signature_service = SignatureServiceProvider()
+        # Recovering owners doesn't require calls to the node, so check them before
+        # verifying signatures (EIP-1271 signatures are verified on the node)
+        owners = signature_service.recover_owners(parsed_signatures)
+        for owner in owners:
             if owner in settings.BANNED_EOAS:
                 raise ValidationError(
                     f"Signer={owner} is not authorized to interact with the service"
@@ -140,9 +142,15 @@ class SafeMultisigConfirmationSerializer(serializers.Serializer):
                 raise ValidationError(
                     f"Signer={owner} is not an owner. Current owners={safe_owners}"
                 )
-            if not safe_signature.is_valid(ethereum_client, safe_address):
+
+        signature_owners = []
+        for verification in signature_service.verify_safe_signatures(
+            parsed_signatures, safe_address, owners=owners
+        ):
+            owner = verification.owner
+            if not verification.is_valid:
                 raise ValidationError(
-                    f"Signature={to_0x_hex_str(safe_signature.signature)} for owner={owner} is not valid"
+                    f"Signature={to_0x_hex_str(verification.safe_signature.signature)} for owner={owner} is not valid"
                 )
             if owner in signature_owners:
                 raise ValidationError(f"Signature for owner={owner} is duplicated")
@@ -284,11 +292,13 @@ class SafeMultisigTransactionSerializer(SafeMultisigTxSerializer):
         attrs["parsed_signatures"] = parsed_signatures
         # If there's at least one signature, transaction is trusted (until signatures are mandatory)
         attrs["trusted"] = bool(parsed_signatures)
-        for safe_signature in parsed_signatures:
-            owner = safe_signature.owner
-            if not safe_signature.is_valid(ethereum_client, safe_address):
+        for verification in SignatureServiceProvider().verify_safe_signatures(
+            parsed_signatures, safe_address
+        ):
+            owner = verification.owner
+            if not verification.is_valid:
                 raise ValidationError(
-                    f"Signature={to_0x_hex_str(safe_signature.signature)} for owner={owner} is not valid"
+                    f"Signature={to_0x_hex_str(verification.safe_signature.signature)} for owner={owner} is not valid"
                 )
 
             if owner in settings.BANNED_EOAS:
@@ -1415,6 +1425,14 @@ class SafeExportTransactionRequestParams(serializers.Serializer):
     execution_date__lte = serializers.DateTimeField(required=False, allow_null=True)
 
 
+class SafeExportFileRequestParams(SafeExportTransactionRequestParams):
+    file_format = serializers.ChoiceField(choices=["csv", "ndjson"], default="csv")
+
+
+class SafeExportFileResponseSerializer(serializers.Serializer):
+    url = serializers.CharField()
+
+
 class SafeExportTransactionSerializer(serializers.Serializer):
     """
     Serializer for the export endpoint that returns transaction data optimized for CSV export
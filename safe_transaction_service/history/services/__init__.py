@@ -5,4 +5,9 @@ from .collectibles_service import CollectiblesService, CollectiblesServiceProvid
 from .index_service import IndexingException, IndexService, IndexServiceProvider
 from .reorg_service import ReorgService, ReorgServiceProvider
 from .safe_service import SafeService, SafeServiceProvider
+from .signature_service import (
+    SignatureService,
+    SignatureServiceProvider,
+    SignatureVerification,
+)
 from .transaction_service import TransactionService, TransactionServiceProvider
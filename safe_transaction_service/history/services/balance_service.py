@@ -10,6 +10,7 @@ from django.db.models import Q
 
 from cache_memoize import cache_memoize
 from cachetools import TTLCache, cachedmethod
+from cachetools.keys import hashkey
 from eth_typing import ChecksumAddress
 from redis import Redis
 from safe_eth.eth import EthereumClient, get_auto_ethereum_client
@@ -20,7 +21,7 @@ from safe_transaction_service.utils.redis import get_redis
 from safe_transaction_service.utils.utils import chunks
 
 from ..exceptions import NodeConnectionException
-from ..models import ERC20Transfer, InternalTx, MultisigTransaction
+from ..models import ERC20Transfer, InternalTx, MultisigTransaction, SafeTokenLedger
 
 logger = logging.getLogger(__name__)
 
@@ -160,7 +161,18 @@ class BalanceService:
             .filter(safe=safe_address)
             .count()
         )
-        number_erc20_events = ERC20Transfer.objects.fast_count(safe_address)
+        erc20_addresses: list[ChecksumAddress] | None = None
+        if settings.TOKENS_BALANCES_USE_LEDGER:
+            # Tokens and cache key are retrieved using the same query
+            safe_token_ledger = SafeTokenLedger.objects.get_for_safe(safe_address)
+            erc20_addresses = [
+                token_address for token_address, _, _ in safe_token_ledger
+            ]
+            number_erc20_events = sum(
+                transfer_count for _, transfer_count, _ in safe_token_ledger
+            )
+        else:
+            number_erc20_events = ERC20Transfer.objects.fast_count(safe_address)
         number_eth_events = InternalTx.objects.ether_txs_for_address(
             safe_address
         ).count()
@@ -174,7 +186,12 @@ class BalanceService:
             return balances, count
         else:
             balances, count = self._get_balances(
-                safe_address, only_trusted, exclude_spam, limit, offset
+                safe_address,
+                only_trusted,
+                exclude_spam,
+                limit,
+                offset,
+                erc20_addresses=erc20_addresses,
             )
             django_cache.set(cache_key, balances, 60 * 10)  # 10 minutes cache
             django_cache.set(cache_key_count, count, 60 * 10)  # 10 minutes cache
@@ -187,6 +204,7 @@ class BalanceService:
         exclude_spam: bool = False,
         limit: int | None = None,
         offset: int = 0,
+        erc20_addresses: Sequence[ChecksumAddress] | None = None,
     ) -> tuple[list[ChecksumAddress], int]:
         """
         :param safe_address:
@@ -194,12 +212,25 @@ class BalanceService:
         :param exclude_spam:
         :param limit:
         :param offset:
+        :param erc20_addresses: Tokens used by the Safe. If not provided, they will be retrieved from the transfers
         :return: List of ERC20 token addresses (paginated if `limit` is provided)
             and count of all ERC20 addresses for a given Safe
         """
-        all_erc20_addresses = ERC20Transfer.objects.tokens_used_by_address(safe_address)
+        all_erc20_addresses = (
+            ERC20Transfer.objects.tokens_used_by_address(safe_address)
+            if erc20_addresses is None
+            else erc20_addresses
+        )
+        # Store tokens in database if not present, requesting all of them at once to the node.
+        # Tokens already cached were stored, so they don't need to be checked again
+        Token.objects.create_from_blockchain_in_batch(
+            [
+                address
+                for address in all_erc20_addresses
+                if hashkey(address) not in self.cache_token_info
+            ]
+        )
         for address in all_erc20_addresses:
-            # Store tokens in database if not present
             self.get_token_info(address)  # This is cached
         erc20_addresses = self._filter_tokens(
             all_erc20_addresses, only_trusted, exclude_spam
@@ -229,6 +260,7 @@ class BalanceService:
         exclude_spam: bool = False,
         limit: int | None = None,
         offset: int = 0,
+        erc20_addresses: Sequence[ChecksumAddress] | None = None,
     ) -> tuple[list[Balance], int]:
         """
         Get a list of balances including native token balance.
@@ -240,6 +272,7 @@ class BalanceService:
         :param exclude_spam: If True, exclude spam tokens
         :param limit:
         :param offset:
+        :param erc20_addresses: Tokens used by the Safe. If not provided, they will be retrieved from the transfers
         :return: a list of `{'token_address': str, 'balance': int}` and the number of different tokens for the providen Safe.
         """
         assert fast_is_checksum_address(safe_address), (
@@ -247,7 +280,12 @@ class BalanceService:
         )
 
         erc20_addresses_page, erc20_count = self._get_page_erc20_balances(
-            safe_address, only_trusted, exclude_spam, limit, offset
+            safe_address,
+            only_trusted,
+            exclude_spam,
+            limit,
+            offset,
+            erc20_addresses=erc20_addresses,
         )
 
         try:
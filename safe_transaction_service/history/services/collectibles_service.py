@@ -13,9 +13,9 @@ from django.conf import settings
 from django.core.cache import cache as django_cache
 
 import gevent
-import requests
 from cache_memoize import cache_memoize
 from cachetools import TTLCache, cachedmethod
+from cachetools.keys import hashkey
 from eth_typing import ChecksumAddress
 from redis import Redis
 from safe_eth.eth import EthereumClient, EthereumNetwork, get_auto_ethereum_client
@@ -30,23 +30,17 @@ from safe_transaction_service.utils.redis import get_redis
 from safe_transaction_service.utils.utils import chunks
 
 from ..exceptions import NodeConnectionException
-from ..models import ERC721Transfer
+from ..models import ERC721Ownership, ERC721Transfer
+from .metadata_fetcher import (
+    CollectiblesServiceException,  # noqa F401
+    MetadataFetcher,
+    MetadataRetrievalException,
+    MetadataRetrievalExceptionTimeout,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class CollectiblesServiceException(Exception):
-    pass
-
-
-class MetadataRetrievalException(CollectiblesServiceException):
-    pass
-
-
-class MetadataRetrievalExceptionTimeout(CollectiblesServiceException):
-    pass
-
-
 def ipfs_to_http(uri: str | None) -> str | None:
     if uri and uri.startswith("ipfs://"):
         uri = uri.replace("ipfs://ipfs/", "ipfs://")
@@ -189,6 +183,17 @@ class CollectiblesService:
             maxsize=4096, ttl=self.TOKEN_EXPIRATION
         )
         self.ens_image_url = settings.TOKENS_ENS_IMAGE_URL
+        self.metadata_fetcher = MetadataFetcher(
+            redis,
+            settings.COLLECTIBLES_METADATA_MAX_CONCURRENCY,
+            settings.COLLECTIBLES_METADATA_MAX_CONCURRENCY_PER_HOST,
+            settings.COLLECTIBLES_METADATA_REQUEST_TIMEOUT,
+            self.METADATA_MAX_CONTENT_LENGTH,
+            settings.COLLECTIBLES_METADATA_CIRCUIT_BREAKER_FAILURES,
+            settings.COLLECTIBLES_METADATA_CIRCUIT_BREAKER_SECONDS,
+            settings.COLLECTIBLES_METADATA_NEGATIVE_CACHE_SECONDS,
+            settings.COLLECTIBLES_METADATA_NEGATIVE_CACHE_MAX_SECONDS,
+        )
 
     def fallback_ens_client(self) -> EnsClient.Config:
         if self.ethereum_network == EthereumNetwork.SEPOLIA:
@@ -245,37 +250,7 @@ class CollectiblesService:
         if not uri.startswith("http"):
             raise MetadataRetrievalException(uri)
 
-        try:
-            logger.debug("Getting metadata for uri=%s", uri)
-            with requests.get(uri, timeout=10, stream=True) as response:
-                if not response.ok:
-                    logger.debug("Cannot get metadata for uri=%s", uri)
-                    raise MetadataRetrievalException(uri)
-
-                content_length = response.headers.get("content-length", 0)
-                content_type = response.headers.get("content-type", "")
-                if int(content_length) > self.METADATA_MAX_CONTENT_LENGTH:
-                    raise MetadataRetrievalException(
-                        f"Content-length={content_length} for uri={uri} is too big"
-                    )
-
-                if "application/json" not in content_type:
-                    raise MetadataRetrievalException(
-                        f"Content-type={content_type} for uri={uri} is not valid, "
-                        f'expected "application/json"'
-                    )
-
-                logger.debug("Got metadata for uri=%s", uri)
-
-                # Some requests don't provide `Content-Length` on the headers
-                if len(response.content) > self.METADATA_MAX_CONTENT_LENGTH:
-                    raise MetadataRetrievalException(
-                        f"Retrieved content for uri={uri} is too big"
-                    )
-
-                return response.json()
-        except (OSError, ValueError) as e:
-            raise MetadataRetrievalExceptionTimeout(uri) from e
+        return self.metadata_fetcher.retrieve(uri)
 
     def build_collectible(
         self,
@@ -390,19 +365,37 @@ class CollectiblesService:
         :param offset: page position
         :return: Collectibles (using the owner, addresses and the token_ids) and count (total of collectibles)
         """
-        addresses_with_token_ids = ERC721Transfer.objects.erc721_owned_by(
-            safe_address, only_trusted=only_trusted, exclude_spam=exclude_spam
-        )
-        if not addresses_with_token_ids:
-            return [], 0
-
-        count = len(addresses_with_token_ids)
-        # TODO Paginate on DB
-        if limit is not None:
-            addresses_with_token_ids = addresses_with_token_ids[offset : offset + limit]
+        if settings.COLLECTIBLES_USE_OWNERSHIP_TABLE:
+            addresses_with_token_ids, count = ERC721Ownership.objects.owned_by(
+                safe_address,
+                only_trusted=only_trusted,
+                exclude_spam=exclude_spam,
+                limit=limit,
+                offset=offset,
+            )
+        else:
+            addresses_with_token_ids = ERC721Transfer.objects.erc721_owned_by(
+                safe_address, only_trusted=only_trusted, exclude_spam=exclude_spam
+            )
+            count = len(addresses_with_token_ids)
+            if limit is not None:
+                addresses_with_token_ids = addresses_with_token_ids[
+                    offset : offset + limit
+                ]
 
+        if not addresses_with_token_ids:
+            return [], count
+
+        # Store tokens in database if not present, requesting all of them at once to the node.
+        # Tokens already cached were stored, so they don't need to be checked again
+        Token.objects.create_from_blockchain_in_batch(
+            [
+                address
+                for address, _ in addresses_with_token_ids
+                if hashkey(address) not in self.cache_token_info
+            ]
+        )
         for address, _ in addresses_with_token_ids:
-            # Store tokens in database if not present
             self.get_token_info(address)  # This is cached
 
         logger.debug("Getting token_uris for %s", addresses_with_token_ids)
@@ -443,9 +436,6 @@ class CollectiblesService:
         :return: collectibles and count
         """
 
-        # Async retry for getting metadata if fetching fails
-        from ..tasks import retry_get_metadata_task
-
         collectibles_with_metadata: list[CollectibleWithMetadata] = []
         collectibles, count = self.get_collectibles(
             safe_address,
@@ -461,7 +451,6 @@ class CollectiblesService:
         cached_results = self.redis.mget(metadata_cache_keys)
 
         collectibles_not_cached = []
-        jobs = []
         for cached, collectible in zip(cached_results, collectibles, strict=False):
             if cached:
                 collectible_cache = json.loads(cached)
@@ -478,15 +467,59 @@ class CollectiblesService:
                 )
             else:
                 collectibles_not_cached.append(collectible)
-                jobs.append(gevent.spawn(self.get_metadata, collectible))
                 collectibles_with_metadata.append(None)  # Keeps the order
 
-        _ = gevent.joinall(jobs)
-        collectibles_with_metadata_not_cached = []
+        collectibles_with_metadata_not_cached = self._fetch_collectibles_metadata(
+            collectibles_not_cached
+        )
+
+        # Creates a collectibles metadata keeping the initial order
+        for collectible_metadata_cached_index in range(len(collectibles_with_metadata)):
+            if collectibles_with_metadata[collectible_metadata_cached_index] is None:
+                collectibles_with_metadata[collectible_metadata_cached_index] = (
+                    collectibles_with_metadata_not_cached.pop(0)
+                )
+
+        return collectibles_with_metadata, count
+
+    def _fetch_collectibles_metadata(
+        self, collectibles: Sequence[Collectible]
+    ) -> list[CollectibleWithMetadata]:
+        """
+        Download metadata for `collectibles` using the metadata fetcher pool and store them on the cache.
+        Metadata not retrieved after `COLLECTIBLES_METADATA_MAX_WAIT_SECONDS` is retried asynchronously
+
+        :param collectibles:
+        :return: Collectibles with metadata in the same order that `collectibles` were provided
+        """
+
+        # Async retry for getting metadata if fetching fails
+        from ..tasks import retry_get_metadata_task
+
+        if not collectibles:
+            return []
+
+        jobs = [
+            self.metadata_fetcher.spawn(self.get_metadata, collectible)
+            for collectible in collectibles
+        ]
+        _ = gevent.joinall(
+            jobs, timeout=settings.COLLECTIBLES_METADATA_MAX_WAIT_SECONDS
+        )
+        # Don't keep slow downloads using the pool, they will be retried. Killed jobs can
+        # finish later as `successful` with a `GreenletExit` value, so they are stored before
+        timed_out_jobs = {job for job in jobs if not job.ready()}
+        gevent.killall(list(timed_out_jobs), block=False)
+
+        collectibles_with_metadata = []
         redis_pipe = self.redis.pipeline()
-        for collectible, job in zip(collectibles_not_cached, jobs, strict=False):
+        for collectible, job in zip(collectibles, jobs, strict=True):
             try:
-                metadata = job.get()
+                if job in timed_out_jobs:
+                    raise MetadataRetrievalExceptionTimeout(collectible.uri)
+                if not job.successful():
+                    raise job.exception
+                metadata = job.value
                 if not isinstance(metadata, dict):
                     metadata = {}
                     logger.warning(
@@ -522,22 +555,51 @@ class CollectiblesService:
                 collectible.uri,
                 metadata,
             )
-            collectibles_with_metadata_not_cached.append(collectible_with_metadata)
+            collectibles_with_metadata.append(collectible_with_metadata)
             redis_pipe.set(
                 self.get_metadata_cache_key(collectible.address, collectible.id),
                 json.dumps(dataclasses.asdict(collectible_with_metadata)),
                 self.COLLECTIBLE_EXPIRATION,
             )
         redis_pipe.execute()
+        return collectibles_with_metadata
 
-        # Creates a collectibles metadata keeping the initial order
-        for collectible_metadata_cached_index in range(len(collectibles_with_metadata)):
-            if collectibles_with_metadata[collectible_metadata_cached_index] is None:
-                collectibles_with_metadata[collectible_metadata_cached_index] = (
-                    collectibles_with_metadata_not_cached.pop(0)
-                )
+    def prefetch_metadata(
+        self, addresses_with_token_ids: Sequence[tuple[ChecksumAddress, int]]
+    ) -> int:
+        """
+        Warm the metadata cache for collectibles, so they are not downloaded when requested by the users
 
-        return collectibles_with_metadata, count
+        :param addresses_with_token_ids:
+        :return: Number of collectibles not cached whose metadata was downloaded
+        """
+        cached_results = self.redis.mget(
+            [
+                self.get_metadata_cache_key(address, token_id)
+                for address, token_id in addresses_with_token_ids
+            ]
+        )
+        addresses_with_token_ids_not_cached = [
+            (address, token_id)
+            for (address, token_id), cached in zip(
+                addresses_with_token_ids, cached_results, strict=True
+            )
+            if not cached
+        ]
+        token_uris = []
+        for addresses_with_token_ids_chunk in chunks(
+            addresses_with_token_ids_not_cached, 25
+        ):
+            token_uris.extend(self.get_token_uris(addresses_with_token_ids_chunk))
+        collectibles = [
+            self.build_collectible(
+                self.get_token_info(token_address), token_address, token_id, token_uri
+            )
+            for (token_address, token_id), token_uri in zip(
+                addresses_with_token_ids_not_cached, token_uris, strict=True
+            )
+        ]
+        return len(self._fetch_collectibles_metadata(collectibles))
 
     def get_collectibles_with_metadata_paginated(
         self,
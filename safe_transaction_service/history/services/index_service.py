@@ -1,11 +1,11 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import logging
 from collections import OrderedDict
-from collections.abc import Collection
+from collections.abc import Callable, Collection
 from dataclasses import dataclass
 
 from django.db import transaction
-from django.db.models import Min, Q
+from django.db.models import Min, Q, QuerySet
 
 import gevent
 from eth_typing import ChecksumAddress, Hash32
@@ -13,10 +13,13 @@ from hexbytes import HexBytes
 from safe_eth.eth import EthereumClient, get_auto_ethereum_client
 from safe_eth.eth.utils import fast_to_checksum_address
 from safe_eth.util.util import to_0x_hex_str
+from web3.types import BlockData, TxData, TxReceipt
 
+from ...utils.rpc_cache import RpcCache, get_rpc_cache
 from ..models import (
     EthereumBlock,
     EthereumTx,
+    IndexingShard,
     InternalTx,
     InternalTxDecoded,
     ModuleTransaction,
@@ -106,6 +109,7 @@ class IndexService:
         )
         self.processing_enable_out_of_order_check = processing_enable_out_of_order_check
         self.eth_reindex_max_retries = eth_reindex_max_retries
+        self.rpc_cache: RpcCache | None = get_rpc_cache()
 
         # Prevent circular import
         from ..indexers.tx_processor import SafeTxProcessor, SafeTxProcessorProvider
@@ -220,11 +224,55 @@ class IndexService:
 
         return synced
 
+    def _get_blocks(self, block_hashes: list[Hash32]) -> list[BlockData | None]:
+        """
+        :param block_hashes:
+        :return: Blocks from the RPC cache if configured, from the node otherwise
+        """
+        if not self.rpc_cache:
+            return self.ethereum_client.get_blocks(block_hashes)
+        return self.rpc_cache.get_or_fetch_many(
+            "eth_getBlockByHash",
+            block_hashes,
+            self.ethereum_client.get_blocks,
+            lambda _, block: block["number"],
+        )
+
+    def _get_transaction_receipts(
+        self, tx_hashes: list[bytes]
+    ) -> list[TxReceipt | None]:
+        """
+        :param tx_hashes:
+        :return: Receipts from the RPC cache if configured, from the node otherwise
+        """
+        if not self.rpc_cache:
+            return self.ethereum_client.get_transaction_receipts(tx_hashes)
+        return self.rpc_cache.get_or_fetch_many(
+            "eth_getTransactionReceipt",
+            tx_hashes,
+            self.ethereum_client.get_transaction_receipts,
+            lambda _, tx_receipt: tx_receipt.get("blockNumber"),
+        )
+
+    def _get_transactions(self, tx_hashes: list[bytes]) -> list[TxData | None]:
+        """
+        :param tx_hashes:
+        :return: Transactions from the RPC cache if configured, from the node otherwise
+        """
+        if not self.rpc_cache:
+            return self.ethereum_client.get_transactions(tx_hashes)
+        return self.rpc_cache.get_or_fetch_many(
+            "eth_getTransactionByHash",
+            tx_hashes,
+            self.ethereum_client.get_transactions,
+            lambda _, tx: tx.get("blockNumber"),
+        )
+
     def txs_create_or_update_from_block_hashes(
         self, block_hashes: set[Hash32]
     ) -> tuple[int, dict[Hash32, EthereumBlock]]:
         block_hashes = list(block_hashes)  # Iterate in a defined order
-        blocks = self.ethereum_client.get_blocks(block_hashes)
+        blocks = self._get_blocks(block_hashes)
 
         # Validate blocks from RPC
         for block_hash, block in zip(block_hashes, blocks, strict=False):
@@ -285,11 +333,9 @@ class IndexService:
         # Fetch receipts and transactions concurrently - both are independent RPC batch calls
         logger.debug("Get tx receipts and transactions for hashes not on db")
         receipts_greenlet = gevent.spawn(
-            self.ethereum_client.get_transaction_receipts, tx_hashes_not_in_db
-        )
-        txs_greenlet = gevent.spawn(
-            self.ethereum_client.get_transactions, tx_hashes_not_in_db
+            self._get_transaction_receipts, tx_hashes_not_in_db
         )
+        txs_greenlet = gevent.spawn(self._get_transactions, tx_hashes_not_in_db)
         gevent.joinall([receipts_greenlet, txs_greenlet], raise_error=True)
 
         logger.debug("Got tx receipts and transactions from RPC")
@@ -450,6 +496,29 @@ class IndexService:
         """
         Process all the pending `InternalTxDecoded` for every Safe
 
+        :return: Number of `InternalTxDecoded` processed
+        """
+        return self._process_pending_decoded_txs(
+            InternalTxDecoded.objects.pending_for_safes().below_backfill_merge_boundary()
+        )
+
+    def process_decoded_txs_for_partitions(self, partitions: Collection[int]) -> int:
+        """
+        Process all the pending `InternalTxDecoded` for the Safes on some partitions. Every Safe is always on
+        the same partition, so partitions can be processed in parallel keeping the order for every Safe
+
+        :param partitions: From `0` to `SAFE_PARTITIONS - 1`
+        :return: Number of `InternalTxDecoded` processed
+        """
+        return self._process_pending_decoded_txs(
+            InternalTxDecoded.objects.pending_for_safes()
+            .for_partitions(partitions)
+            .below_backfill_merge_boundary()
+        )
+
+    def _process_pending_decoded_txs(self, pending_queryset: QuerySet) -> int:
+        """
+        :param pending_queryset: Pending `InternalTxDecoded` sorted to be processed
         :return: Number of `InternalTxDecoded` processed
         """
         # Use chunks for memory issues
@@ -461,9 +530,7 @@ class IndexService:
         while True:
             logger.debug("Getting pending transactions to process for all Safes")
             internal_txs_decoded = list(
-                InternalTxDecoded.objects.pending_for_safes()[
-                    : self.eth_internal_tx_decoded_process_batch
-                ]
+                pending_queryset[: self.eth_internal_tx_decoded_process_batch]
             )
             logger.debug(
                 "Got %d pending transactions to process for all Safes",
@@ -483,18 +550,17 @@ class IndexService:
                     "Checking out of order transactions for %d Safes",
                     len(safe_addresses_to_check),
                 )
-                for safe_address in safe_addresses_to_check:
-                    if InternalTxDecoded.objects.out_of_order_for_safe(safe_address):
-                        logger.error(
-                            "[%s] Found out of order transactions", safe_address
-                        )
-                        self.fix_out_of_order(
-                            safe_address,
-                            InternalTxDecoded.objects.pending_for_safe(safe_address)[
-                                0
-                            ].internal_tx,
-                        )
-                    checked_out_of_order.add(safe_address)
+                for safe_address in InternalTxDecoded.objects.out_of_order_for_safes(
+                    safe_addresses_to_check
+                ):
+                    logger.error("[%s] Found out of order transactions", safe_address)
+                    self.fix_out_of_order(
+                        safe_address,
+                        InternalTxDecoded.objects.pending_for_safe(safe_address)[
+                            0
+                        ].internal_tx,
+                    )
+                checked_out_of_order.update(safe_addresses_to_check)
                 logger.info(
                     "Checked out of order transactions for %d Safes",
                     len(safe_addresses_to_check),
@@ -532,14 +598,16 @@ class IndexService:
                 "[%s] End checking for out of order transactions", safe_address
             )
 
+        pending_queryset = InternalTxDecoded.objects.pending_for_safe(
+            safe_address
+        ).below_backfill_merge_boundary()
+
         # Use chunks for memory issues
         total_processed_txs = 0
         while True:
             logger.debug("[%s] Fetching batch of transactions to process", safe_address)
             internal_txs_decoded = list(
-                InternalTxDecoded.objects.pending_for_safe(safe_address)[
-                    : self.eth_internal_tx_decoded_process_batch
-                ]
+                pending_queryset[: self.eth_internal_tx_decoded_process_batch]
             )
             logger.debug(
                 "[%s] Fetched %d of transactions to process",
@@ -584,6 +652,7 @@ class IndexService:
         to_block_number: int | None = None,
         block_process_limit: int | None = None,
         addresses: Collection[ChecksumAddress] | None = None,
+        on_block_range_processed: Callable[[int, int], None] | None = None,
     ) -> int:
         """
         :param indexer: A new instance must be provider, providing the singleton one can break indexing
@@ -593,11 +662,13 @@ class IndexService:
             configured ``block_process_limit`` is used. The indexer's auto-adjust
             mechanism may grow or shrink the limit during the run.
         :param addresses:
+        :param on_block_range_processed: Called with `from_block_number` and `to_block_number`
+            after every block range is processed, so progress can be stored
         :return: Number of reindexed elements
         """
         from ..indexers import FindRelevantElementsException
 
-        assert (not to_block_number) or to_block_number > from_block_number
+        assert (not to_block_number) or to_block_number >= from_block_number
 
         if addresses:
             # Just process addresses provided
@@ -682,6 +753,8 @@ class IndexService:
                 len(elements),
             )
             element_number += len(elements)
+            if on_block_range_processed:
+                on_block_range_processed(block_number, chunk_to)
             block_number = chunk_to + 1
 
         logger.info("End reindexing addresses %s", addresses_str)
@@ -752,3 +825,106 @@ class IndexService:
             block_process_limit=block_process_limit,
             addresses=addresses,
         )
+
+    def create_safe_events_backfill_shards(
+        self,
+        from_block_number: int,
+        to_block_number: int,
+        shard_size: int,
+    ) -> list[IndexingShard]:
+        """
+        Split the Safe events backfill in disjoint block ranges, so they can be processed
+        by multiple workers at the same time. Shards will not be created if a backfill is already running
+
+        :param from_block_number: Block number to start indexing from
+        :param to_block_number: Block number to stop indexing on
+        :param shard_size: Number of blocks for every shard
+        :return: Created shards
+        """
+        if IndexingShard.objects.exists():
+            logger.warning("Safe events backfill is already running")
+            return []
+
+        if to_block_number < from_block_number:
+            logger.warning(
+                "Nothing to backfill from-block-number=%d to-block-number=%d",
+                from_block_number,
+                to_block_number,
+            )
+            return []
+
+        shards = IndexingShard.objects.create_shards(
+            from_block_number, to_block_number, shard_size
+        )
+        logger.info(
+            "Created %d shards for Safe events backfill from-block-number=%d to-block-number=%d",
+            len(shards),
+            from_block_number,
+            to_block_number,
+        )
+        return shards
+
+    def process_safe_events_backfill_shard(self, shard_id: int) -> int:
+        """
+        Index Safe events for the block range of a shard, storing progress after every range
+        so shard can be resumed if worker is stopped
+
+        :param shard_id:
+        :return: Number of indexed events
+        """
+        from ..indexers import SafeEventsIndexerProvider
+
+        try:
+            shard = IndexingShard.objects.get(pk=shard_id)
+        except IndexingShard.DoesNotExist:
+            logger.warning("Shard with id=%d does not exist", shard_id)
+            return 0
+
+        if shard.finished:
+            return 0
+
+        def store_progress(_: int, to_block_number: int) -> None:
+            IndexingShard.objects.set_block_number(shard_id, to_block_number + 1)
+
+        return self._reindex(
+            SafeEventsIndexerProvider.get_new_instance(),
+            shard.block_number,
+            to_block_number=shard.to_block_number,
+            on_block_range_processed=store_progress,
+        )
+
+    @transaction.atomic
+    def merge_safe_events_backfill_shards(self) -> int | None:
+        """
+        Advance `tx_block_number` for the L2 master copies up to the first block not processed by the shards,
+        so regular indexing will continue from there. When every shard is finished, shards are removed
+
+        :return: Block number the master copies were advanced to, `None` if there are no shards
+            or master copies were not advanced
+        """
+        if (merge_boundary := IndexingShard.objects.get_merge_boundary()) is None:
+            return None
+
+        from_block_number = (
+            IndexingShard.objects.order_by("from_block_number")
+            .values_list("from_block_number", flat=True)
+            .first()
+        )
+        updated = (
+            SafeMasterCopy.objects.l2()
+            .filter(
+                tx_block_number__gte=from_block_number,
+                tx_block_number__lt=merge_boundary,
+            )
+            .update(tx_block_number=merge_boundary)
+        )
+        logger.info(
+            "Advanced %d master copies to block-number=%d after Safe events backfill",
+            updated,
+            merge_boundary,
+        )
+
+        if not IndexingShard.objects.not_finished().exists():
+            logger.info("Safe events backfill finished, removing shards")
+            IndexingShard.objects.all().delete()
+        return merge_boundary if updated else None
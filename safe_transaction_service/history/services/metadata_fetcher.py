@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import json
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from gevent import Greenlet
+from gevent.lock import BoundedSemaphore
+from gevent.pool import Pool
+from redis import Redis
+from safe_eth.eth.utils import fast_keccak_text
+
+logger = logging.getLogger(__name__)
+
+
+class CollectiblesServiceException(Exception):
+    pass
+
+
+class MetadataRetrievalException(CollectiblesServiceException):
+    pass
+
+
+class MetadataRetrievalExceptionTimeout(CollectiblesServiceException):
+    pass
+
+
+class MetadataFetcher:
+    """
+    Download collectibles metadata using a global pool of greenlets, limiting the number of concurrent
+    requests for every host and reusing connections (keep-alive).
+
+    - Hosts failing repeatedly (timeouts, connection errors or server errors, e.g. a slow IPFS gateway)
+      are not requested until `circuit_breaker_seconds` pass (circuit breaker).
+    - URIs that cannot be retrieved (e.g. `404`, not valid json) are not requested again until a backoff,
+      doubled on every failure, expires (negative cache shared using Redis).
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_concurrency: int,
+        max_concurrency_per_host: int,
+        request_timeout: int,
+        max_content_length: int,
+        circuit_breaker_failures: int,
+        circuit_breaker_seconds: int,
+        negative_cache_seconds: int,
+        negative_cache_max_seconds: int,
+    ):
+        """
+        :param redis:
+        :param max_concurrency: Maximum number of metadata downloads running at the same time
+        :param max_concurrency_per_host: Maximum number of requests to the same host running at the same time
+        :param request_timeout: Seconds to wait for every request
+        :param max_content_length: Maximum size of the metadata in bytes
+        :param circuit_breaker_failures: Consecutive failures for a host to stop requesting it
+        :param circuit_breaker_seconds: Seconds a host is not requested after failing
+        :param negative_cache_seconds: Seconds a URI is not requested after failing the first time
+        :param negative_cache_max_seconds: Maximum seconds a URI is not requested after failing
+        """
+        self.redis = redis
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.request_timeout = request_timeout
+        self.max_content_length = max_content_length
+        self.circuit_breaker_failures = circuit_breaker_failures
+        self.circuit_breaker_seconds = circuit_breaker_seconds
+        self.negative_cache_seconds = negative_cache_seconds
+        self.negative_cache_max_seconds = negative_cache_max_seconds
+
+        self.pool = Pool(max_concurrency)
+        self.http_session = self._prepare_http_session()
+        self.host_semaphores: dict[str, BoundedSemaphore] = {}
+        self.host_failures: dict[str, int] = {}
+        self.host_open_until: dict[str, float] = {}
+
+    def _prepare_http_session(self) -> requests.Session:
+        """
+        Prepare http session with a pool of connections for every host
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=100,  # Number of hosts to keep connections for
+            pool_maxsize=self.max_concurrency_per_host,
+            pool_block=False,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def spawn(self, function: Callable[..., Any], *args) -> Greenlet:
+        """
+        :param function:
+        :param args:
+        :return: Greenlet running `function` on the global pool. Blocks if the pool is full
+        """
+        return self.pool.spawn(function, *args)
+
+    def get_negative_cache_key(self, uri: str) -> str:
+        return f"metadata-failed:{fast_keccak_text(uri).hex()}"
+
+    def _get_host_semaphore(self, host: str) -> BoundedSemaphore:
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = BoundedSemaphore(self.max_concurrency_per_host)
+        return self.host_semaphores[host]
+
+    def is_circuit_open(self, host: str) -> bool:
+        """
+        :param host:
+        :return: ``True`` if `host` must not be requested as it failed recently, ``False`` otherwise
+        """
+        return self.host_open_until.get(host, 0) > time.monotonic()
+
+    def _store_host_result(self, host: str, success: bool) -> None:
+        if success:
+            self.host_failures.pop(host, None)
+            return
+
+        failures = self.host_failures.get(host, 0) + 1
+        self.host_failures[host] = failures
+        if failures >= self.circuit_breaker_failures:
+            logger.warning(
+                "Host=%s failed %d times, not requesting metadata from it for %d seconds",
+                host,
+                failures,
+                self.circuit_breaker_seconds,
+            )
+            self.host_open_until[host] = time.monotonic() + self.circuit_breaker_seconds
+            self.host_failures.pop(host)
+
+    def _get_uri_failures(self, uri: str) -> tuple[int, float]:
+        """
+        :param uri:
+        :return: Number of failures for `uri` and timestamp when it can be requested again
+        """
+        if cached := self.redis.get(self.get_negative_cache_key(uri)):
+            failures, retry_at = json.loads(cached)
+            return failures, retry_at
+        return 0, 0.0
+
+    def _store_uri_failure(self, uri: str, failures: int) -> None:
+        """
+        Store `uri` on the negative cache, doubling the time it won't be requested on every failure
+
+        :param uri:
+        :param failures: Previous failures for `uri`
+        """
+        backoff = min(
+            self.negative_cache_seconds * 2**failures, self.negative_cache_max_seconds
+        )
+        self.redis.set(
+            self.get_negative_cache_key(uri),
+            json.dumps([failures + 1, time.time() + backoff]),
+            # Keep the number of failures after the backoff expires, so next backoff is longer
+            self.negative_cache_max_seconds * 2,
+        )
+
+    def _download(self, uri: str) -> Any:
+        """
+        :param uri: HTTP/S uri
+        :return: Metadata as a decoded json
+        :raises MetadataRetrievalException: If metadata is not valid
+        :raises MetadataRetrievalExceptionTimeout: If host is not available
+        """
+        try:
+            logger.debug("Getting metadata for uri=%s", uri)
+            with self.http_session.get(
+                uri, timeout=self.request_timeout, stream=True
+            ) as response:
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise MetadataRetrievalExceptionTimeout(
+                        f"Status-code={response.status_code} for uri={uri}"
+                    )
+                if not response.ok:
+                    logger.debug("Cannot get metadata for uri=%s", uri)
+                    raise MetadataRetrievalException(uri)
+
+                content_length = response.headers.get("content-length", 0)
+                content_type = response.headers.get("content-type", "")
+                if int(content_length) > self.max_content_length:
+                    raise MetadataRetrievalException(
+                        f"Content-length={content_length} for uri={uri} is too big"
+                    )
+
+                if "application/json" not in content_type:
+                    raise MetadataRetrievalException(
+                        f"Content-type={content_type} for uri={uri} is not valid, "
+                        f'expected "application/json"'
+                    )
+
+                logger.debug("Got metadata for uri=%s", uri)
+
+                # Some requests don't provide `Content-Length` on the headers
+                if len(response.content) > self.max_content_length:
+                    raise MetadataRetrievalException(
+                        f"Retrieved content for uri={uri} is too big"
+                    )
+
+                return response.json()
+        except (OSError, ValueError) as e:
+            raise MetadataRetrievalExceptionTimeout(uri) from e
+
+    def retrieve(self, uri: str) -> Any:
+        """
+        :param uri: HTTP/S uri
+        :return: Metadata as a decoded json
+        :raises MetadataRetrievalException: If metadata is not valid or `uri` failed recently
+        :raises MetadataRetrievalExceptionTimeout: If host is not available or failed recently
+        """
+        failures, retry_at = self._get_uri_failures(uri)
+        if retry_at > time.time():
+            raise MetadataRetrievalException(f"uri={uri} failed recently")
+
+        host = urlparse(uri).netloc
+        with self._get_host_semaphore(host):
+            # Circuit could be opened while waiting for the semaphore
+            if self.is_circuit_open(host):
+                raise MetadataRetrievalExceptionTimeout(
+                    f"Not requesting uri={uri}, host={host} failed recently"
+                )
+            try:
+                metadata = self._download(uri)
+            except MetadataRetrievalExceptionTimeout:
+                self._store_host_result(host, False)
+                raise
+            except MetadataRetrievalException:
+                self._store_host_result(host, True)
+                self._store_uri_failure(uri, failures)
+                raise
+
+        self._store_host_result(host, True)
+        if failures:
+            self.redis.delete(self.get_negative_cache_key(uri))
+        return metadata
@@ -16,6 +16,7 @@ from ..indexers import (
     SafeEventsIndexerProvider,
 )
 from ..models import (
+    ERC721Ownership,
     EthereumBlock,
     IndexingStatus,
     MultisigTransaction,
@@ -179,6 +180,8 @@ class ReorgService:
         number_deleted_blocks, _ = EthereumBlock.objects.filter(
             number__gte=reorg_block_number
         ).delete()
+        # ERC721 transfers were removed with the blocks, ownership must be restored
+        ERC721Ownership.objects.rewind(reorg_block_number)
 
         # Fix multisig transactions that had EthereumBlock removed
         # We will remove signature to don't remove not indexed data as origin.
@@ -3,6 +3,8 @@ import logging
 from dataclasses import dataclass, replace
 from datetime import datetime
 
+from django.conf import settings
+
 from eth_typing import ChecksumAddress
 from eth_utils import event_abi_to_log_topic
 from hexbytes import HexBytes
@@ -18,11 +20,16 @@ from safe_eth.safe.exceptions import CannotRetrieveSafeInfoException
 from safe_eth.safe.multi_send import MultiSend
 from safe_eth.safe.safe import SafeInfo
 from web3 import Web3
-from web3.exceptions import Web3RPCError
+from web3.exceptions import Web3Exception, Web3RPCError
 
 from safe_transaction_service.account_abstraction import models as aa_models
 from safe_transaction_service.utils.abis.gelato import gelato_relay_1_balance_v2_abi
 
+from ..cache import (
+    get_cached_safe_owners,
+    get_safe_owners_generation,
+    set_cached_safe_owners,
+)
 from ..exceptions import (
     CannotGetSafeInfoFromBlockchain,
     CannotGetSafeInfoFromDB,
@@ -235,6 +242,54 @@ class SafeService:
         except SafeLastStatus.DoesNotExist as exc:
             raise CannotGetSafeInfoFromDB(safe_address) from exc
 
+    def get_safe_owners_and_threshold(
+        self, safe_address: ChecksumAddress
+    ) -> tuple[list[ChecksumAddress], int]:
+        """
+        Owners and threshold are cached, so validating signatures for the same Safe doesn't query
+        the node every time. First tries database, if not found or if `nonce=0` it will try blockchain.
+        Cache is removed when the indexer stores a new Safe status, and owners retrieved before
+        that are not cached
+
+        :param safe_address:
+        :return: Current owners and threshold for the Safe
+        :raises: CannotGetSafeInfoFromBlockchain
+        :raises: NodeConnectionException
+        """
+        if cached := get_cached_safe_owners(safe_address):
+            return cached
+
+        # Must be retrieved before owners, so they are not cached if they change meanwhile
+        generation = get_safe_owners_generation(safe_address)
+        safe_last_status = (
+            SafeLastStatus.objects.filter(address=safe_address)
+            .values_list("owners", "threshold", "nonce")
+            .first()
+        )
+        if safe_last_status and safe_last_status[2]:
+            owners, threshold, _ = safe_last_status
+            threshold = int(threshold)
+            timeout = settings.CACHE_SAFE_OWNERS_TIMEOUT
+        else:
+            # This works for:
+            # - Not indexed Safes
+            # - Not L2 Safes on L2 networks
+            safe = Safe(safe_address, self.ethereum_client)
+            try:
+                # Use the same block for owners and threshold
+                block_number = self.ethereum_client.current_block_number
+                owners = safe.retrieve_owners(block_identifier=block_number)
+                threshold = safe.retrieve_threshold(block_identifier=block_number)
+            except Web3Exception as exc:
+                raise CannotGetSafeInfoFromBlockchain(safe_address) from exc
+            except OSError as exc:
+                raise NodeConnectionException from exc
+            timeout = settings.CACHE_SAFE_OWNERS_BLOCKCHAIN_TIMEOUT
+
+        if settings.CACHE_SAFE_OWNERS_TIMEOUT:
+            set_cached_safe_owners(safe_address, owners, threshold, generation, timeout)
+        return owners, threshold
+
     def _process_creation_data(
         self,
         safe_address: ChecksumAddress,
@@ -0,0 +1,289 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from eth_keys.exceptions import BadSignature
+from eth_keys.exceptions import ValidationError as EthKeysValidationError
+from eth_typing import ChecksumAddress
+from redis import Redis
+from safe_eth.eth import EthereumClient, get_auto_ethereum_client
+from safe_eth.eth.contracts import (
+    get_compatibility_fallback_handler_contract,
+    get_compatibility_fallback_handler_V1_4_1_contract,
+)
+from safe_eth.eth.utils import fast_keccak
+from safe_eth.safe.safe_signature import (
+    SafeSignature,
+    SafeSignatureContract,
+    SafeSignatureType,
+)
+from web3.contract.contract import ContractFunction
+from web3.exceptions import Web3Exception
+
+from safe_transaction_service.utils.redis import get_redis
+from safe_transaction_service.utils.utils import chunks
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignatureVerification:
+    safe_signature: SafeSignature
+    owner: ChecksumAddress | None  # `None` if owner cannot be recovered
+    is_valid: bool
+
+
+class SignatureServiceProvider:
+    def __new__(cls):
+        if not hasattr(cls, "instance"):
+            from django.conf import settings
+
+            cls.instance = SignatureService(
+                get_auto_ethereum_client(),
+                get_redis(),
+                settings.SIGNATURE_VERIFICATION_MAX_WORKERS,
+                settings.SIGNATURE_VERIFICATION_EIP1271_BATCH_SIZE,
+                settings.CACHE_EIP1271_SIGNATURES_TIMEOUT,
+            )
+        return cls.instance
+
+    @classmethod
+    def del_singleton(cls):
+        if hasattr(cls, "instance"):
+            del cls.instance
+
+
+class SignatureService:
+    EIP1271_MAGIC_VALUES = (
+        SafeSignatureContract.EIP1271_MAGIC_VALUE,
+        SafeSignatureContract.EIP1271_MAGIC_VALUE_UPDATED,
+    )
+
+    def __init__(
+        self,
+        ethereum_client: EthereumClient,
+        redis: Redis,
+        max_workers: int,
+        eip1271_batch_size: int,
+        eip1271_cache_timeout: int,
+    ):
+        """
+        :param ethereum_client:
+        :param redis:
+        :param max_workers: Threads used to recover ECDSA owners. If `1`, owners are recovered
+            on the calling thread. Under gevent monkey patching (API and Celery workers) threads are
+            greenlets and there's no parallelism, so it should only be increased for real threads
+        :param eip1271_batch_size: Maximum number of EIP-1271 signatures checked on the same `multicall`
+        :param eip1271_cache_timeout: Seconds valid EIP-1271 signatures are cached. `0` disables the cache
+        """
+        self.ethereum_client = ethereum_client
+        self.redis = redis
+        self.executor = (
+            ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="signature-service"
+            )
+            if max_workers > 1
+            else None
+        )
+        self.eip1271_batch_size = eip1271_batch_size
+        self.eip1271_cache_timeout = eip1271_cache_timeout
+
+    def get_eip1271_cache_key(self, safe_signature: SafeSignature) -> str:
+        signature_hash = fast_keccak(
+            bytes(safe_signature.safe_hash)
+            + bytes(safe_signature.signature)
+            + bytes(safe_signature.contract_signature)
+        )
+        return f"eip1271:{safe_signature.owner}:{signature_hash.hex()}"
+
+    def _recover_owner(self, safe_signature: SafeSignature) -> ChecksumAddress | None:
+        """
+        :param safe_signature:
+        :return: Owner of the signature, `None` if it cannot be recovered (malformed ECDSA signature)
+        """
+        try:
+            return safe_signature.owner
+        except (BadSignature, EthKeysValidationError, ValueError):
+            return None
+
+    def recover_owners(
+        self, safe_signatures: Sequence[SafeSignature]
+    ) -> list[ChecksumAddress | None]:
+        """
+        ``ecrecover`` is CPU bound, so it's done on a thread pool when there's more than one
+        signature to recover. No calls to the node are required
+
+        :param safe_signatures:
+        :return: Owners in the same order as ``safe_signatures``
+        """
+        if self.executor and len(safe_signatures) > 1:
+            return list(self.executor.map(self._recover_owner, safe_signatures))
+        return [
+            self._recover_owner(safe_signature) for safe_signature in safe_signatures
+        ]
+
+    def _build_eip1271_functions(
+        self, safe_signature: SafeSignature
+    ) -> list[ContractFunction]:
+        """
+        :param safe_signature:
+        :return: Current `isValidSignature(bytes32,bytes)` and legacy `isValidSignature(bytes,bytes)`
+            calls, same ones ``SafeSignatureContract.is_valid`` tries
+        """
+        contract_signature = bytes(safe_signature.contract_signature)
+        return [
+            get_compatibility_fallback_handler_contract(
+                self.ethereum_client.w3, safe_signature.owner
+            ).get_function_by_signature("isValidSignature(bytes32,bytes)")(
+                bytes(safe_signature.safe_hash), contract_signature
+            ),
+            get_compatibility_fallback_handler_V1_4_1_contract(
+                self.ethereum_client.w3, safe_signature.owner
+            ).get_function_by_signature("isValidSignature(bytes,bytes)")(
+                bytes(safe_signature.safe_hash_preimage), contract_signature
+            ),
+        ]
+
+    def _check_eip1271_signatures(
+        self, safe_signatures: Sequence[SafeSignature]
+    ) -> list[bool]:
+        """
+        Check EIP-1271 signatures using one `multicall` per ``eip1271_batch_size`` signatures.
+        Valid ones are cached
+
+        :param safe_signatures: Contract signatures
+        :return: `True` if signature is valid, `False` otherwise, in the same order as ``safe_signatures``
+        """
+        if not safe_signatures:
+            return []
+
+        results: list[bool] = []
+        for safe_signatures_chunk in chunks(safe_signatures, self.eip1271_batch_size):
+            contract_functions = [
+                contract_function
+                for safe_signature in safe_signatures_chunk
+                for contract_function in self._build_eip1271_functions(safe_signature)
+            ]
+            try:
+                return_values = self.ethereum_client.batch_call(
+                    contract_functions, raise_exception=False
+                )
+            except (Web3Exception, ValueError) as exc:
+                logger.warning(
+                    "Cannot check %d EIP1271 signatures: %s",
+                    len(safe_signatures_chunk),
+                    exc,
+                )
+                return_values = [None] * len(contract_functions)
+
+            # Every signature has 2 calls, it's valid if any of them returns the magic value
+            results.extend(
+                any(
+                    return_value in self.EIP1271_MAGIC_VALUES
+                    for return_value in return_values[i : i + 2]
+                )
+                for i in range(0, len(return_values), 2)
+            )
+
+        if self.eip1271_cache_timeout:
+            # Only valid signatures are cached, as contracts could consider them valid later
+            with self.redis.pipeline() as pipe:
+                for safe_signature, is_valid in zip(
+                    safe_signatures, results, strict=True
+                ):
+                    if is_valid:
+                        pipe.set(
+                            self.get_eip1271_cache_key(safe_signature),
+                            1,
+                            ex=self.eip1271_cache_timeout,
+                        )
+                pipe.execute()
+        return results
+
+    def verify_signatures(
+        self,
+        safe_signatures_with_safes: Sequence[tuple[SafeSignature, ChecksumAddress]],
+        owners: Sequence[ChecksumAddress | None] | None = None,
+    ) -> list[SignatureVerification]:
+        """
+        Validate signatures for any number of hashes and Safes at once:
+
+        - Owners are recovered in parallel, as ECDSA recovery (`EOA` and `ETH_SIGN`) is CPU bound.
+        - EIP-1271 signatures not cached are checked using `multicall`.
+        - Other signature types are validated one by one using ``SafeSignature.is_valid``, that
+          for ECDSA signatures only checks the already recovered owner.
+
+        :param safe_signatures_with_safes: Tuples of parsed signature and Safe address
+        :param owners: Owners already recovered using ``recover_owners``, in the same order as
+            ``safe_signatures_with_safes``. If not provided, they will be recovered
+        :return: Verifications in the same order as ``safe_signatures_with_safes``
+        """
+        safe_signatures = [
+            safe_signature for safe_signature, _ in safe_signatures_with_safes
+        ]
+        if owners is None:
+            owners = self.recover_owners(safe_signatures)
+        verifications = [
+            SignatureVerification(safe_signature, owner, False)
+            for safe_signature, owner in zip(safe_signatures, owners, strict=True)
+        ]
+
+        contract_verifications: list[SignatureVerification] = []
+        for verification, (safe_signature, safe_address) in zip(
+            verifications, safe_signatures_with_safes, strict=True
+        ):
+            if verification.owner is None:
+                continue
+            if safe_signature.signature_type == SafeSignatureType.CONTRACT_SIGNATURE:
+                contract_verifications.append(verification)
+            else:
+                # `True` for ECDSA signatures, as owner was already recovered
+                verification.is_valid = safe_signature.is_valid(
+                    self.ethereum_client, safe_address
+                )
+
+        if contract_verifications and self.eip1271_cache_timeout:
+            cached = self.redis.mget(
+                [
+                    self.get_eip1271_cache_key(verification.safe_signature)
+                    for verification in contract_verifications
+                ]
+            )
+            for verification, is_cached in zip(
+                contract_verifications, cached, strict=True
+            ):
+                verification.is_valid = bool(is_cached)
+            contract_verifications = [
+                verification
+                for verification in contract_verifications
+                if not verification.is_valid
+            ]
+
+        for verification, is_valid in zip(
+            contract_verifications,
+            self._check_eip1271_signatures(
+                [verification.safe_signature for verification in contract_verifications]
+            ),
+            strict=True,
+        ):
+            verification.is_valid = is_valid
+        return verifications
+
+    def verify_safe_signatures(
+        self,
+        safe_signatures: Sequence[SafeSignature],
+        safe_address: ChecksumAddress,
+        owners: Sequence[ChecksumAddress | None] | None = None,
+    ) -> list[SignatureVerification]:
+        """
+        :param safe_signatures: Signatures for the same Safe
+        :param safe_address:
+        :param owners: Owners already recovered using ``recover_owners``. If not provided, they will be recovered
+        :return: Verifications in the same order as ``safe_signatures``
+        """
+        return self.verify_signatures(
+            [(safe_signature, safe_address) for safe_signature in safe_signatures],
+            owners=owners,
+        )
@@ -1,9 +1,9 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import csv
 import logging
-import pickle
 import zlib
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -13,9 +13,12 @@ from django.db.models import F, QuerySet
 from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
+import orjson
+from djangorestframework_camel_case.util import camelize
 from eth_typing import ChecksumAddress, HexStr
 from hexbytes import HexBytes
 from redis import Redis
+from rest_framework.utils.encoders import JSONEncoder
 from safe_eth.eth import EthereumClient, get_auto_ethereum_client
 from safe_eth.eth.utils import fast_to_checksum_address
 
@@ -34,6 +37,7 @@ from ..models import (
 )
 from ..serializers import (
     EthereumTxWithTransfersResponseSerializer,
+    SafeExportTransactionSerializer,
     SafeModuleTransactionWithTransfersResponseSerializer,
     SafeMultisigTransactionWithTransfersResponseSerializer,
     SafeMultisigTransactionWithTransfersResponseSerializerV2,
@@ -44,6 +48,17 @@ logger = logging.getLogger(__name__)
 
 AnySafeTransaction = EthereumTx | MultisigTransaction | ModuleTransaction
 
+EXPORT_FILE_FORMATS = ("csv", "ndjson")
+
+
+class _EchoBuffer:
+    """
+    File-like object returning the value written, so `csv.writer` can be used to build lines one by one
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
 
 class TransactionServiceException(Exception):
     pass
@@ -68,45 +83,66 @@ class TransactionService:
         self.cache_expiration = settings.CACHE_ALL_TXS_VIEW
 
     #  Cache methods ---------------------------------
-    def get_cache_key(self, safe_address: str, tx_id: str):
-        return f"tx-service:{safe_address}:{tx_id}"
+    # Increase it when serializers change, so txs cached with the old representation are not used
+    CACHE_SERIALIZATION_VERSION = 1
 
-    def get_txs_from_cache(
-        self, safe_address: str, ids_to_search: Sequence[str]
-    ) -> list[AnySafeTransaction]:
+    def get_cache_key(self, safe_address: str, tx_id: str, api_version: int) -> str:
+        return f"tx-service:{safe_address}:{tx_id}:v{api_version}:{self.CACHE_SERIALIZATION_VERSION}"
+
+    def get_serialized_txs_from_cache(
+        self, safe_address: str, ids_to_search: Sequence[str], api_version: int
+    ) -> list[list[dict[str, Any]] | None]:
+        """
+        :param safe_address:
+        :param ids_to_search:
+        :param api_version: API version the txs were serialized for
+        :return: Serialized txs for every id in `ids_to_search`, ``None`` if not cached
+        """
+        if not ids_to_search:
+            return []
         keys_to_search = [
-            self.get_cache_key(safe_address, id_to_search)
+            self.get_cache_key(safe_address, id_to_search, api_version)
             for id_to_search in ids_to_search
         ]
         return [
-            pickle.loads(zlib.decompress(data)) if data else None
+            orjson.loads(zlib.decompress(data)) if data else None
             for data in self.redis.mget(keys_to_search)
         ]
 
-    def store_txs_in_cache(
+    def store_serialized_txs_in_cache(
         self,
         safe_address: str,
-        ids_with_txs: tuple[str, list[AnySafeTransaction]],
+        ids_with_txs: Sequence[
+            tuple[str, list[AnySafeTransaction], list[dict[str, Any]]]
+        ],
+        api_version: int,
     ):
         """
-        Store executed transactions older than 10 minutes, using `ethereum_tx_hash` as key (for
-        MultisigTransaction it will be `SafeTxHash`) and expire them in one hour
+        Store serialized executed transactions older than 10 minutes, using `ethereum_tx_hash`
+        as key (for MultisigTransaction it will be `SafeTxHash`) and expire them in one hour
 
         :param safe_address:
-        :param ids_with_txs:
+        :param ids_with_txs: Tuples of tx id, txs and serialized txs
+        :param api_version: API version the txs were serialized for
         """
         # Just store executed transactions older than 10 minutes
-        to_store = {
-            self.get_cache_key(safe_address, tx_hash): zlib.compress(
-                pickle.dumps(txs), level=settings.CACHE_ALL_TXS_COMPRESSION_LEVEL
-            )
-            for tx_hash, txs in ids_with_txs
-            if all(
+        to_store = {}
+        for tx_hash, txs, txs_serialized in ids_with_txs:
+            if not all(
                 tx.execution_date
                 and (tx.execution_date + timedelta(minutes=10)) < timezone.now()
                 for tx in txs
+            ):
+                continue
+            try:
+                data = orjson.dumps(txs_serialized, default=JSONEncoder().default)
+            except orjson.JSONEncodeError:
+                # e.g. integers bigger than 64 bits
+                logger.debug("[%s] Cannot cache tx %s", safe_address, tx_hash)
+                continue
+            to_store[self.get_cache_key(safe_address, tx_hash, api_version)] = (
+                zlib.compress(data, level=settings.CACHE_ALL_TXS_COMPRESSION_LEVEL)
             )
-        }
         if to_store:
             pipe = self.redis.pipeline()
             pipe.mset(to_store)
@@ -139,49 +175,28 @@ class TransactionService:
             "-timestamp", "ethereum_tx_id"
         )
 
-    def get_all_txs_from_identifiers(
+    def get_txs_for_identifiers(
         self, safe_address: str, ids_to_search: Sequence[str]
-    ) -> list[AnySafeTransaction]:
+    ) -> list[tuple[str, list[AnySafeTransaction]]]:
         """
         Now that we know how to paginate, we retrieve the real transactions
 
         :param safe_address:
         :param ids_to_search: `SafeTxHash` for MultisigTransactions, `txHash` for other transactions
-        :return:
+        :return: Tuples of every id in `ids_to_search` and its transactions, with transfers appended
         """
 
         logger.debug(
             "[%s] Getting %d txs from identifiers", safe_address, len(ids_to_search)
         )
-        ids_with_cached_txs = {
-            id_to_search: cached_txs
-            for id_to_search, cached_txs in zip(
-                ids_to_search,
-                self.get_txs_from_cache(safe_address, ids_to_search),
-                strict=False,
-            )
-            if cached_txs
-        }
-        logger.debug(
-            "[%s] Got %d cached txs from identifiers",
-            safe_address,
-            len(ids_with_cached_txs),
-        )
-        ids_not_cached = [
-            hash_to_search
-            for hash_to_search in ids_to_search
-            if hash_to_search not in ids_with_cached_txs
-        ]
-        logger.debug(
-            "[%s] %d not cached txs from identifiers",
-            safe_address,
-            len(ids_not_cached),
-        )
+        if not ids_to_search:
+            return []
+
         ids_with_multisig_txs: dict[HexStr, list[MultisigTransaction]] = {}
         number_multisig_txs = 0
         for multisig_tx in (
             MultisigTransaction.objects.filter(
-                safe=safe_address, ethereum_tx_id__in=ids_not_cached
+                safe=safe_address, ethereum_tx_id__in=ids_to_search
             )
             .with_confirmations_required()
             .prefetch_related("confirmations")
@@ -201,7 +216,7 @@ class TransactionService:
         ids_with_module_txs: dict[HexStr, list[ModuleTransaction]] = {}
         number_module_txs = 0
         for module_tx in ModuleTransaction.objects.filter(
-            safe=safe_address, internal_tx__ethereum_tx__in=ids_not_cached
+            safe=safe_address, internal_tx__ethereum_tx__in=ids_to_search
         ).select_related("internal_tx"):
             ids_with_module_txs.setdefault(
                 module_tx.internal_tx.ethereum_tx_id, []
@@ -216,7 +231,7 @@ class TransactionService:
         ids_with_plain_ethereum_txs: dict[HexStr, list[EthereumTx]] = {
             ethereum_tx.tx_hash: [ethereum_tx]
             for ethereum_tx in EthereumTx.objects.filter(
-                tx_hash__in=ids_not_cached
+                tx_hash__in=ids_to_search
             ).select_related("block")
         }
         logger.debug(
@@ -226,8 +241,8 @@ class TransactionService:
         )
 
         # We also need the in/out transfers for the MultisigTxs,
-        # add the MultisigTx Ethereum Tx hashes to not cached ids
-        all_ids = ids_not_cached + [
+        # add the MultisigTx Ethereum Tx hashes to the ids
+        all_ids = list(ids_to_search) + [
             multisig_tx.ethereum_tx_id
             for multisig_txs in ids_with_multisig_txs.values()
             for multisig_tx in multisig_txs
@@ -287,9 +302,6 @@ class TransactionService:
             :param transaction_id: SafeTxHash (in case of a ``MultisigTransaction``) or Ethereum ``TxHash`` for the rest
             :return: Transactions for the transaction id, with transfers appended
             """
-            if result := ids_with_cached_txs.get(transaction_id):
-                return result
-
             result: MultisigTransaction | ModuleTransaction | EthereumTx | None
             if result := ids_with_multisig_txs.get(transaction_id):
                 for multisig_tx in result:
@@ -319,21 +331,88 @@ class TransactionService:
                 )
 
         logger.debug(
-            "[%s] Got all transactions from tx identifiers. Storing in cache",
+            "[%s] Got all transactions from tx identifiers",
             safe_address,
         )
-        ids_with_txs = [
+        return [
             (id_to_search, get_the_transactions(id_to_search))
             for id_to_search in ids_to_search
         ]
-        self.store_txs_in_cache(safe_address, ids_with_txs)
+
+    def get_all_txs_from_identifiers(
+        self, safe_address: str, ids_to_search: Sequence[str]
+    ) -> list[AnySafeTransaction]:
+        """
+        :param safe_address:
+        :param ids_to_search: `SafeTxHash` for MultisigTransactions, `txHash` for other transactions
+        :return: Transactions for `ids_to_search`, with transfers appended
+        """
+        return list(
+            dict.fromkeys(
+                tx
+                for (_, txs) in self.get_txs_for_identifiers(
+                    safe_address, ids_to_search
+                )
+                for tx in txs
+            )
+        )  # Sorted already by execution_date
+
+    def get_all_txs_serialized_from_identifiers(
+        self, safe_address: str, ids_to_search: Sequence[str], api_version: int
+    ) -> list[dict[str, Any]]:
+        """
+        Serialized transactions are cached, so for cached ids database is not queried
+        and transactions are not serialized again
+
+        :param safe_address:
+        :param ids_to_search: `SafeTxHash` for MultisigTransactions, `txHash` for other transactions
+        :param api_version: `1` or `2`, API version to serialize the transactions for
+        :return: Serialized transactions for `ids_to_search`
+        """
+        if api_version == 1:
+            serialize_txs = self.serialize_all_txs
+        elif api_version == 2:
+            serialize_txs = self.serialize_all_txs_v2
+        else:
+            raise ValueError(f"Not supported api_version={api_version}")
+
+        ids_to_search = list(dict.fromkeys(ids_to_search))
+        ids_with_serialized_txs = {
+            id_to_search: cached_txs
+            for id_to_search, cached_txs in zip(
+                ids_to_search,
+                self.get_serialized_txs_from_cache(
+                    safe_address, ids_to_search, api_version
+                ),
+                strict=True,
+            )
+            if cached_txs
+        }
         logger.debug(
-            "[%s] Got all transactions from tx identifiers. Stored in cache",
+            "[%s] Got %d cached txs from identifiers",
             safe_address,
+            len(ids_with_serialized_txs),
         )
-        return list(
-            dict.fromkeys(tx for (_, txs) in ids_with_txs for tx in txs)
-        )  # Sorted already by execution_date
+        ids_not_cached = [
+            id_to_search
+            for id_to_search in ids_to_search
+            if id_to_search not in ids_with_serialized_txs
+        ]
+        ids_with_txs = [
+            (id_to_search, txs, serialize_txs(txs))
+            for id_to_search, txs in self.get_txs_for_identifiers(
+                safe_address, ids_not_cached
+            )
+        ]
+        self.store_serialized_txs_in_cache(safe_address, ids_with_txs, api_version)
+        for id_to_search, _, txs_serialized in ids_with_txs:
+            ids_with_serialized_txs[id_to_search] = txs_serialized
+
+        return [
+            tx_serialized
+            for id_to_search in ids_to_search
+            for tx_serialized in ids_with_serialized_txs[id_to_search]
+        ]
 
     def serialize_all_txs(
         self, models: list[AnySafeTransaction]
@@ -379,33 +458,19 @@ class TransactionService:
         logger.debug("Serialized all transactions")
         return results
 
-    def get_export_transactions(
+    def _get_export_transactions_query(
         self,
         safe_address: ChecksumAddress,
         execution_date_gte: datetime | None = None,
         execution_date_lte: datetime | None = None,
-        limit: int = 1000,
-        offset: int = 0,
-    ) -> tuple[list[dict[str, Any]], int]:
+    ) -> tuple[str, list[Any]]:
         """
-        Get transactions optimized for CSV export using raw SQL queries
-
         :param safe_address: Safe address to get transactions for
         :param execution_date_gte: Filter transactions executed after this date
         :param execution_date_lte: Filter transactions executed before this date
-        :param limit: Maximum number of transactions to return
-        :param offset: Number of transactions to skip
-        :return: Tuple of (transactions, total_count)
+        :return: Tuple of (raw SQL query, parameters) returning every transaction to export,
+            sorted by execution date
         """
-        logger.debug(
-            "[%s] Getting export transactions with raw SQL: gte=%s, lte=%s, limit=%d, offset=%d",
-            safe_address,
-            execution_date_gte,
-            execution_date_lte,
-            limit,
-            offset,
-        )
-
         # Build timestamp conditions for each subquery
         erc20_timestamp_conditions = ""
         erc721_timestamp_conditions = ""
@@ -604,16 +669,101 @@ class TransactionService:
         FROM export_data
         WHERE rn = 1
         ORDER BY execution_date DESC, transaction_hash
-        LIMIT %s OFFSET %s
         """
         # Parameters for main query (safe_address repeated for each UNION)
-        safe_address_bytes = HexBytes(safe_address)
-        main_params = [
-            safe_address_bytes
-        ] * 27 + [  # 27 instances of safe address in the query
+        return main_query, [
+            HexBytes(safe_address)
+        ] * 27  # 27 instances of safe address in the query
+
+    @staticmethod
+    def _export_row_to_item(row_dict: dict[str, Any]) -> dict[str, Any]:
+        """
+        :param row_dict: Row returned by the export query
+        :return: Row mapped to `SafeExportTransactionSerializer` field names
+        """
+        return {
+            "safe": fast_to_checksum_address(row_dict["safe_address"]),
+            "_from": fast_to_checksum_address(row_dict["from_address"]),
+            "to": fast_to_checksum_address(row_dict["to_address"]),
+            "_value": row_dict["amount"],
+            "asset_type": row_dict["asset_type"],
+            "asset_address": (
+                fast_to_checksum_address(row_dict["asset_address"])
+                if row_dict["asset_address"]
+                else None
+            ),
+            "asset_symbol": (
+                row_dict["asset_symbol"] if row_dict["asset_symbol"] else None
+            ),
+            "asset_decimals": (
+                row_dict["asset_decimals"] if row_dict["asset_decimals"] else None
+            ),
+            "proposer_address": (
+                fast_to_checksum_address(row_dict["proposer_address"])
+                if row_dict["proposer_address"]
+                else None
+            ),
+            "proposed_at": (
+                row_dict["proposed_at"] if row_dict["proposed_at"] else None
+            ),
+            "executor_address": (
+                fast_to_checksum_address(row_dict["executor_address"])
+                if row_dict["executor_address"]
+                else None
+            ),
+            "executed_at": (
+                row_dict["executed_at"] if row_dict["executed_at"] else None
+            ),
+            "note": row_dict["note"] if row_dict["note"] else None,
+            "transaction_hash": "0x" + row_dict["transaction_hash"],
+            "contract_address": (
+                fast_to_checksum_address(row_dict["contract_address"])
+                if row_dict["contract_address"]
+                else None
+            ),
+            "nonce": row_dict["nonce"],
+            "gas_token": (
+                fast_to_checksum_address(row_dict["gas_token"])
+                if row_dict["gas_token"] is not None
+                else None
+            ),
+            "payment": row_dict["payment"],
+            "gas_token_symbol": row_dict["gas_token_symbol"],
+            "gas_token_decimals": row_dict["gas_token_decimals"],
+        }
+
+    def get_export_transactions(
+        self,
+        safe_address: ChecksumAddress,
+        execution_date_gte: datetime | None = None,
+        execution_date_lte: datetime | None = None,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Get transactions optimized for CSV export using raw SQL queries
+
+        :param safe_address: Safe address to get transactions for
+        :param execution_date_gte: Filter transactions executed after this date
+        :param execution_date_lte: Filter transactions executed before this date
+        :param limit: Maximum number of transactions to return
+        :param offset: Number of transactions to skip
+        :return: Tuple of (transactions, total_count)
+        """
+        logger.debug(
+            "[%s] Getting export transactions with raw SQL: gte=%s, lte=%s, limit=%d, offset=%d",
+            safe_address,
+            execution_date_gte,
+            execution_date_lte,
             limit,
             offset,
-        ]
+        )
+
+        main_query, main_params = self._get_export_transactions_query(
+            safe_address, execution_date_gte, execution_date_lte
+        )
+        main_query += " LIMIT %s OFFSET %s"
+        main_params += [limit, offset]
 
         erc20_transfers = ERC20Transfer.objects.to_or_from(safe_address)
         erc721_transfers = ERC721Transfer.objects.to_or_from(safe_address)
@@ -655,65 +805,10 @@ class TransactionService:
             # Get the data
             cursor.execute(main_query, main_params)
             columns = [col[0] for col in cursor.description]
-            results = []
-
-            for row in cursor.fetchall():
-                row_dict = dict(zip(columns, row, strict=False))
-
-                # Map to serializer field names
-                export_item = {
-                    "safe": fast_to_checksum_address(row_dict["safe_address"]),
-                    "_from": fast_to_checksum_address(row_dict["from_address"]),
-                    "to": fast_to_checksum_address(row_dict["to_address"]),
-                    "_value": row_dict["amount"],
-                    "asset_type": row_dict["asset_type"],
-                    "asset_address": (
-                        fast_to_checksum_address(row_dict["asset_address"])
-                        if row_dict["asset_address"]
-                        else None
-                    ),
-                    "asset_symbol": (
-                        row_dict["asset_symbol"] if row_dict["asset_symbol"] else None
-                    ),
-                    "asset_decimals": (
-                        row_dict["asset_decimals"]
-                        if row_dict["asset_decimals"]
-                        else None
-                    ),
-                    "proposer_address": (
-                        fast_to_checksum_address(row_dict["proposer_address"])
-                        if row_dict["proposer_address"]
-                        else None
-                    ),
-                    "proposed_at": (
-                        row_dict["proposed_at"] if row_dict["proposed_at"] else None
-                    ),
-                    "executor_address": (
-                        fast_to_checksum_address(row_dict["executor_address"])
-                        if row_dict["executor_address"]
-                        else None
-                    ),
-                    "executed_at": (
-                        row_dict["executed_at"] if row_dict["executed_at"] else None
-                    ),
-                    "note": row_dict["note"] if row_dict["note"] else None,
-                    "transaction_hash": "0x" + row_dict["transaction_hash"],
-                    "contract_address": (
-                        fast_to_checksum_address(row_dict["contract_address"])
-                        if row_dict["contract_address"]
-                        else None
-                    ),
-                    "nonce": row_dict["nonce"],
-                    "gas_token": (
-                        fast_to_checksum_address(row_dict["gas_token"])
-                        if row_dict["gas_token"] is not None
-                        else None
-                    ),
-                    "payment": row_dict["payment"],
-                    "gas_token_symbol": row_dict["gas_token_symbol"],
-                    "gas_token_decimals": row_dict["gas_token_decimals"],
-                }
-                results.append(export_item)
+            results = [
+                self._export_row_to_item(dict(zip(columns, row, strict=False)))
+                for row in cursor.fetchall()
+            ]
 
         logger.debug(
             "[%s] Got %d export transactions from %d total using raw SQL",
@@ -723,3 +818,86 @@ class TransactionService:
         )
 
         return results, total_count
+
+    def iter_export_transactions(
+        self,
+        safe_address: ChecksumAddress,
+        execution_date_gte: datetime | None = None,
+        execution_date_lte: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Same as `get_export_transactions`, but every transaction is returned running the query
+        only once using a server side cursor, so memory usage does not depend on the number of transactions
+
+        :param safe_address: Safe address to get transactions for
+        :param execution_date_gte: Filter transactions executed after this date
+        :param execution_date_lte: Filter transactions executed before this date
+        :return: Iterator of transactions
+        """
+        main_query, main_params = self._get_export_transactions_query(
+            safe_address, execution_date_gte, execution_date_lte
+        )
+        exported = 0
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(main_query, main_params)
+            columns = [col[0] for col in cursor.description]
+            while rows := cursor.fetchmany(settings.EXPORT_STREAM_CHUNK_SIZE):
+                for row in rows:
+                    yield self._export_row_to_item(
+                        dict(zip(columns, row, strict=False))
+                    )
+                exported += len(rows)
+
+        logger.debug(
+            "[%s] Streamed %d export transactions using a server side cursor",
+            safe_address,
+            exported,
+        )
+
+    def iter_export_transactions_file(
+        self,
+        safe_address: ChecksumAddress,
+        file_format: str,
+        execution_date_gte: datetime | None = None,
+        execution_date_lte: datetime | None = None,
+    ) -> Iterator[str]:
+        """
+        :param safe_address: Safe address to get transactions for
+        :param file_format: `csv` or `ndjson`
+        :param execution_date_gte: Filter transactions executed after this date
+        :param execution_date_lte: Filter transactions executed before this date
+        :return: Iterator of lines of the export file, using the same field names as the export endpoint
+        :raises ValueError: If `file_format` is not supported
+        """
+        if file_format not in EXPORT_FILE_FORMATS:
+            raise ValueError(f"Not supported export file format {file_format}")
+
+        transactions = (
+            camelize(SafeExportTransactionSerializer(transaction).data)
+            for transaction in self.iter_export_transactions(
+                safe_address, execution_date_gte, execution_date_lte
+            )
+        )
+        if file_format == "ndjson":
+            return (
+                orjson.dumps(transaction).decode() + "\n"
+                for transaction in transactions
+            )
+        return self._iter_csv_lines(transactions)
+
+    @staticmethod
+    def _iter_csv_lines(transactions: Iterator[dict[str, Any]]) -> Iterator[str]:
+        writer = csv.DictWriter(
+            _EchoBuffer(),
+            fieldnames=list(
+                camelize(
+                    {
+                        ("from" if field_name == "_from" else field_name): None
+                        for field_name in SafeExportTransactionSerializer().fields
+                    }
+                )
+            ),
+        )
+        yield writer.writeheader()
+        for transaction in transactions:
+            yield writer.writerow(transaction)
@@ -10,7 +10,11 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from ..events.services.queue_service import get_queue_service
-from .cache import get_cache_view_tag_and_addresses, remove_cache_view_for_addresses
+from .cache import (
+    get_cache_view_tags_and_addresses,
+    remove_cache_view_for_addresses,
+    remove_cached_safe_owners,
+)
 from .models import (
     ERC20Transfer,
     ERC721Transfer,
@@ -168,11 +172,11 @@ def _process_event(
         "An instance cannot be created and deleted at the same time"
     )
     if settings.CACHE_VIEW_DEFAULT_TIMEOUT and (
-        tag_and_addresses := get_cache_view_tag_and_addresses(instance)
+        tags_and_addresses := get_cache_view_tags_and_addresses(instance)
     ):
         # Runs (or is registered) before the events, so the cache is clean
         # when consumers are notified
-        remove_cache_view_for_addresses(*tag_and_addresses)
+        remove_cache_view_for_addresses(*tags_and_addresses)
 
     # Skip payload generation for events that won't be emitted anyway
     # (for example, old/reindexed txs).
@@ -265,7 +269,8 @@ def add_to_historical_table(
     **kwargs,
 ) -> SafeStatus:
     """
-    Add every `SafeLastStatus` entry to `SafeStatus` historical table
+    Add every `SafeLastStatus` entry to `SafeStatus` historical table and remove the
+    cached owners for the Safe
 
     :param sender:
     :param instance:
@@ -280,6 +285,7 @@ def add_to_historical_table(
     )
     safe_status = SafeStatus.from_status_instance(instance)
     safe_status.save()
+    remove_cached_safe_owners([instance.address])
     return safe_status
 
 
@@ -4,9 +4,11 @@ import dataclasses
 import datetime
 import json
 import random
+import tempfile
 from itertools import islice
 
 from django.conf import settings
+from django.core.files import File
 from django.utils import timezone
 
 from celery import app
@@ -19,6 +21,7 @@ from safe_eth.eth.utils import fast_to_checksum_address
 from safe_transaction_service.utils.redis import get_redis
 
 from ..events.services.queue_service import get_queue_service
+from ..tokens.models import get_file_storage
 from ..utils.celery import task_timeout
 from ..utils.tasks import LOCK_TIMEOUT, only_one_running_task
 from .indexers import (
@@ -30,9 +33,11 @@ from .indexers import (
 )
 from .models import (
     EthereumBlock,
+    IndexingShard,
     InternalTxDecoded,
     MultisigTransaction,
     SafeContractDelegate,
+    get_shard_partitions,
 )
 from .services import (
     CollectiblesServiceProvider,
@@ -41,6 +46,7 @@ from .services import (
     IndexServiceProvider,
     ReorgService,
     ReorgServiceProvider,
+    TransactionServiceProvider,
 )
 from .services.collectibles_service import (
     Collectible,
@@ -259,6 +265,10 @@ def index_safe_events_task(self) -> tuple[int, int] | None:
     :return: Tuple of number of addresses processed and number of blocks processed
     """
 
+    if IndexingShard.objects.not_finished().exists():
+        logger.info("Safe events backfill is running, skipping indexing of Safe events")
+        return None
+
     with contextlib.suppress(LockError):
         with only_one_running_task(self):
             logger.info("Start indexing of Safe events")
@@ -270,12 +280,114 @@ def index_safe_events_task(self) -> tuple[int, int] | None:
             return number, number_of_blocks_processed
 
 
+@app.shared_task
+def backfill_safe_events_task(
+    from_block_number: int,
+    to_block_number: int | None = None,
+    shard_size: int | None = None,
+) -> int:
+    """
+    Split the Safe events backfill in shards and send a task to process every shard, so cold indexing
+    can be distributed across workers. Regular Safe events indexing is paused until every shard is finished
+
+    :param from_block_number:
+    :param to_block_number: If not provided, last stable block (current block - `ETH_REORG_BLOCKS`) will be used
+    :param shard_size: If not provided, `ETH_EVENTS_BACKFILL_SHARD_SIZE` will be used
+    :return: Number of shards created
+    """
+    index_service = IndexServiceProvider()
+    if to_block_number is None:
+        to_block_number = (
+            index_service.ethereum_client.current_block_number
+            - settings.ETH_REORG_BLOCKS
+        )
+    shards = index_service.create_safe_events_backfill_shards(
+        from_block_number,
+        to_block_number,
+        shard_size or settings.ETH_EVENTS_BACKFILL_SHARD_SIZE,
+    )
+    for shard in shards:
+        process_safe_events_backfill_shard_task.delay(shard.id)
+    return len(shards)
+
+
+@app.shared_task(
+    bind=True,
+    autoretry_for=(IndexingException, FindRelevantElementsException, IOError),
+    default_retry_delay=15,
+    retry_kwargs={"max_retries": 3},
+)
+@task_timeout(timeout_seconds=LOCK_TIMEOUT)
+def process_safe_events_backfill_shard_task(self, shard_id: int) -> int | None:
+    """
+    Index Safe events for a backfill shard and merge the finished shards.
+    Progress is stored, so if the task is stopped it will be resumed by
+    `resend_stale_safe_events_backfill_shards_task`
+
+    :param shard_id:
+    :return: Number of events processed
+    """
+    with contextlib.suppress(LockError):
+        with only_one_running_task(self, lock_name_suffix=str(shard_id)):
+            logger.info("Start processing Safe events backfill shard %d", shard_id)
+            index_service = IndexServiceProvider()
+            number = index_service.process_safe_events_backfill_shard(shard_id)
+            logger.info(
+                "Safe events backfill shard %d processed %d events", shard_id, number
+            )
+            # Decoded txs cannot be processed until the previous shards are finished, or they
+            # would be processed out of order
+            if index_service.merge_safe_events_backfill_shards() is not None:
+                process_decoded_internal_txs_task.delay()
+            return number
+
+
+@app.shared_task(bind=True)
+@task_timeout(timeout_seconds=LOCK_TIMEOUT)
+def resend_stale_safe_events_backfill_shards_task(self) -> int | None:
+    """
+    Send again the task for the backfill shards without progress for the last
+    `ETH_EVENTS_BACKFILL_SHARD_STALE_MINUTES`, as regular Safe events indexing is paused
+    until every shard is finished. A task can be lost if the worker is restarted, or
+    give up after retrying
+
+    :return: Number of shards sent again
+    """
+    with contextlib.suppress(LockError):
+        with only_one_running_task(self):
+            shard_ids = list(
+                IndexingShard.objects.stale(
+                    settings.ETH_EVENTS_BACKFILL_SHARD_STALE_MINUTES
+                ).values_list("id", flat=True)
+            )
+            # Don't send them again until they are stale again
+            IndexingShard.objects.filter(id__in=shard_ids).update(
+                modified=timezone.now()
+            )
+            for shard_id in shard_ids:
+                logger.warning(
+                    "Safe events backfill shard %d is stale, sending it again",
+                    shard_id,
+                )
+                process_safe_events_backfill_shard_task.delay(shard_id)
+            return len(shard_ids)
+
+
 @app.shared_task(bind=True)
 @task_timeout(timeout_seconds=LOCK_TIMEOUT)
 def process_decoded_internal_txs_task(self) -> int | None:
     with contextlib.suppress(LockError):
         with only_one_running_task(self):
-            if settings.PROCESSING_ALL_SAFES_TOGETHER:
+            if shards := settings.PROCESSING_SHARDS:
+                # Safes are partitioned in shards processed in parallel, every shard as a batch
+                logger.info(
+                    "Start process decoded internal txs for every Safe in %d shards",
+                    shards,
+                )
+                for shard in range(shards):
+                    process_decoded_internal_txs_for_shard_task.delay(shard, shards)
+                return shards
+            elif settings.PROCESSING_ALL_SAFES_TOGETHER:
                 # We can process all Safes together, big optimization
                 logger.info(
                     "Start process decoded internal txs for every Safe together"
@@ -289,7 +401,9 @@ def process_decoded_internal_txs_task(self) -> int | None:
                 )
                 count = 0
                 for safe_to_process in (
-                    InternalTxDecoded.objects.safes_pending_to_be_processed().iterator()
+                    InternalTxDecoded.objects.below_backfill_merge_boundary()
+                    .safes_pending_to_be_processed()
+                    .iterator()
                 ):
                     process_decoded_internal_txs_for_safe_task.delay(
                         safe_to_process, reindex_master_copies=True
@@ -328,6 +442,46 @@ def process_decoded_internal_txs_for_safe_task(
             return number_processed
 
 
+@app.shared_task(bind=True)
+@task_timeout(timeout_seconds=LOCK_TIMEOUT)
+def process_decoded_internal_txs_for_shard_task(
+    self, shard: int, shards: int
+) -> int | None:
+    """
+    Process decoded internal txs for the Safes on a shard. Only one task can process a Safe partition
+    at the same time, and partitions don't depend on the number of shards, so transactions for a Safe
+    are always processed in order, even if tasks for a previous number of shards are still running
+
+    :param shard: From `0` to `shards - 1`
+    :param shards: Number of shards
+    :return: Number of `InternalTxDecoded` processed
+    """
+    with contextlib.ExitStack() as stack:
+        partitions = []
+        for partition in get_shard_partitions(shard, shards):
+            # Skip partitions being processed by other task
+            with contextlib.suppress(LockError):
+                stack.enter_context(
+                    only_one_running_task(self, lock_name_suffix=str(partition))
+                )
+                partitions.append(partition)
+        if not partitions:
+            return None
+
+        logger.info(
+            "[Shard %d/%d] Start processing decoded internal txs", shard, shards
+        )
+        index_service: IndexService = IndexServiceProvider()
+        number_processed = index_service.process_decoded_txs_for_partitions(partitions)
+        logger.info(
+            "[Shard %d/%d] Processed %d decoded transactions",
+            shard,
+            shards,
+            number_processed,
+        )
+        return number_processed
+
+
 @app.shared_task(bind=True)
 @task_timeout(timeout_seconds=LOCK_TIMEOUT)
 def reindex_mastercopies_last_hours_task(self, hours: float = 2.5) -> bool:
@@ -473,6 +627,26 @@ def reindex_erc20_events_task(
             )
 
 
+@app.shared_task
+@task_timeout(timeout_seconds=LOCK_TIMEOUT)
+def prefetch_collectibles_metadata_task(
+    addresses_with_token_ids: list[tuple[ChecksumAddress, int]],
+) -> int:
+    """
+    Download metadata for new collectibles, so it's cached when requested
+
+    :param addresses_with_token_ids: List of tuples(token_address, token_id)
+    :return: Number of collectibles whose metadata was downloaded
+    """
+    if not settings.COLLECTIBLES_ENABLE_DOWNLOAD_METADATA:
+        logger.warning("Downloading collectibles metadata is disabled")
+        return 0
+
+    return CollectiblesServiceProvider().prefetch_metadata(
+        [(address, int(token_id)) for address, token_id in addresses_with_token_ids]
+    )
+
+
 @app.shared_task(max_retries=4)
 @task_timeout(timeout_seconds=LOCK_TIMEOUT)
 def retry_get_metadata_task(
@@ -573,3 +747,48 @@ def delete_expired_delegates_task():
     now = timezone.now()
     deleted, _ = SafeContractDelegate.objects.filter(expiry_date__lte=now).delete()
     return deleted
+
+
+@app.shared_task()
+@task_timeout(timeout_seconds=LOCK_TIMEOUT)
+def export_safe_transactions_file_task(
+    safe_address: ChecksumAddress,
+    file_format: str,
+    path: str,
+    execution_date_gte: str | None = None,
+    execution_date_lte: str | None = None,
+) -> str | None:
+    """
+    Generate the export file for a Safe and store it on the file storage
+
+    :param safe_address:
+    :param file_format: `csv` or `ndjson`
+    :param path: Path to store the file on the file storage
+    :param execution_date_gte: ISO formatted date
+    :param execution_date_lte: ISO formatted date
+    :return: Path of the stored file
+    """
+    logger.info("[%s] Generating %s export file", safe_address, file_format)
+    transaction_service = TransactionServiceProvider()
+    lines = transaction_service.iter_export_transactions_file(
+        safe_address,
+        file_format,
+        execution_date_gte=(
+            datetime.datetime.fromisoformat(execution_date_gte)
+            if execution_date_gte
+            else None
+        ),
+        execution_date_lte=(
+            datetime.datetime.fromisoformat(execution_date_lte)
+            if execution_date_lte
+            else None
+        ),
+    )
+    # Lines are written to a temporary file, so memory usage does not depend on the number of transactions
+    with tempfile.TemporaryFile() as f:
+        for line in lines:
+            f.write(line.encode())
+        f.seek(0)
+        stored_path = get_file_storage().save(path, File(f))
+    logger.info("[%s] Stored %s export file on %s", safe_address, file_format, path)
+    return stored_path
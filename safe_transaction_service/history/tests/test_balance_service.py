@@ -1,13 +1,18 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
-from django.test import TestCase
+from unittest import mock
+
+from django.test import TestCase, override_settings
 
 from eth_account import Account
 from safe_eth.eth.tests.ethereum_test_case import EthereumTestCaseMixin
 
-from safe_transaction_service.tokens.models import Token
+from safe_transaction_service.tokens.models import Token, TokenManager
 from safe_transaction_service.tokens.tests.factories import TokenFactory
 
+from ..models import SafeTokenLedger
 from ..services import BalanceServiceProvider
+from ..services.balance_service import BalanceService
+from .factories import ERC20TransferFactory
 
 
 class TestBalanceService(EthereumTestCaseMixin, TestCase):
@@ -88,3 +93,62 @@ class TestBalanceService(EthereumTestCaseMixin, TestCase):
         self.assertCountEqual(
             balance_service._filter_tokens(addresses, False, True), expected_address
         )
+
+    def test_get_page_erc20_balances_cached_tokens(self):
+        balance_service = self.balance_service
+        balance_service.cache_token_info = {}  # Empty cache
+        safe_address = Account.create().address
+        token_address = TokenFactory().address
+        ERC20TransferFactory(address=token_address, to=safe_address)
+
+        with mock.patch.object(
+            TokenManager, "create_from_blockchain_in_batch"
+        ) as create_from_blockchain_in_batch_mock:
+            balance_service._get_page_erc20_balances(safe_address)
+            create_from_blockchain_in_batch_mock.assert_called_once_with(
+                [token_address]
+            )
+
+            # Token info is cached, so token is not requested again
+            create_from_blockchain_in_batch_mock.reset_mock()
+            balance_service._get_page_erc20_balances(safe_address)
+            create_from_blockchain_in_batch_mock.assert_called_once_with([])
+
+    def test_get_balances_token_ledger(self):
+        balance_service = self.balance_service
+        safe_address = Account.create().address
+        transfer_token_address = ERC20TransferFactory(to=safe_address).address
+        ledger_token_address = Account.create().address
+        SafeTokenLedger.objects.add_transfers(
+            {(safe_address, ledger_token_address): (1, 1)}
+        )
+
+        with mock.patch.object(
+            BalanceService, "_get_balances", return_value=([], 1)
+        ) as get_balances_mock:
+            balance_service.get_balances(safe_address)
+            get_balances_mock.assert_called_once_with(
+                safe_address, False, False, None, 0, erc20_addresses=None
+            )
+            self.assertEqual(
+                balance_service._get_page_erc20_balances(safe_address),
+                ([transfer_token_address], 1),
+            )
+
+            get_balances_mock.reset_mock()
+            with override_settings(TOKENS_BALANCES_USE_LEDGER=True):
+                balance_service.get_balances(safe_address)
+            get_balances_mock.assert_called_once_with(
+                safe_address,
+                False,
+                False,
+                None,
+                0,
+                erc20_addresses=[ledger_token_address],
+            )
+            self.assertEqual(
+                balance_service._get_page_erc20_balances(
+                    safe_address, erc20_addresses=[ledger_token_address]
+                ),
+                ([ledger_token_address], 1),
+            )
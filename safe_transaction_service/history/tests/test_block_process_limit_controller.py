@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from django.test import TestCase
+
+from ..indexers.block_process_limit_controller import (
+    AimdBlockProcessLimitController,
+    BlockRangeMeasure,
+    PidBlockProcessLimitController,
+    get_block_process_limit_controller,
+)
+
+
+class TestBlockProcessLimitController(TestCase):
+    def test_get_block_process_limit_controller(self):
+        with self.settings(
+            ETH_BLOCK_PROCESS_LIMIT_CONTROLLER="pid",
+            ETH_BLOCK_PROCESS_LIMIT_TARGET_SECONDS=5.0,
+            ETH_BLOCK_PROCESS_LIMIT_TARGET_ELEMENTS=100,
+        ):
+            controller = get_block_process_limit_controller()
+            self.assertIsInstance(controller, PidBlockProcessLimitController)
+            self.assertEqual(controller.target_seconds, 5.0)
+            self.assertEqual(controller.target_elements, 100)
+            # Controllers keep state, a new instance is returned every time
+            self.assertIsNot(controller, get_block_process_limit_controller())
+
+        with self.settings(ETH_BLOCK_PROCESS_LIMIT_CONTROLLER="aimd"):
+            self.assertIsInstance(
+                get_block_process_limit_controller(), AimdBlockProcessLimitController
+            )
+
+        with self.settings(ETH_BLOCK_PROCESS_LIMIT_CONTROLLER="not-valid"):
+            with self.assertRaisesMessage(
+                ValueError, "Invalid ETH_BLOCK_PROCESS_LIMIT_CONTROLLER=not-valid"
+            ):
+                get_block_process_limit_controller()
+
+    def test_get_load(self):
+        controller = AimdBlockProcessLimitController(target_seconds=10)
+        self.assertEqual(
+            controller.get_load(BlockRangeMeasure(blocks=1, elements=500, seconds=5)),
+            0.5,
+        )
+        controller = AimdBlockProcessLimitController(
+            target_seconds=10, target_elements=100
+        )
+        self.assertEqual(
+            controller.get_load(BlockRangeMeasure(blocks=1, elements=500, seconds=5)),
+            5,
+        )
+
+    def test_aimd_block_process_limit_controller(self):
+        controller = AimdBlockProcessLimitController(
+            target_seconds=10, additive_increase=10
+        )
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=100, seconds=1)
+            ),
+            110,
+        )
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=50, seconds=1)
+            ),
+            100,
+        )
+        # Slightly over budget, small decrease
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=100, seconds=12.5)
+            ),
+            80,
+        )
+        # Really over budget, never decrease more than `multiplicative_decrease`
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=10, seconds=1_000)
+            ),
+            50,
+        )
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                1, BlockRangeMeasure(blocks=1, seconds=1_000)
+            ),
+            1,
+        )
+
+    def test_pid_block_process_limit_controller(self):
+        controller = PidBlockProcessLimitController(target_seconds=10)
+        block_process_limit = 10
+        # Converges to the target without oscillating between halving and doubling
+        for _ in range(50):
+            # Node takes 0.1 seconds per block
+            block_process_limit = controller.get_next_block_process_limit(
+                block_process_limit,
+                BlockRangeMeasure(
+                    blocks=block_process_limit, seconds=block_process_limit * 0.1
+                ),
+            )
+        self.assertAlmostEqual(block_process_limit, 100, delta=5)
+
+        controller = PidBlockProcessLimitController(target_seconds=10, max_change=2)
+        # One heavy block range cannot move the limit more than `max_change`
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=100, seconds=1_000)
+            ),
+            50,
+        )
+        # Smaller ranges under budget don't increase the limit
+        self.assertEqual(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=10, seconds=0.1)
+            ),
+            100,
+        )
+        self.assertGreater(
+            controller.get_next_block_process_limit(
+                100, BlockRangeMeasure(blocks=100, seconds=0.1)
+            ),
+            100,
+        )
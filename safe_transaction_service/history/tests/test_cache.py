@@ -72,7 +72,7 @@ class TestCacheSafeTxsView(TestCase):
                 "safe_transaction_service.history.cache.remove_cache_views"
             ) as remove_cache_views_mock,
         ):
-            remove_cache_view_for_addresses("testtag", [safe_address])
+            remove_cache_view_for_addresses(["testtag"], [safe_address])
 
         remove_cache_views_mock.assert_called_once_with([f"testtag:{safe_address}"])
         connection_mock.on_commit.assert_not_called()
@@ -6,6 +6,7 @@ from unittest.mock import MagicMock
 from django.conf import settings
 from django.test import TestCase
 
+import gevent
 from eth_account import Account
 from safe_eth.eth import EthereumNetwork
 from safe_eth.eth.ethereum_client import (
@@ -21,6 +22,7 @@ from safe_transaction_service.tokens.models import Token
 from safe_transaction_service.tokens.tests.factories import TokenFactory
 from safe_transaction_service.utils.redis import get_redis
 
+from ..models import ERC721Ownership
 from ..services import CollectiblesService
 from ..services.collectibles_service import (
     Collectible,
@@ -180,6 +182,167 @@ class TestCollectiblesService(EthereumTestCaseMixin, TestCase):
         finally:
             get_auto_ethereum_client.cache_clear()
 
+    @mock.patch.object(CollectiblesService, "get_token_uris", autospec=True)
+    def test_get_collectibles_ownership_table(self, get_token_uris_mock: MagicMock):
+        collectibles_service = CollectiblesServiceProvider()
+        get_token_uris_mock.side_effect = lambda self, addresses_with_token_ids: [
+            f"http://random-address.org/info-{token_id}.json"
+            for _, token_id in addresses_with_token_ids
+        ]
+        safe_address = Account.create().address
+        token = TokenFactory()
+        for token_id in (3, 1, 2):
+            ERC721TransferFactory(
+                to=safe_address, address=token.address, token_id=token_id
+            )
+        # Factories don't update the ownership table
+        ERC721Ownership.objects.rebuild()
+
+        with self.settings(COLLECTIBLES_USE_OWNERSHIP_TABLE=True):
+            collectibles, count = collectibles_service._get_collectibles(
+                safe_address, limit=2, offset=1
+            )
+            self.assertEqual(count, 3)
+            self.assertEqual(
+                collectibles,
+                [
+                    Collectible(
+                        token.name,
+                        token.symbol,
+                        token.get_full_logo_uri(),
+                        token.address,
+                        token_id,
+                        f"http://random-address.org/info-{token_id}.json",
+                    )
+                    for token_id in (2, 3)
+                ],
+            )
+            self.assertEqual(
+                collectibles_service._get_collectibles(safe_address, offset=3),
+                ([], 3),
+            )
+            self.assertEqual(
+                collectibles_service._get_collectibles(safe_address, only_trusted=True),
+                ([], 0),
+            )
+
+    @mock.patch.object(CollectiblesService, "get_metadata", autospec=True)
+    @mock.patch.object(CollectiblesService, "get_token_uris", autospec=True)
+    def test_prefetch_metadata(
+        self, get_token_uris_mock: MagicMock, get_metadata_mock: MagicMock
+    ):
+        collectibles_service = CollectiblesServiceProvider()
+        token = TokenFactory()
+        get_token_uris_mock.side_effect = lambda self, addresses_with_token_ids: [
+            f"http://random-address.org/info-{token_id}.json"
+            for _, token_id in addresses_with_token_ids
+        ]
+        get_metadata_mock.side_effect = lambda self, collectible: {
+            "name": f"Djinn {collectible.id}"
+        }
+        addresses_with_token_ids = [(token.address, 1), (token.address, 2)]
+        self.assertEqual(
+            collectibles_service.prefetch_metadata(addresses_with_token_ids), 2
+        )
+        self.assertEqual(get_metadata_mock.call_count, 2)
+
+        # Cached metadata is not downloaded again
+        self.assertEqual(
+            collectibles_service.prefetch_metadata(
+                addresses_with_token_ids + [(token.address, 3)]
+            ),
+            1,
+        )
+        self.assertEqual(get_metadata_mock.call_count, 3)
+        with mock.patch.object(
+            CollectiblesService,
+            "get_collectibles",
+            return_value=(
+                [
+                    Collectible(
+                        token.name,
+                        token.symbol,
+                        token.get_full_logo_uri(),
+                        token.address,
+                        2,
+                        "http://random-address.org/info-2.json",
+                    )
+                ],
+                1,
+            ),
+        ):
+            collectibles_with_metadata, _ = (
+                collectibles_service.get_collectibles_with_metadata_paginated(
+                    Account.create().address
+                )
+            )
+        self.assertEqual(collectibles_with_metadata[0].name, "Djinn 2")
+        self.assertEqual(get_metadata_mock.call_count, 3)
+
+    @mock.patch("safe_transaction_service.history.tasks.retry_get_metadata_task")
+    @mock.patch.object(CollectiblesService, "get_metadata", autospec=True)
+    def test_fetch_collectibles_metadata_max_wait(
+        self, get_metadata_mock: MagicMock, retry_get_metadata_task_mock: MagicMock
+    ):
+        collectibles_service = CollectiblesServiceProvider()
+        get_metadata_mock.side_effect = lambda self, collectible: gevent.sleep(5)
+        collectible = Collectible(
+            "GoldenSun",
+            "Djinn",
+            "http://random-address.org/logo.png",
+            Account.create().address,
+            28,
+            "http://random-address.org/info-28.json",
+        )
+        with self.settings(COLLECTIBLES_METADATA_MAX_WAIT_SECONDS=0):
+            collectibles_with_metadata = (
+                collectibles_service._fetch_collectibles_metadata([collectible])
+            )
+        self.assertEqual(collectibles_with_metadata[0].metadata, {})
+        retry_get_metadata_task_mock.apply_async.assert_called_once()
+
+    @mock.patch("safe_transaction_service.history.tasks.retry_get_metadata_task")
+    @mock.patch.object(CollectiblesService, "get_metadata", autospec=True)
+    def test_fetch_collectibles_metadata_max_wait_multiple(
+        self, get_metadata_mock: MagicMock, retry_get_metadata_task_mock: MagicMock
+    ):
+        collectibles_service = CollectiblesServiceProvider()
+        get_metadata_mock.side_effect = lambda self, collectible: gevent.sleep(5)
+        # Sending the task yields to the hub, so killed jobs finish in the meantime
+        retry_get_metadata_task_mock.apply_async.side_effect = lambda *args, **kwargs: (
+            gevent.sleep(0)
+        )
+        collectibles = [
+            Collectible(
+                "GoldenSun",
+                "Djinn",
+                "http://random-address.org/logo.png",
+                Account.create().address,
+                token_id,
+                f"http://random-address.org/info-{token_id}.json",
+            )
+            for token_id in range(3)
+        ]
+        with self.settings(COLLECTIBLES_METADATA_MAX_WAIT_SECONDS=0):
+            collectibles_with_metadata = (
+                collectibles_service._fetch_collectibles_metadata(collectibles)
+            )
+        self.assertEqual(
+            [
+                collectible_with_metadata.metadata
+                for collectible_with_metadata in collectibles_with_metadata
+            ],
+            [{}, {}, {}],
+        )
+        # Every collectible is retried
+        self.assertEqual(
+            [
+                call.args[0]
+                for call in retry_get_metadata_task_mock.apply_async.call_args_list
+            ],
+            [(collectible.address, collectible.id) for collectible in collectibles],
+        )
+
     @mock.patch.object(CollectiblesService, "get_metadata", autospec=True)
     @mock.patch.object(CollectiblesService, "get_collectibles", autospec=True)
     def test_get_collectibles_with_metadata_paginated(
@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import json
 import os.path
 import tempfile
 from datetime import timedelta
@@ -20,12 +21,17 @@ from safe_eth.safe import Safe
 from safe_eth.safe.tests.safe_test_case import SafeTestCaseMixin
 from safe_eth.util.util import to_0x_hex_str
 
+from ...utils.redis import get_redis
 from ..indexers import Erc20EventsIndexer, InternalTxIndexer, SafeEventsIndexer
+from ..indexers.block_process_limit_controller import (
+    delete_stored_block_process_limits,
+)
 from ..management.commands.setup_service import Command
 from ..models import (
     EthereumTx,
     IndexingStatus,
     InternalTxDecoded,
+    MultisigTransaction,
     ProxyFactory,
     SafeLastStatus,
     SafeMasterCopy,
@@ -97,6 +103,68 @@ class TestCommands(SafeTestCaseMixin, TestCase):
         self.assertIn("Old tasks were removed", buf.getvalue())
         self.assertIn("Created Periodic Task", buf.getvalue())
 
+    def test_block_process_limits(self):
+        command = "block_process_limits"
+        redis = get_redis()
+        delete_stored_block_process_limits()
+        buf = StringIO()
+        call_command(command, stdout=buf)
+        self.assertIn("No block process limits stored", buf.getvalue())
+
+        redis.set("block-process-limit:SafeEventsIndexer", 25)
+        buf = StringIO()
+        call_command(command, stdout=buf)
+        self.assertIn("SafeEventsIndexer: 25", buf.getvalue())
+
+        buf = StringIO()
+        call_command(command, "--reset", stdout=buf)
+        self.assertIn("Removed 1 block process limits", buf.getvalue())
+        self.assertIsNone(redis.get("block-process-limit:SafeEventsIndexer"))
+
+    def test_benchmark_indexers(self):
+        command = "benchmark_indexers"
+        current_block_number = self.ethereum_client.current_block_number
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixture_path = os.path.join(tmp_dir, "fixture.json.gz")
+            output_path = os.path.join(tmp_dir, "output.json")
+            arguments = [
+                fixture_path,
+                "--from-block-number=0",
+                f"--to-block-number={current_block_number}",
+                "--indexers",
+                "safe_events",
+                "erc20",
+                "--use-configured-database",
+            ]
+
+            with self.assertRaisesMessage(CommandError, "Cannot load fixture"):
+                call_command(command, *arguments)
+
+            buf = StringIO()
+            call_command(
+                command,
+                *arguments,
+                f"--record-from-node={self.ethereum_client.w3.provider.endpoint_uri}",
+                stdout=buf,
+            )
+            self.assertIn("responses on fixture", buf.getvalue())
+            self.assertTrue(os.path.exists(fixture_path))
+
+            buf = StringIO()
+            call_command(command, *arguments, f"--output={output_path}", stdout=buf)
+            output = buf.getvalue()
+            self.assertNotIn("not recorded", output)
+            self.assertIn("safe_events:", output)
+            self.assertIn("erc20:", output)
+            self.assertIn("process_decoded_txs:", output)
+            with open(output_path) as f:
+                results = json.load(f)
+            self.assertEqual(
+                [result["name"] for result in results],
+                ["safe_events", "erc20", "process_decoded_txs"],
+            )
+            self.assertEqual(results[0]["blocks"], current_block_number + 1)
+
     def test_index_erc20(self):
         command = "index_erc20"
         buf = StringIO()
@@ -905,6 +973,69 @@ class TestCommands(SafeTestCaseMixin, TestCase):
         self.assertNotIn("is not matching", text)
         self.assertNotIn("is not valid for multisig transaction", text)
 
+    def test_validate_tx_integrity_checkpoint(self):
+        command = "validate_tx_integrity"
+        for _ in range(3):
+            safe_last_status = SafeLastStatusFactory(nonce=0)
+            MultisigTransactionFactory(
+                ethereum_tx=None, nonce=0, safe=safe_last_status.address
+            )
+        safe_tx_hashes = list(
+            MultisigTransaction.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, "checkpoint.json")
+            buf = StringIO()
+            call_command(
+                command,
+                "--batch-size=1",
+                "--workers=2",
+                f"--checkpoint-file={checkpoint_path}",
+                stdout=buf,
+            )
+            text = buf.getvalue()
+            self.assertIn("Found 3 transactions", text)
+            for safe_tx_hash in safe_tx_hashes:
+                self.assertIn(f"{safe_tx_hash} is not matching", text)
+            self.assertIn("Processed=3 Problems=3", text)
+            # Checkpoint is removed when completed
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+            # Resume from a checkpoint
+            with open(checkpoint_path, "w") as checkpoint_file:
+                json.dump(
+                    {
+                        "name": command,
+                        "last_pk": safe_tx_hashes[0],
+                        "processed": 1,
+                        "problems": 1,
+                        "batches": 1,
+                    },
+                    checkpoint_file,
+                )
+            buf = StringIO()
+            call_command(
+                command,
+                "--batch-size=1",
+                f"--checkpoint-file={checkpoint_path}",
+                stdout=buf,
+            )
+            text = buf.getvalue()
+            self.assertIn(f"Resuming {command} after pk={safe_tx_hashes[0]}", text)
+            self.assertNotIn(f"{safe_tx_hashes[0]} is not matching", text)
+            for safe_tx_hash in safe_tx_hashes[1:]:
+                self.assertIn(f"{safe_tx_hash} is not matching", text)
+            self.assertIn("Processed=3 Problems=3 First-bad-block=None Batches=3", text)
+
+            # Checkpoints from other commands are not used
+            with open(checkpoint_path, "w") as checkpoint_file:
+                json.dump({"name": "check_index_problems"}, checkpoint_file)
+            with self.assertRaisesMessage(CommandError, "check_index_problems"):
+                call_command(
+                    command, f"--checkpoint-file={checkpoint_path}", stdout=StringIO()
+                )
+
     def test_backfill_multisig_tx_payment(self):
         command = "backfill_multisig_tx_payment"
 
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from django.test import TestCase
+
+from hexbytes import HexBytes
+
+from ..indexers.element_already_processed_checker import (
+    ElementAlreadyProcessedChecker,
+)
+
+
+class TestElementAlreadyProcessedChecker(TestCase):
+    def test_get_key(self):
+        tx_hash = "0x" + "01" * 32
+        block_hash = "0x" + "02" * 32
+        key = ElementAlreadyProcessedChecker.get_key(tx_hash, block_hash, 3)
+        self.assertEqual(len(key), 68)
+        self.assertEqual(key, bytes.fromhex("01" * 32 + "02" * 32 + "00000003"))
+        # Same key for hex strings and bytes
+        self.assertEqual(
+            ElementAlreadyProcessedChecker.get_key(
+                HexBytes(tx_hash), HexBytes(block_hash), 3
+            ),
+            key,
+        )
+        # Missing block hash
+        self.assertEqual(
+            ElementAlreadyProcessedChecker.get_key(tx_hash, None, 0),
+            bytes.fromhex("01" * 32) + bytes(36),
+        )
+
+    def test_lru(self):
+        checker = ElementAlreadyProcessedChecker(
+            max_size_bytes=ElementAlreadyProcessedChecker.ENTRY_SIZE_BYTES * 2
+        )
+        tx_hashes = [HexBytes(bytes([i]) * 32) for i in range(3)]
+        self.assertTrue(checker.mark_as_processed(tx_hashes[0], None))
+        self.assertFalse(checker.mark_as_processed(tx_hashes[0], None))
+        self.assertTrue(checker.mark_as_processed(tx_hashes[1], None))
+        # Use first element, so second one is the least recently used
+        self.assertTrue(checker.is_processed(tx_hashes[0], None))
+        self.assertTrue(checker.mark_as_processed(tx_hashes[2], None))
+        self.assertEqual(len(checker), 2)
+        self.assertTrue(checker.is_processed(tx_hashes[0], None))
+        self.assertFalse(checker.is_processed(tx_hashes[1], None))
+        self.assertTrue(checker.is_processed(tx_hashes[2], None))
+
+        checker.clear()
+        self.assertEqual(len(checker), 0)
+
+    def test_filter_not_processed(self):
+        checker = ElementAlreadyProcessedChecker()
+        log_receipts = [
+            {
+                "transactionHash": HexBytes(bytes([i]) * 32),
+                "blockHash": HexBytes(bytes([i + 10]) * 32),
+                "logIndex": i,
+            }
+            for i in range(4)
+        ]
+        self.assertEqual(checker.filter_not_processed(log_receipts), log_receipts)
+        self.assertEqual(checker.mark_processed_many(log_receipts[:2]), 2)
+        self.assertEqual(checker.mark_processed_many(log_receipts[1:3]), 1)
+        self.assertEqual(checker.filter_not_processed(log_receipts), log_receipts[3:])
+        self.assertTrue(
+            checker.is_processed(
+                log_receipts[0]["transactionHash"], log_receipts[0]["blockHash"], 0
+            )
+        )
+        # Same transaction and block, different log index
+        self.assertFalse(
+            checker.is_processed(
+                log_receipts[0]["transactionHash"], log_receipts[0]["blockHash"], 1
+            )
+        )
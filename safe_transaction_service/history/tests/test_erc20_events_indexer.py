@@ -1,17 +1,30 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import os
+import tempfile
+from unittest import mock
+
 from django.test import TestCase
 
+from eth_account import Account
 from hexbytes import HexBytes
 from safe_eth.eth.tests.ethereum_test_case import EthereumTestCaseMixin
 
-from ..indexers import Erc20EventsIndexerProvider
+from ...tokens.services import TokenService
+from ...utils.sorted_address_set import SortedAddressSet
+from ..indexers import (
+    Erc20EventsIndexer,
+    Erc20EventsIndexerProvider,
+    FindRelevantElementsException,
+)
 from ..indexers.erc20_events_indexer import AddressesCache
 from ..models import (
     ERC20Transfer,
+    ERC721Ownership,
     EthereumBlock,
     EthereumTx,
     IndexingStatus,
     SafeRelevantTransaction,
+    SafeTokenLedger,
 )
 from .factories import EthereumTxFactory, SafeContractFactory
 from .mocks.mocks_erc20_events_indexer import log_receipt_mock
@@ -91,6 +104,63 @@ class TestErc20EventsIndexer(EthereumTestCaseMixin, TestCase):
         )[0]
         self.assertIn("value", event["args"])
 
+    def test_erc20_events_indexer_pipelined(self):
+        erc20_events_indexer = self.erc20_events_indexer
+        erc20_events_indexer.confirmations = 0
+        erc20_events_indexer.block_auto_process_limit = False
+        erc20_events_indexer.block_process_limit = 2
+        erc20_events_indexer.prefetch_ranges = 2
+
+        account = self.ethereum_test_account
+        amount = 10
+        erc20_contract = self.deploy_example_erc20(amount, account.address)
+
+        safe_contract = SafeContractFactory()
+        IndexingStatus.objects.set_erc20_721_indexing_status(0)
+        tx_hash = self.ethereum_client.erc20.send_tokens(
+            safe_contract.address, amount, erc20_contract.address, account.key
+        )
+        current_block_number = self.ethereum_client.current_block_number
+        self.assertEqual(
+            erc20_events_indexer.start(),
+            (1, current_block_number + 1),
+        )
+        self.assertEqual(
+            IndexingStatus.objects.get_erc20_721_indexing_status().block_number,
+            current_block_number + 1,
+        )
+        self.assertTrue(EthereumTx.objects.filter(tx_hash=tx_hash).exists())
+        self.assertEqual(
+            ERC20Transfer.objects.to_or_from(safe_contract.address).count(), 1
+        )
+
+    def test_process_addresses_pipelined_error(self):
+        erc20_events_indexer = self.erc20_events_indexer
+        erc20_events_indexer.confirmations = 0
+        erc20_events_indexer.block_auto_process_limit = False
+        erc20_events_indexer.block_process_limit = 10
+        erc20_events_indexer.prefetch_ranges = 1
+        IndexingStatus.objects.set_erc20_721_indexing_status(0)
+        addresses = {HexBytes(SafeContractFactory().address)}
+
+        with mock.patch.object(
+            Erc20EventsIndexer,
+            "find_relevant_elements",
+            side_effect=[[], FindRelevantElementsException()],
+        ):
+            results = erc20_events_indexer.process_addresses_pipelined(
+                addresses, current_block_number=100
+            )
+            self.assertEqual(next(results), ([], 0, 9, False))
+            with self.assertRaises(FindRelevantElementsException):
+                next(results)
+
+        # Only the range stored is marked as indexed, and block limit is halved after the error
+        self.assertEqual(
+            IndexingStatus.objects.get_erc20_721_indexing_status().block_number, 10
+        )
+        self.assertEqual(erc20_events_indexer.block_process_limit, 5)
+
     def test_element_already_processed_checker(self):
         # Create transaction in db so not fetching of transaction is needed
         for log_receipt in log_receipt_mock:
@@ -120,6 +190,54 @@ class TestErc20EventsIndexer(EthereumTestCaseMixin, TestCase):
             len(self.erc20_events_indexer.process_elements(log_receipt_mock)), 1
         )
 
+    def test_process_elements_bulk_copy(self):
+        for log_receipt in log_receipt_mock:
+            EthereumTxFactory(
+                tx_hash=log_receipt["transactionHash"],
+                block__block_hash=log_receipt["blockHash"],
+            )
+
+        erc20_events_indexer = self.erc20_events_indexer
+        self.assertFalse(erc20_events_indexer._use_bulk_copy(log_receipt_mock))
+        erc20_events_indexer.eth_erc20_bulk_copy_blocks_behind = 10
+        current_block_number = log_receipt_mock[0]["blockNumber"] + 10
+        with mock.patch.object(
+            type(erc20_events_indexer.ethereum_client),
+            "current_block_number",
+            new_callable=mock.PropertyMock,
+            return_value=current_block_number,
+        ):
+            self.assertFalse(erc20_events_indexer._use_bulk_copy(log_receipt_mock))
+            erc20_events_indexer.eth_erc20_bulk_copy_blocks_behind = 9
+            self.assertTrue(erc20_events_indexer._use_bulk_copy(log_receipt_mock))
+            self.assertFalse(erc20_events_indexer._use_bulk_copy([]))
+
+            with mock.patch.object(
+                ERC20Transfer.objects,
+                "bulk_copy_from_generator",
+                wraps=ERC20Transfer.objects.bulk_copy_from_generator,
+            ) as bulk_copy_from_generator_mock:
+                self.assertEqual(
+                    len(erc20_events_indexer.process_elements(log_receipt_mock)), 1
+                )
+                bulk_copy_from_generator_mock.assert_called_once()
+
+        self.assertEqual(ERC20Transfer.objects.count(), 1)
+        self.assertEqual(SafeRelevantTransaction.objects.count(), 2)
+
+        # Already stored events are not stored again
+        erc20_events_indexer.element_already_processed_checker.clear()
+        with mock.patch.object(
+            type(erc20_events_indexer.ethereum_client),
+            "current_block_number",
+            new_callable=mock.PropertyMock,
+            return_value=current_block_number,
+        ):
+            self.assertEqual(
+                len(erc20_events_indexer.process_elements(log_receipt_mock)), 0
+            )
+        self.assertEqual(ERC20Transfer.objects.count(), 1)
+
     def test_process_elements_reorged_block_is_flagged_not_confirmed(self):
         """
         A reorg can move an already-indexed tx to a new block. The event then
@@ -195,6 +313,194 @@ class TestErc20EventsIndexer(EthereumTestCaseMixin, TestCase):
         self.assertFalse(transfer._to_is_a_safe)
         self.assertTrue(transfer._from_is_a_safe)
 
+    def test_process_elements_safe_token_ledger(self):
+        log_receipt = log_receipt_mock[0]
+        EthereumTxFactory(
+            tx_hash=log_receipt["transactionHash"],
+            block__block_hash=log_receipt["blockHash"],
+        )
+        token_address = log_receipt["address"]
+        to = log_receipt["args"]["to"]
+        indexer = self.erc20_events_indexer
+
+        # Only Safes are stored on the ledger
+        indexer.addresses_cache = AddressesCache({HexBytes(to)}, None)
+        self.assertEqual(len(indexer.process_elements(log_receipt_mock)), 1)
+        self.assertEqual(
+            SafeTokenLedger.objects.get_for_safe(to),
+            [(token_address, 1, log_receipt["blockNumber"])],
+        )
+        self.assertEqual(SafeTokenLedger.objects.count(), 1)
+
+        # Reprocessing increments the counter, so balances cache is invalidated
+        indexer.element_already_processed_checker.clear()
+        indexer.process_elements(log_receipt_mock)
+        self.assertEqual(
+            SafeTokenLedger.objects.get_for_safe(to),
+            [(token_address, 2, log_receipt["blockNumber"])],
+        )
+
+    def test_process_elements_erc721_ownership(self):
+        log_receipt = log_receipt_mock[0]
+        EthereumTxFactory(
+            tx_hash=log_receipt["transactionHash"],
+            block__block_hash=log_receipt["blockHash"],
+        )
+        args = log_receipt["args"]
+        erc721_log_receipt = dict(
+            log_receipt, args={"from": args["from"], "to": args["to"], "tokenId": 5}
+        )
+        # Token sent back on a later event of the same transaction
+        erc721_log_receipt_back = dict(
+            log_receipt,
+            args={"from": args["to"], "to": args["from"], "tokenId": 5},
+            logIndex=log_receipt["logIndex"] + 1,
+        )
+        indexer = self.erc20_events_indexer
+        indexer.addresses_cache = AddressesCache({HexBytes(args["to"])}, None)
+        self.assertEqual(
+            len(
+                indexer.process_elements([erc721_log_receipt_back, erc721_log_receipt])
+            ),
+            2,
+        )
+        self.assertEqual(ERC721Ownership.objects.owned_by(args["to"]), ([], 0))
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(args["from"]),
+            ([(log_receipt["address"], 5)], 1),
+        )
+
+        # Metadata is prefetched for tokens received by Safes
+        indexer.collectibles_prefetch_metadata = True
+        indexer.element_already_processed_checker.clear()
+        with mock.patch(
+            "safe_transaction_service.history.tasks.prefetch_collectibles_metadata_task.delay"
+        ) as prefetch_collectibles_metadata_task_delay_mock:
+            indexer.process_elements([erc721_log_receipt])
+            prefetch_collectibles_metadata_task_delay_mock.assert_called_once_with(
+                [(log_receipt["address"], 5)]
+            )
+
+        # Tokens not stored in database are queued for creation
+        indexer.collectibles_prefetch_metadata = False
+        indexer.tokens_create = True
+        indexer.element_already_processed_checker.clear()
+        with mock.patch.object(
+            TokenService, "enqueue_tokens", return_value=1
+        ) as enqueue_tokens_mock:
+            indexer.process_elements([erc721_log_receipt])
+            enqueue_tokens_mock.assert_called_once_with([log_receipt["address"]])
+
+            # Token was already checked by the indexer
+            indexer.element_already_processed_checker.clear()
+            indexer.process_elements([erc721_log_receipt])
+            enqueue_tokens_mock.assert_called_once()
+
+    def test_filter_transfer_logs(self):
+        log_receipt = {
+            key: value for key, value in log_receipt_mock[0].items() if key != "args"
+        }
+        from_address = HexBytes(log_receipt_mock[0]["args"]["from"])
+        to_address = HexBytes(log_receipt_mock[0]["args"]["to"])
+        # Non standard `Transfer` event, addresses are not indexed
+        not_indexed_log_receipt = dict(
+            log_receipt, topics=log_receipt["topics"][:1], logIndex=1
+        )
+        transfer_logs = [log_receipt, not_indexed_log_receipt]
+
+        for addresses, expected in (
+            (set(), [not_indexed_log_receipt]),
+            ({from_address}, transfer_logs),
+            ({to_address}, transfer_logs),
+            (
+                SortedAddressSet(
+                    SortedAddressSet.HEADER.pack(SortedAddressSet.MAGIC, 0, 0),
+                    delta={to_address},
+                ),
+                transfer_logs,
+            ),
+            ({HexBytes(self.ethereum_test_account.address)}, [not_indexed_log_receipt]),
+        ):
+            with self.subTest(addresses=addresses):
+                self.assertEqual(
+                    Erc20EventsIndexer._filter_transfer_logs(transfer_logs, addresses),
+                    expected,
+                )
+
+    def test_erc20_events_indexer_not_filtering_in_node(self):
+        erc20_events_indexer = self.erc20_events_indexer
+        erc20_events_indexer.confirmations = 0
+        # Get every transfer event and filter them on the indexer
+        erc20_events_indexer.query_chunk_size = 0
+
+        account = self.ethereum_test_account
+        amount = 10
+        erc20_contract = self.deploy_example_erc20(amount, account.address)
+
+        safe_contract = SafeContractFactory()
+        IndexingStatus.objects.set_erc20_721_indexing_status(0)
+        tx_hash = self.ethereum_client.erc20.send_tokens(
+            safe_contract.address, amount // 2, erc20_contract.address, account.key
+        )
+        not_safe_tx_hash = self.ethereum_client.erc20.send_tokens(
+            Account.create().address,
+            amount // 2,
+            erc20_contract.address,
+            account.key,
+        )
+        self.assertEqual(
+            erc20_events_indexer.start(),
+            (1, self.ethereum_client.current_block_number + 1),
+        )
+        self.assertEqual(
+            ERC20Transfer.objects.to_or_from(safe_contract.address).count(), 1
+        )
+        self.assertTrue(EthereumTx.objects.filter(tx_hash=tx_hash).exists())
+        self.assertFalse(EthereumTx.objects.filter(tx_hash=not_safe_tx_hash).exists())
+
+    def test_get_almost_updated_addresses_snapshot(self):
+        safe_contract_1 = SafeContractFactory()
+        safe_contract_2 = SafeContractFactory()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            indexer = Erc20EventsIndexer(
+                self.ethereum_client,
+                eth_erc20_addresses_snapshot_path=os.path.join(tmp_dir, "safes.bin"),
+                eth_erc20_addresses_snapshot_max_delta=1,
+            )
+            expected_addresses = {
+                HexBytes(safe_contract_1.address),
+                HexBytes(safe_contract_2.address),
+            }
+            addresses = indexer.get_almost_updated_addresses(0)
+            self.assertIsInstance(addresses, SortedAddressSet)
+            self.assertEqual(addresses, expected_addresses)
+            self.assertEqual(addresses.delta, set())
+
+            # New Safes are added to the delta
+            safe_contract_3 = SafeContractFactory()
+            expected_addresses.add(HexBytes(safe_contract_3.address))
+            addresses = indexer.get_almost_updated_addresses(0)
+            self.assertEqual(addresses, expected_addresses)
+            self.assertEqual(addresses.delta, {HexBytes(safe_contract_3.address)})
+
+            # Another indexer uses the same snapshot
+            other_indexer = Erc20EventsIndexer(
+                self.ethereum_client,
+                eth_erc20_addresses_snapshot_path=os.path.join(tmp_dir, "safes.bin"),
+                eth_erc20_addresses_snapshot_max_delta=1,
+            )
+            self.assertEqual(
+                other_indexer.get_almost_updated_addresses(0), expected_addresses
+            )
+
+            # When delta is too big, snapshot is written again
+            safe_contract_4 = SafeContractFactory()
+            expected_addresses.add(HexBytes(safe_contract_4.address))
+            self.assertEqual(len(indexer.get_almost_updated_addresses(0).delta), 2)
+            addresses = indexer.get_almost_updated_addresses(0)
+            self.assertEqual(addresses, expected_addresses)
+            self.assertLessEqual(len(addresses.delta), 1)
+
     def test_get_almost_updated_addresses(self):
         self.assertIsNone(self.erc20_events_indexer.addresses_cache)
         self.assertEqual(
@@ -5,17 +5,21 @@ from unittest.mock import PropertyMock
 from django.test import TestCase
 
 from eth_account import Account
+from hexbytes import HexBytes
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from safe_eth.eth import EthereumClient
 from safe_eth.eth.tests.ethereum_test_case import EthereumTestCaseMixin
 from safe_eth.eth.utils import fast_keccak_text
 
 from ..models import (
+    SAFE_PARTITIONS,
     EthereumTx,
+    IndexingShard,
     IndexingStatus,
     MultisigTransaction,
     SafeLastStatus,
     SafeStatus,
+    get_shard_partitions,
 )
 from ..services.index_service import (
     IndexService,
@@ -127,6 +131,136 @@ class TestIndexService(EthereumTestCaseMixin, TestCase):
         current_block_number_mock.side_effect = RequestsConnectionError
         self.assertFalse(self.index_service.is_service_synced())
 
+    def test_safe_events_backfill_shards(self):
+        index_service: IndexService = self.index_service
+        safe_master_copy = SafeMasterCopyFactory(l2=True, tx_block_number=10)
+        not_l2_safe_master_copy = SafeMasterCopyFactory(l2=False, tx_block_number=10)
+
+        self.assertIsNone(index_service.merge_safe_events_backfill_shards())
+        self.assertEqual(
+            index_service.create_safe_events_backfill_shards(10, 5, 10), []
+        )
+        shards = index_service.create_safe_events_backfill_shards(10, 39, 10)
+        self.assertEqual(len(shards), 3)
+        # Backfill already running
+        self.assertEqual(
+            index_service.create_safe_events_backfill_shards(10, 39, 10), []
+        )
+
+        with mock.patch.object(
+            IndexService, "_reindex", return_value=2
+        ) as reindex_mock:
+            self.assertEqual(
+                index_service.process_safe_events_backfill_shard(shards[1].id), 2
+            )
+            self.assertEqual(reindex_mock.call_args.args[1], 20)
+            self.assertEqual(reindex_mock.call_args.kwargs["to_block_number"], 29)
+            # Progress is stored for the shard after every block range
+            reindex_mock.call_args.kwargs["on_block_range_processed"](20, 29)
+            self.assertTrue(IndexingShard.objects.get(pk=shards[1].id).finished)
+
+            # Finished shards are not processed again
+            reindex_mock.reset_mock()
+            self.assertEqual(
+                index_service.process_safe_events_backfill_shard(shards[1].id), 0
+            )
+            reindex_mock.assert_not_called()
+
+        # First shard is not finished, master copies cannot be advanced
+        self.assertIsNone(index_service.merge_safe_events_backfill_shards())
+        safe_master_copy.refresh_from_db()
+        self.assertEqual(safe_master_copy.tx_block_number, 10)
+
+        IndexingShard.objects.set_block_number(shards[0].id, 20)
+        self.assertEqual(index_service.merge_safe_events_backfill_shards(), 30)
+        safe_master_copy.refresh_from_db()
+        self.assertEqual(safe_master_copy.tx_block_number, 30)
+        self.assertEqual(IndexingShard.objects.count(), 3)
+
+        IndexingShard.objects.set_block_number(shards[2].id, 40)
+        self.assertEqual(index_service.merge_safe_events_backfill_shards(), 40)
+        safe_master_copy.refresh_from_db()
+        self.assertEqual(safe_master_copy.tx_block_number, 40)
+        # Only L2 master copies are indexed using events
+        not_l2_safe_master_copy.refresh_from_db()
+        self.assertEqual(not_l2_safe_master_copy.tx_block_number, 10)
+        # Shards are removed when backfill is finished
+        self.assertFalse(IndexingShard.objects.exists())
+
+    def test_process_decoded_txs_for_partitions(self):
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_partitions(
+                range(SAFE_PARTITIONS)
+            ),
+            0,
+        )
+        internal_txs_decoded = InternalTxDecodedFactory.create_batch(
+            6, function_name="setup"
+        )
+        processed = sum(
+            self.index_service.process_decoded_txs_for_partitions(
+                get_shard_partitions(shard, 2)
+            )
+            for shard in range(2)
+        )
+        self.assertEqual(processed, len(internal_txs_decoded))
+        for internal_tx_decoded in internal_txs_decoded:
+            internal_tx_decoded.refresh_from_db()
+            self.assertTrue(internal_tx_decoded.processed)
+
+        # Only Safes on the partitions are processed
+        internal_tx_decoded = InternalTxDecodedFactory(function_name="setup")
+        partition = HexBytes(internal_tx_decoded.safe_address)[-1]
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_partitions(
+                [(partition + 1) % SAFE_PARTITIONS]
+            ),
+            0,
+        )
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_partitions([partition]), 1
+        )
+
+    def test_process_decoded_txs_safe_events_backfill_running(self):
+        shards = self.index_service.create_safe_events_backfill_shards(10, 39, 10)
+        IndexingShard.objects.set_block_number(shards[0].id, 20)
+        IndexingShard.objects.set_block_number(shards[1].id, 25)
+        # Merge boundary is the first block not processed by the second shard
+        below_internal_tx_decoded = InternalTxDecodedFactory(
+            function_name="setup", internal_tx__block_number=24
+        )
+        above_internal_tx_decoded = InternalTxDecodedFactory(
+            function_name="setup", internal_tx__block_number=25
+        )
+
+        self.assertEqual(self.index_service.process_all_decoded_txs(), 1)
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_partitions(
+                range(SAFE_PARTITIONS)
+            ),
+            0,
+        )
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_safe(
+                above_internal_tx_decoded.safe_address
+            ),
+            0,
+        )
+        below_internal_tx_decoded.refresh_from_db()
+        self.assertTrue(below_internal_tx_decoded.processed)
+        above_internal_tx_decoded.refresh_from_db()
+        self.assertFalse(above_internal_tx_decoded.processed)
+
+        # When backfill is finished every decoded tx can be processed
+        IndexingShard.objects.set_block_number(shards[1].id, 30)
+        IndexingShard.objects.set_block_number(shards[2].id, 40)
+        self.assertEqual(
+            self.index_service.process_decoded_txs_for_safe(
+                above_internal_tx_decoded.safe_address
+            ),
+            1,
+        )
+
     def test_process_decoded_txs_for_safe(self):
         safe_address = Account.create().address
         with mock.patch.object(
@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from unittest import mock
+from unittest.mock import MagicMock
+
+from django.test import TestCase
+
+import requests
+
+from safe_transaction_service.utils.redis import get_redis
+
+from ..services.metadata_fetcher import (
+    MetadataFetcher,
+    MetadataRetrievalException,
+    MetadataRetrievalExceptionTimeout,
+)
+
+
+class TestMetadataFetcher(TestCase):
+    def setUp(self) -> None:
+        get_redis().flushall()
+        self.metadata_fetcher = MetadataFetcher(
+            get_redis(),
+            max_concurrency=10,
+            max_concurrency_per_host=2,
+            request_timeout=5,
+            max_content_length=1024,
+            circuit_breaker_failures=2,
+            circuit_breaker_seconds=60,
+            negative_cache_seconds=60,
+            negative_cache_max_seconds=100,
+        )
+
+    def tearDown(self) -> None:
+        get_redis().flushall()
+
+    def _build_response(self, status_code: int, json_content=None) -> MagicMock:
+        response = MagicMock(
+            status_code=status_code,
+            ok=status_code < 400,
+            headers={"content-type": "application/json"},
+            content=b"{}",
+        )
+        response.json.return_value = json_content
+        return response
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retrieve(self, get_mock: MagicMock):
+        uri = "https://random-address.org/info-1.json"
+        metadata = {"name": "Gust"}
+        get_mock.return_value.__enter__.return_value = self._build_response(
+            200, metadata
+        )
+        self.assertEqual(self.metadata_fetcher.retrieve(uri), metadata)
+        get_mock.assert_called_once_with(uri, timeout=5, stream=True)
+
+        get_mock.return_value.__enter__.return_value.headers = {
+            "content-type": "application/json",
+            "content-length": "2048",
+        }
+        with self.assertRaisesMessage(MetadataRetrievalException, "too big"):
+            self.metadata_fetcher.retrieve(uri)
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retrieve_negative_cache(self, get_mock: MagicMock):
+        uri = "https://random-address.org/info-1.json"
+        get_mock.return_value.__enter__.return_value = self._build_response(404)
+        with self.assertRaisesMessage(MetadataRetrievalException, uri):
+            self.metadata_fetcher.retrieve(uri)
+        self.assertEqual(self.metadata_fetcher._get_uri_failures(uri)[0], 1)
+
+        # Uri is not requested again until backoff expires
+        with self.assertRaisesMessage(MetadataRetrievalException, "failed recently"):
+            self.metadata_fetcher.retrieve(uri)
+        self.assertEqual(get_mock.call_count, 1)
+
+        # Backoff is doubled on every failure
+        with mock.patch("time.time", return_value=0):
+            for failures in range(1, 4):
+                self.metadata_fetcher._store_uri_failure(uri, failures)
+                self.assertEqual(
+                    self.metadata_fetcher._get_uri_failures(uri),
+                    (failures + 1, min(60 * 2**failures, 100)),
+                )
+
+        # Negative cache is removed when uri is retrieved
+        get_redis().set(self.metadata_fetcher.get_negative_cache_key(uri), "[3, 0]")
+        get_mock.return_value.__enter__.return_value = self._build_response(
+            200, {"name": "Gust"}
+        )
+        self.assertEqual(self.metadata_fetcher.retrieve(uri), {"name": "Gust"})
+        self.assertEqual(self.metadata_fetcher._get_uri_failures(uri), (0, 0.0))
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retrieve_circuit_breaker(self, get_mock: MagicMock):
+        uri = "https://random-address.org/info-1.json"
+        other_host_uri = "https://other-address.org/info-1.json"
+        get_mock.side_effect = requests.exceptions.ConnectTimeout
+        for _ in range(2):
+            with self.assertRaises(MetadataRetrievalExceptionTimeout):
+                self.metadata_fetcher.retrieve(uri)
+        self.assertEqual(get_mock.call_count, 2)
+        self.assertTrue(self.metadata_fetcher.is_circuit_open("random-address.org"))
+
+        # Host is not requested while circuit is open
+        with self.assertRaisesMessage(
+            MetadataRetrievalExceptionTimeout, "failed recently"
+        ):
+            self.metadata_fetcher.retrieve(uri)
+        self.assertEqual(get_mock.call_count, 2)
+
+        # Other hosts are not affected
+        get_mock.side_effect = None
+        get_mock.return_value.__enter__.return_value = self._build_response(503)
+        with self.assertRaisesMessage(MetadataRetrievalExceptionTimeout, "503"):
+            self.metadata_fetcher.retrieve(other_host_uri)
+        self.assertEqual(get_mock.call_count, 3)
+        self.assertFalse(self.metadata_fetcher.is_circuit_open("other-address.org"))
+        # Timeouts are not stored on the negative cache
+        self.assertEqual(
+            self.metadata_fetcher._get_uri_failures(other_host_uri), (0, 0.0)
+        )
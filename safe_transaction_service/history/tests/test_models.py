@@ -11,6 +11,7 @@ from django.test import TestCase
 from django.utils import timezone
 
 from eth_account import Account
+from hexbytes import HexBytes
 from safe_eth.eth.utils import fast_keccak_text
 from safe_eth.safe.safe_signature import SafeSignatureType
 
@@ -20,12 +21,15 @@ from safe_transaction_service.contracts.tests.factories import ContractFactory
 
 from ...tokens.tests.factories import TokenFactory
 from ..models import (
+    SAFE_PARTITIONS,
     ERC20Transfer,
+    ERC721Ownership,
     ERC721Transfer,
     EthereumBlock,
     EthereumBlockManager,
     EthereumTx,
     EthereumTxCallType,
+    IndexingShard,
     IndexingStatus,
     InternalTx,
     InternalTxDecoded,
@@ -36,6 +40,7 @@ from ..models import (
     SafeLastStatus,
     SafeMasterCopy,
     SafeStatus,
+    SafeTokenLedger,
 )
 from ..utils import clean_receipt_log
 from .factories import (
@@ -145,6 +150,134 @@ class TestModelMixins(TestCase):
             number,
         )
 
+    def test_bulk_copy(self):
+        self.assertEqual(ERC20Transfer.objects.bulk_copy([]), [])
+
+        number = 5
+        erc20_transfers = ERC20TransferFactory.build_batch(
+            number, ethereum_tx=EthereumTxFactory()
+        )
+
+        with mock.patch(
+            "safe_transaction_service.history.models.post_bulk_create.send"
+        ) as send_mock:
+            inserted = ERC20Transfer.objects.bulk_copy(erc20_transfers[:2])
+            self.assertEqual(inserted, erc20_transfers[:2])
+            self.assertEqual(send_mock.call_count, 2)
+            send_mock.reset_mock()
+
+            # Conflicting transfers are ignored and signal is not sent for them
+            inserted = ERC20Transfer.objects.bulk_copy(erc20_transfers)
+            self.assertEqual(inserted, erc20_transfers[2:])
+            self.assertEqual(send_mock.call_count, number - 2)
+            for call, erc20_transfer in zip(
+                send_mock.call_args_list, erc20_transfers[2:], strict=True
+            ):
+                self.assertEqual(call.kwargs["instance"], erc20_transfer)
+
+        self.assertEqual(ERC20Transfer.objects.count(), number)
+        for erc20_transfer in erc20_transfers:
+            self.assertIsNotNone(erc20_transfer.pk)
+            db_erc20_transfer = ERC20Transfer.objects.get(pk=erc20_transfer.pk)
+            self.assertEqual(db_erc20_transfer.to, erc20_transfer.to)
+            self.assertEqual(db_erc20_transfer.value, erc20_transfer.value)
+            self.assertEqual(db_erc20_transfer.log_index, erc20_transfer.log_index)
+
+    def test_bulk_insert_ignore_conflicts(self):
+        self.assertEqual(InternalTx.objects.bulk_insert_ignore_conflicts([]), [])
+
+        stored_internal_tx = InternalTxFactory()
+        internal_txs = [
+            InternalTxFactory.build(
+                ethereum_tx=stored_internal_tx.ethereum_tx,
+                trace_address=stored_internal_tx.trace_address,
+            ),
+            InternalTxFactory.build(ethereum_tx=stored_internal_tx.ethereum_tx),
+            InternalTxFactory.build(),
+        ]
+        internal_txs[2].ethereum_tx.block.save()
+        internal_txs[2].ethereum_tx.save()
+        with mock.patch(
+            "safe_transaction_service.history.models.post_bulk_create.send"
+        ) as send_mock:
+            inserted = InternalTx.objects.bulk_insert_ignore_conflicts(internal_txs)
+            self.assertEqual(inserted, internal_txs[1:])
+            self.assertEqual(send_mock.call_count, 2)
+
+        self.assertIsNone(internal_txs[0].pk)
+        self.assertEqual(InternalTx.objects.count(), 3)
+        for internal_tx in inserted:
+            db_internal_tx = InternalTx.objects.get(pk=internal_tx.pk)
+            self.assertEqual(db_internal_tx.ethereum_tx_id, internal_tx.ethereum_tx_id)
+            self.assertEqual(db_internal_tx.trace_address, internal_tx.trace_address)
+            self.assertEqual(db_internal_tx.value, internal_tx.value)
+
+    def test_bulk_copy_from_generator(self):
+        number = 5
+        erc20_transfers = ERC20TransferFactory.build_batch(
+            number, ethereum_tx=EthereumTxFactory()
+        )
+        self.assertEqual(
+            ERC20Transfer.objects.bulk_copy_from_generator(
+                (x for x in erc20_transfers), batch_size=2
+            ),
+            number,
+        )
+        self.assertEqual(
+            ERC20Transfer.objects.bulk_copy_from_generator(
+                (x for x in erc20_transfers), batch_size=2
+            ),
+            0,
+        )
+        self.assertEqual(ERC20Transfer.objects.count(), number)
+
+
+class TestIndexingShard(TestCase):
+    def test_indexing_shard(self):
+        self.assertIsNone(IndexingShard.objects.get_merge_boundary())
+        shards = IndexingShard.objects.create_shards(10, 34, 10)
+        self.assertEqual(
+            [(shard.from_block_number, shard.to_block_number) for shard in shards],
+            [(10, 19), (20, 29), (30, 34)],
+        )
+        self.assertEqual(
+            str(shards[0]), "Shard from-block-number=10 to-block-number=19 - 10"
+        )
+        self.assertEqual(IndexingShard.objects.not_finished().count(), 3)
+        self.assertEqual(IndexingShard.objects.get_merge_boundary(), 10)
+
+        # Merge boundary cannot advance over a shard not finished
+        self.assertTrue(IndexingShard.objects.set_block_number(shards[1].id, 30))
+        self.assertEqual(IndexingShard.objects.get_merge_boundary(), 10)
+        self.assertTrue(IndexingShard.objects.set_block_number(shards[0].id, 15))
+        self.assertEqual(IndexingShard.objects.get_merge_boundary(), 15)
+        # Progress cannot go backwards
+        self.assertFalse(IndexingShard.objects.set_block_number(shards[0].id, 12))
+        self.assertTrue(IndexingShard.objects.set_block_number(shards[0].id, 20))
+        self.assertEqual(IndexingShard.objects.get_merge_boundary(), 30)
+
+        self.assertTrue(IndexingShard.objects.set_block_number(shards[2].id, 35))
+        self.assertTrue(IndexingShard.objects.get(pk=shards[2].id).finished)
+        self.assertFalse(IndexingShard.objects.not_finished().exists())
+        self.assertEqual(IndexingShard.objects.get_merge_boundary(), 35)
+
+    def test_stale(self):
+        shards = IndexingShard.objects.create_shards(10, 39, 10)
+        self.assertFalse(IndexingShard.objects.stale(10).exists())
+        IndexingShard.objects.update(
+            modified=timezone.now() - datetime.timedelta(minutes=15)
+        )
+        self.assertEqual(IndexingShard.objects.stale(10).count(), 3)
+        self.assertFalse(IndexingShard.objects.stale(20).exists())
+
+        # Storing progress for a shard or finishing it makes it not stale
+        IndexingShard.objects.set_block_number(shards[0].id, 15)
+        IndexingShard.objects.filter(pk=shards[1].id).update(block_number=30)
+        self.assertEqual(
+            list(IndexingShard.objects.stale(10).values_list("id", flat=True)),
+            [shards[2].id],
+        )
+
 
 class TestIndexingStatus(TestCase):
     def test_indexing_status(self):
@@ -571,6 +704,164 @@ class TestTokenTransfer(TestCase):
         )
 
 
+class TestERC721Ownership(TestCase):
+    def test_add_transfers(self):
+        owner = Account.create().address
+        other_owner = Account.create().address
+        token_address = Account.create().address
+        self.assertEqual(ERC721Ownership.objects.add_transfers({}), 0)
+        self.assertEqual(ERC721Ownership.objects.owned_by(owner), ([], 0))
+
+        self.assertEqual(
+            ERC721Ownership.objects.add_transfers(
+                {
+                    (token_address, 2): (owner, 10, 1),
+                    (token_address, 1): (owner, 5, 0),
+                }
+            ),
+            2,
+        )
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner),
+            ([(token_address, 1), (token_address, 2)], 2),
+        )
+
+        # Older transfers are ignored
+        ERC721Ownership.objects.add_transfers(
+            {(token_address, 2): (other_owner, 10, 0)}, batch_size=1
+        )
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner, limit=1, offset=1),
+            ([(token_address, 2)], 2),
+        )
+
+        ERC721Ownership.objects.add_transfers(
+            {(token_address, 2): (other_owner, 10, 2)}
+        )
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner), ([(token_address, 1)], 1)
+        )
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(other_owner), ([(token_address, 2)], 1)
+        )
+
+    def test_owned_by_trusted_spam(self):
+        owner = Account.create().address
+        token_address = Account.create().address
+        ERC721Ownership.objects.add_transfers(
+            {
+                (token_address, 1): (owner, 1, 0),
+                (Account.create().address, 1): (owner, 1, 1),
+            }
+        )
+        token = TokenFactory(address=token_address, spam=True)
+        self.assertEqual(ERC721Ownership.objects.owned_by(owner)[1], 2)
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner, exclude_spam=True)[1], 1
+        )
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner, only_trusted=True)[1], 0
+        )
+        token.trusted = True
+        token.spam = False
+        token.save(update_fields=["trusted", "spam"])
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner, only_trusted=True),
+            ([(token_address, 1)], 1),
+        )
+
+    def test_rebuild_and_rewind(self):
+        owner = Account.create().address
+        other_owner = Account.create().address
+        ethereum_block = EthereumBlockFactory(number=100_000)
+        reorg_ethereum_block = EthereumBlockFactory(number=100_002)
+        erc721_transfer = ERC721TransferFactory(
+            to=owner, ethereum_tx__block=ethereum_block
+        )
+        ERC721TransferFactory(
+            _from=owner,
+            to=other_owner,
+            address=erc721_transfer.address,
+            token_id=erc721_transfer.token_id,
+            ethereum_tx__block=reorg_ethereum_block,
+        )
+        ERC721TransferFactory(to=other_owner, ethereum_tx__block=reorg_ethereum_block)
+
+        self.assertEqual(ERC721Ownership.objects.rebuild(), 2)
+        self.assertEqual(ERC721Ownership.objects.owned_by(owner), ([], 0))
+        self.assertEqual(ERC721Ownership.objects.owned_by(other_owner)[1], 2)
+
+        # Nothing to rewind
+        self.assertEqual(ERC721Ownership.objects.rewind(100_003), 0)
+
+        # Remove the transfers of the block, as a reorg would do
+        reorg_ethereum_block.delete()
+        self.assertEqual(ERC721Ownership.objects.rewind(100_001), 2)
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(owner),
+            ([(erc721_transfer.address, int(erc721_transfer.token_id))], 1),
+        )
+        self.assertEqual(ERC721Ownership.objects.owned_by(other_owner), ([], 0))
+        self.assertEqual(ERC721Ownership.objects.count(), 1)
+
+
+class TestSafeTokenLedger(TestCase):
+    def test_add_transfers(self):
+        safe_address = Account.create().address
+        token_address = Account.create().address
+        other_token_address = Account.create().address
+        self.assertEqual(SafeTokenLedger.objects.add_transfers({}), 0)
+        self.assertEqual(SafeTokenLedger.objects.get_for_safe(safe_address), [])
+
+        self.assertEqual(
+            SafeTokenLedger.objects.add_transfers(
+                {
+                    (safe_address, token_address): (2, 10),
+                    (safe_address, other_token_address): (1, 5),
+                }
+            ),
+            2,
+        )
+        self.assertEqual(
+            SafeTokenLedger.objects.add_transfers(
+                {(safe_address, token_address): (3, 8)}, batch_size=1
+            ),
+            1,
+        )
+        self.assertCountEqual(
+            SafeTokenLedger.objects.get_for_safe(safe_address),
+            [(token_address, 5, 10), (other_token_address, 1, 5)],
+        )
+
+    def test_rebuild(self):
+        safe_address = SafeContractFactory().address
+        other_safe_address = SafeContractFactory().address
+        token_address = Account.create().address
+        ERC20TransferFactory(to=safe_address, address=token_address, block_number=5)
+        ERC20TransferFactory(_from=safe_address, address=token_address, block_number=7)
+        ERC20TransferFactory(to=other_safe_address, address=token_address)
+        # Not a Safe
+        ERC20TransferFactory(address=token_address)
+
+        self.assertEqual(SafeTokenLedger.objects.rebuild([safe_address]), 1)
+        self.assertEqual(
+            SafeTokenLedger.objects.get_for_safe(safe_address),
+            [(token_address, 2, 7)],
+        )
+        self.assertEqual(SafeTokenLedger.objects.get_for_safe(other_safe_address), [])
+
+        # Stored counters are replaced
+        SafeTokenLedger.objects.add_transfers({(safe_address, token_address): (5, 9)})
+        self.assertEqual(SafeTokenLedger.objects.rebuild(), 2)
+        self.assertEqual(
+            SafeTokenLedger.objects.get_for_safe(safe_address),
+            [(token_address, 2, 7)],
+        )
+        self.assertEqual(
+            len(SafeTokenLedger.objects.get_for_safe(other_safe_address)), 1
+        )
+
+
 class TestInternalTx(TestCase):
     def test_ether_and_token_txs(self):
         ethereum_address = Account.create().address
@@ -738,6 +1029,26 @@ class TestInternalTx(TestCase):
         self.assertEqual(InternalTx.objects.count(), 2)
         self.assertEqual(InternalTxDecoded.objects.get().internal_tx, new_internal_tx)
 
+        # InternalTxs are not stored one by one if there are conflicts
+        another_internal_tx = InternalTxFactory.build(
+            ethereum_tx=stored_internal_tx.ethereum_tx
+        )
+        another_internal_tx_decoded = InternalTxDecodedFactory.build(
+            internal_tx=another_internal_tx
+        )
+        with mock.patch.object(InternalTx, "save") as save_mock:
+            stored = InternalTx.objects.store_internal_txs_and_decoded_in_db(
+                [stored_internal_tx, new_internal_tx, another_internal_tx],
+                [another_internal_tx_decoded],
+            )
+            save_mock.assert_not_called()
+        self.assertEqual(stored, [another_internal_tx])
+        self.assertEqual(InternalTx.objects.count(), 3)
+        self.assertEqual(
+            InternalTxDecoded.objects.get(internal_tx=another_internal_tx),
+            another_internal_tx_decoded,
+        )
+
     def test_get_parent_child(self):
         i = InternalTxFactory(trace_address="0")
         self.assertIsNone(i.get_parent())
@@ -758,6 +1069,62 @@ class TestInternalTx(TestCase):
 
 
 class TestInternalTxDecoded(TestCase):
+    def test_for_shard(self):
+        shards = 3
+        internal_txs_decoded = InternalTxDecodedFactory.create_batch(10)
+        internal_txs_decoded_by_shard = [
+            list(InternalTxDecoded.objects.for_shard(shard, shards))
+            for shard in range(shards)
+        ]
+        self.assertCountEqual(
+            [
+                internal_tx_decoded
+                for shard_internal_txs_decoded in internal_txs_decoded_by_shard
+                for internal_tx_decoded in shard_internal_txs_decoded
+            ],
+            internal_txs_decoded,
+        )
+        for shard, shard_internal_txs_decoded in enumerate(
+            internal_txs_decoded_by_shard
+        ):
+            for internal_tx_decoded in shard_internal_txs_decoded:
+                self.assertEqual(
+                    HexBytes(internal_tx_decoded.safe_address)[-1] % shards, shard
+                )
+
+        # Every transaction for a Safe is on the same shard
+        safe_address = internal_txs_decoded[0].safe_address
+        InternalTxDecodedFactory(internal_tx___from=safe_address)
+        self.assertEqual(
+            sum(
+                InternalTxDecoded.objects.for_shard(shard, shards)
+                .for_safe(safe_address)
+                .count()
+                > 0
+                for shard in range(shards)
+            ),
+            1,
+        )
+
+        with self.assertRaises(AssertionError):
+            InternalTxDecoded.objects.for_shard(shards, shards)
+
+        # Partitions don't depend on the number of shards
+        partition = HexBytes(safe_address)[-1]
+        self.assertEqual(
+            InternalTxDecoded.objects.for_partitions([partition])
+            .for_safe(safe_address)
+            .count(),
+            2,
+        )
+        self.assertFalse(
+            InternalTxDecoded.objects.for_partitions(
+                [(partition + 1) % SAFE_PARTITIONS]
+            )
+            .for_safe(safe_address)
+            .exists()
+        )
+
     def test_order_by_processing_queue(self):
         self.assertQuerySetEqual(
             InternalTxDecoded.objects.order_by_processing_queue(), []
@@ -876,6 +1243,33 @@ class TestInternalTxDecoded(TestCase):
         )
         self.assertTrue(InternalTxDecoded.objects.out_of_order_for_safe(random_safe))
 
+    def test_out_of_order_for_safes(self):
+        self.assertEqual(InternalTxDecoded.objects.out_of_order_for_safes([]), set())
+        safe_in_order, safe_out_of_order, safe_not_processed = (
+            Account.create().address for _ in range(3)
+        )
+        for safe_address, seconds in ((safe_in_order, 1), (safe_out_of_order, -1)):
+            processed = InternalTxDecodedFactory(
+                internal_tx___from=safe_address, processed=True
+            )
+            InternalTxDecodedFactory(
+                internal_tx___from=safe_address,
+                processed=False,
+                internal_tx__timestamp=processed.internal_tx.timestamp
+                + datetime.timedelta(seconds=seconds),
+            )
+        InternalTxDecodedFactory(internal_tx___from=safe_not_processed, processed=False)
+
+        safe_addresses = [safe_in_order, safe_out_of_order, safe_not_processed]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                InternalTxDecoded.objects.out_of_order_for_safes(safe_addresses),
+                {safe_out_of_order},
+            )
+        self.assertEqual(
+            InternalTxDecoded.objects.out_of_order_for_safes([safe_in_order]), set()
+        )
+
 
 class TestLastSafeStatus(TestCase):
     def test_insert(self):
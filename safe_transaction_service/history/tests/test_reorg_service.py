@@ -7,6 +7,7 @@ from django.test import TestCase
 from safe_eth.eth import EthereumClient
 
 from ..models import (
+    ERC721Ownership,
     EthereumBlock,
     EthereumTx,
     IndexingStatus,
@@ -16,6 +17,7 @@ from ..models import (
 )
 from ..services import ReorgServiceProvider
 from .factories import (
+    ERC721TransferFactory,
     EthereumBlockFactory,
     EthereumTxFactory,
     MultisigTransactionFactory,
@@ -120,9 +122,25 @@ class TestReorgService(TestCase):
             tx_block_number=master_copies_status
         )  # Should be updated
         proxy_factory = ProxyFactoryFactory(tx_block_number=reorg_block)
+        # ERC721 token received before the reorg and sent after it
+        erc721_transfer = ERC721TransferFactory(ethereum_tx=ethereum_txs[0])
+        ERC721TransferFactory(
+            ethereum_tx=ethereum_txs[3],
+            _from=erc721_transfer.to,
+            address=erc721_transfer.address,
+            token_id=erc721_transfer.token_id,
+        )
+        ERC721Ownership.objects.rebuild()
+        self.assertEqual(ERC721Ownership.objects.owned_by(erc721_transfer.to), ([], 0))
 
         self.reorg_service.recover_from_reorg(reorg_block)
 
+        # Check ERC721 ownership was rewound
+        self.assertEqual(
+            ERC721Ownership.objects.owned_by(erc721_transfer.to),
+            ([(erc721_transfer.address, int(erc721_transfer.token_id))], 1),
+        )
+
         # Check that blocks and ethereum txs were deleted
         self.assertEqual(EthereumBlock.objects.count(), 2)
         self.assertEqual(
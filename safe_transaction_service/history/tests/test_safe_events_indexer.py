@@ -22,7 +22,12 @@ from web3.auto import w3
 from web3.datastructures import AttributeDict
 from web3.types import LogReceipt
 
+from ...utils.redis import get_redis
 from ..indexers import SafeEventsIndexer, SafeEventsIndexerProvider
+from ..indexers.block_process_limit_controller import (
+    AimdBlockProcessLimitController,
+    get_stored_block_process_limits,
+)
 from ..indexers.tx_processor import SafeTxProcessor
 from ..models import (
     EthereumTx,
@@ -778,25 +783,72 @@ class SafeEventsIndexerBaseAbstractTestBase(SafeTestCaseMixin, TestCase, ABC):
         )
 
     def test_auto_adjust_block_limit(self):
+        self.safe_events_indexer.block_process_limit_controller = (
+            AimdBlockProcessLimitController(target_elements=10)
+        )
         self.safe_events_indexer.block_process_limit = 1
-        self.safe_events_indexer.block_process_limit_max = 5
+        self.safe_events_indexer.block_process_limit_max = 30
         with self.safe_events_indexer.auto_adjust_block_limit(100, 100):
             pass
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 21)
 
-        self.assertEqual(self.safe_events_indexer.block_process_limit, 2)
-
-        with self.safe_events_indexer.auto_adjust_block_limit(100, 101):
+        # Range is smaller than the limit, so it cannot be increased
+        with self.safe_events_indexer.auto_adjust_block_limit(100, 110):
             pass
-        self.assertEqual(self.safe_events_indexer.block_process_limit, 4)
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 21)
 
         # Check it cannot go further than `block_process_limit_max`
-        with self.safe_events_indexer.auto_adjust_block_limit(100, 103):
+        with self.safe_events_indexer.auto_adjust_block_limit(100, 120):
             pass
-        self.assertEqual(self.safe_events_indexer.block_process_limit, 5)
-
-        with self.safe_events_indexer.auto_adjust_block_limit(100, 104):
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 30)
+
+        # Too many elements returned, decrease just enough to meet the budget
+        with self.safe_events_indexer.auto_adjust_block_limit(
+            100, 129
+        ) as block_range_measure:
+            block_range_measure.elements = 15
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 20)
+
+        # But never more than half
+        with self.safe_events_indexer.auto_adjust_block_limit(
+            100, 119
+        ) as block_range_measure:
+            block_range_measure.elements = 100
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 10)
+
+        # Auto adjustment disabled
+        self.safe_events_indexer.block_auto_process_limit = False
+        with self.safe_events_indexer.auto_adjust_block_limit(100, 109):
+            pass
+        self.assertEqual(self.safe_events_indexer.block_process_limit, 10)
+
+    def test_persist_block_process_limit(self):
+        safe_events_indexer = SafeEventsIndexerProvider.get_new_instance()
+        redis_key = safe_events_indexer.block_process_limit_redis_key
+        get_redis().delete(redis_key)
+        self.addCleanup(get_redis().delete, redis_key)
+        safe_events_indexer.persist_block_process_limit = True
+        safe_events_indexer.block_process_limit = 5
+        self.assertIsNone(safe_events_indexer.get_stored_block_process_limit())
+        with safe_events_indexer.auto_adjust_block_limit(100, 104):
             pass
-        self.assertEqual(self.safe_events_indexer.block_process_limit, 5)
+        self.assertEqual(safe_events_indexer.block_process_limit, 25)
+        self.assertEqual(safe_events_indexer.get_stored_block_process_limit(), 25)
+        self.assertEqual(
+            get_stored_block_process_limits()[safe_events_indexer.__class__.__name__],
+            25,
+        )
+
+        # New instances start from the stored limit
+        with self.settings(ETH_BLOCK_PROCESS_LIMIT_PERSIST=True):
+            self.assertEqual(
+                SafeEventsIndexerProvider.get_new_instance().block_process_limit, 25
+            )
+            with self.settings(ETH_EVENTS_BLOCK_PROCESS_LIMIT_MAX=10):
+                self.assertEqual(
+                    SafeEventsIndexerProvider.get_new_instance().block_process_limit,
+                    10,
+                )
 
     def test_get_safe_creation_events(self):
         decoded_elements = self.safe_events_indexer.decode_elements(safe_events_mock)
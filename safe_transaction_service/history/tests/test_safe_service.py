@@ -9,11 +9,19 @@ from hexbytes import HexBytes
 from safe_eth.eth.constants import NULL_ADDRESS
 from safe_eth.eth.contracts import get_proxy_factory_V1_5_0_contract
 from safe_eth.eth.ethereum_client import TracingManager
+from safe_eth.safe import Safe
 from safe_eth.safe.tests.safe_test_case import SafeTestCaseMixin
 from web3 import Web3
 
+from safe_transaction_service.utils.redis import get_redis
+
+from ..cache import (
+    get_cached_safe_owners,
+    remove_cached_safe_owners,
+    set_cached_safe_owners,
+)
 from ..exceptions import CannotGetSafeInfoFromBlockchain, CannotGetSafeInfoFromDB
-from ..models import InternalTxType, SafeMasterCopy
+from ..models import InternalTxType, SafeLastStatus, SafeMasterCopy
 from ..services.safe_service import SafeCreationInfo, SafeInfo, SafeServiceProvider
 from ..services.safe_service import logger as safe_service_logger
 from ..utils import clean_receipt_log
@@ -225,6 +233,90 @@ class TestSafeService(SafeTestCaseMixin, TestCase):
         self.assertEqual(safe_info.module_guard, NULL_ADDRESS)
         self.assertEqual(safe_info.version, None)
 
+    def test_get_safe_owners_and_threshold(self):
+        get_redis().flushall()
+        safe_address = Account.create().address
+        with self.assertRaises(CannotGetSafeInfoFromBlockchain):
+            self.safe_service.get_safe_owners_and_threshold(safe_address)
+
+        # Not indexed Safe, blockchain is used
+        safe = self.deploy_test_safe()
+        expected = (safe.retrieve_owners(), safe.retrieve_threshold())
+        self.assertEqual(
+            self.safe_service.get_safe_owners_and_threshold(safe.address), expected
+        )
+        self.assertEqual(get_cached_safe_owners(safe.address), expected)
+
+        # Result is cached, node is not queried again
+        with mock.patch.object(Safe, "retrieve_owners") as retrieve_owners_mock:
+            self.assertEqual(
+                self.safe_service.get_safe_owners_and_threshold(safe.address),
+                expected,
+            )
+            retrieve_owners_mock.assert_not_called()
+
+        # Indexed Safe, database is used after cache is invalidated
+        owner = Account.create().address
+        SafeLastStatusFactory(
+            address=safe.address, owners=[owner], threshold=1, nonce=2
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_cached_safe_owners([safe.address])
+        with mock.patch.object(Safe, "retrieve_owners") as retrieve_owners_mock:
+            self.assertEqual(
+                self.safe_service.get_safe_owners_and_threshold(safe.address),
+                ([owner], 1),
+            )
+            retrieve_owners_mock.assert_not_called()
+        self.assertEqual(get_cached_safe_owners(safe.address), ([owner], 1))
+
+        # Storing a new status removes the cache
+        safe_last_status = SafeLastStatus.objects.get(address=safe.address)
+        safe_last_status.threshold = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            safe_last_status.save()
+        self.assertIsNone(get_cached_safe_owners(safe.address))
+        self.assertEqual(
+            self.safe_service.get_safe_owners_and_threshold(safe.address),
+            ([owner], 2),
+        )
+
+        with self.settings(CACHE_SAFE_OWNERS_TIMEOUT=0):
+            with self.captureOnCommitCallbacks(execute=True):
+                remove_cached_safe_owners([safe.address])
+            self.safe_service.get_safe_owners_and_threshold(safe.address)
+            self.assertIsNone(get_cached_safe_owners(safe.address))
+
+    def test_get_safe_owners_and_threshold_removed_meanwhile(self):
+        owner = Account.create().address
+        safe_last_status = SafeLastStatusFactory(owners=[owner], threshold=1, nonce=1)
+        safe_address = safe_last_status.address
+        new_owner = Account.create().address
+
+        def store_new_owner_and_set_cached_safe_owners(*args, **kwargs):
+            # Indexer stores a new owner after the old ones were retrieved from database
+            safe_last_status.owners = [new_owner]
+            with self.captureOnCommitCallbacks(execute=True):
+                safe_last_status.save()
+            return set_cached_safe_owners(*args, **kwargs)
+
+        with mock.patch(
+            "safe_transaction_service.history.services.safe_service.set_cached_safe_owners",
+            side_effect=store_new_owner_and_set_cached_safe_owners,
+        ):
+            self.assertEqual(
+                self.safe_service.get_safe_owners_and_threshold(safe_address),
+                ([owner], 1),
+            )
+
+        # Old owners were not cached
+        self.assertIsNone(get_cached_safe_owners(safe_address))
+        self.assertEqual(
+            self.safe_service.get_safe_owners_and_threshold(safe_address),
+            ([new_owner], 1),
+        )
+        self.assertEqual(get_cached_safe_owners(safe_address), ([new_owner], 1))
+
     def test_decode_creation_data(self):
         for creation_mock in (multisend_creation_mock, gelato_relay_creation_mock):
             with self.subTest(creation_mock=creation_mock):
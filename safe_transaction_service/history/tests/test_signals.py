@@ -561,11 +561,14 @@ class TestSignals(SafeTestCaseMixin, TestCase):
             _process_event(ERC20Transfer, tx, created=True, deleted=False)
             remove_cache_views_mock.assert_not_called()
 
-        transfers_cache_tag = CacheSafeTxsView.LIST_TRANSFERS_VIEW_CACHE_KEY
         remove_cache_views_mock.assert_called_once_with(
             {
-                f"{transfers_cache_tag}:{tx.to}",
-                f"{transfers_cache_tag}:{tx._from}",
+                f"{cache_tag}:{address}"
+                for cache_tag in (
+                    CacheSafeTxsView.LIST_TRANSFERS_VIEW_CACHE_KEY,
+                    CacheSafeTxsView.LIST_ALL_TRANSACTIONS_VIEW_CACHE_KEY,
+                )
+                for address in (tx.to, tx._from)
             }
         )
         build_event_payload_mock.assert_not_called()
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from unittest import mock
+from unittest.mock import MagicMock
+
+from django.test import TestCase
+
+from eth_account import Account
+from safe_eth.eth import EthereumClient
+from safe_eth.eth.tests.ethereum_test_case import EthereumTestCaseMixin
+from safe_eth.eth.utils import fast_keccak_text
+from safe_eth.safe.safe_signature import (
+    SafeSignature,
+    SafeSignatureContract,
+    SafeSignatureEOA,
+)
+
+from safe_transaction_service.utils.redis import get_redis
+
+from ..services.signature_service import SignatureService
+
+
+class TestSignatureService(EthereumTestCaseMixin, TestCase):
+    def setUp(self) -> None:
+        get_redis().flushall()
+        self.signature_service = SignatureService(
+            self.ethereum_client,
+            get_redis(),
+            max_workers=2,
+            eip1271_batch_size=1,
+            eip1271_cache_timeout=60,
+        )
+
+    def tearDown(self) -> None:
+        get_redis().flushall()
+
+    def test_verify_signatures(self):
+        safe_address = Account.create().address
+        accounts = [Account.create() for _ in range(3)]
+        safe_hashes = [fast_keccak_text(f"safe-hash-{i}") for i in range(3)]
+        safe_signatures = [
+            SafeSignature.parse_signature(
+                account.unsafe_sign_hash(safe_hash)["signature"], safe_hash
+            )[0]
+            for account, safe_hash in zip(accounts, safe_hashes, strict=True)
+        ]
+
+        verifications = self.signature_service.verify_signatures(
+            [(safe_signature, safe_address) for safe_signature in safe_signatures]
+        )
+        self.assertEqual(
+            [verification.owner for verification in verifications],
+            [account.address for account in accounts],
+        )
+        self.assertTrue(all(verification.is_valid for verification in verifications))
+
+        with mock.patch.object(SafeSignatureEOA, "is_valid", return_value=False):
+            (verification,) = self.signature_service.verify_safe_signatures(
+                safe_signatures[:1], safe_address
+            )
+            self.assertEqual(verification.owner, accounts[0].address)
+            self.assertFalse(verification.is_valid)
+
+    @mock.patch.object(EthereumClient, "batch_call")
+    def test_verify_signatures_eip1271(self, batch_call_mock: MagicMock):
+        safe_address = Account.create().address
+        safe_hash = fast_keccak_text("safe-hash")
+        owners = [Account.create().address for _ in range(2)]
+        safe_signatures = [
+            SafeSignatureContract.from_values(owner, safe_hash, safe_hash, b"")
+            for owner in owners
+        ]
+        # First owner is valid using the legacy `isValidSignature(bytes,bytes)`, second one is not valid
+        batch_call_mock.side_effect = [
+            [b"", SafeSignatureContract.EIP1271_MAGIC_VALUE],
+            [None, b""],
+        ]
+
+        verifications = self.signature_service.verify_safe_signatures(
+            safe_signatures, safe_address
+        )
+        self.assertEqual(
+            [
+                (verification.owner, verification.is_valid)
+                for verification in verifications
+            ],
+            [(owners[0], True), (owners[1], False)],
+        )
+        # 2 calls per signature, one `multicall` per `eip1271_batch_size` signatures
+        self.assertEqual(batch_call_mock.call_count, 2)
+        self.assertEqual(len(batch_call_mock.call_args[0][0]), 2)
+
+        # Valid signatures are cached, not valid ones are checked again
+        batch_call_mock.reset_mock()
+        batch_call_mock.side_effect = None
+        batch_call_mock.return_value = [
+            SafeSignatureContract.EIP1271_MAGIC_VALUE_UPDATED,
+            None,
+        ]
+        verifications = self.signature_service.verify_safe_signatures(
+            safe_signatures, safe_address
+        )
+        self.assertTrue(all(verification.is_valid for verification in verifications))
+        batch_call_mock.assert_called_once()
+        self.assertEqual(
+            batch_call_mock.call_args[0][0][0].address,
+            owners[1],
+        )
@@ -14,6 +14,7 @@ from hexbytes import HexBytes
 from safe_transaction_service.events.services import QueueService
 
 from ...utils.redis import get_redis
+from ...utils.tasks import get_task_lock_name
 from ..indexers import (
     Erc20EventsIndexerProvider,
     FindRelevantElementsException,
@@ -22,6 +23,8 @@ from ..indexers import (
 )
 from ..indexers.erc20_events_indexer import Erc20EventsIndexer
 from ..models import (
+    SAFE_PARTITIONS,
+    IndexingShard,
     MultisigTransaction,
     SafeContract,
     SafeContractDelegate,
@@ -37,6 +40,7 @@ from ..services import (
 from ..services.collectibles_service import CollectibleWithMetadata
 from ..services.index_service import SpecificIndexingStatus
 from ..tasks import (
+    backfill_safe_events_task,
     check_reorgs_task,
     check_sync_status_task,
     delete_expired_delegates_task,
@@ -46,10 +50,13 @@ from ..tasks import (
     index_new_proxies_task,
     index_safe_events_task,
     process_decoded_internal_txs_for_safe_task,
+    process_decoded_internal_txs_for_shard_task,
     process_decoded_internal_txs_task,
+    process_safe_events_backfill_shard_task,
     reindex_erc20_erc721_last_hours_task,
     reindex_mastercopies_last_hours_task,
     remove_not_trusted_multisig_txs_task,
+    resend_stale_safe_events_backfill_shards_task,
     retry_get_metadata_task,
 )
 from ..tasks import logger as task_logger
@@ -189,6 +196,79 @@ class TestTasks(TestCase):
     def test_index_safe_events_task(self):
         self.assertEqual(index_safe_events_task.delay().result, (0, 0))
 
+        # Regular indexing is paused while a backfill is running
+        IndexingShard.objects.create_shards(0, 10, 5)
+        self.assertIsNone(index_safe_events_task.delay().result)
+
+    @patch.object(IndexService, "process_safe_events_backfill_shard", return_value=0)
+    def test_backfill_safe_events_task(
+        self, process_safe_events_backfill_shard_mock: MagicMock
+    ):
+        self.assertEqual(
+            backfill_safe_events_task.delay(
+                0, to_block_number=24, shard_size=10
+            ).result,
+            3,
+        )
+        self.assertEqual(process_safe_events_backfill_shard_mock.call_count, 3)
+        self.assertEqual(IndexingShard.objects.count(), 3)
+
+    @patch.object(IndexService, "process_safe_events_backfill_shard", return_value=2)
+    def test_process_safe_events_backfill_shard_task(
+        self, process_safe_events_backfill_shard_mock: MagicMock
+    ):
+        shards = IndexingShard.objects.create_shards(0, 19, 10)
+        with patch.object(process_decoded_internal_txs_task, "delay") as delay_mock:
+            # Master copies were not advanced, as the first shard is not finished
+            with patch.object(
+                IndexService, "merge_safe_events_backfill_shards", return_value=None
+            ):
+                self.assertEqual(
+                    process_safe_events_backfill_shard_task.delay(shards[1].id).result,
+                    2,
+                )
+                delay_mock.assert_not_called()
+
+            with patch.object(
+                IndexService, "merge_safe_events_backfill_shards", return_value=20
+            ):
+                self.assertEqual(
+                    process_safe_events_backfill_shard_task.delay(shards[0].id).result,
+                    2,
+                )
+                delay_mock.assert_called_once_with()
+
+    @patch.object(IndexService, "process_safe_events_backfill_shard", return_value=0)
+    def test_resend_stale_safe_events_backfill_shards_task(
+        self, process_safe_events_backfill_shard_mock: MagicMock
+    ):
+        self.assertEqual(
+            resend_stale_safe_events_backfill_shards_task.delay().result, 0
+        )
+        shards = IndexingShard.objects.create_shards(0, 29, 10)
+        self.assertEqual(
+            resend_stale_safe_events_backfill_shards_task.delay().result, 0
+        )
+
+        IndexingShard.objects.update(
+            modified=timezone.now() - datetime.timedelta(days=1)
+        )
+        IndexingShard.objects.filter(pk=shards[2].id).update(block_number=30)
+        self.assertEqual(
+            resend_stale_safe_events_backfill_shards_task.delay().result, 2
+        )
+        self.assertEqual(
+            [
+                call.args[0]
+                for call in process_safe_events_backfill_shard_mock.call_args_list
+            ],
+            [shards[0].id, shards[1].id],
+        )
+        # Shards are not sent again until they are stale again
+        self.assertEqual(
+            resend_stale_safe_events_backfill_shards_task.delay().result, 0
+        )
+
     @patch.object(IndexService, "get_master_copies_indexing_status")
     @patch.object(IndexService, "reindex_master_copies")
     def test_reindex_mastercopies_last_hours_task(
@@ -300,6 +380,64 @@ class TestTasks(TestCase):
                     cm.output[0],
                 )
 
+    def test_process_decoded_internal_txs_task_safe_events_backfill_running(self):
+        shards = IndexingShard.objects.create_shards(10, 29, 10)
+        IndexingShard.objects.set_block_number(shards[0].id, 15)
+        InternalTxDecodedFactory(function_name="setup", internal_tx__block_number=15)
+        with self.settings(PROCESSING_ALL_SAFES_TOGETHER=False):
+            with patch.object(
+                process_decoded_internal_txs_for_safe_task, "delay"
+            ) as process_decoded_internal_txs_for_safe_task_mock:
+                self.assertEqual(process_decoded_internal_txs_task.delay().result, 0)
+                process_decoded_internal_txs_for_safe_task_mock.assert_not_called()
+
+                IndexingShard.objects.set_block_number(shards[0].id, 16)
+                self.assertEqual(process_decoded_internal_txs_task.delay().result, 1)
+                process_decoded_internal_txs_for_safe_task_mock.assert_called_once()
+
+    def test_process_decoded_internal_txs_task_shards(self):
+        with self.settings(PROCESSING_SHARDS=3):
+            with self.assertLogs(logger=task_logger) as cm:
+                self._test_process_decoded_internal_txs_task()
+                self.assertIn(
+                    "Start process decoded internal txs for every Safe in 3 shards",
+                    cm.output[0],
+                )
+
+    def test_process_decoded_internal_txs_for_shard_task(self):
+        with self.assertLogs(logger=task_logger) as cm:
+            with patch.object(
+                IndexService, "process_decoded_txs_for_partitions", return_value=5
+            ) as process_decoded_txs_for_partitions_mock:
+                process_decoded_internal_txs_for_shard_task.delay(1, 4)
+                process_decoded_txs_for_partitions_mock.assert_called_with(
+                    list(range(1, SAFE_PARTITIONS, 4))
+                )
+                self.assertIn(
+                    "[Shard 1/4] Start processing decoded internal txs", cm.output[0]
+                )
+                self.assertIn(
+                    "[Shard 1/4] Processed 5 decoded transactions", cm.output[1]
+                )
+
+                # Partitions being processed by a task for a different number of shards are skipped
+                process_decoded_txs_for_partitions_mock.reset_mock()
+                with get_redis().lock(
+                    get_task_lock_name(
+                        process_decoded_internal_txs_for_shard_task.name,
+                        lock_name_suffix="3",
+                    ),
+                    blocking=False,
+                ):
+                    process_decoded_internal_txs_for_shard_task.delay(1, 2)
+                process_decoded_txs_for_partitions_mock.assert_called_once_with(
+                    [
+                        partition
+                        for partition in range(1, SAFE_PARTITIONS, 2)
+                        if partition != 3
+                    ]
+                )
+
     def test_process_decoded_internal_txs_for_banned_safe(self):
         owner = Account.create().address
         safe_address = Account.create().address
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 from datetime import timedelta
+from unittest import mock
 
 from django.test import TestCase
 from django.utils import timezone
@@ -108,6 +109,85 @@ class TestTransactionService(TestCase):
             1,
         )
 
+    def test_get_all_txs_serialized_from_identifiers(self):
+        transaction_service: TransactionService = self.transaction_service
+        safe_address = Account.create().address
+        self.assertEqual(
+            transaction_service.get_all_txs_serialized_from_identifiers(
+                safe_address, [], api_version=1
+            ),
+            [],
+        )
+
+        # Only executed txs older than 10 minutes are cached
+        multisig_transaction = MultisigTransactionFactory(
+            safe=safe_address,
+            ethereum_tx__block__timestamp=timezone.now() - timedelta(days=1),
+        )
+        erc20_transfer = ERC20TransferFactory(to=safe_address)
+        all_tx_hashes = [
+            q.ethereum_tx_id
+            for q in transaction_service.get_all_tx_identifiers(safe_address)
+        ]
+        self.assertEqual(
+            all_tx_hashes,
+            [erc20_transfer.ethereum_tx_id, multisig_transaction.ethereum_tx_id],
+        )
+
+        with self.assertRaisesMessage(ValueError, "Not supported api_version=3"):
+            transaction_service.get_all_txs_serialized_from_identifiers(
+                safe_address, all_tx_hashes, api_version=3
+            )
+
+        for api_version, nonce in (
+            (1, multisig_transaction.nonce),
+            (2, str(multisig_transaction.nonce)),
+        ):
+            all_txs_serialized = (
+                transaction_service.get_all_txs_serialized_from_identifiers(
+                    safe_address, all_tx_hashes, api_version
+                )
+            )
+            self.assertEqual(len(all_txs_serialized), 2)
+            self.assertEqual(all_txs_serialized[1]["nonce"], nonce)
+            cached_txs = transaction_service.get_serialized_txs_from_cache(
+                safe_address, all_tx_hashes, api_version
+            )
+            self.assertIsNone(cached_txs[0])
+            self.assertEqual(
+                cached_txs[1][0]["safe_tx_hash"], multisig_transaction.safe_tx_hash
+            )
+            self.assertEqual(cached_txs[1][0]["nonce"], nonce)
+
+            # Cached txs are not queried nor serialized again
+            with mock.patch.object(
+                transaction_service,
+                "get_txs_for_identifiers",
+                wraps=transaction_service.get_txs_for_identifiers,
+            ) as get_txs_for_identifiers_mock:
+                self.assertEqual(
+                    len(
+                        transaction_service.get_all_txs_serialized_from_identifiers(
+                            safe_address, all_tx_hashes, api_version
+                        )
+                    ),
+                    2,
+                )
+                get_txs_for_identifiers_mock.assert_called_once_with(
+                    safe_address, [erc20_transfer.ethereum_tx_id]
+                )
+
+        # Every API version has its own cache
+        self.assertEqual(len(self.transaction_service.redis.keys("tx-service:*")), 2)
+
+        with mock.patch.object(TransactionService, "CACHE_SERIALIZATION_VERSION", 2):
+            self.assertEqual(
+                transaction_service.get_serialized_txs_from_cache(
+                    safe_address, all_tx_hashes, 1
+                ),
+                [None, None],
+            )
+
     def test_get_all_txs_from_identifiers(self):
         transaction_service: TransactionService = self.transaction_service
         safe_address = Account.create().address
@@ -130,15 +210,11 @@ class TestTransactionService(TestCase):
         queryset = transaction_service.get_all_tx_identifiers(safe_address)
         all_tx_hashes = [q.ethereum_tx_id for q in queryset]
 
-        self.assertEqual(len(self.transaction_service.redis.keys("tx-service:*")), 0)
         all_txs = transaction_service.get_all_txs_from_identifiers(
             safe_address, all_tx_hashes
         )
-        self.assertEqual(len(self.transaction_service.redis.keys("tx-service:*")), 1)
-        all_txs = transaction_service.get_all_txs_from_identifiers(
-            safe_address, all_tx_hashes
-        )  # Force caching
-        self.assertEqual(len(self.transaction_service.redis.keys("tx-service:*")), 1)
+        # Models are not cached
+        self.assertEqual(len(self.transaction_service.redis.keys("tx-service:*")), 0)
         self.assertEqual(len(all_txs), 6)
         tx_types = [
             MultisigTransaction,
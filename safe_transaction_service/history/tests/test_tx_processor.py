@@ -18,9 +18,11 @@ from safe_transaction_service.safe_messages.tests.factories import (
     SafeMessageFactory,
 )
 
+from ..cache import get_cached_safe_owners
 from ..indexers.tx_processor import (
     CannotFindPreviousTrace,
     ModuleCannotBeDisabled,
+    PendingSafeStatuses,
     SafeTxProcessor,
     SafeTxProcessorProvider,
 )
@@ -35,9 +37,11 @@ from ..models import (
     SafeRelevantTransaction,
     SafeStatus,
 )
+from ..services import SafeServiceProvider
 from .factories import (
     EthereumTxFactory,
     InternalTxDecodedFactory,
+    InternalTxFactory,
     MultisigConfirmationFactory,
     MultisigTransactionFactory,
     SafeContractDelegateFactory,
@@ -696,12 +700,27 @@ class TestSafeTxProcessor(SafeTestCaseMixin, TestCase):
 
         # Increase nonce and store it
         safe_last_status.nonce = 5
+        pending_safe_statuses = PendingSafeStatuses()
         self.tx_processor.store_new_safe_status(
-            safe_last_status, safe_last_status.internal_tx, ["nonce"]
+            safe_last_status, safe_last_status.internal_tx, pending_safe_statuses
+        )
+        # Nothing is stored until flushed
+        self.assertEqual(SafeLastStatus.objects.get().nonce, 0)
+        # Flushing other snapshots doesn't store these ones
+        self.assertEqual(
+            self.tx_processor.flush_safe_statuses(PendingSafeStatuses()), 0
+        )
+        self.assertEqual(SafeLastStatus.objects.get().nonce, 0)
+        self.assertEqual(
+            self.tx_processor.flush_safe_statuses(pending_safe_statuses), 1
+        )
+        self.assertEqual(
+            self.tx_processor.flush_safe_statuses(pending_safe_statuses), 0
         )
         safe_last_status_db = SafeLastStatus.objects.get()
         self.assertEqual(safe_last_status_db.address, safe_address)
         self.assertEqual(safe_last_status_db.nonce, 5)
+        self.assertEqual(SafeStatus.objects.get().nonce, 5)
 
         # Use the factory to create a new SafeLastStatus
         new_safe_last_status = SafeLastStatusFactory(nonce=1)
@@ -711,8 +730,129 @@ class TestSafeTxProcessor(SafeTestCaseMixin, TestCase):
         new_safe_last_status.address = safe_address
 
         self.tx_processor.store_new_safe_status(
-            new_safe_last_status, new_safe_last_status.internal_tx, []
+            new_safe_last_status,
+            new_safe_last_status.internal_tx,
+            pending_safe_statuses,
         )
+        self.tx_processor.flush_safe_statuses(pending_safe_statuses)
         safe_last_status_db = SafeLastStatus.objects.get()
         self.assertEqual(safe_last_status_db.address, safe_address)
         self.assertEqual(safe_last_status_db.nonce, 1)
+        self.assertEqual(SafeStatus.objects.filter(address=safe_address).count(), 2)
+
+    def test_store_new_safe_status_snapshots(self):
+        safe_last_status = SafeLastStatusFactory(nonce=0, owners=[])
+        safe_address = safe_last_status.address
+        owners = [Account.create().address for _ in range(2)]
+        internal_txs = [InternalTxFactory(_from=safe_address) for _ in owners]
+        pending_safe_statuses = PendingSafeStatuses()
+        # Same instance is modified in place, every `SafeStatus` must keep its own values
+        for nonce, (owner, internal_tx) in enumerate(
+            zip(owners, internal_txs, strict=True), start=1
+        ):
+            safe_last_status.owners.append(owner)
+            safe_last_status.nonce = nonce
+            self.tx_processor.store_new_safe_status(
+                safe_last_status, internal_tx, pending_safe_statuses
+            )
+
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                self.tx_processor.flush_safe_statuses(pending_safe_statuses), 2
+            )
+
+        safe_statuses = SafeStatus.objects.filter(
+            internal_tx__in=internal_txs
+        ).order_by("nonce")
+        self.assertEqual(
+            [(safe_status.nonce, safe_status.owners) for safe_status in safe_statuses],
+            [(1, owners[:1]), (2, owners)],
+        )
+        safe_last_status_db = SafeLastStatus.objects.get(address=safe_address)
+        self.assertEqual(safe_last_status_db.nonce, 2)
+        self.assertEqual(safe_last_status_db.owners, owners)
+        self.assertEqual(safe_last_status_db.internal_tx_id, internal_txs[-1].pk)
+
+    def test_process_decoded_transactions_interleaved(self):
+        # Processor is shared by every task of a gevent worker, so a batch can be processed
+        # while another one is still in progress (e.g. processing shards in parallel)
+        tx_processor = self.tx_processor
+        safe_addresses = [Account.create().address for _ in range(2)]
+        owners = [Account.create().address for _ in safe_addresses]
+        internal_txs_decoded = [
+            InternalTxDecodedFactory(
+                function_name="setup",
+                owner=owner,
+                internal_tx___from=safe_address,
+            )
+            for safe_address, owner in zip(safe_addresses, owners, strict=True)
+        ]
+
+        store_new_safe_status = tx_processor.store_new_safe_status
+        interleaved = []
+
+        def store_new_safe_status_and_interleave(*args, **kwargs):
+            result = store_new_safe_status(*args, **kwargs)
+            if not interleaved:
+                # Process the second batch before the first one is flushed
+                interleaved.append(True)
+                self.assertEqual(
+                    tx_processor.process_decoded_transactions(
+                        [internal_txs_decoded[1]]
+                    ),
+                    [True],
+                )
+            return result
+
+        with mock.patch.object(
+            tx_processor,
+            "store_new_safe_status",
+            side_effect=store_new_safe_status_and_interleave,
+        ):
+            self.assertEqual(
+                tx_processor.process_decoded_transactions([internal_txs_decoded[0]]),
+                [True],
+            )
+
+        self.assertTrue(interleaved)
+        for safe_address, owner in zip(safe_addresses, owners, strict=True):
+            self.assertEqual(
+                SafeStatus.objects.get(address=safe_address).owners, [owner]
+            )
+            self.assertEqual(
+                SafeLastStatus.objects.get(address=safe_address).owners, [owner]
+            )
+        self.assertFalse(InternalTxDecoded.objects.not_processed().exists())
+
+    def test_process_decoded_transactions_removes_cached_safe_owners(self):
+        owner = Account.create().address
+        safe_address = SafeLastStatusFactory(
+            nonce=1, owners=[owner], threshold=1
+        ).address
+        safe_service = SafeServiceProvider()
+        self.assertEqual(
+            safe_service.get_safe_owners_and_threshold(safe_address), ([owner], 1)
+        )
+        self.assertEqual(get_cached_safe_owners(safe_address), ([owner], 1))
+
+        new_owner = Account.create().address
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(
+                self.tx_processor.process_decoded_transactions(
+                    [
+                        InternalTxDecodedFactory(
+                            function_name="addOwnerWithThreshold",
+                            owner=new_owner,
+                            threshold=2,
+                            internal_tx___from=safe_address,
+                        )
+                    ]
+                ),
+                [True],
+            )
+        # New owners are used right after they are stored
+        self.assertIsNone(get_cached_safe_owners(safe_address))
+        self.assertEqual(
+            safe_service.get_safe_owners_and_threshold(safe_address),
+            ([new_owner, owner], 2),
+        )
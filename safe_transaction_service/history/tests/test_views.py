@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import csv
 import datetime
 import json
 import logging
@@ -8,6 +9,8 @@ from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
+from django.core.files.storage import InMemoryStorage
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -50,6 +53,7 @@ from ..models import (
     SafeMasterCopy,
 )
 from ..serializers import TransferType
+from ..services.signature_service import SignatureService
 from ..views import (
     SafeModuleTransactionListView,
     SafeMultisigTransactionListView,
@@ -345,18 +349,20 @@ class TestViewsV150(SafeTestCaseMixin, APITestCase):
 
         # Factories create the models using current datetime, so as the txs are returned sorted they should be
         # in the reverse order that they were created
-        multisig_transaction = MultisigTransactionFactory(safe=safe_address)
-        module_transaction = ModuleTransactionFactory(safe=safe_address)
-        InternalTxFactory(to=safe_address, value=4)
-        InternalTxFactory(_from=safe_address, value=5)  # Should not appear
-        ERC20TransferFactory(to=safe_address)
-        erc20_transfer_out = ERC20TransferFactory(_from=safe_address)
-        MultisigTransactionFactory(safe=safe_address)
-        (MultisigTransactionFactory())  # Should not appear, it's for another Safe
+        # Cached response is invalidated on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            multisig_transaction = MultisigTransactionFactory(safe=safe_address)
+            module_transaction = ModuleTransactionFactory(safe=safe_address)
+            InternalTxFactory(to=safe_address, value=4)
+            InternalTxFactory(_from=safe_address, value=5)  # Should not appear
+            ERC20TransferFactory(to=safe_address)
+            erc20_transfer_out = ERC20TransferFactory(_from=safe_address)
+            MultisigTransactionFactory(safe=safe_address)
+            (MultisigTransactionFactory())  # Should not appear, it's for another Safe
 
-        # Should not appear as they are not executed
-        for _ in range(2):
-            MultisigTransactionFactory(safe=safe_address, ethereum_tx=None)
+            # Should not appear as they are not executed
+            for _ in range(2):
+                MultisigTransactionFactory(safe=safe_address, ethereum_tx=None)
 
         response = self.client.get(
             reverse("v1:history:all-transactions", args=(safe_address,))
@@ -396,14 +402,16 @@ class TestViewsV150(SafeTestCaseMixin, APITestCase):
         self.assertEqual(len(response.data["results"]), 2)
 
         # Add transfer out for the module transaction and transfer in for the multisig transaction
-        erc20_transfer_out = ERC20TransferFactory(
-            _from=safe_address, ethereum_tx=module_transaction.internal_tx.ethereum_tx
-        )
-        # Add token info for that transfer
-        token = TokenFactory(address=erc20_transfer_out.address)
-        InternalTxFactory(
-            to=safe_address, value=8, ethereum_tx=multisig_transaction.ethereum_tx
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            erc20_transfer_out = ERC20TransferFactory(
+                _from=safe_address,
+                ethereum_tx=module_transaction.internal_tx.ethereum_tx,
+            )
+            # Add token info for that transfer
+            token = TokenFactory(address=erc20_transfer_out.address)
+            InternalTxFactory(
+                to=safe_address, value=8, ethereum_tx=multisig_transaction.ethereum_tx
+            )
         response = self.client.get(
             reverse("v1:history:all-transactions", args=(safe_address,))
         )
@@ -492,6 +500,10 @@ class TestViewsV150(SafeTestCaseMixin, APITestCase):
             multisig_transaction.ethereum_tx_id,
         )
 
+    @mock.patch(
+        "safe_transaction_service.history.views.settings.CACHE_VIEW_DEFAULT_TIMEOUT",
+        0,
+    )  # Cache is not invalidated on token changes
     def test_all_transactions_wrong_transfer_type_view(self):
         # No token in database, so we must trust the event
         safe_address = Account.create().address
@@ -823,13 +835,19 @@ class TestViewsV150(SafeTestCaseMixin, APITestCase):
         # Mark transaction as not executed, signature is still not valid
         multisig_transaction.ethereum_tx = None
         multisig_transaction.save(update_fields=["ethereum_tx"])
-        response = self.client.post(
-            reverse(
-                "v1:history:multisig-transaction-confirmations", args=(safe_tx_hash,)
-            ),
-            format="json",
-            data=data,
-        )
+        with mock.patch.object(
+            SignatureService, "verify_safe_signatures"
+        ) as verify_safe_signatures_mock:
+            response = self.client.post(
+                reverse(
+                    "v1:history:multisig-transaction-confirmations",
+                    args=(safe_tx_hash,),
+                ),
+                format="json",
+                data=data,
+            )
+            # Signatures are not verified if signer is not an owner
+            verify_safe_signatures_mock.assert_not_called()
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn(
             f"Signer={random_account.address} is not an owner",
@@ -4351,6 +4369,136 @@ class TestViewsV150(SafeTestCaseMixin, APITestCase):
         # Should default to 1000
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_safe_export_stream_view(self):
+        safe_address = Account.create().address
+        url = reverse("v1:history:safe-export-stream", args=(safe_address,))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        SafeContractFactory(address=safe_address)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(
+            csv.DictReader(b"".join(response.streaming_content).decode().splitlines())
+        )
+        self.assertEqual(rows, [])
+
+        ethereum_tx = EthereumTxFactory()
+        MultisigTransactionFactory(
+            safe=safe_address, ethereum_tx=ethereum_tx, trusted=True
+        )
+        token = TokenFactory(
+            address=Account.create().address, symbol="TEST", decimals=18
+        )
+        erc20_transfers = [
+            ERC20TransferFactory(
+                ethereum_tx=ethereum_tx,
+                address=token.address,
+                to=safe_address,
+                log_index=log_index,
+            )
+            for log_index in range(3)
+        ]
+
+        # Streamed rows must match the paginated export endpoint
+        expected = self.client.get(
+            reverse("v1:history:safe-export", args=(safe_address,)), format="json"
+        ).json()["results"]
+        self.assertEqual(len(expected), len(erc20_transfers))
+
+        with self.settings(EXPORT_STREAM_CHUNK_SIZE=2):
+            response = self.client.get(url)
+            rows = list(
+                csv.DictReader(
+                    b"".join(response.streaming_content).decode().splitlines()
+                )
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="{safe_address}-transactions.csv"',
+        )
+        self.assertEqual(len(rows), 3)
+        # Transfers belong to the same transaction, so order between them is not defined
+        rows.sort(key=lambda row: row["from"])
+        expected.sort(key=lambda row: row["from"])
+        for row, expected_row in zip(rows, expected, strict=True):
+            self.assertEqual(row["transactionHash"], expected_row["transactionHash"])
+            self.assertEqual(row["from"], expected_row["from"])
+            self.assertEqual(row["amount"], expected_row["amount"])
+            self.assertEqual(row["assetSymbol"], "TEST")
+
+        response = self.client.get(url + "?file_format=ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            sorted(
+                (
+                    json.loads(line)
+                    for line in b"".join(response.streaming_content)
+                    .decode()
+                    .splitlines()
+                ),
+                key=lambda row: row["from"],
+            ),
+            expected,
+        )
+
+        future_date = timezone.now() + datetime.timedelta(days=1)
+        params = urlencode(
+            {"execution_date__gte": future_date.isoformat(), "file_format": "ndjson"}
+        )
+        response = self.client.get(url + f"?{params}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+        response = self.client.get(url + "?file_format=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_safe_export_files_view(self):
+        safe_address = Account.create().address
+        url = reverse("v1:history:safe-export-files", args=(safe_address,))
+        SafeContractFactory(address=safe_address)
+        ERC20TransferFactory(to=safe_address)
+        response = self.client.post(url + "?file_format=ndjson")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        storage = InMemoryStorage()
+        with (
+            override_settings(EXPORT_FILES_ENABLED=True),
+            mock.patch(
+                "safe_transaction_service.history.views.get_file_storage",
+                return_value=storage,
+            ),
+            mock.patch(
+                "safe_transaction_service.history.tasks.get_file_storage",
+                return_value=storage,
+            ),
+        ):
+            response = self.client.post(
+                reverse(
+                    "v1:history:safe-export-files", args=(Account.create().address,)
+                )
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+            response = self.client.post(url + "?file_format=ndjson")
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            file_url = response.json()["url"]
+            self.assertTrue(file_url.endswith(".ndjson"))
+
+        # Celery tasks are eager on tests, so file must be generated
+        (path,) = [
+            f"exports/{safe_address}/{file_name}"
+            for file_name in storage.listdir(f"exports/{safe_address}")[1]
+        ]
+        self.assertEqual(storage.url(path), file_url)
+        with storage.open(path) as f:
+            lines = f.read().decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["to"], safe_address)
+
     def _setup_export_tests(self):
         self.token = TokenFactory(
             address=Account.create().address, symbol="TEST", decimals=18
@@ -1032,6 +1032,42 @@ class TestViewsV2V150(SafeTestCaseMixin, APITestCase):
         self.assertEqual(response.data["count"], 2)
         self.assertEqual(response.data["count_unique_nonce"], 2)
 
+    def test_get_multisig_transactions_cursor_pagination(self):
+        safe_address = Account.create().address
+        url = reverse("v2:history:multisig-transactions", args=(safe_address,))
+        with self.captureOnCommitCallbacks(execute=True):
+            for nonce in range(3):
+                MultisigTransactionFactory(safe=safe_address, nonce=nonce, trusted=True)
+
+        response = self.client.get(url + "?cursor=&limit=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["count"])
+        self.assertEqual(response.data["count_unique_nonce"], 3)
+        self.assertEqual(
+            [result["nonce"] for result in response.data["results"]], ["2", "1"]
+        )
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(
+            [result["nonce"] for result in response.data["results"]], ["0"]
+        )
+
+        response = self.client.get(url + "?cursor=&ordering=nonce")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["nonce"] for result in response.data["results"]], ["0", "1", "2"]
+        )
+
+        # Offset pagination is still the default
+        response = self.client.get(url + "?limit=1&offset=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [result["nonce"] for result in response.data["results"]], ["1"]
+        )
+
     @mock.patch.object(
         DbTxDecoder, "get_data_decoded", return_value={"param1": "value"}
     )
@@ -2451,18 +2487,20 @@ class TestViewsV2V150(SafeTestCaseMixin, APITestCase):
 
         # Factories create the models using current datetime, so as the txs are returned sorted they should be
         # in the reverse order that they were created
-        multisig_transaction = MultisigTransactionFactory(safe=safe_address)
-        module_transaction = ModuleTransactionFactory(safe=safe_address)
-        InternalTxFactory(to=safe_address, value=4)
-        InternalTxFactory(_from=safe_address, value=5)  # Should not appear
-        ERC20TransferFactory(to=safe_address)
-        erc20_transfer_out = ERC20TransferFactory(_from=safe_address)
-        MultisigTransactionFactory(safe=safe_address)
-        (MultisigTransactionFactory())  # Should not appear, it's for another Safe
+        # Cached response is invalidated on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            multisig_transaction = MultisigTransactionFactory(safe=safe_address)
+            module_transaction = ModuleTransactionFactory(safe=safe_address)
+            InternalTxFactory(to=safe_address, value=4)
+            InternalTxFactory(_from=safe_address, value=5)  # Should not appear
+            ERC20TransferFactory(to=safe_address)
+            erc20_transfer_out = ERC20TransferFactory(_from=safe_address)
+            MultisigTransactionFactory(safe=safe_address)
+            (MultisigTransactionFactory())  # Should not appear, it's for another Safe
 
-        # Should not appear as they are not executed
-        for _ in range(2):
-            MultisigTransactionFactory(safe=safe_address, ethereum_tx=None)
+            # Should not appear as they are not executed
+            for _ in range(2):
+                MultisigTransactionFactory(safe=safe_address, ethereum_tx=None)
 
         response = self.client.get(
             reverse("v2:history:all-transactions", args=(safe_address,))
@@ -2502,14 +2540,16 @@ class TestViewsV2V150(SafeTestCaseMixin, APITestCase):
         self.assertEqual(len(response.data["results"]), 2)
 
         # Add transfer out for the module transaction and transfer in for the multisig transaction
-        erc20_transfer_out = ERC20TransferFactory(
-            _from=safe_address, ethereum_tx=module_transaction.internal_tx.ethereum_tx
-        )
-        # Add token info for that transfer
-        token = TokenFactory(address=erc20_transfer_out.address)
-        InternalTxFactory(
-            to=safe_address, value=8, ethereum_tx=multisig_transaction.ethereum_tx
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            erc20_transfer_out = ERC20TransferFactory(
+                _from=safe_address,
+                ethereum_tx=module_transaction.internal_tx.ethereum_tx,
+            )
+            # Add token info for that transfer
+            token = TokenFactory(address=erc20_transfer_out.address)
+            InternalTxFactory(
+                to=safe_address, value=8, ethereum_tx=multisig_transaction.ethereum_tx
+            )
         response = self.client.get(
             reverse("v2:history:all-transactions", args=(safe_address,))
         )
@@ -2541,6 +2581,78 @@ class TestViewsV2V150(SafeTestCaseMixin, APITestCase):
         ):
             self.assertEqual(bool(transaction["transfers"]), transfer_not_empty)
 
+    def test_all_transactions_view_cache(self):
+        safe_address = Account.create().address
+        url = reverse("v2:history:all-transactions", args=(safe_address,))
+        with self.captureOnCommitCallbacks(execute=True):
+            MultisigTransactionFactory(safe=safe_address)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+        # Rendered response is returned from cache
+        with mock.patch(
+            "safe_transaction_service.history.views_v2.AllTransactionsListView.list"
+        ) as list_mock:
+            cached_response = self.client.get(url)
+            list_mock.assert_not_called()
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response["Content-Type"], "application/json")
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+        self.assertEqual(cached_response.content, response.content)
+
+        # Every query parameter has its own cache
+        response = self.client.get(url + "?limit=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        # Cache is invalidated when a new transaction is stored
+        with self.captureOnCommitCallbacks(execute=True):
+            ERC20TransferFactory(to=safe_address)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_all_transactions_cursor_pagination(self):
+        safe_address = Account.create().address
+        url = reverse("v2:history:all-transactions", args=(safe_address,))
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                MultisigTransactionFactory(safe=safe_address)
+        # Offset pagination is still the default
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        expected_tx_hashes = [
+            result["transaction_hash"] for result in response.data["results"]
+        ]
+
+        response = self.client.get(url + "?cursor=&limit=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["count"])
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(
+            [result["transaction_hash"] for result in response.data["results"]],
+            expected_tx_hashes[:2],
+        )
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+        self.assertEqual(
+            [result["transaction_hash"] for result in response.data["results"]],
+            expected_tx_hashes[2:],
+        )
+
+        response = self.client.get(url + "?cursor=&approximate_count=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data["count"], int)
+        self.assertEqual(len(response.data["results"]), 3)
+
+        response = self.client.get(url + "?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_all_transactions_executed(self):
         safe_address = Account.create().address
 
@@ -2598,6 +2710,10 @@ class TestViewsV2V150(SafeTestCaseMixin, APITestCase):
             multisig_transaction.ethereum_tx_id,
         )
 
+    @mock.patch(
+        "safe_transaction_service.history.views.settings.CACHE_VIEW_DEFAULT_TIMEOUT",
+        0,
+    )  # Cache is not invalidated on token changes
     def test_all_transactions_wrong_transfer_type_view(self):
         # No token in database, so we must trust the event
         safe_address = Account.create().address
@@ -85,6 +85,16 @@ urlpatterns = [
         views.SafeExportView.as_view(),
         name="safe-export",
     ),
+    path(
+        "safes/<str:address>/export/stream/",
+        views.SafeExportStreamView.as_view(),
+        name="safe-export-stream",
+    ),
+    path(
+        "safes/<str:address>/export/files/",
+        views.SafeExportFileView.as_view(),
+        name="safe-export-files",
+    ),
     path(
         "multisig-transactions/<str:safe_tx_hash>/",
         views.SafeMultisigTransactionDetailView.as_view(),
@@ -1,9 +1,11 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import hashlib
 import logging
+import uuid
 from typing import Any
 
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 
@@ -41,8 +43,13 @@ from safe_transaction_service.utils.utils import parse_boolean_query_param
 from safe_transaction_service.utils.views.mixins import BannedSafeMixin
 
 from ..loggers.custom_logger import http_request_log
+from ..tokens.models import get_file_storage
 from . import filters, pagination, serializers
-from .cache import CacheSafeTxsView, cache_txs_view_for_address
+from .cache import (
+    CacheSafeTxsView,
+    cache_rendered_txs_view_for_address,
+    cache_txs_view_for_address,
+)
 from .exceptions import CannotGetSafeInfoFromBlockchain
 from .helpers import add_tokens_to_transfers, is_valid_unique_transfer_id
 from .models import (
@@ -59,13 +66,18 @@ from .models import (
     TransferDict,
 )
 from .pagination import DummyPagination
-from .serializers import SafeExportTransactionRequestParams, get_data_decoded_from_data
+from .serializers import (
+    SafeExportFileRequestParams,
+    SafeExportTransactionRequestParams,
+    get_data_decoded_from_data,
+)
 from .services import (
     BalanceServiceProvider,
     IndexServiceProvider,
     SafeServiceProvider,
     TransactionServiceProvider,
 )
+from .tasks import export_safe_transactions_file_task
 
 logger = logging.getLogger(__name__)
 
@@ -282,10 +294,11 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
         OrderingFilter,
     )
     ordering_fields = ["timestamp"]
+    ordering = ["-timestamp", "ethereum_tx_id"]
     allowed_ordering_fields = ordering_fields + [
         f"-{ordering_field}" for ordering_field in ordering_fields
     ]
-    pagination_class = pagination.SmallPagination
+    pagination_class = pagination.SmallCursorPagination
     serializer_class = (
         serializers.AllTransactionsSchemaSerializer
     )  # Just for docs, not used
@@ -350,17 +363,13 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
             return self.get_paginated_response([])
 
         all_tx_identifiers = [element.ethereum_tx_id for element in tx_identifiers_page]
-        all_txs = transaction_service.get_all_txs_from_identifiers(
-            safe, all_tx_identifiers
-        )
-        logger.debug(
-            "%s: Got all txs from identifiers for Safe=%s",
-            self.__class__.__name__,
-            safe,
+        all_txs_serialized = (
+            transaction_service.get_all_txs_serialized_from_identifiers(
+                safe, all_tx_identifiers, api_version=1
+            )
         )
-        all_txs_serialized = transaction_service.serialize_all_txs(all_txs)
         logger.debug(
-            "%s: All txs from identifiers for Safe=%s were serialized",
+            "%s: Got all txs serialized from identifiers for Safe=%s",
             self.__class__.__name__,
             safe,
         )
@@ -373,6 +382,9 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
         )
         return paginated_response
 
+    @cache_rendered_txs_view_for_address(
+        CacheSafeTxsView.LIST_ALL_TRANSACTIONS_VIEW_CACHE_KEY
+    )
     def get(self, request, *args, **kwargs):
         """
         Returns all the *executed* transactions for a given Safe address.
@@ -651,7 +663,8 @@ class SafeMultisigTransactionListView(BannedSafeMixin, ListAPIView):
     )
     filterset_class = filters.MultisigTransactionFilter
     ordering_fields = ["nonce", "created", "modified"]
-    pagination_class = pagination.DefaultPagination
+    ordering = ["-nonce", "-created"]
+    pagination_class = pagination.DefaultCursorPagination
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -1617,3 +1630,159 @@ class SafeExportView(BannedSafeMixin, GenericAPIView):
         serializer = self.get_serializer(transactions, many=True)
 
         return paginator.get_paginated_response(serializer.data)
+
+
+EXPORT_FILE_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+export_file_parameters = [
+    OpenApiParameter(
+        "execution_date__gte",
+        location="query",
+        type=OpenApiTypes.DATETIME,
+        description="Filter transactions executed after this date (ISO format)",
+    ),
+    OpenApiParameter(
+        "execution_date__lte",
+        location="query",
+        type=OpenApiTypes.DATETIME,
+        description="Filter transactions executed before this date (ISO format)",
+    ),
+    OpenApiParameter(
+        "file_format",
+        location="query",
+        type=OpenApiTypes.STR,
+        enum=list(EXPORT_FILE_CONTENT_TYPES),
+        default="csv",
+        description="Format of the export file",
+    ),
+]
+
+
+class SafeExportFileMixin:
+    def get_export_params(self, request, address) -> Response | dict[str, Any]:
+        """
+        :param request:
+        :param address:
+        :return: Validated query params, or error `Response` if address or params are not valid
+        """
+        if not fast_is_checksum_address(address):
+            return Response(
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                data={
+                    "code": 1,
+                    "message": "Checksum address validation failed",
+                    "arguments": [address],
+                },
+            )
+
+        if not SafeContract.objects.filter(address=address).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        serializer = SafeExportFileRequestParams(data=request.query_params.dict())
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+
+@extend_schema(
+    parameters=export_file_parameters,
+    responses={
+        (200, "text/csv"): OpenApiTypes.STR,
+        (200, "application/x-ndjson"): OpenApiTypes.STR,
+        404: OpenApiResponse(description="Safe not found"),
+        422: OpenApiResponse(
+            description="Safe address checksum not valid",
+            response=serializers.CodeErrorResponse,
+        ),
+    },
+)
+class SafeExportStreamView(SafeExportFileMixin, BannedSafeMixin, GenericAPIView):
+    """
+    Export every transaction in a single request, streamed as CSV or NDJSON
+    """
+
+    pagination_class = None  # Don't show limit/offset in swagger
+
+    def get(self, request, address):
+        """
+        Get every transaction with transfer information as a CSV or NDJSON file, with the same fields
+        as the export endpoint. Transactions are streamed, so no pagination is required.
+        """
+        params = self.get_export_params(request, address)
+        if isinstance(params, Response):
+            return params
+
+        file_format = params["file_format"]
+        transaction_service = TransactionServiceProvider()
+        response = StreamingHttpResponse(
+            transaction_service.iter_export_transactions_file(
+                address,
+                file_format,
+                execution_date_gte=params.get("execution_date__gte"),
+                execution_date_lte=params.get("execution_date__lte"),
+            ),
+            content_type=EXPORT_FILE_CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{address}-transactions.{file_format}"'
+        )
+        return response
+
+
+@extend_schema(
+    parameters=export_file_parameters,
+    request=None,
+    responses={
+        202: OpenApiResponse(
+            response=serializers.SafeExportFileResponseSerializer,
+            description="Export file will be available on the returned url when generated",
+        ),
+        404: OpenApiResponse(description="Safe not found or export files not enabled"),
+        422: OpenApiResponse(
+            description="Safe address checksum not valid",
+            response=serializers.CodeErrorResponse,
+        ),
+    },
+)
+class SafeExportFileView(SafeExportFileMixin, BannedSafeMixin, GenericAPIView):
+    """
+    Generate export files in the background
+    """
+
+    pagination_class = None  # Don't show limit/offset in swagger
+    serializer_class = serializers.SafeExportFileResponseSerializer
+
+    def post(self, request, address):
+        """
+        Generate a CSV or NDJSON file with every transaction with transfer information, with the same fields
+        as the export endpoint. File is generated in the background and it will be available on the returned `url`.
+        """
+        if not settings.EXPORT_FILES_ENABLED:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        params = self.get_export_params(request, address)
+        if isinstance(params, Response):
+            return params
+
+        file_format = params["file_format"]
+        path = f"exports/{address}/{uuid.uuid4().hex}.{file_format}"
+        export_safe_transactions_file_task.delay(
+            address,
+            file_format,
+            path,
+            execution_date_gte=(
+                params["execution_date__gte"].isoformat()
+                if params.get("execution_date__gte")
+                else None
+            ),
+            execution_date_lte=(
+                params["execution_date__lte"].isoformat()
+                if params.get("execution_date__lte")
+                else None
+            ),
+        )
+        serializer = self.get_serializer(data={"url": get_file_storage().url(path)})
+        assert serializer.is_valid()
+        return Response(status=status.HTTP_202_ACCEPTED, data=serializer.data)
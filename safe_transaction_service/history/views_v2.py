@@ -24,7 +24,11 @@ from safe_transaction_service.utils.views.mixins import BannedSafeMixin
 
 from ..loggers.custom_logger import http_request_log
 from . import filters, pagination, serializers
-from .cache import CacheSafeTxsView, cache_txs_view_for_address
+from .cache import (
+    CacheSafeTxsView,
+    cache_rendered_txs_view_for_address,
+    cache_txs_view_for_address,
+)
 from .models import (
     MultisigTransaction,
     SafeContract,
@@ -381,7 +385,8 @@ class SafeMultisigTransactionListView(BannedSafeMixin, ListAPIView):
     )
     filterset_class = filters.MultisigTransactionFilter
     ordering_fields = ["nonce", "created", "modified"]
-    pagination_class = pagination.DefaultPagination
+    ordering = ["-nonce", "-created"]
+    pagination_class = pagination.DefaultCursorPagination
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -504,10 +509,11 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
         OrderingFilter,
     )
     ordering_fields = ["timestamp"]
+    ordering = ["-timestamp", "ethereum_tx_id"]
     allowed_ordering_fields = ordering_fields + [
         f"-{ordering_field}" for ordering_field in ordering_fields
     ]
-    pagination_class = pagination.SmallPagination
+    pagination_class = pagination.SmallCursorPagination
     serializer_class = (
         serializers.AllTransactionsSchemaSerializerV2
     )  # Just for docs, not used
@@ -572,17 +578,13 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
             return self.get_paginated_response([])
 
         all_tx_identifiers = [element.ethereum_tx_id for element in tx_identifiers_page]
-        all_txs = transaction_service.get_all_txs_from_identifiers(
-            safe, all_tx_identifiers
-        )
-        logger.debug(
-            "%s: Got all txs from identifiers for Safe=%s",
-            self.__class__.__name__,
-            safe,
+        all_txs_serialized = (
+            transaction_service.get_all_txs_serialized_from_identifiers(
+                safe, all_tx_identifiers, api_version=2
+            )
         )
-        all_txs_serialized = transaction_service.serialize_all_txs_v2(all_txs)
         logger.debug(
-            "%s: All txs from identifiers for Safe=%s were serialized",
+            "%s: Got all txs serialized from identifiers for Safe=%s",
             self.__class__.__name__,
             safe,
         )
@@ -596,6 +598,9 @@ class AllTransactionsListView(BannedSafeMixin, ListAPIView):
         return paginated_response
 
     @extend_schema(tags=["transactions"])
+    @cache_rendered_txs_view_for_address(
+        CacheSafeTxsView.LIST_ALL_TRANSACTIONS_VIEW_CACHE_KEY
+    )
     def get(self, request, *args, **kwargs):
         """
         Returns all the *executed* transactions for a given Safe address.
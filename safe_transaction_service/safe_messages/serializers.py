@@ -10,15 +10,15 @@ from eth_typing import ChecksumAddress, HexStr
 from hexbytes import HexBytes
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from safe_eth.eth import get_auto_ethereum_client
 from safe_eth.eth.eip712 import eip712_encode
 from safe_eth.eth.utils import fast_keccak
 from safe_eth.safe.safe_signature import SafeSignature, SafeSignatureType
 from safe_eth.util.util import to_0x_hex_str
 
-from safe_transaction_service.utils.serializers import (
-    get_safe_owners,
+from safe_transaction_service.history.services.signature_service import (
+    SignatureServiceProvider,
 )
+from safe_transaction_service.utils.serializers import get_safe_owners
 
 from .models import SIGNATURE_LENGTH, SafeMessage, SafeMessageConfirmation
 from .utils import get_message_encoded, get_safe_message_hash_and_preimage_for_message
@@ -44,14 +44,15 @@ class SafeMessageSignatureParserMixin:
                 f"1 owner signature was expected, {len(safe_signatures)} received"
             )
 
-        ethereum_client = get_auto_ethereum_client()
-        for safe_signature in safe_signatures:
-            if not safe_signature.is_valid(ethereum_client, safe_address):
-                raise ValidationError(
-                    f"Signature={to_0x_hex_str(safe_signature.signature)} for owner={safe_signature.owner} is not valid"
-                )
+        (verification,) = SignatureServiceProvider().verify_safe_signatures(
+            safe_signatures, safe_address
+        )
+        if not verification.is_valid:
+            raise ValidationError(
+                f"Signature={to_0x_hex_str(verification.safe_signature.signature)} for owner={verification.owner} is not valid"
+            )
 
-        owner = safe_signatures[0].owner
+        owner = verification.owner
         signature_type = safe_signatures[0].signature_type
         if safe_message:
             # Check signature is not already in database
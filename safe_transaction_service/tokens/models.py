@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import logging
 import os
+from collections.abc import Sequence
 from json import JSONDecodeError
 from typing import Optional, TypedDict
 from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
@@ -17,10 +18,21 @@ from eth_abi.exceptions import DecodingError
 from eth_typing import ChecksumAddress
 from imagekit.models import ProcessedImageField
 from pilkit.processors import Resize
-from safe_eth.eth import InvalidERC20Info, InvalidERC721Info, get_auto_ethereum_client
+from safe_eth.eth import (
+    EthereumClient,
+    InvalidERC20Info,
+    InvalidERC721Info,
+    get_auto_ethereum_client,
+)
+from safe_eth.eth.contracts import get_erc20_contract
 from safe_eth.eth.django.models import EthereumAddressBinaryField
+from safe_eth.eth.exceptions import BatchCallFunctionFailed
+from safe_eth.eth.multicall import MulticallDecodedResult
+from safe_eth.eth.utils import decode_string_or_bytes32
 from web3.exceptions import Web3Exception
 
+from safe_transaction_service.utils.utils import chunks
+
 from .clients.zerion_client import (
     BalancerTokenAdapterClient,
     ZerionTokenAdapterClient,
@@ -139,19 +151,7 @@ class TokenManager(models.Manager):
             TokenNotValid.objects.get_or_create(address=token_address)
             return None
 
-        name_and_symbol: list[str] = []
-        for text in (erc_info.name, erc_info.symbol):
-            if isinstance(text, str):
-                text = text.encode()
-            name_and_symbol.append(
-                text.decode("utf-8", errors="replace").replace("\x00", "\ufffd")
-            )
-
-        name, symbol = name_and_symbol
-        # If symbol is way bigger than name (by 5 characters), swap them (e.g. POAP)
-        if (len(name) - len(symbol)) < -5:
-            name, symbol = symbol, name
-
+        name, symbol = self._normalize_name_and_symbol(erc_info.name, erc_info.symbol)
         try:
             with transaction.atomic():
                 return self.create(
@@ -171,6 +171,196 @@ class TokenManager(models.Manager):
             )
             return None
 
+    @staticmethod
+    def _normalize_name_and_symbol(
+        name: str | bytes, symbol: str | bytes
+    ) -> tuple[str, str]:
+        """
+        :param name:
+        :param symbol:
+        :return: `name` and `symbol` as valid strings for the database, swapped if
+            symbol is way bigger than name
+        """
+        name_and_symbol: list[str] = []
+        for text in (name, symbol):
+            if isinstance(text, str):
+                text = text.encode()
+            name_and_symbol.append(
+                text.decode("utf-8", errors="replace").replace("\x00", "\ufffd")
+            )
+
+        name, symbol = name_and_symbol
+        # If symbol is way bigger than name (by 5 characters), swap them (e.g. POAP)
+        if (len(name) - len(symbol)) < -5:
+            name, symbol = symbol, name
+        return name, symbol
+
+    @staticmethod
+    def _decode_multicall_text(result: MulticallDecodedResult) -> str | None:
+        """
+        :param result: `name()` or `symbol()` result
+        :return: Decoded text, `None` if call failed. `bytes32` is supported (e.g. MKR)
+        """
+        if not result.success or result.return_data_decoded is None:
+            return None
+        if isinstance(result.return_data_decoded, str):
+            return result.return_data_decoded
+        # Multicall returns raw data if it cannot be decoded as `string`
+        try:
+            return decode_string_or_bytes32(result.return_data_decoded)
+        except (DecodingError, OverflowError, ValueError):
+            return None
+
+    def _get_info_from_multicall(
+        self,
+        ethereum_client: EthereumClient,
+        token_addresses: Sequence[ChecksumAddress],
+    ) -> list[tuple[str | None, str | None, int | None]]:
+        """
+        :param ethereum_client:
+        :param token_addresses:
+        :return: `name`, `symbol` and `decimals` for every token using one `multicall`, `None` if the call failed
+        :raises: BatchCallFunctionFailed, Web3Exception, ValueError if `multicall` cannot be executed
+        """
+        contract_functions = []
+        for token_address in token_addresses:
+            erc20_contract = get_erc20_contract(ethereum_client.w3, token_address)
+            contract_functions.extend(
+                (
+                    erc20_contract.functions.name(),
+                    erc20_contract.functions.symbol(),
+                    erc20_contract.functions.decimals(),
+                )
+            )
+        results = ethereum_client.multicall.try_aggregate(contract_functions)
+        return [
+            (
+                self._decode_multicall_text(name_result),
+                self._decode_multicall_text(symbol_result),
+                (
+                    decimals_result.return_data_decoded
+                    if decimals_result.success
+                    and isinstance(decimals_result.return_data_decoded, int)
+                    else None
+                ),
+            )
+            for name_result, symbol_result, decimals_result in chunks(results, 3)
+        ]
+
+    def _create_from_multicall(
+        self,
+        ethereum_client: EthereumClient,
+        token_addresses: Sequence[ChecksumAddress],
+    ) -> list["Token"]:
+        """
+        Same logic as ``create_from_blockchain``, but `name`, `symbol` and `decimals` for every token
+        are requested on the same `multicall`. Every call shares the gas of the same `eth_call`, so a call
+        can fail because of another token (e.g. a spam token burning all the gas). Tokens with any failed call
+        are requested again once, using one `multicall` for every token. Then:
+
+        - ERC20 if every call works.
+        - ERC721 if `name` and `symbol` work but `decimals` fails.
+        - ``TokenNotValid`` otherwise, or if `name` or `symbol` are empty.
+
+        If `multicall` cannot be executed, tokens are requested using ``create_from_blockchain``
+
+        :param ethereum_client:
+        :param token_addresses: Tokens not stored in database
+        :return: Tokens created
+        """
+        try:
+            infos = self._get_info_from_multicall(ethereum_client, token_addresses)
+        except (BatchCallFunctionFailed, Web3Exception, ValueError):
+            logger.warning(
+                "Cannot get info for %d tokens using multicall, querying them one by one",
+                len(token_addresses),
+            )
+            return [
+                token
+                for token_address in token_addresses
+                if (token := self.create_from_blockchain(token_address))
+            ]
+
+        tokens: list[Token] = []
+        tokens_not_valid: list[TokenNotValid] = []
+        created_from_blockchain: list[Token] = []
+        for token_address, info in zip(token_addresses, infos, strict=True):
+            if None in info:
+                logger.debug(
+                    "Cannot get info for token=%s using multicall, requesting it again",
+                    token_address,
+                )
+                try:
+                    (info,) = self._get_info_from_multicall(
+                        ethereum_client, [token_address]
+                    )
+                except (BatchCallFunctionFailed, Web3Exception, ValueError):
+                    if token := self.create_from_blockchain(token_address):
+                        created_from_blockchain.append(token)
+                    continue
+
+            name, symbol, decimals = info
+            if not name or not symbol:
+                logger.debug(
+                    "Token with address=%s has not name or symbol", token_address
+                )
+                tokens_not_valid.append(TokenNotValid(address=token_address))
+            else:
+                name, symbol = self._normalize_name_and_symbol(name, symbol)
+                tokens.append(
+                    Token(
+                        address=token_address,
+                        name=name[:60],
+                        symbol=symbol[:60],
+                        decimals=decimals,
+                    )
+                )
+
+        # Tokens could be created by another worker in the meantime
+        TokenNotValid.objects.bulk_create(tokens_not_valid, ignore_conflicts=True)
+        return self.bulk_create(tokens, ignore_conflicts=True) + created_from_blockchain
+
+    def create_from_blockchain_in_batch(
+        self,
+        token_addresses: Sequence[ChecksumAddress],
+        batch_size: int | None = None,
+    ) -> list["Token"]:
+        """
+        Same as ``create_from_blockchain`` for multiple tokens, but every ``batch_size`` tokens not
+        stored in database are requested using one `multicall`, and ``Token`` and ``TokenNotValid``
+        are bulk inserted. If `multicall` is not supported for the network, they are requested one by one
+
+        :param token_addresses:
+        :param batch_size: Defaults to ``TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH``
+        :return: Tokens created
+        """
+        batch_size = batch_size or settings.TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH
+        token_addresses = list(dict.fromkeys(token_addresses))
+        stored_addresses = set(
+            self.filter(address__in=token_addresses).values_list("address", flat=True)
+        ) | set(
+            TokenNotValid.objects.filter(address__in=token_addresses).values_list(
+                "address", flat=True
+            )
+        )
+        ethereum_client = get_auto_ethereum_client()
+        multicall_addresses = []
+        tokens: list[Token] = []
+        for token_address in token_addresses:
+            if token_address in stored_addresses:
+                continue
+            if token_address in ENS_CONTRACTS_WITH_TLD or not ethereum_client.multicall:
+                if token := self.create_from_blockchain(token_address):
+                    tokens.append(token)
+            else:
+                multicall_addresses.append(token_address)
+
+        for token_addresses_chunk in chunks(multicall_addresses, batch_size):
+            tokens.extend(
+                self._create_from_multicall(ethereum_client, token_addresses_chunk)
+            )
+        return tokens
+
     def fix_missing_logos(self) -> int:
         """
         Syncs tokens with empty logos with files that exist on S3 and match the address
@@ -1,12 +1,19 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import logging
+from collections.abc import Iterable
 from threading import Lock
 
 from django.conf import settings
 
 from cachetools import TTLCache
 from eth_typing import ChecksumAddress
+from safe_eth.eth.utils import fast_to_checksum_address
 
-from ..models import Token
+from safe_transaction_service.utils.redis import get_redis
+
+from ..models import Token, TokenNotValid
+
+logger = logging.getLogger(__name__)
 
 
 class TokenServiceProvider:
@@ -22,7 +29,10 @@ class TokenServiceProvider:
 
 
 class TokenService:
+    PENDING_TOKENS_KEY = "tokens:pending"
+
     def __init__(self):
+        self.redis = get_redis()
         self.cache_trusted_addresses: TTLCache[str, frozenset[ChecksumAddress]] = (
             TTLCache(maxsize=1, ttl=settings.TOKENS_TRUSTED_CACHE_TTL)
         )
@@ -59,3 +69,74 @@ class TokenService:
         :return: ``True`` if the token is trusted, ``False`` otherwise
         """
         return token_address in self.get_trusted_token_addresses()
+
+    def enqueue_tokens(self, token_addresses: Iterable[ChecksumAddress]) -> int:
+        """
+        Queue tokens not stored in database (as ``Token`` or ``TokenNotValid``) to be created
+        by ``create_pending_tokens``. Queue is a Redis set, so tokens are never queued twice
+
+        :param token_addresses:
+        :return: Number of tokens added to the queue
+        """
+        token_addresses = list(dict.fromkeys(token_addresses))
+        if not token_addresses:
+            return 0
+
+        stored_addresses = set(
+            Token.objects.filter(address__in=token_addresses).values_list(
+                "address", flat=True
+            )
+        ) | set(
+            TokenNotValid.objects.filter(address__in=token_addresses).values_list(
+                "address", flat=True
+            )
+        )
+        pending_addresses = [
+            token_address
+            for token_address in token_addresses
+            if token_address not in stored_addresses
+        ]
+        if not pending_addresses:
+            return 0
+        return self.redis.sadd(self.PENDING_TOKENS_KEY, *pending_addresses)
+
+    def get_pending_tokens_count(self) -> int:
+        """
+        :return: Number of tokens queued for creation
+        """
+        return self.redis.scard(self.PENDING_TOKENS_KEY)
+
+    def create_pending_tokens(self, max_tokens: int) -> int:
+        """
+        Create up to ``max_tokens`` queued tokens, requesting their metadata using `multicall`.
+        Tokens are removed atomically from the queue in chunks of ``TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH``,
+        so it's safe to run it concurrently. If creation of a chunk is interrupted (including a task timeout),
+        its tokens are queued again
+
+        :param max_tokens:
+        :return: Number of tokens created
+        """
+        created = 0
+        while max_tokens > 0:
+            token_addresses = [
+                fast_to_checksum_address(token_address.decode())
+                for token_address in self.redis.spop(
+                    self.PENDING_TOKENS_KEY,
+                    min(max_tokens, settings.TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH),
+                )
+            ]
+            if not token_addresses:
+                break
+            max_tokens -= len(token_addresses)
+
+            tokens = None
+            try:
+                tokens = Token.objects.create_from_blockchain_in_batch(token_addresses)
+            finally:
+                if tokens is None:
+                    self.redis.sadd(self.PENDING_TOKENS_KEY, *token_addresses)
+            logger.debug(
+                "Created %d tokens from %d queued", len(tokens), len(token_addresses)
+            )
+            created += len(tokens)
+        return created
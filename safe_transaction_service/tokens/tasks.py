@@ -2,6 +2,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
@@ -59,6 +60,23 @@ def fix_pool_tokens_task() -> int | None:
         return number
 
 
+@app.shared_task()
+@task_timeout(timeout_seconds=TASK_TIME_LIMIT)
+def create_pending_tokens_task() -> int:
+    """
+    Create tokens queued by the ERC20 indexer, so they are already stored when balances
+    or collectibles are requested
+
+    :return: Number of tokens created
+    """
+    number = TokenServiceProvider().create_pending_tokens(
+        settings.TOKENS_CREATE_FROM_INDEXER_MAX
+    )
+    if number:
+        logger.info("%d pending tokens were created", number)
+    return number
+
+
 def _parse_token_address_from_token_list(
     token_address: str,
 ) -> ChecksumAddress | None:
@@ -1,13 +1,14 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 from json import JSONDecodeError
 from unittest import mock
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock
 
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from eth_account import Account
-from safe_eth.eth.ethereum_client import Erc20Info, Erc20Manager
+from safe_eth.eth.ethereum_client import Erc20Info, Erc20Manager, EthereumClient
+from safe_eth.eth.multicall import MulticallDecodedResult
 
 from ..clients.zerion_client import (
     BalancerTokenAdapterClient,
@@ -247,6 +248,132 @@ class TestModels(TestCase):
         # Token should not be marked as not valid if there's a blockchain error
         self.assertEqual(TokenNotValid.objects.count(), 0)
 
+    @mock.patch.object(TokenManager, "create_from_blockchain", autospec=True)
+    @mock.patch.object(EthereumClient, "multicall", new_callable=PropertyMock)
+    def test_create_from_blockchain_in_batch(
+        self, multicall_mock: MagicMock, create_from_blockchain_mock: MagicMock
+    ):
+        stored_token = TokenFactory()
+        stored_token_not_valid = TokenNotValid.objects.create(
+            address=Account.create().address
+        )
+        create_from_blockchain_mock.return_value = None
+        (
+            erc20_address,
+            erc721_address,
+            bytes32_address,
+            not_valid_address,
+            failed_address,
+            failed_name_address,
+            multicall_error_address,
+        ) = (Account.create().address for _ in range(7))
+        multicall_mock.return_value.try_aggregate.side_effect = [
+            [
+                # ERC20
+                MulticallDecodedResult(True, "PESETA"),
+                MulticallDecodedResult(True, "PTA"),
+                MulticallDecodedResult(True, 18),
+                # ERC721, no decimals
+                MulticallDecodedResult(True, "Uxio Collectible Card"),
+                MulticallDecodedResult(True, "UCC"),
+                MulticallDecodedResult(False, b""),
+                # Name and symbol as bytes32, like MKR
+                MulticallDecodedResult(True, b"Maker".ljust(32, b"\x00")),
+                MulticallDecodedResult(True, b"MKR".ljust(32, b"\x00")),
+                MulticallDecodedResult(True, 18),
+                # Empty name
+                MulticallDecodedResult(True, ""),
+                MulticallDecodedResult(True, "SYMBOL"),
+                MulticallDecodedResult(True, 18),
+                # Call failed, e.g. out of gas because of another token in the batch
+                MulticallDecodedResult(False, None),
+                MulticallDecodedResult(True, "GAS"),
+                MulticallDecodedResult(True, 6),
+                # Name call failed
+                MulticallDecodedResult(False, None),
+                MulticallDecodedResult(True, "NONAME"),
+                MulticallDecodedResult(True, 18),
+                # Call failed, it will fail again when requested alone
+                MulticallDecodedResult(False, None),
+                MulticallDecodedResult(False, None),
+                MulticallDecodedResult(False, None),
+            ],
+            # Tokens with any failed call are requested again, one multicall for every token
+            [
+                MulticallDecodedResult(True, "Uxio Collectible Card"),
+                MulticallDecodedResult(True, "UCC"),
+                MulticallDecodedResult(False, b""),
+            ],
+            [
+                MulticallDecodedResult(True, "Out of Gas"),
+                MulticallDecodedResult(True, "GAS"),
+                MulticallDecodedResult(True, 6),
+            ],
+            [
+                MulticallDecodedResult(False, None),
+                MulticallDecodedResult(True, "NONAME"),
+                MulticallDecodedResult(True, 18),
+            ],
+            ValueError("Cannot execute multicall"),
+        ]
+
+        tokens = Token.objects.create_from_blockchain_in_batch(
+            [
+                stored_token.address,
+                stored_token_not_valid.address,
+                erc20_address,
+                erc721_address,
+                bytes32_address,
+                not_valid_address,
+                failed_address,
+                failed_name_address,
+                multicall_error_address,
+                erc20_address,
+            ]
+        )
+        # Only tokens not in database are requested on the same multicall, and then only failed tokens
+        try_aggregate_call_args_list = (
+            multicall_mock.return_value.try_aggregate.call_args_list
+        )
+        self.assertEqual(
+            [len(call_args[0][0]) for call_args in try_aggregate_call_args_list],
+            [21, 3, 3, 3, 3],
+        )
+        self.assertEqual(
+            [
+                (token.address, token.name, token.symbol, token.decimals)
+                for token in tokens
+            ],
+            [
+                (erc20_address, "PESETA", "PTA", 18),
+                (erc721_address, "Uxio Collectible Card", "UCC", None),
+                (bytes32_address, "Maker", "MKR", 18),
+                (failed_address, "Out of Gas", "GAS", 6),
+            ],
+        )
+        self.assertEqual(Token.objects.count(), 5)
+        self.assertEqual(
+            set(
+                TokenNotValid.objects.exclude(
+                    address=stored_token_not_valid.address
+                ).values_list("address", flat=True)
+            ),
+            {not_valid_address, failed_name_address},
+        )
+        # Only tokens that cannot be requested using multicall are requested one by one
+        create_from_blockchain_mock.assert_called_once_with(
+            Token.objects, multicall_error_address
+        )
+
+        # If multicall is not available, tokens are created one by one
+        create_from_blockchain_mock.reset_mock()
+        multicall_mock.return_value = None
+        token_address = Account.create().address
+        Token.objects.create_from_blockchain_in_batch([erc20_address, token_address])
+        create_from_blockchain_mock.assert_called_once_with(
+            Token.objects, token_address
+        )
+
 
 class TestTokenListModel(TestCase):
     @mock.patch("requests.get")
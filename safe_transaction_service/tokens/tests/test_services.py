@@ -1,9 +1,14 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+from unittest import mock
+from unittest.mock import MagicMock
+
 from django.test import TestCase
 
+import gevent
 from eth_account import Account
 
-from ..models import Token
+from ...utils.redis import get_redis
+from ..models import Token, TokenManager, TokenNotValid
 from ..services import TokenServiceProvider
 from .factories import TokenFactory
 
@@ -11,9 +16,11 @@ from .factories import TokenFactory
 class TokenServiceTestCase(TestCase):
     def setUp(self):
         TokenServiceProvider.del_singleton()
+        get_redis().flushall()
 
     def tearDown(self):
         TokenServiceProvider.del_singleton()
+        get_redis().flushall()
 
     def test_is_trusted(self):
         token_service = TokenServiceProvider()
@@ -50,3 +57,64 @@ class TokenServiceTestCase(TestCase):
         self.assertEqual(
             token_service.get_trusted_token_addresses(), frozenset({token.address})
         )
+
+    @mock.patch.object(TokenManager, "create_from_blockchain_in_batch")
+    def test_create_pending_tokens(
+        self, create_from_blockchain_in_batch_mock: MagicMock
+    ):
+        token_service = TokenServiceProvider()
+        token = TokenFactory()
+        token_not_valid = TokenNotValid.objects.create(address=Account.create().address)
+        token_addresses = [Account.create().address for _ in range(3)]
+
+        # Stored tokens are not queued, queued tokens are not queued twice
+        self.assertEqual(
+            token_service.enqueue_tokens(
+                [token.address, token_not_valid.address] + token_addresses
+            ),
+            3,
+        )
+        self.assertEqual(token_service.enqueue_tokens(token_addresses[:1]), 0)
+        self.assertEqual(token_service.get_pending_tokens_count(), 3)
+
+        create_from_blockchain_in_batch_mock.return_value = [token]
+        self.assertEqual(token_service.create_pending_tokens(2), 1)
+        self.assertEqual(len(create_from_blockchain_in_batch_mock.call_args[0][0]), 2)
+        self.assertTrue(
+            set(create_from_blockchain_in_batch_mock.call_args[0][0])
+            <= set(token_addresses)
+        )
+        self.assertEqual(token_service.get_pending_tokens_count(), 1)
+
+        # Tokens are queued again if creation fails
+        create_from_blockchain_in_batch_mock.side_effect = IOError
+        with self.assertRaises(IOError):
+            token_service.create_pending_tokens(2)
+        self.assertEqual(token_service.get_pending_tokens_count(), 1)
+
+        # Also if task is stopped by a timeout, that is not an `Exception`
+        create_from_blockchain_in_batch_mock.side_effect = gevent.Timeout
+        with self.assertRaises(gevent.Timeout):
+            token_service.create_pending_tokens(2)
+        self.assertEqual(token_service.get_pending_tokens_count(), 1)
+
+        create_from_blockchain_in_batch_mock.side_effect = None
+        create_from_blockchain_in_batch_mock.reset_mock()
+        token_service.create_pending_tokens(2)
+        token_service.create_pending_tokens(2)
+        create_from_blockchain_in_batch_mock.assert_called_once()
+        self.assertEqual(token_service.get_pending_tokens_count(), 0)
+
+        # Tokens are removed from the queue and created in chunks
+        self.assertEqual(token_service.enqueue_tokens(token_addresses), 3)
+        create_from_blockchain_in_batch_mock.reset_mock()
+        with self.settings(TOKENS_CREATE_FROM_BLOCKCHAIN_BATCH=2):
+            self.assertEqual(token_service.create_pending_tokens(5), 2)
+        self.assertEqual(
+            [
+                len(call_args[0][0])
+                for call_args in create_from_blockchain_in_batch_mock.call_args_list
+            ],
+            [2, 1],
+        )
+        self.assertEqual(token_service.get_pending_tokens_count(), 0)
@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.db.models import Model, QuerySet
+
+logger = logging.getLogger(__name__)
+
+
+class BatchProcessorException(Exception):
+    pass
+
+
+@dataclass
+class BatchResult:
+    problems: int = 0
+    first_bad_block: int | None = None
+
+
+@dataclass
+class BatchProcessorCheckpoint:
+    """
+    Progress of a ``KeysetBatchProcessor`` run. Stored after every batch so the run can be resumed
+    """
+
+    name: str
+    last_pk: Any = None
+    processed: int = 0
+    problems: int = 0
+    first_bad_block: int | None = None
+    batches: int = 0
+    elapsed: float = 0.0
+    slowest_batch_elapsed: float = 0.0
+
+    def update(self, elements: list[Model], result: BatchResult, elapsed: float):
+        self.last_pk = elements[-1].pk
+        self.processed += len(elements)
+        self.problems += result.problems
+        if result.first_bad_block is not None:
+            self.first_bad_block = (
+                result.first_bad_block
+                if self.first_bad_block is None
+                else min(self.first_bad_block, result.first_bad_block)
+            )
+        self.batches += 1
+        self.elapsed += elapsed
+        self.slowest_batch_elapsed = max(self.slowest_batch_elapsed, elapsed)
+
+    def get_summary(self) -> str:
+        average = self.elapsed / self.batches if self.batches else 0.0
+        return (
+            f"Processed={self.processed} Problems={self.problems} "
+            f"First-bad-block={self.first_bad_block} Batches={self.batches} "
+            f"Elapsed={self.elapsed:.2f}s Batch-average={average:.2f}s Batch-slowest={self.slowest_batch_elapsed:.2f}s"
+        )
+
+
+class KeysetBatchProcessor[M: Model, R]:
+    """
+    Process a queryset in batches, iterating by primary key (no `OFFSET`) so every batch costs the same:
+
+    - ``fetch_fn`` receives every batch on a thread pool, it's intended for I/O (RPC calls). It must not
+      use the database, as the rows for the batch are already retrieved.
+    - ``handle_fn`` receives every batch with the ``fetch_fn`` result on the calling thread, in order,
+      so it can safely use the database. It returns a ``BatchResult``.
+
+    If a ``checkpoint_path`` is provided, progress is stored there after every handled batch and the next run
+    resumes from it. Checkpoint is removed when the run is completed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        queryset: QuerySet[M],
+        batch_size: int,
+        workers: int = 1,
+        checkpoint_path: str | None = None,
+        write: Callable[[str], Any] = logger.info,
+    ):
+        """
+        :param name: Checkpoints stored for a different ``name`` will not be used
+        :param queryset:
+        :param batch_size:
+        :param workers: Threads for ``fetch_fn``. If `1`, it will run on the calling thread
+        :param checkpoint_path: File to store progress
+        :param write: Function to report progress
+        """
+        self.name = name
+        self.queryset = queryset.order_by("pk")
+        self.batch_size = batch_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.write = write
+
+    def load_checkpoint(self) -> BatchProcessorCheckpoint:
+        """
+        :return: Stored checkpoint if ``checkpoint_path`` exists, a new one otherwise
+        :raises: BatchProcessorException if checkpoint was stored for other ``name``
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return BatchProcessorCheckpoint(self.name)
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = BatchProcessorCheckpoint(**json.load(checkpoint_file))
+        if checkpoint.name != self.name:
+            raise BatchProcessorException(
+                f"Checkpoint {self.checkpoint_path} was stored by {checkpoint.name}, not by {self.name}"
+            )
+        return checkpoint
+
+    def store_checkpoint(self, checkpoint: BatchProcessorCheckpoint) -> None:
+        if self.checkpoint_path:
+            # Write and rename, so checkpoint is never left half written
+            tmp_path = f"{self.checkpoint_path}.tmp"
+            with open(tmp_path, "w") as checkpoint_file:
+                json.dump(asdict(checkpoint), checkpoint_file)
+            os.replace(tmp_path, self.checkpoint_path)
+
+    def iter_batches(self, last_pk: Any = None) -> Iterator[list[M]]:
+        """
+        :param last_pk: Start after this primary key
+        :return: Batches of ``batch_size`` elements ordered by primary key
+        """
+        while True:
+            queryset = (
+                self.queryset
+                if last_pk is None
+                else self.queryset.filter(pk__gt=last_pk)
+            )
+            elements = list(queryset[: self.batch_size])
+            if not elements:
+                return
+            yield elements
+            last_pk = elements[-1].pk
+
+    def run(
+        self,
+        fetch_fn: Callable[[list[M]], R],
+        handle_fn: Callable[[list[M], R], BatchResult],
+    ) -> BatchProcessorCheckpoint:
+        """
+        :param fetch_fn:
+        :param handle_fn:
+        :return: Checkpoint with the summary for the whole run, including previous runs if resumed
+        """
+        checkpoint = self.load_checkpoint()
+        if checkpoint.last_pk is not None:
+            self.write(
+                f"Resuming {self.name} after pk={checkpoint.last_pk}, {checkpoint.processed} already processed"
+            )
+
+        executor = (
+            ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        )
+        # Batches are handled in the same order they are fetched, so checkpoint only moves forward
+        pending: deque[tuple[list[M], Future]] = deque()
+        try:
+            for elements in self.iter_batches(checkpoint.last_pk):
+                if executor:
+                    future = executor.submit(self._timed_fetch, fetch_fn, elements)
+                else:
+                    future = Future()
+                    future.set_result(self._timed_fetch(fetch_fn, elements))
+                pending.append((elements, future))
+                # Keep every worker busy while the oldest batch is handled
+                if len(pending) >= self.workers:
+                    self._handle_batch(pending.popleft(), handle_fn, checkpoint)
+            while pending:
+                self._handle_batch(pending.popleft(), handle_fn, checkpoint)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        self.write(f"Completed {self.name}. {checkpoint.get_summary()}")
+        return checkpoint
+
+    @staticmethod
+    def _timed_fetch(
+        fetch_fn: Callable[[list[M]], R], elements: list[M]
+    ) -> tuple[R, float]:
+        start = time.time()
+        return fetch_fn(elements), time.time() - start
+
+    def _handle_batch(
+        self,
+        pending_batch: tuple[list[M], Future],
+        handle_fn: Callable[[list[M], R], BatchResult],
+        checkpoint: BatchProcessorCheckpoint,
+    ) -> None:
+        elements, future = pending_batch
+        fetch_result, fetch_elapsed = future.result()
+        start = time.time()
+        result = handle_fn(elements, fetch_result)
+        elapsed = fetch_elapsed + time.time() - start
+        checkpoint.update(elements, result, elapsed)
+        self.store_checkpoint(checkpoint)
+        self.write(
+            f"Batch {checkpoint.batches}: processed={checkpoint.processed} "
+            f"last-pk={checkpoint.last_pk} problems={result.problems} elapsed={elapsed:.2f}s"
+        )
@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from typing import Any
+
+import requests
+
+logger = getLogger(__name__)
+
+JsonRpcRequest = dict[str, Any]
+JsonRpcResponse = dict[str, Any]
+
+
+class JsonRpcReplayServer:
+    """
+    Local stand-in for an Ethereum node. It answers JSON-RPC requests (single and batch) with the
+    responses recorded on a fixture, so indexing can be replayed without a node.
+
+    If `upstream_url` is provided requests are forwarded to it and the responses are recorded, so they
+    can be stored using `save` and replayed later. Responses are stored by method and parameters,
+    request `id` is ignored
+    """
+
+    FIXTURE_VERSION = 1
+    NOT_RECORDED_ERROR_CODE = -32001
+
+    def __init__(
+        self,
+        responses: dict[str, JsonRpcResponse] | None = None,
+        upstream_url: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        :param responses: Recorded responses, with `get_request_key` as the key
+        :param upstream_url: If provided, node to forward the requests to and record the responses
+        :param host:
+        :param port: `0` to use a random free port
+        """
+        self.responses: dict[str, JsonRpcResponse] = responses or {}
+        self.upstream_url = upstream_url
+        self.host = host
+        self.port = port
+        self.requests_count = 0
+        self.not_recorded_requests_count = 0
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._http_server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def get_request_key(request: JsonRpcRequest) -> str:
+        """
+        :param request:
+        :return: Key to store the response for `request`, ignoring the `id`
+        """
+        return json.dumps(
+            [request.get("method"), request.get("params", [])],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "JsonRpcReplayServer":
+        """
+        :param path: Fixture stored with `save`
+        :return: Server replaying the responses on the fixture
+        """
+        with gzip.open(path, "rt") as f:
+            fixture = json.load(f)
+        if fixture.get("version") != cls.FIXTURE_VERSION:
+            raise ValueError(f"Not supported fixture version {fixture.get('version')}")
+        return cls(responses=fixture["responses"])
+
+    def save(self, path: str) -> int:
+        """
+        Store recorded responses on `path` as gzipped JSON
+
+        :param path:
+        :return: Number of responses stored
+        """
+        with self._lock:
+            responses = dict(self.responses)
+        with gzip.open(path, "wt") as f:
+            json.dump({"version": self.FIXTURE_VERSION, "responses": responses}, f)
+        return len(responses)
+
+    def _fetch_from_upstream(
+        self, requests_: list[JsonRpcRequest]
+    ) -> list[JsonRpcResponse]:
+        response = self._session.post(self.upstream_url, json=requests_, timeout=120)
+        response.raise_for_status()
+        upstream_responses = response.json()
+        if isinstance(upstream_responses, dict):
+            # Some nodes answer with a single error for the whole batch
+            return [
+                {**upstream_responses, "id": request.get("id")} for request in requests_
+            ]
+        upstream_responses_by_id = {
+            upstream_response.get("id"): upstream_response
+            for upstream_response in upstream_responses
+        }
+        results = []
+        for request in requests_:
+            upstream_response = upstream_responses_by_id[request.get("id")]
+            recorded = {
+                key: value
+                for key, value in upstream_response.items()
+                if key in ("result", "error")
+            }
+            with self._lock:
+                self.responses[self.get_request_key(request)] = recorded
+            results.append(upstream_response)
+        return results
+
+    def _replay(self, request: JsonRpcRequest) -> JsonRpcResponse:
+        recorded = self.responses.get(self.get_request_key(request))
+        if recorded is None:
+            with self._lock:
+                self.not_recorded_requests_count += 1
+            logger.warning(
+                "Request method=%s params=%s is not recorded",
+                request.get("method"),
+                request.get("params"),
+            )
+            recorded = {
+                "error": {
+                    "code": self.NOT_RECORDED_ERROR_CODE,
+                    "message": "Request not recorded on fixture",
+                }
+            }
+        return {"jsonrpc": "2.0", "id": request.get("id"), **recorded}
+
+    def handle_payload(
+        self, payload: JsonRpcRequest | list[JsonRpcRequest]
+    ) -> JsonRpcResponse | list[JsonRpcResponse]:
+        """
+        :param payload: Single or batch JSON-RPC request
+        :return: JSON-RPC response for `payload`
+        """
+        requests_ = payload if isinstance(payload, list) else [payload]
+        with self._lock:
+            self.requests_count += len(requests_)
+        if self.upstream_url:
+            responses = self._fetch_from_upstream(requests_)
+        else:
+            responses = [self._replay(request) for request in requests_]
+        return responses if isinstance(payload, list) else responses[0]
+
+    def _build_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                body = json.dumps(server.handle_payload(payload)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        return RequestHandler
+
+    def start(self) -> "JsonRpcReplayServer":
+        self._http_server = ThreadingHTTPServer(
+            (self.host, self.port), self._build_request_handler()
+        )
+        self.port = self._http_server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._http_server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        logger.info("JSON-RPC replay server listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._thread.join()
+            self._http_server = self._thread = None
+
+    def __enter__(self) -> "JsonRpcReplayServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
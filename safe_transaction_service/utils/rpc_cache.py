@@ -0,0 +1,265 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from collections.abc import Callable, Collection, Hashable, Sequence
+from functools import cache
+from logging import getLogger
+from typing import Any
+
+from django.conf import settings
+
+from hexbytes import HexBytes
+from safe_eth.eth import EthereumClient, get_auto_ethereum_client
+
+logger = getLogger(__name__)
+
+
+class RpcCache:
+    """
+    Persistent cache for RPC responses that cannot change anymore, as they belong to blocks
+    older than the reorg window. Reindexing the same chain segment again will be bound by
+    the database instead of the node.
+
+    Responses are pickled, compressed and stored on a local SQLite file, keyed by the hash of the
+    chain id, a `namespace` (RPC method and parameters not related to block numbers) and a key
+    (block number, block hash or tx hash). Responses for block ranges are stored per block, so
+    they can be reused when the range is requested with a different `block_process_limit`.
+
+    Filters like the addresses for `eth_getLogs` or `trace_filter` are part of the namespace, so
+    a response is only reused when the same set of addresses is requested again (e.g. reindexing
+    every Safe), not for a subset of them
+    """
+
+    STABLE_BLOCK_NUMBER_REFRESH_SECONDS = 10
+
+    def __init__(
+        self,
+        path: str,
+        ethereum_client: EthereumClient,
+        eth_reorg_blocks: int,
+        compression_level: int = 1,
+    ):
+        """
+        :param path: SQLite file to store the responses
+        :param ethereum_client: Used to get the chain id and the current block number
+        :param eth_reorg_blocks: Blocks newer than `current block - eth_reorg_blocks` are never cached
+        :param compression_level: `zlib` compression level, from `0` to `9`
+        """
+        self.path = path
+        self.ethereum_client = ethereum_client
+        self.eth_reorg_blocks = eth_reorg_blocks
+        self.compression_level = compression_level
+        self._chain_id: int | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+        self._stable_block_number = -1
+        self._stable_block_number_refreshed = 0.0
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.ethereum_client.get_chain_id()
+        return self._chain_id
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared with forked processes (e.g. Celery prefork workers)
+        if self._connection is None or self._connection_pid != os.getpid():
+            logger.info("Opening RPC cache on %s", self.path)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rpc_cache "
+                "(key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID"
+            )
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def is_stable(self, block_number: int) -> bool:
+        """
+        :param block_number:
+        :return: ``True`` if `block_number` is older than the reorg window, so data for it can be cached
+        """
+        if block_number <= self._stable_block_number:
+            return True
+        # Underestimating the stable block number is safe, so don't query the node every time
+        if (
+            time.monotonic() - self._stable_block_number_refreshed
+            > self.STABLE_BLOCK_NUMBER_REFRESH_SECONDS
+        ):
+            self._stable_block_number = (
+                self.ethereum_client.current_block_number - self.eth_reorg_blocks
+            )
+            self._stable_block_number_refreshed = time.monotonic()
+        return block_number <= self._stable_block_number
+
+    @staticmethod
+    def build_namespace(method: str, parameters: Any = None) -> str:
+        """
+        :param method: RPC method or client function name
+        :param parameters: JSON serializable parameters for the call, excluding block numbers
+        :return: Namespace for `method` with `parameters`
+        """
+        if parameters is None:
+            return method
+        parameters_hash = hashlib.sha256(
+            json.dumps(parameters, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{method}:{parameters_hash}"
+
+    def _get_db_key(self, namespace: str, key: Hashable) -> bytes:
+        if isinstance(key, bytes | bytearray) or (
+            isinstance(key, str) and key.startswith("0x")
+        ):
+            # Same key for hashes provided as `bytes` or hex strings
+            key = HexBytes(key).hex()
+        return hashlib.sha256(f"{self.chain_id}:{namespace}:{key}".encode()).digest()
+
+    def get_many(self, namespace: str, keys: Sequence[Hashable]) -> dict[Hashable, Any]:
+        """
+        :param namespace:
+        :param keys:
+        :return: Dictionary with the cached responses for `keys`. Keys not cached are not returned
+        """
+        db_keys = {self._get_db_key(namespace, key): key for key in keys}
+        result: dict[Hashable, Any] = {}
+        db_keys_list = list(db_keys)
+        # Keep the number of SQL variables under SQLite limits
+        for i in range(0, len(db_keys_list), 500):
+            chunk = db_keys_list[i : i + 500]
+            for db_key, value in self.connection.execute(
+                f"SELECT key, value FROM rpc_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                result[db_keys[bytes(db_key)]] = pickle.loads(zlib.decompress(value))
+        return result
+
+    def set_many(self, namespace: str, values: dict[Hashable, Any]) -> None:
+        """
+        Store `values`. Caller must make sure they belong to stable blocks
+
+        :param namespace:
+        :param values: Dictionary with the responses to store for every key
+        """
+        if not values:
+            return None
+        with self.connection as connection:  # Commit on exit
+            connection.executemany(
+                "INSERT OR IGNORE INTO rpc_cache (key, value) VALUES (?, ?)",
+                [
+                    (
+                        self._get_db_key(namespace, key),
+                        zlib.compress(pickle.dumps(value), self.compression_level),
+                    )
+                    for key, value in values.items()
+                ],
+            )
+
+    def get_or_fetch_block_range(
+        self,
+        namespace: str,
+        from_block_number: int,
+        to_block_number: int,
+        fetch: Callable[[], list[Any]],
+        get_block_number: Callable[[Any], int] = lambda element: element["blockNumber"],
+    ) -> list[Any]:
+        """
+        Return the elements for a block range (logs, traces...) from the cache if every block in the range
+        is cached, otherwise call `fetch` and store the result per block if blocks are stable
+
+        :param namespace:
+        :param from_block_number:
+        :param to_block_number:
+        :param fetch: Function to retrieve the elements for the full range from the node
+        :param get_block_number: Function to get the block number of an element
+        :return: Elements for the block range, in the same order the node returns them
+        """
+        block_numbers = list(range(from_block_number, to_block_number + 1))
+        if not self.is_stable(to_block_number):
+            return fetch()
+
+        cached = self.get_many(namespace, block_numbers)
+        if len(cached) == len(block_numbers):
+            logger.debug(
+                "Found %s from-block=%d to-block=%d on RPC cache",
+                namespace,
+                from_block_number,
+                to_block_number,
+            )
+            return [
+                element
+                for block_number in block_numbers
+                for element in cached[block_number]
+            ]
+
+        elements = fetch()
+        elements_per_block: dict[int, list[Any]] = {
+            block_number: [] for block_number in block_numbers
+        }
+        for element in elements:
+            if (block_number := get_block_number(element)) in elements_per_block:
+                elements_per_block[block_number].append(element)
+            else:
+                # Unexpected element outside the range, don't cache anything
+                return elements
+        self.set_many(namespace, elements_per_block)
+        return elements
+
+    def get_or_fetch_many(
+        self,
+        namespace: str,
+        keys: Collection[Hashable],
+        fetch: Callable[[list[Hashable]], Sequence[Any]],
+        get_block_number: Callable[[Hashable, Any], int | None],
+    ) -> list[Any]:
+        """
+        Return responses for `keys` (tx hashes, block hashes...), retrieving only the missing
+        ones with `fetch` and storing them if they belong to a stable block
+
+        :param namespace:
+        :param keys:
+        :param fetch: Function to retrieve responses for a list of keys from the node, in the same order
+        :param get_block_number: Function to get the block number for a key and its response. If ``None`` is returned
+            (e.g. transaction still pending), response will not be stored
+        :return: Responses in the same order as `keys`
+        """
+        keys = list(keys)
+        cached = self.get_many(namespace, keys)
+        missing_keys = [key for key in keys if key not in cached]
+        if missing_keys:
+            fetched = dict(zip(missing_keys, fetch(missing_keys), strict=True))
+            self.set_many(
+                namespace,
+                {
+                    key: value
+                    for key, value in fetched.items()
+                    # Empty responses (e.g. no traces for a block) are also stored
+                    if value is not None
+                    and (block_number := get_block_number(key, value)) is not None
+                    and self.is_stable(block_number)
+                },
+            )
+            cached.update(fetched)
+        return [cached[key] for key in keys]
+
+
+@cache
+def get_rpc_cache() -> RpcCache | None:
+    """
+    :return: `RpcCache` if `ETH_RPC_CACHE_PATH` is configured, ``None`` otherwise
+    """
+    if not settings.ETH_RPC_CACHE_PATH:
+        return None
+    return RpcCache(
+        settings.ETH_RPC_CACHE_PATH,
+        get_auto_ethereum_client(),
+        settings.ETH_REORG_BLOCKS,
+        compression_level=settings.ETH_RPC_CACHE_COMPRESSION_LEVEL,
+    )
@@ -5,26 +5,29 @@ from eth_typing import ChecksumAddress
 from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import DateTimeField
 from safe_eth.eth import get_auto_ethereum_client
-from safe_eth.safe import Safe
-from web3.exceptions import Web3Exception
 
 
 def get_safe_owners(safe_address: ChecksumAddress) -> list[ChecksumAddress]:
     """
     :param safe_address:
-    :return: Current owners for a Safe
+    :return: Current owners for a Safe. They are cached, see `SafeService.get_safe_owners_and_threshold`
     :raises: ValidationError
     """
-    ethereum_client = get_auto_ethereum_client()
-    safe = Safe(safe_address, ethereum_client)
+    from safe_transaction_service.history.exceptions import (
+        CannotGetSafeInfoFromBlockchain,
+        NodeConnectionException,
+    )
+    from safe_transaction_service.history.services import SafeServiceProvider
+
     try:
-        return safe.retrieve_owners(block_identifier="latest")
-    except Web3Exception as e:
+        owners, _ = SafeServiceProvider().get_safe_owners_and_threshold(safe_address)
+        return owners
+    except CannotGetSafeInfoFromBlockchain as e:
         raise ValidationError(
             f"Could not get Safe {safe_address} owners from blockchain, check contract exists on network "
-            f"{ethereum_client.get_network().name}"
+            f"{get_auto_ethereum_client().get_network().name}"
         ) from e
-    except OSError as exc:
+    except NodeConnectionException as exc:
         raise ValidationError(
             "Problem connecting to the ethereum node, please try again later"
         ) from exc
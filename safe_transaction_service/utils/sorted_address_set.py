@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import datetime
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Set
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+class _AddressesView:
+    """
+    Sequence of the fixed width addresses stored on a buffer, to be used with `bisect`
+    """
+
+    def __init__(self, buffer: mmap.mmap | bytes, offset: int, length: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self.offset + index * SortedAddressSet.ADDRESS_SIZE
+        return self.buffer[start : start + SortedAddressSet.ADDRESS_SIZE]
+
+
+class SortedAddressSet(Set):
+    """
+    Set of 20 bytes addresses stored sorted on a file. File is memory mapped read only, so
+    every process on the same host shares the same pages instead of keeping its own Python `set`.
+    Membership is checked using binary search.
+
+    Addresses added after the file was written are kept in a small in-memory `delta` set.
+
+    File format: `MAGIC` (8 bytes), `last_checked` timestamp in microseconds (8 bytes), number
+    of addresses (8 bytes), 8 bytes reserved and then the sorted addresses
+    """
+
+    ADDRESS_SIZE = 20
+    MAGIC = b"SAFEADR1"
+    HEADER = struct.Struct(">8sQQ8x")
+
+    def __init__(self, buffer: mmap.mmap | bytes, delta: set[bytes] | None = None):
+        """
+        :param buffer: File contents, including the header
+        :param delta: Addresses not included on the `buffer`
+        :raises ValueError: If `buffer` is not valid
+        """
+        try:
+            magic, timestamp, length = self.HEADER.unpack_from(buffer)
+        except struct.error as e:
+            raise ValueError("Invalid sorted address set header") from e
+        if (
+            magic != self.MAGIC
+            or len(buffer) != self.HEADER.size + length * self.ADDRESS_SIZE
+        ):
+            raise ValueError("Invalid sorted address set")
+
+        self.buffer = buffer
+        # Addresses created after `last_checked` may not be on the `buffer`
+        self.last_checked = datetime.datetime.fromtimestamp(
+            timestamp / 1_000_000, tz=datetime.UTC
+        )
+        self.delta = delta or set()
+        self._addresses = _AddressesView(buffer, self.HEADER.size, length)
+
+    @classmethod
+    def open(cls, path: str) -> "SortedAddressSet | None":
+        """
+        :param path:
+        :return: `SortedAddressSet` memory mapping the file on `path`. ``None`` if file does not exist
+            or it's not valid
+        """
+        try:
+            with open(path, "rb") as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring invalid sorted address set file %s: %s", path, e)
+            return None
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        sorted_addresses: Iterable[bytes],
+        last_checked: datetime.datetime | None,
+    ) -> int:
+        """
+        Write addresses to `path`. File is replaced atomically, so processes with the previous
+        file mapped can keep using it
+
+        :param path:
+        :param sorted_addresses: Unique addresses, sorted ascending
+        :param last_checked: Creation date of the last address. ``None`` if there are no addresses
+        :return: Number of addresses written
+        :raises ValueError: If addresses are not sorted, unique and 20 bytes long
+        """
+        timestamp = round(last_checked.timestamp() * 1_000_000) if last_checked else 0
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        length = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(cls.HEADER.pack(cls.MAGIC, timestamp, 0))
+                previous_address = b""
+                for address in sorted_addresses:
+                    address = bytes(address)
+                    if len(address) != cls.ADDRESS_SIZE or address <= previous_address:
+                        raise ValueError(
+                            "Addresses must be unique, sorted and 20 bytes long"
+                        )
+                    f.write(address)
+                    previous_address = address
+                    length += 1
+                f.seek(0)
+                f.write(cls.HEADER.pack(cls.MAGIC, timestamp, length))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return length
+
+    def _contains_sorted(self, address: bytes) -> bool:
+        index = bisect_left(self._addresses, address)
+        return index < len(self._addresses) and self._addresses[index] == address
+
+    def __contains__(self, address: object) -> bool:
+        if not isinstance(address, bytes) or len(address) != self.ADDRESS_SIZE:
+            return False
+        return address in self.delta or self._contains_sorted(address)
+
+    def __len__(self) -> int:
+        return len(self._addresses) + len(self.delta)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index in range(len(self._addresses)):
+            yield self._addresses[index]
+        yield from self.delta
+
+    def add(self, address: bytes) -> None:
+        """
+        Add `address` to the `delta` if it's not already on the set
+
+        :param address:
+        """
+        if not self._contains_sorted(address):
+            self.delta.add(address)
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+import requests
+
+from ..json_rpc_replay_server import JsonRpcReplayServer
+
+
+class TestJsonRpcReplayServer(SimpleTestCase):
+    def setUp(self) -> None:
+        block_number_request = {"jsonrpc": "2.0", "method": "eth_blockNumber", "id": 1}
+        get_logs_request = {
+            "jsonrpc": "2.0",
+            "method": "eth_getLogs",
+            "params": [{"fromBlock": "0x1", "toBlock": "0x2"}],
+            "id": 2,
+        }
+        self.responses = {
+            JsonRpcReplayServer.get_request_key(block_number_request): {
+                "result": "0x10"
+            },
+            JsonRpcReplayServer.get_request_key(get_logs_request): {"result": []},
+        }
+
+    def test_get_request_key(self):
+        self.assertEqual(
+            JsonRpcReplayServer.get_request_key(
+                {"method": "eth_getLogs", "params": [{"toBlock": 2, "fromBlock": 1}]}
+            ),
+            JsonRpcReplayServer.get_request_key(
+                {
+                    "id": 5,
+                    "method": "eth_getLogs",
+                    "params": [{"fromBlock": 1, "toBlock": 2}],
+                }
+            ),
+        )
+        self.assertNotEqual(
+            JsonRpcReplayServer.get_request_key({"method": "eth_blockNumber"}),
+            JsonRpcReplayServer.get_request_key({"method": "eth_chainId"}),
+        )
+
+    def test_replay(self):
+        with JsonRpcReplayServer(responses=self.responses) as server:
+            response = requests.post(
+                server.url,
+                json={"jsonrpc": "2.0", "method": "eth_blockNumber", "id": 7},
+            ).json()
+            self.assertEqual(response, {"jsonrpc": "2.0", "id": 7, "result": "0x10"})
+
+            responses = requests.post(
+                server.url,
+                json=[
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "eth_getLogs",
+                        "params": [{"fromBlock": "0x1", "toBlock": "0x2"}],
+                        "id": 8,
+                    },
+                    {"jsonrpc": "2.0", "method": "eth_chainId", "id": 9},
+                ],
+            ).json()
+            self.assertEqual(responses[0], {"jsonrpc": "2.0", "id": 8, "result": []})
+            self.assertEqual(responses[1]["id"], 9)
+            self.assertEqual(
+                responses[1]["error"]["code"],
+                JsonRpcReplayServer.NOT_RECORDED_ERROR_CODE,
+            )
+            self.assertEqual(server.requests_count, 3)
+            self.assertEqual(server.not_recorded_requests_count, 1)
+
+    def test_record(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixture_path = os.path.join(tmp_dir, "fixture.json.gz")
+            with JsonRpcReplayServer(responses=self.responses) as upstream_server:
+                with JsonRpcReplayServer(
+                    upstream_url=upstream_server.url
+                ) as recording_server:
+                    responses = requests.post(
+                        recording_server.url,
+                        json=[
+                            {"jsonrpc": "2.0", "method": "eth_blockNumber", "id": 1},
+                            {"jsonrpc": "2.0", "method": "eth_chainId", "id": 2},
+                        ],
+                    ).json()
+                    self.assertEqual(responses[0]["result"], "0x10")
+                    self.assertIn("error", responses[1])
+            self.assertEqual(recording_server.save(fixture_path), 2)
+
+            with JsonRpcReplayServer.load(fixture_path) as server:
+                response = requests.post(
+                    server.url,
+                    json={"jsonrpc": "2.0", "method": "eth_blockNumber", "id": 3},
+                ).json()
+                self.assertEqual(response["result"], "0x10")
+                self.assertEqual(server.not_recorded_requests_count, 0)
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from hexbytes import HexBytes
+
+from ..rpc_cache import RpcCache
+
+
+class TestRpcCache(SimpleTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ethereum_client = mock.MagicMock()
+        self.ethereum_client.get_chain_id.return_value = 1
+        self.ethereum_client.current_block_number = 100
+        self.rpc_cache = RpcCache(
+            os.path.join(self.tmp_dir.name, "rpc_cache.sqlite3"),
+            self.ethereum_client,
+            eth_reorg_blocks=10,
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_is_stable(self):
+        self.assertTrue(self.rpc_cache.is_stable(90))
+        self.assertFalse(self.rpc_cache.is_stable(91))
+
+    def test_get_or_fetch_block_range(self):
+        logs = [
+            {"blockNumber": 10, "logIndex": 0},
+            {"blockNumber": 10, "logIndex": 1},
+            {"blockNumber": 12, "logIndex": 0},
+        ]
+        fetch = mock.MagicMock(return_value=logs)
+        namespace = self.rpc_cache.build_namespace("eth_getLogs", {"topics": []})
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_block_range(namespace, 10, 12, fetch), logs
+        )
+        fetch.assert_called_once()
+
+        # Range is cached per block, so it can be requested with a different size
+        fetch.reset_mock()
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_block_range(namespace, 10, 12, fetch), logs
+        )
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_block_range(namespace, 11, 12, fetch),
+            logs[2:],
+        )
+        fetch.assert_not_called()
+
+        # Different parameters use a different namespace
+        other_namespace = self.rpc_cache.build_namespace(
+            "eth_getLogs", {"topics": ["0x01"]}
+        )
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_block_range(other_namespace, 10, 12, fetch),
+            logs,
+        )
+        fetch.assert_called_once()
+
+        # Blocks inside the reorg window are never cached
+        fetch = mock.MagicMock(return_value=[])
+        self.rpc_cache.get_or_fetch_block_range(namespace, 95, 96, fetch)
+        self.rpc_cache.get_or_fetch_block_range(namespace, 95, 96, fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_or_fetch_many(self):
+        tx_hash_1 = HexBytes("0x" + "01" * 32)
+        tx_hash_2 = HexBytes("0x" + "02" * 32)
+        tx_hash_3 = HexBytes("0x" + "03" * 32)
+        txs = {
+            tx_hash_1: {"hash": tx_hash_1, "blockNumber": 5},
+            tx_hash_2: {"hash": tx_hash_2, "blockNumber": 99},  # Not stable
+            tx_hash_3: None,  # Not found
+        }
+        fetch = mock.MagicMock(
+            side_effect=lambda tx_hashes: [txs[tx_hash] for tx_hash in tx_hashes]
+        )
+
+        def get_block_number(_, tx):
+            return tx["blockNumber"]
+
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_many(
+                "eth_getTransactionByHash", list(txs), fetch, get_block_number
+            ),
+            list(txs.values()),
+        )
+        fetch.assert_called_once_with([tx_hash_1, tx_hash_2, tx_hash_3])
+
+        # Only the tx on a stable block was cached. Hex strings and bytes share the same key
+        fetch.reset_mock()
+        self.assertEqual(
+            self.rpc_cache.get_or_fetch_many(
+                "eth_getTransactionByHash",
+                [tx_hash_2, tx_hash_1.to_0x_hex(), tx_hash_3],
+                fetch,
+                get_block_number,
+            ),
+            [txs[tx_hash_2], txs[tx_hash_1], None],
+        )
+        fetch.assert_called_once_with([tx_hash_2, tx_hash_3])
+
+    def test_get_or_fetch_many_empty_responses(self):
+        traces = {10: [], 11: [{"blockNumber": 11}]}
+        fetch = mock.MagicMock(
+            side_effect=lambda block_numbers: [
+                traces[block_number] for block_number in block_numbers
+            ]
+        )
+
+        def get_block_number(block_number, _):
+            return block_number
+
+        for _ in range(2):
+            self.assertEqual(
+                self.rpc_cache.get_or_fetch_many(
+                    "trace_block", list(traces), fetch, get_block_number
+                ),
+                list(traces.values()),
+            )
+        # Empty responses are cached too
+        fetch.assert_called_once_with([10, 11])
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import datetime
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from ..sorted_address_set import SortedAddressSet
+
+
+class TestSortedAddressSet(SimpleTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "addresses.bin")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_sorted_address_set(self):
+        self.assertIsNone(SortedAddressSet.open(self.path))
+
+        addresses = sorted(os.urandom(20) for _ in range(100))
+        last_checked = datetime.datetime.now(datetime.UTC)
+        self.assertEqual(
+            SortedAddressSet.write(self.path, addresses, last_checked), 100
+        )
+        sorted_address_set = SortedAddressSet.open(self.path)
+        self.assertEqual(sorted_address_set.last_checked, last_checked)
+        self.assertEqual(len(sorted_address_set), 100)
+        self.assertEqual(list(sorted_address_set), addresses)
+        for address in addresses:
+            self.assertIn(address, sorted_address_set)
+        self.assertNotIn(bytes(20), sorted_address_set)
+        self.assertNotIn(b"\xff" * 20, sorted_address_set)
+        self.assertNotIn("not-bytes", sorted_address_set)
+
+        # New addresses are stored on the delta
+        new_address = os.urandom(20)
+        sorted_address_set.add(new_address)
+        sorted_address_set.add(addresses[0])
+        self.assertEqual(sorted_address_set.delta, {new_address})
+        self.assertIn(new_address, sorted_address_set)
+        self.assertEqual(len(sorted_address_set), 101)
+        self.assertEqual(sorted_address_set, set(addresses) | {new_address})
+
+    def test_write(self):
+        addresses = sorted(os.urandom(20) for _ in range(2))
+        with self.assertRaises(ValueError):
+            SortedAddressSet.write(self.path, reversed(addresses), None)
+        with self.assertRaises(ValueError):
+            SortedAddressSet.write(self.path, [addresses[0], addresses[0]], None)
+        with self.assertRaises(ValueError):
+            SortedAddressSet.write(self.path, [b"\x01"], None)
+        # Temporary files are removed
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+        self.assertEqual(SortedAddressSet.write(self.path, [], None), 0)
+        sorted_address_set = SortedAddressSet.open(self.path)
+        self.assertEqual(len(sorted_address_set), 0)
+        self.assertNotIn(addresses[0], sorted_address_set)
+        self.assertEqual(
+            sorted_address_set.last_checked,
+            datetime.datetime.fromtimestamp(0, tz=datetime.UTC),
+        )
+
+        # Invalid files are ignored
+        with open(self.path, "wb") as f:
+            f.write(b"not-valid")
+        self.assertIsNone(SortedAddressSet.open(self.path))